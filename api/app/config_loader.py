@@ -48,6 +48,9 @@ def _default_agent_config() -> dict[str, Any]:
             "runtime_fallback_in_tests": False,
             "task_log_dir": "data/task_logs",
             "smart_reap_max_age_minutes": 15,
+            "claim_candidate_window": 25,
+            "claim_max_wait_seconds": 30,
+            "claim_poll_interval_seconds": 2.0,
         },
         "agent_executor": {
             "default": "federation",
@@ -160,6 +163,18 @@ def _default_runtime_config() -> dict[str, Any]:
             "telemetry_enabled": True,
             "aggregate_noisy_routes": True,
             "aggregate_bucket_seconds": 60.0,
+            "event_log_segment_max_bytes": 8388608,
+            "event_log_segment_max_seconds": 3600.0,
+            "event_log_retention_days": 0.0,
+            "rollup_minute_retention_hours": 48.0,
+            "rollup_hour_retention_days": 31.0,
+            "ingest_queue_enabled": True,
+            "ingest_queue_max": 10000,
+            "ingest_batch_size": 200,
+            "ingest_flush_interval_ms": 250.0,
+            "ingest_sample_watermark": 0.8,
+            "ingest_sample_rate": 10,
+            "ingest_block_timeout_ms": 50.0,
         },
         "friction": {
             "events_path": None,
@@ -400,7 +415,16 @@ def _default_config() -> dict[str, Any]:
             "internal_email_prefixes": None,
         },
         "governance": {"min_approvals": 1},
-        "federation": {"stats_window_days": 7, "bridge_token": None},
+        "federation": {
+            "stats_window_days": 7,
+            "bridge_token": None,
+            "peer_poll_concurrency": 8,
+            "peer_poll_min_timeout_s": 1.0,
+            "peer_poll_backoff_base_s": 60.0,
+            "peer_poll_backoff_max_s": 1800.0,
+            "sync_async_threshold": 2000,
+            "sync_job_history": 100,
+        },
         "github": {"token": None, "api_token": None},
     }
     for section_defaults in (
@@ -0,0 +1,351 @@
+"""Keep synchronous work off the event loop, and report what still blocks it.
+
+Most router handlers are declared ``async def`` but never await anything:
+they call synchronous SQLAlchemy services straight from the coroutine.
+Each such call runs on the event loop thread, so one slow query stalls
+every request the worker has in flight. FastAPI already runs plain
+``def`` handlers in a thread pool. This module gives the async-declared
+ones the same treatment, without touching each router:
+
+  · Offloading is opt-in per router: ``offload_router(router)`` marks a
+    router whose handlers, and everything they call, have been checked
+    to be safe on a worker thread. That means no asyncio APIs anywhere
+    down the call chain, and no module state that is mutated without a
+    lock. Many services keep unsynchronised module caches that only
+    stayed consistent because the loop ran one handler at a time, so
+    nothing is moved without that audit. The bytecode check below only
+    sees the handler, not what it calls.
+  · ``offload_blocking_endpoints(app)`` runs once after every route is
+    registered. On opted-in routers it finds async endpoints whose
+    bytecode has no await point (no ``await``, ``async for`` or
+    ``async with``) and does not reference the asyncio loop. Each such
+    route is switched in place to a wrapper that drives the coroutine to
+    completion in a worker thread. Reads (GET/HEAD/OPTIONS) draw on a
+    limiter sized by ``api.offload_max_threads``. Writes go through a
+    separate lane of ``api.offload_write_threads`` (default 1), so two
+    writes of an opted-in router never overlap. A handler that must stay
+    on the loop is marked with ``@keep_on_loop``.
+    ``api.offload_sync_handlers=false`` turns the whole pass off.
+  · ``start_lag_monitor()`` starts a watchdog thread. It pings the loop
+    every ``api.loop_lag_interval_ms``. When the ping isn't answered
+    within ``api.loop_lag_threshold_ms``, it samples the loop thread's
+    stack until the loop comes back, and charges the stall to the
+    router handler on that stack. ``lag_stats()`` reports the worst
+    offenders, including what each one was calling when sampled.
+"""
+
+from __future__ import annotations
+
+import dis
+import functools
+import inspect
+import logging
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, TypeVar
+
+import anyio
+import anyio.to_thread
+from anyio.lowlevel import RunVar
+from fastapi import APIRouter, FastAPI
+from fastapi.routing import APIRoute, request_response
+
+from app.config_loader import get_bool, get_int
+
+log = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Opcodes that mark a suspension point in a coroutine body.
+_AWAIT_OPS = frozenset({
+    "GET_AWAITABLE", "GET_AITER", "GET_ANEXT", "BEFORE_ASYNC_WITH", "END_ASYNC_FOR", "SEND",
+})
+# Globals/attributes that tie a handler to the running loop even without
+# an await (scheduling a task, grabbing the loop).
+_LOOP_BOUND_NAMES = frozenset({
+    "asyncio", "get_running_loop", "get_event_loop", "ensure_future", "run_coroutine_threadsafe",
+})
+
+_READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+_LIMITERS: dict[str, RunVar[anyio.CapacityLimiter]] = {
+    "read": RunVar("coherence_offload_read_limiter"),
+    "write": RunVar("coherence_offload_write_limiter"),
+}
+_OFFLOADED: list[str] = []
+
+
+def keep_on_loop(fn: F) -> F:
+    """Leave this async handler on the event loop even if it never awaits."""
+    fn.__keep_on_loop__ = True  # type: ignore[attr-defined]
+    return fn
+
+
+def offload_router(router: APIRouter) -> APIRouter:
+    """Opt ``router`` into ``offload_blocking_endpoints``; returns it.
+
+    Only for routers audited as described in the module docstring.
+    """
+    router.__offload__ = True  # type: ignore[attr-defined]
+    return router
+
+
+def _offload_max_threads() -> int:
+    return max(1, get_int("api", "offload_max_threads", 40))
+
+
+def _offload_write_threads() -> int:
+    return max(1, get_int("api", "offload_write_threads", 1))
+
+
+def never_awaits(fn: Callable[..., Any]) -> bool:
+    """True for a coroutine function that runs start to finish without suspending."""
+    fn = inspect.unwrap(fn)
+    if not inspect.iscoroutinefunction(fn) or getattr(fn, "__keep_on_loop__", False):
+        return False
+    code = fn.__code__
+    if _LOOP_BOUND_NAMES & set(code.co_names):
+        return False
+    return not any(ins.opname in _AWAIT_OPS for ins in dis.get_instructions(code))
+
+
+def _limiter(lane: str) -> anyio.CapacityLimiter:
+    var = _LIMITERS[lane]
+    try:
+        return var.get()
+    except LookupError:
+        size = _offload_max_threads() if lane == "read" else _offload_write_threads()
+        limiter = anyio.CapacityLimiter(size)
+        var.set(limiter)
+        return limiter
+
+
+def _drive(endpoint: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+    coro = endpoint(*args, **kwargs)
+    try:
+        coro.send(None)
+    except StopIteration as done:
+        return done.value
+    coro.close()
+    raise RuntimeError(f"{endpoint.__qualname__} suspended after being offloaded")
+
+
+def offloaded(endpoint: Callable[..., Any], lane: str = "read") -> Callable[..., Any]:
+    """Async wrapper that runs a never-awaiting endpoint in an offload lane.
+
+    ``functools.wraps`` keeps ``__wrapped__``, so FastAPI resolves the
+    signature and annotations from the original handler.
+    """
+
+    @functools.wraps(endpoint)
+    async def run_offloaded(*args: Any, **kwargs: Any) -> Any:
+        return await anyio.to_thread.run_sync(
+            functools.partial(_drive, endpoint, args, kwargs), limiter=_limiter(lane),
+        )
+
+    run_offloaded.__offloaded__ = lane  # type: ignore[attr-defined]
+    return run_offloaded
+
+
+def _walk_routers(router, seen: set[int]):
+    """The router and every router included into it (flattened or nested)."""
+    if id(router) in seen:
+        return
+    seen.add(id(router))
+    yield router
+    for route in router.routes:
+        included = getattr(route, "original_router", None)
+        if included is not None:
+            yield from _walk_routers(included, seen)
+
+
+def offload_blocking_endpoints(app: FastAPI) -> list[str]:
+    """Move the never-awaiting async endpoints of opted-in routers into the offload pool.
+
+    The routes are updated in place: endpoint, dependant call and ASGI
+    handler. Each router is then marked as changed, so FastAPI rebuilds
+    any route it derived from an included router on the next request.
+    Returns ``"METHOD path"`` for each route moved.
+    """
+    if not get_bool("api", "offload_sync_handlers", True):
+        return []
+    moved: list[str] = []
+    for router in _walk_routers(app.router, set()):
+        if not getattr(router, "__offload__", False):
+            continue
+        changed = False
+        for route in router.routes:
+            if not isinstance(route, APIRoute) or getattr(route.endpoint, "__offloaded__", False):
+                continue
+            if not never_awaits(route.endpoint):
+                continue
+            lane = "read" if (route.methods or set()) <= _READ_METHODS else "write"
+            wrapper = offloaded(route.endpoint, lane)
+            route.endpoint = wrapper
+            route.dependant.call = wrapper
+            route.app = request_response(route.get_route_handler())
+            moved.extend(f"{method} {route.path}" for method in sorted(route.methods or ()))
+            changed = True
+        if changed and hasattr(router, "_mark_routes_changed"):
+            router._mark_routes_changed()
+    _OFFLOADED.extend(moved)
+    log.info("event_loop: %d async endpoints run in the offload pool", len(moved))
+    return moved
+
+
+# ---------------------------------------------------------------------------
+# Loop lag monitor
+# ---------------------------------------------------------------------------
+
+_MONITOR_LOCK = threading.Lock()
+_MONITOR: dict[str, Any] = {"thread": None, "stop": None}
+_RECENT: deque[dict[str, Any]] = deque(maxlen=50)
+_HANDLERS: dict[str, dict[str, Any]] = {}
+_LAG: dict[str, Any] = {
+    "beats": 0,
+    "blocked_events": 0,
+    "total_blocked_ms": 0.0,
+    "max_lag_ms": 0.0,
+    "last_lag_ms": 0.0,
+}
+
+
+def _interval_seconds() -> float:
+    return max(10, get_int("api", "loop_lag_interval_ms", 200)) / 1000.0
+
+
+def _threshold_seconds() -> float:
+    return max(5, get_int("api", "loop_lag_threshold_ms", 100)) / 1000.0
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}.{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _culprit(frame) -> tuple[str, str]:
+    """(handler, site) for a sampled loop-thread stack.
+
+    The handler is the outermost ``app.routers`` frame (the endpoint
+    itself); the site is the innermost ``app.`` frame, i.e. the service
+    call it was stuck in. Without a router frame, the innermost ``app.``
+    frame (middleware, startup work) stands in for both.
+    """
+    handler = site = None
+    innermost = frame
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("app.") and not module.startswith("app.core.event_loop"):
+            if site is None:
+                site = _frame_label(frame)
+            if module.startswith("app.routers."):
+                handler = _frame_label(frame)
+        frame = frame.f_back
+    site = site or (_frame_label(innermost) if innermost is not None else "?")
+    return handler or site, site
+
+
+def _record(lag_ms: float, samples: dict[tuple[str, str], int], threshold_ms: float) -> None:
+    with _MONITOR_LOCK:
+        _LAG["beats"] += 1
+        _LAG["last_lag_ms"] = round(lag_ms, 3)
+        _LAG["max_lag_ms"] = max(_LAG["max_lag_ms"], round(lag_ms, 3))
+        if lag_ms < threshold_ms:
+            return
+        _LAG["blocked_events"] += 1
+        _LAG["total_blocked_ms"] += lag_ms
+        total = sum(samples.values()) or 1
+        for (handler, site), n in samples.items():
+            share = lag_ms * n / total
+            entry = _HANDLERS.setdefault(handler, {"events": 0, "total_ms": 0.0, "max_ms": 0.0, "last_site": None})
+            entry["events"] += 1
+            entry["total_ms"] += share
+            entry["max_ms"] = max(entry["max_ms"], share)
+            entry["last_site"] = site
+        top = max(samples, key=samples.get) if samples else ("?", "?")
+        _RECENT.append({"at": time.time(), "lag_ms": round(lag_ms, 3), "handler": top[0], "site": top[1]})
+
+
+def _watch(loop, loop_thread_id: int, stop: threading.Event) -> None:
+    while not stop.wait(_interval_seconds()):
+        threshold = _threshold_seconds()
+        beat = threading.Event()
+        started = time.perf_counter()
+        try:
+            loop.call_soon_threadsafe(beat.set)
+        except RuntimeError:
+            return  # loop closed
+        samples: dict[tuple[str, str], int] = {}
+        if not beat.wait(threshold):
+            sample_every = max(0.005, threshold / 10)
+            while not beat.is_set() and not stop.is_set():
+                frame = sys._current_frames().get(loop_thread_id)
+                if frame is not None:
+                    key = _culprit(frame)
+                    samples[key] = samples.get(key, 0) + 1
+                beat.wait(sample_every)
+        _record((time.perf_counter() - started) * 1000.0, samples, threshold * 1000.0)
+
+
+def start_lag_monitor() -> bool:
+    """Watch the running event loop. Call from the loop (e.g. lifespan)."""
+    if not get_bool("api", "loop_lag_monitor", True):
+        return False
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    with _MONITOR_LOCK:
+        thread = _MONITOR["thread"]
+        if thread is not None and thread.is_alive():
+            return True
+        stop = threading.Event()
+        thread = threading.Thread(
+            target=_watch, args=(loop, threading.get_ident(), stop), name="event-loop-lag", daemon=True,
+        )
+        _MONITOR.update(thread=thread, stop=stop)
+        thread.start()
+    return True
+
+
+def stop_lag_monitor(timeout: float = 2.0) -> None:
+    with _MONITOR_LOCK:
+        thread, stop = _MONITOR["thread"], _MONITOR["stop"]
+        _MONITOR.update(thread=None, stop=None)
+    if stop is not None:
+        stop.set()
+    if thread is not None:
+        thread.join(timeout)
+
+
+def lag_stats(limit: int = 20) -> dict[str, Any]:
+    with _MONITOR_LOCK:
+        payload = dict(_LAG)
+        payload["total_blocked_ms"] = round(payload["total_blocked_ms"], 3)
+        handlers = sorted(_HANDLERS.items(), key=lambda item: item[1]["total_ms"], reverse=True)[:limit]
+        payload["handlers"] = [
+            {
+                "handler": name,
+                "events": entry["events"],
+                "total_ms": round(entry["total_ms"], 3),
+                "max_ms": round(entry["max_ms"], 3),
+                "last_site": entry["last_site"],
+            }
+            for name, entry in handlers
+        ]
+        payload["recent"] = list(_RECENT)[-10:]
+        thread = _MONITOR["thread"]
+    payload["running"] = bool(thread is not None and thread.is_alive())
+    payload["interval_ms"] = round(_interval_seconds() * 1000.0, 1)
+    payload["threshold_ms"] = round(_threshold_seconds() * 1000.0, 1)
+    payload["offloaded_endpoints"] = len(_OFFLOADED)
+    payload["offload_max_threads"] = _offload_max_threads()
+    payload["offload_write_threads"] = _offload_write_threads()
+    return payload
+
+
+def reset_lag_stats() -> None:
+    with _MONITOR_LOCK:
+        _HANDLERS.clear()
+        _RECENT.clear()
+        _LAG.update(beats=0, blocked_events=0, total_blocked_ms=0.0, max_lag_ms=0.0, last_lag_ms=0.0)
@@ -0,0 +1,138 @@
+"""Where ``from app.main import app`` spends its time.
+
+Cold start is dominated by imports: ``app.main`` pulls in the routers, and
+the routers pull in most of ``app.services`` and ``app.models`` plus their
+third-party dependencies. ``python -X importtime`` reports every module
+but buries the answer in ~2,000 lines. This module runs the import in a
+fresh interpreter (so nothing is already cached in ``sys.modules``) and
+folds the trace into a report:
+
+  · ``wall_ms``: wall-clock time of the import inside the child, the
+    number the cold-start budget is checked against. It is the median
+    of ``runs`` plain runs; ``-X importtime`` itself adds overhead, so
+    the traced run is not used for it.
+  · ``packages``: self time summed per package. App modules group by
+    their first three dotted parts (``app.services.agent_service`` and
+    ``app.routers.agent`` stay separate). Third-party modules group by
+    top-level package (``sqlalchemy``, ``numpy``).
+  · ``modules``: the slowest single modules by self time and by
+    cumulative time.
+
+``api/scripts/check_cold_start.py`` prints the report and compares
+``wall_ms`` with ``api.cold_start_budget_ms``.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+_API_DIR = Path(__file__).resolve().parents[2]
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+_TIMED_IMPORT = (
+    "import sys, time\n"
+    "t = time.perf_counter()\n"
+    "import {target}\n"
+    "sys.stdout.write('%.3f\\n' % ((time.perf_counter() - t) * 1000.0))\n"
+)
+
+
+def parse_importtime(text: str) -> list[dict[str, Any]]:
+    """Rows of ``-X importtime`` output as ``{module, self_us, cumulative_us, depth}``."""
+    rows: list[dict[str, Any]] = []
+    for line in text.splitlines():
+        match = _LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        rows.append({
+            "module": module,
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "depth": max(0, (len(indent) - 1) // 2),
+        })
+    return rows
+
+
+def package_of(module: str) -> str:
+    parts = module.split(".")
+    if parts[0] == "app":
+        return ".".join(parts[:3])
+    return parts[0]
+
+
+def aggregate(rows: list[dict[str, Any]], *, top: int = 25) -> dict[str, Any]:
+    """Fold parsed rows into per-package and per-module rankings."""
+    packages: dict[str, dict[str, Any]] = {}
+    for row in rows:
+        entry = packages.setdefault(package_of(row["module"]), {"self_us": 0, "modules": 0})
+        entry["self_us"] += row["self_us"]
+        entry["modules"] += 1
+    total_us = sum(row["self_us"] for row in rows)
+    ranked = sorted(packages.items(), key=lambda item: item[1]["self_us"], reverse=True)
+
+    def _module(row: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "module": row["module"],
+            "self_ms": round(row["self_us"] / 1000.0, 1),
+            "cumulative_ms": round(row["cumulative_us"] / 1000.0, 1),
+        }
+
+    return {
+        "module_count": len(rows),
+        "traced_ms": round(total_us / 1000.0, 1),
+        "packages": [
+            {
+                "package": name,
+                "self_ms": round(entry["self_us"] / 1000.0, 1),
+                "share": round(entry["self_us"] / total_us, 3) if total_us else 0.0,
+                "modules": entry["modules"],
+            }
+            for name, entry in ranked[:top]
+        ],
+        "slowest_self": [
+            _module(row) for row in sorted(rows, key=lambda r: r["self_us"], reverse=True)[:top]
+        ],
+        "slowest_cumulative": [
+            _module(row)
+            for row in sorted(
+                (r for r in rows if r["module"].startswith("app.")),
+                key=lambda r: r["cumulative_us"],
+                reverse=True,
+            )[:top]
+        ],
+    }
+
+
+def _run_child(target: str, *, trace: bool, env: dict[str, str]) -> subprocess.CompletedProcess:
+    argv = [sys.executable]
+    if trace:
+        argv += ["-X", "importtime"]
+    argv += ["-c", _TIMED_IMPORT.format(target=target)]
+    return subprocess.run(
+        argv, cwd=str(_API_DIR), env=env, capture_output=True, text=True, check=True,
+    )
+
+
+def profile(target: str = "app.main", *, runs: int = 3, top: int = 25) -> dict[str, Any]:
+    """Import ``target`` in fresh interpreters and report where the time went."""
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONPROFILEIMPORTTIME"}
+    samples = [
+        float(_run_child(target, trace=False, env=env).stdout.strip().splitlines()[-1])
+        for _ in range(max(1, runs))
+    ]
+    traced = _run_child(target, trace=True, env=env)
+    report = aggregate(parse_importtime(traced.stderr), top=top)
+    return {
+        "target": target,
+        "wall_ms": round(statistics.median(samples), 1),
+        "samples_ms": [round(s, 1) for s in samples],
+        **report,
+    }
@@ -0,0 +1,239 @@
+"""Register heavy routers up front, import them when they are first needed.
+
+``app.main`` used to import every router module at import time, and with
+them nearly every service module. That cost is paid by every container
+restart and every test collection. Most of it buys nothing until a
+request actually reaches one of those routers. A few routers carry
+dependencies nothing else in the app touches (pywebpush for push, numpy
+for resonance, the peer poller for federation). Those are registered
+lazily:
+
+  · ``include(app, "app.routers.push", prefixes=("/api/push",), prefix="/api", ...)``
+    puts a placeholder route at the position the router would have taken
+    in ``app.router.routes``. It claims every path under ``prefixes``.
+    The ``prefix``/``tags``/... keywords are kept for ``include_router``.
+  · On the first request that reaches the placeholder, the module is
+    imported in a worker thread (the loop keeps serving). Then the real
+    router is included at the placeholder's position and the request is
+    dispatched again from the top. Route order, and so matching
+    precedence, is the same as an eager include.
+  · ``start_warm(app)`` runs in the lifespan. It loads whatever is still
+    pending in the background after ``api.lazy_router_warm_delay_seconds``,
+    so a long-running worker ends up with the full table without any
+    request paying for it. ``api.lazy_router_warm=false`` turns it off.
+  · Anything that needs the whole table loads it first with ``load_all``:
+    the OpenAPI schema (``install_openapi_hook``) and runtime endpoint
+    discovery.
+
+``api.lazy_routers=false`` makes ``include`` import and include on the
+spot, exactly like ``app.include_router``. ``stats()`` (served at
+``/api/runtime/lazy-routers``) reports each lazy router's state, what
+loaded it and how long its import took.
+
+A lazily imported module can register ORM tables after startup already
+ran ``create_all``, so every lazy import is followed by
+``unified_db.ensure_schema()``, which creates whatever is new.
+
+Only routers with no startup/shutdown hooks or lifespan of their own
+belong here: those are merged when the router is included, which for a
+lazy router is after startup has already run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import logging
+import threading
+import time
+from typing import Any
+
+import anyio.to_thread
+from fastapi import FastAPI
+from starlette.routing import BaseRoute, Match, get_route_path
+from starlette.types import Receive, Scope, Send
+
+from app.config_loader import get_bool, get_float
+from app.core import event_loop
+
+log = logging.getLogger(__name__)
+
+_INSTALL_LOCK = threading.Lock()
+_STATS: dict[str, dict[str, Any]] = {}
+
+
+class LazyRouterRoute(BaseRoute):
+    """Placeholder for a router module that has not been imported yet."""
+
+    def __init__(
+        self,
+        app: FastAPI,
+        module: str,
+        prefixes: tuple[str, ...],
+        include_kwargs: dict[str, Any],
+        attr: str = "router",
+    ) -> None:
+        self.app = app
+        self.module = module
+        self.prefixes = prefixes
+        self.include_kwargs = include_kwargs
+        self.attr = attr
+
+    def matches(self, scope: Scope) -> tuple[Match, Scope]:
+        if scope["type"] in ("http", "websocket"):
+            path = get_route_path(scope)
+            if any(path == p or path.startswith(p + "/") for p in self.prefixes):
+                return Match.FULL, {}
+        return Match.NONE, {}
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await _load(self, trigger="request")
+        if _position(self) is not None:
+            raise RuntimeError(f"lazy router {self.module} did not replace its placeholder")
+        await self.app.router(scope, receive, send)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(module={self.module!r}, prefixes={self.prefixes!r})"
+
+
+def include(
+    app: FastAPI,
+    module: str,
+    *,
+    prefixes: tuple[str, ...] | list[str],
+    attr: str = "router",
+    **include_kwargs: Any,
+) -> None:
+    """Include ``module``'s router in ``app``, deferring the import when enabled."""
+    if not get_bool("api", "lazy_routers", True):
+        router = getattr(importlib.import_module(module), attr)
+        app.include_router(router, **include_kwargs)
+        return
+    app.router.routes.append(
+        LazyRouterRoute(app, module, tuple(prefixes), dict(include_kwargs), attr)
+    )
+    _STATS[module] = {
+        "module": module,
+        "prefixes": list(prefixes),
+        "state": "pending",
+        "trigger": None,
+        "import_ms": None,
+        "loaded_at": None,
+        "error": None,
+    }
+
+
+def pending(app: FastAPI) -> list[LazyRouterRoute]:
+    """Placeholders still sitting in ``app``'s route table."""
+    return [r for r in app.router.routes if isinstance(r, LazyRouterRoute)]
+
+
+def load_all(app: FastAPI) -> int:
+    """Import and include every pending router of ``app`` on the calling thread.
+
+    Returns how many placeholders were replaced.
+    """
+    loaded = 0
+    for route in pending(app):
+        module = _import(route, trigger="load_all")
+        if _install(route, module):
+            loaded += 1
+    return loaded
+
+
+def install_openapi_hook(app: FastAPI) -> None:
+    """Make ``app.openapi()`` load pending routers before building the schema."""
+    build = app.openapi
+
+    def openapi() -> dict[str, Any]:
+        if load_all(app):
+            app.openapi_schema = None
+        return build()
+
+    app.openapi = openapi  # type: ignore[method-assign]
+
+
+def start_warm(app: FastAPI) -> asyncio.Task | None:
+    """Load the pending routers in the background; ``None`` when warming is off."""
+    if not pending(app) or not get_bool("api", "lazy_router_warm", True):
+        return None
+    delay = max(0.0, get_float("api", "lazy_router_warm_delay_seconds", 5.0))
+    return asyncio.get_running_loop().create_task(_warm(app, delay), name="lazy-router-warm")
+
+
+def stats() -> dict[str, Any]:
+    routers = [dict(entry) for entry in _STATS.values()]
+    return {
+        "enabled": get_bool("api", "lazy_routers", True),
+        "pending": sum(1 for r in routers if r.get("state") != "loaded"),
+        "routers": routers,
+    }
+
+
+async def _warm(app: FastAPI, delay: float) -> None:
+    await asyncio.sleep(delay)
+    for route in pending(app):
+        try:
+            await _load(route, trigger="warm")
+        except Exception:
+            log.warning("lazy_routers: warm load of %s failed", route.module, exc_info=True)
+
+
+async def _load(route: LazyRouterRoute, *, trigger: str) -> None:
+    module = await anyio.to_thread.run_sync(_import, route, trigger)
+    _install(route, module)
+
+
+def _import(route: LazyRouterRoute, trigger: str) -> Any:
+    entry = _STATS.setdefault(route.module, {"module": route.module})
+    start = time.perf_counter()
+    try:
+        module = importlib.import_module(route.module)
+    except Exception as exc:
+        entry.update(state="failed", trigger=trigger, error=f"{type(exc).__name__}: {exc}")
+        log.exception("lazy_routers: import of %s failed", route.module)
+        raise
+    _ensure_schema(route.module)
+    if entry.get("state") != "loaded":
+        entry.update(
+            state="loaded",
+            trigger=trigger,
+            import_ms=round((time.perf_counter() - start) * 1000.0, 1),
+            loaded_at=time.time(),
+            error=None,
+        )
+        log.info("lazy_routers: loaded %s on %s in %.1fms", route.module, trigger, entry["import_ms"])
+    return module
+
+
+def _ensure_schema(module: str) -> None:
+    from app.services import unified_db
+
+    try:
+        unified_db.ensure_schema()
+    except Exception:
+        log.warning("lazy_routers: schema update after importing %s failed", module, exc_info=True)
+
+
+def _position(route: LazyRouterRoute) -> int | None:
+    for index, candidate in enumerate(route.app.router.routes):
+        if candidate is route:
+            return index
+    return None
+
+
+def _install(route: LazyRouterRoute, module: Any) -> bool:
+    """Swap ``route`` for the real router; ``False`` if another caller already did."""
+    app = route.app
+    with _INSTALL_LOCK:
+        if _position(route) is None:
+            return False
+        app.include_router(getattr(module, route.attr), **route.include_kwargs)
+        # include_router appends; move the new entry into the placeholder's
+        # slot. Each step is a single list operation, so a request walking
+        # the table concurrently sees either the placeholder or the router.
+        included = app.router.routes.pop()
+        app.router.routes[_position(route)] = included
+        app.router._mark_routes_changed()
+    event_loop.offload_blocking_endpoints(app)
+    return True
@@ -0,0 +1,24 @@
+-- Reverse child index for substrate composites.
+-- One row per position of each interned composite (position 0 = category,
+-- 1..n = children), so reverse walks — downstream cells, resonance sources,
+-- resonance signatures — use an index lookup instead of
+-- `substrate_nodes.serialized LIKE '%<ref>%'` scans.
+--
+-- The table is created by Base.metadata.create_all on startup. Rows for
+-- composites interned before it existed are filled by
+-- app.services.substrate.kernel.backfill_node_children, which also runs
+-- once per process before the first reverse walk. The backfill is
+-- idempotent (it only touches composites with no child rows).
+
+CREATE TABLE IF NOT EXISTS substrate_node_children (
+    parent_db_id    INTEGER NOT NULL REFERENCES substrate_nodes (node_id),
+    position        INTEGER NOT NULL,
+    child_package   INTEGER NOT NULL,
+    child_level     INTEGER NOT NULL,
+    child_type      INTEGER NOT NULL,
+    child_instance  INTEGER NOT NULL,
+    PRIMARY KEY (parent_db_id, position)
+);
+
+CREATE INDEX IF NOT EXISTS ix_substrate_child_lookup
+    ON substrate_node_children (child_package, child_level, child_type, child_instance);
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import gc
 import logging
 import threading
 import time
@@ -7,111 +8,125 @@ from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
-from fastapi import FastAPI, HTTPException, Header, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
-from sqlalchemy import text
-from starlette.middleware.base import BaseHTTPMiddleware
-
-from app.adapters.graph_store import InMemoryGraphStore
-from app.adapters.postgres_store import PostgresGraphStore, Base
-from app.config_loader import database_url, get_bool, get_float, get_str
-from app.routers import (
-    agent,
-    automation_usage,
-    assets,
-    audit,
-    coherence,
-    contributor_recognition,
-    contributions,
-    contributor_identity,
-    credentials,
-    contributors,
-    distributions,
-    federation,
-    field_stories,
-    friction,
-    gates,
-    governance,
-    health,
-    pulse,
-    ideas,
-    inventory,
-    lenses,
-    marketplace,
-    mcp_remote,
-    registry_discovery,
-    news,
-    peers,
-    providers,
-    spec_registry,
-    runtime,
-    auth_keys,
-    blueprints,
-    content,
-    vision,
-    traceability,
-    treasury,
-    value_lineage,
-    contributors_portfolio,
-    me_portfolio,
-)
-from app.routers import cc_economics as cc_economics_router
-from app.routers import cc_exchange as cc_exchange_router
-from app.routers import rooms as rooms_router
-from app.routers import accessible_ontology as accessible_ontology_router
-from app.routers import beliefs
-from app.routers import concepts
-from app.routers import substrate as substrate_router
-from app.routers import deployment_observer as deployment_observer_router
-from app.routers import agent_relationship as agent_relationship_router
-from app.routers import wellness as wellness_router
-from app.routers import locales as locales_router
-from app.routers import entity_views as entity_views_router
-from app.routers import hati_mesh as hati_mesh_router
-from app.routers import debug as debug_router
-from app.routers import dif_feedback
-from app.routers import models as models_router
-from app.routers import data_retention as data_retention_router
-from app.routers import geolocation
-from app.routers import edges as edges_router
-from app.routers import graph
-from app.routers import graph_questions
-from app.routers import graph_zoom
-from app.routers import graph_health
-from app.routers import agent_grounded_metrics_routes
-from app.routers import execution_value as execution_value_router
-from app.routers import creator_resonance as creator_resonance_router
-from app.routers import meta as meta_router
-from app.routers import verification as verification_router
-from app.routers import onboarding as onboarding_router
-from app.routers import openclaw_node_bridge
-from app.routers import field_relay as field_relay_router
-from app.routers import pipeline
-from app.routers import pipeline_policies
-from app.routers import push as push_router
-from app.routers import ui_preferences as ui_preferences_router
-from app.routers import memberships as memberships_router
-from app.routers import activity as activity_router
-from app.routers import messages as messages_router
-from app.routers import workspaces as workspaces_router
-from app.routers import workspace_projects as workspace_projects_router
-from app.routers import provider_stats
-from app.routers import service_registry_router
-from app.routers import constellation as constellation_router
-from app.routers import inspired_by as inspired_by_router
-from app.routers import investments as investments_router
-from app.routers import gatherings as gatherings_router
-from app.routers import presence_resonance as presence_resonance_router
-from app.routers import places as places_router
-from app.routers import vitality as vitality_router
-from app.middleware.attribution import AttributionMiddleware
-from app.middleware.rate_limit import RateLimitMiddleware
-from app.middleware.read_tracking import ReadTrackingMiddleware
-from app.middleware.request_duration import RequestDurationMiddleware
-from app.middleware.request_outcomes import RequestOutcomesMiddleware
-from app.models.runtime import RuntimeEventCreate
-from app.services import runtime_service
+# Importing the routers allocates a large, long-lived object graph, and the
+# cyclic GC keeps re-scanning it mid-import (four full passes that free next
+# to nothing, ~15% of cold start). Collection is paused while the routers
+# are imported; once every router is registered the startup heap is frozen
+# out of future passes.
+_gc_was_enabled = gc.isenabled()
+gc.disable()
+
+try:
+    from fastapi import FastAPI, HTTPException, Header, Request
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import RedirectResponse
+    from sqlalchemy import text
+    from starlette.datastructures import Headers, MutableHeaders
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+    from app.adapters.graph_store import InMemoryGraphStore
+    from app.adapters.postgres_store import PostgresGraphStore, Base
+    from app.config_loader import database_url, get_bool, get_float, get_str
+    from app.core import event_loop, lazy_routers
+    from app.routers import (
+        agent,
+        automation_usage,
+        assets,
+        audit,
+        coherence,
+        contributor_recognition,
+        contributions,
+        contributor_identity,
+        credentials,
+        contributors,
+        distributions,
+        field_stories,
+        friction,
+        gates,
+        governance,
+        health,
+        pulse,
+        ideas,
+        inventory,
+        lenses,
+        marketplace,
+        mcp_remote,
+        registry_discovery,
+        news,
+        peers,
+        providers,
+        spec_registry,
+        runtime,
+        auth_keys,
+        blueprints,
+        content,
+        vision,
+        traceability,
+        treasury,
+        value_lineage,
+        contributors_portfolio,
+        me_portfolio,
+    )
+    from app.routers import cc_economics as cc_economics_router
+    from app.routers import cc_exchange as cc_exchange_router
+    from app.routers import rooms as rooms_router
+    from app.routers import accessible_ontology as accessible_ontology_router
+    from app.routers import beliefs
+    from app.routers import concepts
+    from app.routers import substrate as substrate_router
+    from app.routers import deployment_observer as deployment_observer_router
+    from app.routers import agent_relationship as agent_relationship_router
+    from app.routers import wellness as wellness_router
+    from app.routers import locales as locales_router
+    from app.routers import entity_views as entity_views_router
+    from app.routers import hati_mesh as hati_mesh_router
+    from app.routers import debug as debug_router
+    from app.routers import dif_feedback
+    from app.routers import models as models_router
+    from app.routers import data_retention as data_retention_router
+    from app.routers import geolocation
+    from app.routers import edges as edges_router
+    from app.routers import graph
+    from app.routers import graph_questions
+    from app.routers import graph_zoom
+    from app.routers import graph_health
+    from app.routers import agent_grounded_metrics_routes
+    from app.routers import execution_value as execution_value_router
+    from app.routers import creator_resonance as creator_resonance_router
+    from app.routers import meta as meta_router
+    from app.routers import verification as verification_router
+    from app.routers import onboarding as onboarding_router
+    from app.routers import openclaw_node_bridge
+    from app.routers import field_relay as field_relay_router
+    from app.routers import pipeline
+    from app.routers import pipeline_policies
+    from app.routers import ui_preferences as ui_preferences_router
+    from app.routers import memberships as memberships_router
+    from app.routers import activity as activity_router
+    from app.routers import messages as messages_router
+    from app.routers import workspaces as workspaces_router
+    from app.routers import workspace_projects as workspace_projects_router
+    from app.routers import provider_stats
+    from app.routers import service_registry_router
+    from app.routers import constellation as constellation_router
+    from app.routers import inspired_by as inspired_by_router
+    from app.routers import investments as investments_router
+    from app.routers import gatherings as gatherings_router
+    from app.routers import presence_resonance as presence_resonance_router
+    from app.routers import places as places_router
+    from app.routers import vitality as vitality_router
+    from app.middleware.asgi import on_response_start
+    from app.middleware.attribution import AttributionMiddleware
+    from app.middleware.rate_limit import RateLimitMiddleware
+    from app.middleware.read_tracking import ReadTrackingMiddleware
+    from app.middleware.request_duration import RequestDurationMiddleware
+    from app.middleware.request_outcomes import RequestOutcomesMiddleware
+    from app.models.runtime import RuntimeEventCreate
+    from app.services import runtime_service
+finally:
+    if _gc_was_enabled:
+        gc.enable()
+
 _startup_logger = logging.getLogger("coherence.api.slow")
 _RUNTIME_AGGREGATE_LOCK = threading.Lock()
 _RUNTIME_AGGREGATE_BUCKETS: dict[tuple[str, str, str, int, int], dict[str, object]] = {}
@@ -363,8 +378,27 @@ async def lifespan(app: FastAPI):
             "startup: translator/indexer registration failed", exc_info=True,
         )
 
+    event_loop.start_lag_monitor()
+    # Import the lazily registered routers once startup has settled.
+    lazy_router_warm = lazy_routers.start_warm(app)
+
     yield
-    # shutdown: nothing needed currently
+    if lazy_router_warm is not None:
+        lazy_router_warm.cancel()
+    event_loop.stop_lag_monitor()
+    # shutdown: write out telemetry still waiting in the ingestion queue.
+    try:
+        from app.services import runtime_event_queue
+
+        runtime_event_queue.shutdown()
+    except Exception:
+        _startup_logger.warning("shutdown: runtime event queue flush failed", exc_info=True)
+    try:
+        from app.services import read_counter_buffer
+
+        read_counter_buffer.shutdown()
+    except Exception:
+        _startup_logger.warning("shutdown: read counter buffer flush failed", exc_info=True)
 
 
 app = FastAPI(
@@ -722,36 +756,54 @@ app.add_middleware(
 )
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+class SecurityHeadersMiddleware:
     """Add security headers to all responses per OWASP best practices."""
 
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=()"
-        if get_bool("server", "enable_hsts", default=False):
-            response.headers["Strict-Transport-Security"] = "max-age=63072000; includeSubDomains"
-        return response
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
+        def add_headers(message: Message) -> None:
+            headers = MutableHeaders(scope=message)
+            headers["X-Content-Type-Options"] = "nosniff"
+            headers["X-Frame-Options"] = "DENY"
+            headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+            headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=()"
+            if get_bool("server", "enable_hsts", default=False):
+                headers["Strict-Transport-Security"] = "max-age=63072000; includeSubDomains"
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
+        await self.app(scope, receive, on_response_start(send, add_headers))
+
+
+class RequestIDMiddleware:
     """Generate or propagate X-Request-ID for tracing across services."""
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
         request_id = None
         for key in ("x-request-id", "x-amzn-trace-id", "cf-ray"):
-            value = request.headers.get(key)
+            value = request_headers.get(key)
             if value:
                 request_id = value
                 break
         if not request_id:
             request_id = str(uuid4())
-        request.state.request_id = request_id
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
-        return response
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        def echo(message: Message) -> None:
+            MutableHeaders(scope=message)["X-Request-ID"] = request_id
+
+        await self.app(scope, receive, on_response_start(send, echo))
 
 
 app.add_middleware(SecurityHeadersMiddleware)
@@ -863,15 +915,17 @@ app.include_router(coherence.router, prefix="/api", tags=["coherence"])
 from app.routers import practice as practice_router
 from app.routers import sensings as sensings_router
 from app.routers import offerings as offerings_router
-from app.routers import household as household_router
-from app.routers import grocery as grocery_router
 app.include_router(practice_router.router, prefix="/api", tags=["practice"])
 app.include_router(sensings_router.router, prefix="/api", tags=["sensings"])
 app.include_router(offerings_router.router, prefix="/api", tags=["offerings"])
-app.include_router(household_router.router, prefix="/api", tags=["household"])
-app.include_router(grocery_router.router, prefix="/api", tags=["grocery"])
+lazy_routers.include(
+    app, "app.routers.household", prefixes=("/api/household",), prefix="/api", tags=["household"]
+)
+lazy_routers.include(app, "app.routers.grocery", prefixes=("/api/grocery",), prefix="/api", tags=["grocery"])
 app.include_router(governance.router, prefix="/api", tags=["governance"])
-app.include_router(federation.router, prefix="/api", tags=["federation"])
+lazy_routers.include(
+    app, "app.routers.federation", prefixes=("/api/federation",), prefix="/api", tags=["federation"]
+)
 app.include_router(field_stories.router, prefix="/api", tags=["field-stories"])
 app.include_router(openclaw_node_bridge.router, prefix="/api", tags=["federation"])
 app.include_router(field_relay_router.router, prefix="/api", tags=["field-relay"])
@@ -936,7 +990,7 @@ app.include_router(treasury.router, prefix="/api", tags=["treasury"])
 app.include_router(provider_stats.router)
 app.include_router(pipeline.router, prefix="/api", tags=["pipeline"])
 app.include_router(pipeline_policies.router, prefix="/api", tags=["pipeline"])
-app.include_router(push_router.router, prefix="/api", tags=["push"])
+lazy_routers.include(app, "app.routers.push", prefixes=("/api/push",), prefix="/api", tags=["push"])
 app.include_router(service_registry_router.router, prefix="/api", tags=["services"])
 app.include_router(cc_economics_router.router, prefix="/api", tags=["cc-economics"])
 app.include_router(cc_exchange_router.router, prefix="/api", tags=["cc-exchange"])
@@ -991,8 +1045,9 @@ app.include_router(constellation_router.router, prefix="/api", tags=["constellat
 app.include_router(vitality_router.router, prefix="/api", tags=["vitality"])
 
 # Cross-domain resonance (CRK) endpoints
-from app.routers import resonance as resonance_router  # noqa: E402
-app.include_router(resonance_router.router, prefix="/api", tags=["resonance"])
+lazy_routers.include(
+    app, "app.routers.resonance", prefixes=("/api/resonance",), prefix="/api", tags=["resonance"]
+)
 
 # Serendipity Discovery feed
 from app.routers import discovery as discovery_router  # noqa: E402
@@ -1092,48 +1147,54 @@ app.include_router(assets.router, prefix="/v1", include_in_schema=False)
 app.include_router(contributions.router, prefix="/v1", include_in_schema=False)
 app.include_router(distributions.router, prefix="/v1", include_in_schema=False)
 
-
-@app.middleware("http")
-async def capture_runtime_metrics(request: Request, call_next):
-    if not get_bool("runtime", "telemetry_enabled", default=True):
-        return await call_next(request)
-
-    start = time.perf_counter()
-    status_code: int | None = None
-    exc_name: str | None = None
-    exc_message: str | None = None
-    method = request.method
-    request_path, route_name, raw_path = _build_route_signature(request)
-    capture_path = request_path
-    capture_route_name = route_name
-    query_count, raw_query_rows, heavy_query_rows = _query_summary(request.query_params)
-    route_label = route_name or "unknown"
-    response = None
-    excluded_paths = {"/api/runtime/change-token"}
-    should_capture = request_path.startswith("/api") or request_path.startswith("/v1") or raw_path.startswith("/api") or raw_path.startswith("/v1")
-    if request_path in excluded_paths or raw_path in excluded_paths:
-        should_capture = False
-    slow_threshold_ms = _slow_request_ms_threshold()
-    log_all_requests = get_bool("api", "log_all_requests", False)
-    try:
-        response = await call_next(request)
-        status_code = response.status_code
-        return response
-    except Exception as exc:
-        status_code = 500
-        exc_name = exc.__class__.__name__
-        exc_message = str(exc)
-        raise
-    finally:
-        elapsed_ms = (time.perf_counter() - start) * 1000.0
-        if status_code is None:
-            status_code = 500
-        if response is not None:
-            response.headers["x-coherence-runtime-ms"] = f"{max(0.0, elapsed_ms):.3f}"
-            response.headers["x-coherence-runtime-cost-estimate"] = (
+# Never-awaiting async handlers of audited routers (event_loop.offload_router)
+# run in the offload pool, not on the loop.
+event_loop.offload_blocking_endpoints(app)
+# The schema covers lazily registered routers too.
+lazy_routers.install_openapi_hook(app)
+
+gc.freeze()
+
+
+class RuntimeMetricsMiddleware:
+    """Stamp runtime headers on every response and record API requests as runtime events."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not get_bool("runtime", "telemetry_enabled", default=True):
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        request = Request(scope, receive)
+        outcome: dict[str, int | float | None] = {"status_code": None, "elapsed_ms": None}
+        exc_name: str | None = None
+        exc_message: str | None = None
+        method = request.method
+        request_path, route_name, raw_path = _build_route_signature(request)
+        capture_path = request_path
+        capture_route_name = route_name
+        query_count, raw_query_rows, heavy_query_rows = _query_summary(request.query_params)
+        route_label = route_name or "unknown"
+        excluded_paths = {"/api/runtime/change-token"}
+        should_capture = request_path.startswith("/api") or request_path.startswith("/v1") or raw_path.startswith("/api") or raw_path.startswith("/v1")
+        if request_path in excluded_paths or raw_path in excluded_paths:
+            should_capture = False
+        slow_threshold_ms = _slow_request_ms_threshold()
+        log_all_requests = get_bool("api", "log_all_requests", False)
+
+        def stamp(message: Message) -> None:
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            outcome["status_code"] = message["status"]
+            outcome["elapsed_ms"] = elapsed_ms
+            headers = MutableHeaders(scope=message)
+            headers["x-coherence-runtime-ms"] = f"{max(0.0, elapsed_ms):.3f}"
+            headers["x-coherence-runtime-cost-estimate"] = (
                 f"{runtime_service.estimate_runtime_cost(max(0.0, elapsed_ms)):.8f}"
             )
-            existing_exposed = str(response.headers.get("access-control-expose-headers") or "")
+            existing_exposed = str(headers.get("access-control-expose-headers") or "")
             required_exposed = {
                 "x-request-id",
                 "x-coherence-runtime-ms",
@@ -1144,74 +1205,94 @@ async def capture_runtime_metrics(request: Request, call_next):
             else:
                 current = set()
             merged = sorted(current | required_exposed)
-            response.headers["access-control-expose-headers"] = ", ".join(merged)
-        if should_capture:
-            capture_path, capture_route_name, raw_path = _build_route_signature(request)
-            route_label = capture_route_name or route_label or "unknown"
-            if request.headers.get("content-length"):
-                body_size = _safe_int_or_none(request.headers.get("content-length")) or 0
-            else:
-                body_size = 0
-            reasons = _slow_route_reasons(
-                path=capture_path,
-                status_code=status_code,
-                reasons=[],
-                method=method,
-                query_summary=heavy_query_rows,
-            )
-            try:
-                metadata = {
-                    "tracking_kind": "api_route_request",
-                    "method": method,
-                    "route": route_label,
-                    "query_count": query_count,
-                    "query_samples": ",".join(
-                        f"{row.get('k')}={row.get('v')}" for row in raw_query_rows[:6]
-                    ),
-                    "heavy_query_keys": ",".join(sorted(heavy_query_rows.keys())),
-                    "body_bytes": body_size,
-                    "client": _client_identity(request),
-                    "req_id": _correlation_id(request),
-                    "slow_reasons": ", ".join(reasons),
-                    "exception": exc_name or "",
-                    "page_view_id": str(request.headers.get("x-page-view-id") or "").strip(),
-                    "page_route": str(request.headers.get("x-page-route") or "").strip(),
-                    "web_route": str(request.headers.get("x-web-route") or "").strip(),
-                    "web_proxy": str(request.headers.get("x-coherence-web-proxy") or "").strip(),
-                }
-                runtime_payload = RuntimeEventCreate(
-                    source=_runtime_event_source(request),
-                    endpoint=capture_path,
-                    raw_endpoint=raw_path,
-                    method=method,
+            headers["access-control-expose-headers"] = ", ".join(merged)
+
+        try:
+            await self.app(scope, receive, on_response_start(send, stamp))
+        except Exception as exc:
+            outcome["status_code"] = 500
+            exc_name = exc.__class__.__name__
+            exc_message = str(exc)
+            raise
+        finally:
+            # Timed to the response start, as the headers are, so streamed
+            # bodies don't inflate the recorded runtime.
+            elapsed_ms = outcome["elapsed_ms"]
+            if elapsed_ms is None:
+                elapsed_ms = (time.perf_counter() - start) * 1000.0
+            status_code = outcome["status_code"] or 500
+            if should_capture:
+                capture_path, capture_route_name, raw_path = _build_route_signature(request)
+                route_label = capture_route_name or route_label or "unknown"
+                if request.headers.get("content-length"):
+                    body_size = _safe_int_or_none(request.headers.get("content-length")) or 0
+                else:
+                    body_size = 0
+                reasons = _slow_route_reasons(
+                    path=capture_path,
                     status_code=status_code,
-                    runtime_ms=max(0.1, elapsed_ms),
-                    idea_id=request.headers.get("x-idea-id"),
-                    metadata=metadata,
+                    reasons=[],
+                    method=method,
+                    query_summary=heavy_query_rows,
                 )
-                for event_payload in _record_or_aggregate_runtime_event(runtime_payload):
-                    runtime_service.record_event(event_payload)
-            except Exception:
-                # Telemetry should not affect request success.
-                logger.debug("Telemetry recording failed", exc_info=True)
+                try:
+                    metadata = {
+                        "tracking_kind": "api_route_request",
+                        "method": method,
+                        "route": route_label,
+                        "query_count": query_count,
+                        "query_samples": ",".join(
+                            f"{row.get('k')}={row.get('v')}" for row in raw_query_rows[:6]
+                        ),
+                        "heavy_query_keys": ",".join(sorted(heavy_query_rows.keys())),
+                        "body_bytes": body_size,
+                        "client": _client_identity(request),
+                        "req_id": _correlation_id(request),
+                        "slow_reasons": ", ".join(reasons),
+                        "exception": exc_name or "",
+                        "page_view_id": str(request.headers.get("x-page-view-id") or "").strip(),
+                        "page_route": str(request.headers.get("x-page-route") or "").strip(),
+                        "web_route": str(request.headers.get("x-web-route") or "").strip(),
+                        "web_proxy": str(request.headers.get("x-coherence-web-proxy") or "").strip(),
+                    }
+                    runtime_payload = RuntimeEventCreate(
+                        source=_runtime_event_source(request),
+                        endpoint=capture_path,
+                        raw_endpoint=raw_path,
+                        method=method,
+                        status_code=status_code,
+                        runtime_ms=max(0.1, elapsed_ms),
+                        idea_id=request.headers.get("x-idea-id"),
+                        metadata=metadata,
+                    )
+                    for event_payload in _record_or_aggregate_runtime_event(runtime_payload):
+                        runtime_service.record_event(event_payload)
+                except Exception:
+                    # Telemetry should not affect request success.
+                    logger.debug("Telemetry recording failed", exc_info=True)
 
-            if elapsed_ms >= slow_threshold_ms or log_all_requests or status_code >= 500:
+                if elapsed_ms >= slow_threshold_ms or log_all_requests or status_code >= 500:
                     reason_text = ", ".join(reasons) if reasons else "unspecified"
                     logger.warning(
                         "slow_api_request method=%s path=%s route=%s raw_path=%s status=%s elapsed_ms=%.2f "
-                    "query_count=%s query_samples=%s heavy_queries=%s body_bytes=%s reasons=%s correlation=%s client=%s exception=%s",
-                    method,
-                    capture_path,
-                    route_label,
-                    raw_path,
-                    status_code,
-                    elapsed_ms,
-                    query_count,
-                    raw_query_rows,
-                    heavy_query_rows,
-                    body_size,
-                    reason_text,
+                        "query_count=%s query_samples=%s heavy_queries=%s body_bytes=%s reasons=%s correlation=%s client=%s exception=%s",
+                        method,
+                        capture_path,
+                        route_label,
+                        raw_path,
+                        status_code,
+                        elapsed_ms,
+                        query_count,
+                        raw_query_rows,
+                        heavy_query_rows,
+                        body_size,
+                        reason_text,
                         _correlation_id(request),
                         _client_identity(request),
                         f"{exc_name or 'none'}{':' + exc_message if exc_message else ''}",
                     )
+
+
+# Added after the other layers, so it stays the outermost one, as the
+# @app.middleware("http") function it replaces was.
+app.add_middleware(RuntimeMetricsMiddleware)
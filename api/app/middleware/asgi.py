@@ -0,0 +1,31 @@
+"""Shared plumbing for the pure-ASGI middlewares.
+
+Every layer in the request stack is a plain ASGI callable instead of a
+``BaseHTTPMiddleware``. A BaseHTTPMiddleware runs the downstream app in
+a separate task and re-wraps the response body stream on every layer.
+That costs a task hop plus a memory-stream copy per layer per request,
+and it interferes with streaming responses and request-scoped
+contextvars. A pure layer only wraps ``send``: headers are edited on the
+``http.response.start`` message as it passes through, and body chunks go
+straight to the client.
+"""
+
+from __future__ import annotations
+
+from typing import Callable
+
+from starlette.types import Message, Send
+
+
+def on_response_start(send: Send, hook: Callable[[Message], None]) -> Send:
+    """Wrap ``send`` so ``hook`` sees (and may edit) the response start message.
+
+    Use ``MutableHeaders(scope=message)`` inside the hook to set headers.
+    """
+
+    async def send_wrapper(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            hook(message)
+        await send(message)
+
+    return send_wrapper
@@ -25,12 +25,13 @@ a signal. Routes that need authorisation use separate dependencies.
 from __future__ import annotations
 
 import logging
-from typing import Awaitable, Callable, Optional, Tuple
+from typing import Optional, Tuple
 
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
 from starlette.requests import Request
-from starlette.responses import Response
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.middleware.asgi import on_response_start
 
 
 logger = logging.getLogger(__name__)
@@ -70,28 +71,29 @@ def _extract(headers) -> AttributionTriple:
     return None, None, []
 
 
-class AttributionMiddleware(BaseHTTPMiddleware):
+class AttributionMiddleware:
     """Populates request.state and echoes the result on the response."""
 
     def __init__(self, app: ASGIApp) -> None:
-        super().__init__(app)
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
+        request = Request(scope)
         contributor_id, source, scopes = _extract(request.headers)
         request.state.contributor_id = contributor_id
         request.state.attribution_source = source
         request.state.contributor_scopes = scopes
 
-        response = await call_next(request)
-
-        if contributor_id:
-            response.headers["X-Attributed-To"] = contributor_id
-            response.headers["X-Attribution-Source"] = source or "none"
-        else:
-            response.headers["X-Attribution-Source"] = "none"
+        def echo(message: Message) -> None:
+            headers = MutableHeaders(scope=message)
+            if contributor_id:
+                headers["X-Attributed-To"] = contributor_id
+                headers["X-Attribution-Source"] = source or "none"
+            else:
+                headers["X-Attribution-Source"] = "none"
 
-        return response
+        await self.app(scope, receive, on_response_start(send, echo))
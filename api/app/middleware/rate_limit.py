@@ -11,9 +11,9 @@ A last-resort ceiling remains for runaway loops (a single IP sustaining
 upstream layers (Cloudflare, Traefik) catch adversarial traffic before it
 reaches here. Inside this layer the posture is trust and flow.
 
-NOTE: Returns JSONResponse directly instead of raising HTTPException because
-Starlette's BaseHTTPMiddleware wraps pre-call_next exceptions in ExceptionGroups,
-turning 429s into 500s. Returning a response avoids the ASGI double-send bug.
+NOTE: This is a pure ASGI middleware, outside the app's exception handlers,
+so the ceiling is sent as a JSONResponse directly rather than by raising
+HTTPException (which would surface as a 500).
 """
 import asyncio
 import ipaddress
@@ -21,9 +21,9 @@ import logging
 import time
 from collections import defaultdict
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.config_loader import get_bool, get_str
 
@@ -92,29 +92,45 @@ def _is_inner_circle(ip: str) -> bool:
     return addr.is_loopback or addr.is_private or addr.is_link_local
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, requests_per_minute: int = LONG_WINDOW_CEILING):
-        super().__init__(app)
+class RateLimitMiddleware:
+    def __init__(self, app: ASGIApp, requests_per_minute: int = LONG_WINDOW_CEILING):
+        self.app = app
         self.rpm = requests_per_minute
         self._burst_counters: dict[str, list[float]] = defaultdict(list)
         self._window_counters: dict[str, list[float]] = defaultdict(list)
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request = Request(scope)
+        if not await self._admit(request):
+            response = JSONResponse(
+                status_code=429,
+                content=_CEILING_BODY,
+                headers={"Retry-After": "20"},
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+    async def _admit(self, request: Request) -> bool:
+        """Pace the caller if needed; False only at the runaway ceiling."""
         if _testing_mode_enabled() or _is_test_client_request(request):
-            return await call_next(request)
+            return True
         if request.headers.get("x-endpoint-exerciser") == "1":
-            return await call_next(request)
+            return True
 
         path = request.url.path
         if any(path.startswith(p) for p in _EXEMPT_PATHS):
-            return await call_next(request)
+            return True
 
         client_ip = request.client.host if request.client else "unknown"
 
         # Inner circle — loopback, private networks, the organism itself.
         # Served without limit.
         if _is_inner_circle(client_ip):
-            return await call_next(request)
+            return True
 
         now = time.time()
         burst_window_start = now - BURST_WINDOW_SECONDS
@@ -141,11 +157,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 long_count,
                 self.rpm,
             )
-            return JSONResponse(
-                status_code=429,
-                content=_CEILING_BODY,
-                headers={"Retry-After": "20"},
-            )
+            return False
 
         # Cooperative pacing — a brief breath instead of refusal.
         if burst_count >= BURST_HARD_LIMIT:
@@ -153,4 +165,4 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         elif burst_count >= BURST_SOFT_LIMIT:
             await asyncio.sleep(SOFT_DELAY_SECONDS)
 
-        return await call_next(request)
+        return True
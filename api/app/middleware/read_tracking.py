@@ -18,9 +18,10 @@ import time
 import logging
 from collections import defaultdict
 
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.middleware.asgi import on_response_start
 
 log = logging.getLogger(__name__)
 
@@ -119,68 +120,76 @@ def _maybe_promote(asset_id: str) -> None:
                    asset_id, count, vitality)
 
 
-class ReadTrackingMiddleware(BaseHTTPMiddleware):
-    """Adaptive read sensing — tracks only when the value exceeds the cost."""
+class ReadTrackingMiddleware:
+    """Adaptive read sensing — tracks only when the value exceeds the cost.
+
+    Sensing runs after the response has been sent, so its DB writes
+    never hold up the body.
+    """
 
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         # Only track successful GETs
-        if request.method != "GET" or response.status_code != 200:
-            return response
-
-        path = request.url.path
-
-        # Skip paths that should never be sensed
-        for skip in _SKIP_PATTERNS:
-            if skip.match(path):
-                return response
-
-        # Match trackable paths
-        for pattern in _READ_PATTERNS:
-            match = pattern.match(path)
-            if match:
-                asset_id = match.group(1)
-                concept_id = asset_id if asset_id.startswith("lc-") else None
-                t0 = time.monotonic()
-
-                # Check if reader voluntarily identified themselves
-                # X-Contributor-Id header: voluntary on reads, required on writes
-                reader_id = request.headers.get("x-contributor-id", "")
-                session_fingerprint = request.headers.get("x-session-fingerprint", "")
-                page_route = request.headers.get("x-page-route", "")
-                referrer_contributor_id = request.headers.get("x-referrer-contributor-id", "")
-
-                # Check if this is an NFT/registered asset (has a graph node)
-                # NFT assets: identified reads encouraged for CC sensing
-                is_nft = asset_id.startswith("visual-") or concept_id is not None
-
-                # Always increment in-memory counter (cheap)
-                _mem_counters[asset_id] += 1
-                _maybe_promote(asset_id)
-
-                tier = _get_tier(asset_id)
-
-                # Identified readers on NFT assets: always track (they want CC)
-                if reader_id and is_nft:
-                    tier = min(tier, 1)  # promote to full for identified NFT reads
-
-                if tier == 3:
-                    # Untracked — in-memory counter only, no DB write
-                    pass
-                elif tier == 2:
-                    # Sampled — record 1 in every N reads
-                    if _mem_counters[asset_id] % SAMPLE_RATE == 0:
-                        try:
-                            from app.services import read_tracking_service
-                            read_tracking_service.record_read(
-                                asset_id, concept_id,
-                                contributor_id=reader_id or None,
-                            )
-                        except Exception as e:
-                            log.debug("read_tracking: %s", e)
-                elif tier == 1:
-                    # Full — every read recorded
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        status: list[int] = []
+
+        def note_status(message: Message) -> None:
+            status.append(message["status"])
+
+        await self.app(scope, receive, on_response_start(send, note_status))
+        if status and status[0] == 200:
+            _sense_read(Request(scope))
+
+
+def _sense_read(request: Request) -> None:
+    """Sense one successful GET, if its path is a trackable read."""
+    path = request.url.path
+
+    # Skip paths that should never be sensed
+    for skip in _SKIP_PATTERNS:
+        if skip.match(path):
+            return
+
+    # Match trackable paths
+    for pattern in _READ_PATTERNS:
+        match = pattern.match(path)
+        if match:
+            asset_id = match.group(1)
+            concept_id = asset_id if asset_id.startswith("lc-") else None
+            t0 = time.monotonic()
+
+            # Check if reader voluntarily identified themselves
+            # X-Contributor-Id header: voluntary on reads, required on writes
+            reader_id = request.headers.get("x-contributor-id", "")
+            session_fingerprint = request.headers.get("x-session-fingerprint", "")
+            page_route = request.headers.get("x-page-route", "")
+            referrer_contributor_id = request.headers.get("x-referrer-contributor-id", "")
+
+            # Check if this is an NFT/registered asset (has a graph node)
+            # NFT assets: identified reads encouraged for CC sensing
+            is_nft = asset_id.startswith("visual-") or concept_id is not None
+
+            # Always increment in-memory counter (cheap)
+            _mem_counters[asset_id] += 1
+            _maybe_promote(asset_id)
+
+            tier = _get_tier(asset_id)
+
+            # Identified readers on NFT assets: always track (they want CC)
+            if reader_id and is_nft:
+                tier = min(tier, 1)  # promote to full for identified NFT reads
+
+            if tier == 3:
+                # Untracked — in-memory counter only, no DB write
+                pass
+            elif tier == 2:
+                # Sampled — record 1 in every N reads
+                if _mem_counters[asset_id] % SAMPLE_RATE == 0:
                     try:
                         from app.services import read_tracking_service
                         read_tracking_service.record_read(
@@ -189,34 +198,42 @@ class ReadTrackingMiddleware(BaseHTTPMiddleware):
                         )
                     except Exception as e:
                         log.debug("read_tracking: %s", e)
-
-                # Record per-contributor view event for EVERY matched read
-                # (view events are cheap, per-contributor tracking matters for CC)
+            elif tier == 1:
+                # Full — every read recorded
                 try:
                     from app.services import read_tracking_service
-                    read_tracking_service.record_view(
-                        asset_id=asset_id,
-                        concept_id=concept_id,
+                    read_tracking_service.record_read(
+                        asset_id, concept_id,
                         contributor_id=reader_id or None,
-                        session_fingerprint=session_fingerprint or None,
-                        source_page=page_route or None,
-                        referrer_contributor_id=referrer_contributor_id or None,
                     )
                 except Exception as e:
-                    log.debug("read_tracking: view event failed: %s", e)
-
-                # Monitor our own overhead
-                elapsed_us = (time.monotonic() - t0) * 1_000_000
-                _tracking_times.append(elapsed_us)
-                if len(_tracking_times) > 1000:
-                    _tracking_times.pop(0)
-                if elapsed_us > MAX_TRACKING_US:
-                    log.warning("read_tracking: overhead %dμs exceeds budget %dμs for %s",
-                                int(elapsed_us), MAX_TRACKING_US, asset_id)
-
-                break
-
-        return response
+                    log.debug("read_tracking: %s", e)
+
+            # Record per-contributor view event for EVERY matched read
+            # (view events are cheap, per-contributor tracking matters for CC)
+            try:
+                from app.services import read_tracking_service
+                read_tracking_service.record_view(
+                    asset_id=asset_id,
+                    concept_id=concept_id,
+                    contributor_id=reader_id or None,
+                    session_fingerprint=session_fingerprint or None,
+                    source_page=page_route or None,
+                    referrer_contributor_id=referrer_contributor_id or None,
+                )
+            except Exception as e:
+                log.debug("read_tracking: view event failed: %s", e)
+
+            # Monitor our own overhead
+            elapsed_us = (time.monotonic() - t0) * 1_000_000
+            _tracking_times.append(elapsed_us)
+            if len(_tracking_times) > 1000:
+                _tracking_times.pop(0)
+            if elapsed_us > MAX_TRACKING_US:
+                log.warning("read_tracking: overhead %dμs exceeds budget %dμs for %s",
+                            int(elapsed_us), MAX_TRACKING_US, asset_id)
+
+            break
 
 
 def get_tracking_stats() -> dict:
@@ -5,34 +5,46 @@ from __future__ import annotations
 import logging
 import time
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.middleware.asgi import on_response_start
 
 logger = logging.getLogger("coherence.api.duration")
 
 _DEFAULT_SLOW_THRESHOLD_S = 1.0
 
 
-class RequestDurationMiddleware(BaseHTTPMiddleware):
-    """Log a warning for any request that takes longer than *threshold_seconds*."""
+class RequestDurationMiddleware:
+    """Log a warning for any request that takes longer than *threshold_seconds*.
+
+    The duration runs until the response has been fully sent, so a slow
+    streaming body counts against the request.
+    """
 
-    def __init__(self, app, threshold_seconds: float = _DEFAULT_SLOW_THRESHOLD_S):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, threshold_seconds: float = _DEFAULT_SLOW_THRESHOLD_S):
+        self.app = app
         self.threshold_seconds = max(0.0, threshold_seconds)
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status: list[int] = []
+
+        def note_status(message: Message) -> None:
+            status.append(message["status"])
+
         start = time.perf_counter()
-        response = await call_next(request)
+        await self.app(scope, receive, on_response_start(send, note_status))
         duration = time.perf_counter() - start
 
         if duration >= self.threshold_seconds:
             logger.warning(
                 "slow_request method=%s path=%s status=%s duration_s=%.3f threshold_s=%.1f",
-                request.method,
-                request.url.path,
-                response.status_code,
+                scope["method"],
+                scope["path"],
+                status[0] if status else None,
                 duration,
                 self.threshold_seconds,
             )
-
-        return response
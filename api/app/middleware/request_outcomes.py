@@ -31,8 +31,9 @@ from collections import defaultdict
 from threading import Lock
 from typing import Any
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.middleware.asgi import on_response_start
 
 
 # Paths we don't count — they're noise from the monitor itself or from
@@ -129,16 +130,31 @@ def _reset_for_tests() -> None:  # pragma: no cover — test helper
         _buckets.clear()
 
 
-class RequestOutcomesMiddleware(BaseHTTPMiddleware):
+class RequestOutcomesMiddleware:
     """Record the outcome of every non-excluded request."""
 
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        path = request.url.path
-        if path not in _EXCLUDED_PATHS:
-            try:
-                record_outcome(response.status_code)
-            except Exception:
-                # Never let the counter break a request.
-                pass
-        return response
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in _EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        status: list[int] = []
+
+        def note_status(message: Message) -> None:
+            status.append(message["status"])
+
+        try:
+            await self.app(scope, receive, on_response_start(send, note_status))
+        finally:
+            # Counted once the status is on the wire, even if the body
+            # fails afterwards; a request that never started a response
+            # is left to the error handlers.
+            if status:
+                try:
+                    record_outcome(status[0])
+                except Exception:
+                    # Never let the counter break a request.
+                    pass
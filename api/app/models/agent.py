@@ -166,6 +166,18 @@ class AgentTaskUpdate(BaseModel):
         return out
 
 
+class AgentTaskClaimNext(BaseModel):
+    """Request body for atomically claiming the next pending task."""
+
+    worker_id: str = Field(..., min_length=1, max_length=200)
+    task_types: Optional[List[TaskType]] = None
+    tiers: Optional[List[str]] = None
+    workspace_id: Optional[str] = Field(default=None, max_length=200)
+    exclude_idea_ids: List[str] = Field(default_factory=list)
+    repo_urls: Optional[List[str]] = None  # None: any repository; tasks without one always match
+    wait_seconds: float = Field(default=0.0, ge=0.0, le=120.0)
+
+
 class AgentTask(BaseModel):
     """Agent task as returned by the API."""
 
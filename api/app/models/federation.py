@@ -71,7 +71,21 @@ class FederationSyncResult(BaseModel):
     governance_requests_created: int = 0
     accepted: int = 0
     rejected: int = 0
+    duplicates_skipped: int = 0
     errors: list[str] = Field(default_factory=list)
+    job_id: Optional[str] = None  # set when a large payload is processed in the background
+
+
+class FederationSyncJob(BaseModel):
+    """Background intake of a large federated payload (see POST /federation/sync)."""
+    job_id: str
+    source_instance_id: str
+    status: str = "queued"  # queued | running | completed | failed
+    items: int = 0
+    created_at: str
+    finished_at: Optional[str] = None
+    result: Optional[FederationSyncResult] = None
+    error: Optional[str] = None
 
 
 # ---------------------------------------------------------------------------
@@ -307,6 +307,22 @@ class Edge(Base):
         return d
 
 
+class GraphGeneration(Base):
+    """Write counters for in-memory graph caches.
+
+    Row 1 counts graph_edges writes: every edge write through graph_service
+    bumps `value` inside the same transaction, so a process holding an
+    in-memory adjacency snapshot (graph_adjacency) can tell with one
+    primary-key read whether another worker has changed the graph since
+    the snapshot was taken. Row 2 does the same for concept nodes and the
+    concept keyword index (concept_keyword_index).
+    """
+    __tablename__ = "graph_generation"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    value: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
 class NodeRevision(Base):
     """Per-edit history of every graph node — the DB-layer audit log.
 
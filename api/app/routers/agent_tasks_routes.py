@@ -1,15 +1,19 @@
 """Agent task CRUD and list routes."""
 
+import asyncio
 import json
 import logging
+import time
 from datetime import datetime, timezone, timedelta
 from typing import Optional
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
 
-from app.config_loader import get_bool
+from app.config_loader import get_bool, get_float
 from app.models.agent import (
     AgentTask,
+    AgentTaskClaimNext,
     AgentTaskCreate,
     AgentTaskList,
     AgentTaskListItem,
@@ -42,6 +46,30 @@ def _route_side_effects_enabled_in_tests() -> bool:
     return get_bool("agent_tasks", "route_side_effects_in_tests", default=False)
 
 
+def _reject_unregistered_worker(worker_hint: str, task_id: str) -> None:
+    """Block unknown workers from claiming tasks — only registered nodes or API key holders."""
+    from app.services import federation_service
+    try:
+        known = federation_service.list_nodes()
+        known_ids = {n["node_id"] for n in known}
+        known_hosts = {n.get("hostname", "") for n in known if n.get("hostname")}
+        worker_host = worker_hint.split(":")[0] if ":" in worker_hint else worker_hint
+        is_known = any([
+            any(worker_hint.startswith(nid) for nid in known_ids),
+            worker_host in known_hosts,
+            worker_hint.startswith("manual"),
+            worker_hint.startswith("proof"),
+            worker_hint.startswith("claude"),
+        ])
+        if not is_known and known_ids:
+            logger.warning("BLOCKED_CLAIM task=%s worker=%s — not a registered node", task_id, worker_hint)
+            raise HTTPException(status_code=403, detail=f"Worker '{worker_hint}' is not a registered federation node")
+    except HTTPException:
+        raise
+    except Exception:
+        pass  # Don't block on federation service errors
+
+
 @router.post(
     "/tasks",
     status_code=201,
@@ -216,6 +244,53 @@ async def list_skills(limit: int = Query(50, ge=1, le=200)) -> dict:
     }
 
 
+@router.post(
+    "/tasks/claim-next",
+    responses={
+        204: {"description": "No matching pending task within wait_seconds"},
+        403: {"description": "Worker is not a registered federation node", "model": ErrorDetail},
+    },
+    summary="Atomically claim the oldest matching pending task; optionally long-poll until one appears",
+)
+async def claim_next_task(data: AgentTaskClaimNext) -> AgentTask:
+    """Claim one pending task for data.worker_id, filtered by task_types, tiers and workspace_id.
+
+    Replaces list-then-PATCH polling: two runners can never receive the same
+    task. With wait_seconds > 0 the request waits (up to
+    agent_tasks.claim_max_wait_seconds) for a task to appear, retrying when
+    this process creates one and every claim_poll_interval_seconds otherwise.
+    Only the registration check and each claim attempt run in the
+    threadpool; the wait between attempts sleeps on the event loop, so an
+    idle long-poll holds no threadpool worker.
+    """
+    worker_hint = data.worker_id.strip()
+    await run_in_threadpool(_reject_unregistered_worker, worker_hint, "claim-next")
+    wait = min(data.wait_seconds, max(0.0, get_float("agent_tasks", "claim_max_wait_seconds", 30.0)))
+    poll_interval = max(0.1, get_float("agent_tasks", "claim_poll_interval_seconds", 2.0))
+    deadline = time.monotonic() + wait
+    while True:
+        generation = agent_service.pending_generation()
+        try:
+            task = await run_in_threadpool(
+                agent_service.claim_next_task,
+                worker_hint,
+                task_types=data.task_types,
+                tiers=data.tiers,
+                workspace_id=data.workspace_id,
+                exclude_idea_ids=data.exclude_idea_ids,
+                repo_urls=data.repo_urls,
+            )
+        except agent_service.TaskClaimConflictError:
+            task = None  # lost a race on a non-locking backend; try again
+        if task is not None:
+            return AgentTask(**task_to_full(task))
+        next_poll = min(deadline, time.monotonic() + poll_interval)
+        while time.monotonic() < next_poll and agent_service.pending_generation() == generation:
+            await asyncio.sleep(min(0.05, max(0.0, next_poll - time.monotonic())))
+        if time.monotonic() >= deadline and agent_service.pending_generation() == generation:
+            return Response(status_code=204)
+
+
 @router.get(
     "/tasks/{task_id}",
     responses={404: {"description": "Task not found", "model": ErrorDetail}},
@@ -254,26 +329,7 @@ async def update_task(
     worker_hint = data.worker_id or ""
     is_claim = data.status == TaskStatus.RUNNING and not data.decision
     if is_claim and worker_hint:
-        from app.services import federation_service
-        try:
-            known = federation_service.list_nodes()
-            known_ids = {n["node_id"] for n in known}
-            known_hosts = {n.get("hostname", "") for n in known if n.get("hostname")}
-            worker_host = worker_hint.split(":")[0] if ":" in worker_hint else worker_hint
-            is_known = any([
-                any(worker_hint.startswith(nid) for nid in known_ids),
-                worker_host in known_hosts,
-                worker_hint.startswith("manual"),
-                worker_hint.startswith("proof"),
-                worker_hint.startswith("claude"),
-            ])
-            if not is_known and known_ids:
-                logger.warning("BLOCKED_CLAIM task=%s worker=%s — not a registered node", task_id, worker_hint)
-                raise HTTPException(status_code=403, detail=f"Worker '{worker_hint}' is not a registered federation node")
-        except HTTPException:
-            raise
-        except Exception:
-            pass  # Don't block on federation service errors
+        _reject_unregistered_worker(worker_hint, task_id)
     existing_task = agent_service.get_task(task_id)
     previous_status_value = task_status_value(existing_task)
     context_patch = target_state_context_patch(data)
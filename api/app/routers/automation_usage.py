@@ -78,6 +78,11 @@ async def get_automation_usage_snapshots(limit: int = Query(200, ge=1, le=2000))
     }
 
 
+@router.get("/automation/usage/probe-timings", summary="Get Provider Snapshot Probe Timings")
+async def get_automation_usage_probe_timings() -> dict:
+    return automation_usage_service.provider_probe_timings()
+
+
 @router.post(
     "/automation/usage/local-circulation",
     status_code=201,
@@ -7,6 +7,7 @@ from uuid import UUID, uuid4
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
+from app.core import event_loop
 from app.models.asset import Asset, AssetType
 from app.models.contribution import Contribution, ContributionCreate
 from app.models.contributor import Contributor, ContributorType
@@ -19,7 +20,9 @@ from app.services.contribution_cost_service import (
     estimate_commit_cost_with_provenance,
 )
 
-router = APIRouter()
+# Audited for the offload pool: graph_service is shared with the graph
+# router, and the ledger, identity and cost services keep no module state.
+router = event_loop.offload_router(APIRouter())
 
 
 class GitHubContribution(BaseModel):
@@ -8,7 +8,7 @@ import time
 from datetime import datetime, timezone
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Response
 from pydantic import BaseModel
 
 from app.middleware.traceability import traces_to
@@ -35,6 +35,7 @@ from app.models.federation import (
     FederationStrategyEffectivenessReportRequest,
     FederationStrategyEffectivenessReportResponse,
     FederationStrategyListResponse,
+    FederationSyncJob,
     FederationSyncResult,
     MeasurementListResponse,
     MeasurementPushRequest,
@@ -83,10 +84,43 @@ async def get_instance(instance_id: str) -> FederatedInstance:
     return found
 
 
-@router.post("/federation/sync", response_model=FederationSyncResult, summary="Receive a federated payload from a remote instance")
-async def receive_payload(payload: FederatedPayload) -> FederationSyncResult:
-    """Receive a federated payload from a remote instance."""
-    return federation_service.receive_payload(payload)
+@router.post(
+    "/federation/sync",
+    response_model=FederationSyncResult,
+    responses={202: {"description": "Large payload accepted for background intake; poll the job_id"}},
+    summary="Receive a federated payload from a remote instance",
+)
+async def receive_payload(
+    payload: FederatedPayload,
+    background_tasks: BackgroundTasks,
+    response: Response,
+) -> FederationSyncResult:
+    """Receive a federated payload from a remote instance.
+
+    Payloads with more than federation.sync_async_threshold items are
+    validated now and ingested after the response (202 with job_id); poll
+    GET /federation/sync/jobs/{job_id} for the outcome.
+    """
+    if federation_service.payload_item_count(payload) <= federation_service.sync_async_threshold():
+        return federation_service.receive_payload(payload)
+    result, job = federation_service.queue_sync_job(payload)
+    if job is not None:
+        background_tasks.add_task(federation_service.run_sync_job, job.job_id, payload)
+        response.status_code = 202
+    return result
+
+
+@router.get(
+    "/federation/sync/jobs/{job_id}",
+    response_model=FederationSyncJob,
+    summary="Status and result of a background federated payload intake",
+)
+async def get_sync_job(job_id: str) -> FederationSyncJob:
+    """Status and result of a background federated payload intake."""
+    job = federation_service.get_sync_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Sync job not found")
+    return job
 
 
 @router.get("/federation/sync/history", summary="List past sync operations")
@@ -541,6 +575,7 @@ async def trigger_peer_poll(
     return {
         "polled": len(results),
         "results": {pid: r.to_dict() for pid, r in results.items()},
+        "health": federation_peer_poll_service.peer_poll_health(),
     }
 
 
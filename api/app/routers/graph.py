@@ -16,6 +16,7 @@ from fastapi import APIRouter, HTTPException, Query, Request
 from pydantic import BaseModel, Field
 from typing import Any
 
+from app.core import event_loop
 from app.services import graph_service
 from app.models.graph import CANONICAL_EDGE_TYPE_SET, NODE_TYPE_SET
 from app.services.locale_projection import (
@@ -25,7 +26,10 @@ from app.services.locale_projection import (
     resolve_caller_lang,
 )
 
-router = APIRouter()
+# Audited for the offload pool: graph_adjacency and concept_keyword_index
+# guard their state with locks, frequency_profile_service's caches only
+# see single-key get/set/pop, and nothing below touches asyncio.
+router = event_loop.offload_router(APIRouter())
 log = logging.getLogger(__name__)
 
 
@@ -415,10 +419,18 @@ async def get_subgraph(
     node_id: str,
     depth: int = Query(default=1, ge=1, le=5),
     edge_types: str | None = None,
+    max_nodes: int | None = Query(default=None, ge=1, le=10000),
+    max_edges: int | None = Query(default=None, ge=1, le=20000),
 ):
-    """Get a subgraph centered on a node."""
+    """Get a subgraph centered on a node.
+
+    max_nodes / max_edges tighten the traversal budget; the response
+    carries truncated=True when a budget stopped the walk early.
+    """
     types = edge_types.split(",") if edge_types else None
-    return graph_service.get_subgraph(node_id, depth=depth, edge_types=types)
+    return graph_service.get_subgraph(
+        node_id, depth=depth, edge_types=types, max_nodes=max_nodes, max_edges=max_edges,
+    )
 
 
 @router.get("/graph/path", summary="Find shortest path between two nodes")
@@ -10,7 +10,7 @@ Endpoints:
     GET /api/resonance/ideas/{idea_id}   — CRK-ranked resonances for one idea
     GET /api/resonance/proof             — evidence log that resonance is working
     GET /api/resonance/events            — raw resonance discovery event log
-    POST /api/resonance/scan             — trigger a full cross-domain scan
+    POST /api/resonance/scan             — score new/edited ideas (or everything) and log resonances
 """
 
 from __future__ import annotations
@@ -78,6 +78,10 @@ class ScanResult(BaseModel):
     cross_domain_pairs: int
     ideas_scanned: int
     duration_ms: float
+    incremental: bool = True
+    ideas_changed: int = 0
+    pairs_scored: int = 0
+    pairs_pruned: int = 0
 
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
@@ -285,35 +289,41 @@ async def get_resonance_events(
     return {"items": items, "total": total, "limit": limit, "offset": offset}
 
 
-@router.post("/resonance/scan", response_model=ScanResult, summary="Trigger a full cross-domain resonance scan of the idea portfolio")
+@router.post("/resonance/scan", response_model=ScanResult, summary="Score resonance for new or edited ideas (or the full portfolio) and log discoveries")
 async def trigger_resonance_scan(
     min_coherence: float = Query(0.0, ge=0.0, le=1.0),
     max_ideas: int = Query(100, ge=1, le=500, description="Cap ideas to scan (prevents timeout)"),
+    incremental: bool = Query(True, description="Only score pairs touching ideas created or edited since the last scan"),
 ) -> ScanResult:
-    """Trigger a full cross-domain resonance scan of the idea portfolio.
+    """Score resonance across the idea portfolio and log discoveries.
 
-    Scans all pairs up to max_ideas using the CRK algorithm. Results are cached
-    so subsequent calls to /resonance/cross-domain will be fast.
-
-    Warning: O(n²) complexity. For 100 ideas ≈ 5000 pairs ≈ 2-5 seconds.
-    Use max_ideas to control duration.
+    Incremental scans (the default) only score pairs involving ideas that are
+    new or edited since the previous scan; incremental=false rescans every
+    uncached pair up to max_ideas. Candidate pairs are pruned by a cheap
+    harmonic upper bound before the exact CRK runs. Results are cached so
+    subsequent calls to /resonance/cross-domain will be fast.
     """
     import time
 
     all_ideas = _all_ideas_as_dicts()[:max_ideas]
     t0 = time.perf_counter()
 
-    pairs = resonance_svc.get_cross_domain_pairs(
+    scan = resonance_svc.scan_resonance(
         all_ideas=all_ideas,
-        limit=500,
         min_coherence=min_coherence,
+        limit=500,
+        incremental=incremental,
     )
 
     elapsed_ms = round((time.perf_counter() - t0) * 1000, 1)
 
     return ScanResult(
-        pairs_found=len(pairs),
-        cross_domain_pairs=sum(1 for p in pairs if p.cross_domain),
-        ideas_scanned=len(all_ideas),
+        pairs_found=len(scan.pairs),
+        cross_domain_pairs=sum(1 for p in scan.pairs if p.cross_domain),
+        ideas_scanned=scan.ideas_scanned,
         duration_ms=elapsed_ms,
+        incremental=incremental,
+        ideas_changed=scan.ideas_changed,
+        pairs_scored=scan.pairs_scored,
+        pairs_pruned=scan.pairs_pruned,
     )
@@ -5,6 +5,7 @@ from __future__ import annotations
 from fastapi import APIRouter, Body, Query, Request
 from pydantic import BaseModel
 
+from app.core import event_loop, lazy_routers
 from app.models.pagination import PaginatedResponse
 from app.models.runtime import (
     EndpointAttentionReport,
@@ -12,9 +13,12 @@ from app.models.runtime import (
     RuntimeEventCreate,
     WebViewPerformanceReport,
 )
-from app.services import mvp_baseline_service, runtime_service
+from app.services import mvp_baseline_service, runtime_event_queue, runtime_service, unified_db
 
-router = APIRouter()
+# Audited for the offload pool: runtime_service replaces its event and
+# change-token caches under one lock, the ingest queue is a locked
+# write-behind buffer, and the exerciser awaits so it stays on the loop.
+router = event_loop.offload_router(APIRouter())
 
 
 class RuntimeExerciserRunRequest(BaseModel):
@@ -51,6 +55,26 @@ async def runtime_change_token(force_refresh: bool = Query(False)) -> dict:
     return runtime_service.live_change_token(force_refresh=force_refresh)
 
 
+@router.get("/runtime/ingest/stats", summary="Runtime Event Ingestion Queue Stats")
+async def runtime_ingest_stats() -> dict:
+    return runtime_event_queue.stats()
+
+
+@router.get("/runtime/event-loop", summary="Event Loop Lag And Blocking Handlers")
+async def runtime_event_loop() -> dict:
+    return event_loop.lag_stats()
+
+
+@router.get("/runtime/db-pools", summary="Shared Database Connection Pools")
+async def runtime_db_pools() -> dict:
+    return {"pools": unified_db.pool_stats()}
+
+
+@router.get("/runtime/lazy-routers", summary="Lazily Registered Routers And Their Load Times")
+async def runtime_lazy_routers() -> dict:
+    return lazy_routers.stats()
+
+
 @router.get("/runtime/ideas/summary", summary="Runtime Summary By Idea")
 async def runtime_summary_by_idea(
     seconds: int = Query(3600, ge=60, le=2592000),
@@ -40,6 +40,7 @@ from app.services.substrate import (
     ingest_markdown_text,
     lattice_stats,
     lookup_cell,
+    lookup_cells,
     lookup_node,
     view_cell_through_blueprint,
 )
@@ -726,6 +727,90 @@ def get_equivalent(domain: str, name: str) -> EquivalentResponse:
         )
 
 
+class CoherentNeighborOut(BaseModel):
+    cell: CellOut
+    score: float
+
+
+class CoherentNeighborsOut(BaseModel):
+    cell: CellOut
+    neighbors: list[CoherentNeighborOut] = Field(default_factory=list)
+    count: int = 0
+
+
+class CoherentPairOut(BaseModel):
+    a: CellOut
+    b: CellOut
+    score: float
+
+
+class CoherentPairsOut(BaseModel):
+    threshold: float
+    pairs: list[CoherentPairOut] = Field(default_factory=list)
+    count: int = 0
+
+
+def _cells_by_id(session, cell_ids: set[int]) -> dict[int, CellOut]:
+    return {
+        cell_id: CellOut.from_cell(cell)
+        for cell_id, cell in lookup_cells(session, list(cell_ids)).items()
+    }
+
+
+@router.get(
+    "/coherence/neighbors/{domain}/{name:path}",
+    response_model=CoherentNeighborsOut,
+    tags=["substrate"],
+)
+def get_coherent_neighbors(
+    domain: str,
+    name: str,
+    k: int = Query(10, ge=1, le=200),
+    min_score: float = Query(0.0, ge=0.0, le=1.0),
+) -> CoherentNeighborsOut:
+    """The k cells whose resonance signatures are most coherent with (domain, name).
+
+    Jaccard over the (verb, other) signature, as `coherence_score`, served
+    from the sparse resonance index so one request is one index lookup
+    rather than a signature walk per candidate.
+    """
+    from app.services.substrate.resonance_index import most_coherent
+
+    with session_scope() as session:
+        cell = lookup_cell(session, domain, name)
+        if cell is None:
+            raise HTTPException(status_code=404, detail=f"cell ({domain}, {name}) not found")
+        ranked = most_coherent(session, cell.cell_id, k, min_score=min_score)
+        cells = _cells_by_id(session, {cell_id for cell_id, _ in ranked})
+        neighbors = [
+            CoherentNeighborOut(cell=cells[cell_id], score=round(score, 6))
+            for cell_id, score in ranked
+            if cell_id in cells
+        ]
+        return CoherentNeighborsOut(
+            cell=CellOut.from_cell(cell), neighbors=neighbors, count=len(neighbors),
+        )
+
+
+@router.get("/coherence/pairs", response_model=CoherentPairsOut, tags=["substrate"])
+def get_coherent_pairs(
+    threshold: float = Query(0.5, gt=0.0, le=1.0),
+    limit: int = Query(100, ge=1, le=1000),
+) -> CoherentPairsOut:
+    """Every pair of cells whose coherence is at or above `threshold`, best first."""
+    from app.services.substrate.resonance_index import coherent_pairs
+
+    with session_scope() as session:
+        ranked = coherent_pairs(session, threshold, limit=limit)
+        cells = _cells_by_id(session, {c for a, b, _ in ranked for c in (a, b)})
+        pairs = [
+            CoherentPairOut(a=cells[a], b=cells[b], score=round(score, 6))
+            for a, b, score in ranked
+            if a in cells and b in cells
+        ]
+        return CoherentPairsOut(threshold=threshold, pairs=pairs, count=len(pairs))
+
+
 @router.get("/cells", tags=["substrate"])
 def list_cells(
     domain: str | None = Query(None, description="Filter by domain"),
@@ -3,20 +3,28 @@ from __future__ import annotations
 
 import logging
 import time
+from datetime import date, datetime, timezone
 from typing import Any
 
-from fastapi import APIRouter, Header, Query
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from app.core import event_loop
 from app.services import entity_view_attribution_service
 from app.services import read_tracking_service
 from app.services import discovery_reward_service
 from app.services import views_health_service
 from app.services import view_events_archive_service
+from app.services import view_archive_query
 
 log = logging.getLogger(__name__)
 
-router = APIRouter()
+# Audited for the offload pool: read_tracking_service only appends to its
+# in-memory event lists and creates the schema before marking itself ready,
+# views_health_service keeps a bounded deque, archive cache writes go
+# through a per-thread part file, and nothing below touches asyncio.
+router = event_loop.offload_router(APIRouter())
 
 
 class PingBody(BaseModel):
@@ -164,20 +172,58 @@ async def views_health() -> dict[str, Any]:
         "UTC day, verifies the SHA-256 against the tombstone, "
         "decompresses, and returns the events. Local cache makes "
         "repeat reads instant. The tombstone is included in the "
-        "response so callers can verify integrity themselves."
+        "response so callers can verify integrity themselves. "
+        "asset_id / contributor_id / since / until filter inside the "
+        "decode loop; offset + limit page over the matches. "
+        "format=ndjson streams the matching events one per line instead. "
+        "The payload is verified before the first line is sent: an "
+        "integrity failure answers 502, and X-Archive-Sha256 carries the "
+        "verified tombstone hash."
     ),
 )
-async def views_archive_retrieve(day: str) -> dict[str, Any]:
+def views_archive_retrieve(
+    day: str,
+    asset_id: str | None = Query(None, description="Only events for this asset"),
+    contributor_id: str | None = Query(None, description="Only events by this contributor"),
+    since: datetime | None = Query(None, description="Only events at or after this instant (UTC if naive)"),
+    until: datetime | None = Query(None, description="Only events before this instant (UTC if naive)"),
+    offset: int = Query(0, ge=0, description="Matching events to skip"),
+    limit: int | None = Query(None, ge=1, le=100_000, description="Matching events to return"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="json envelope or ndjson stream"),
+):
     try:
-        from datetime import date as _date
-        target_day = _date.fromisoformat(day)
+        target_day = date.fromisoformat(day)
     except ValueError:
-        from fastapi import HTTPException
         raise HTTPException(
             status_code=400,
             detail=f"day must be YYYY-MM-DD (got {day!r})",
         )
-    return view_events_archive_service.retrieve_day(target_day)
+    since = since.replace(tzinfo=timezone.utc) if since and since.tzinfo is None else since
+    until = until.replace(tzinfo=timezone.utc) if until and until.tzinfo is None else until
+    if format == "ndjson":
+        try:
+            stream = view_events_archive_service.open_day(target_day, verify=True)
+        except view_events_archive_service.ArchiveRetrievalError as e:
+            raise HTTPException(status_code=502, detail=str(e))
+        if stream is None:
+            raise HTTPException(status_code=404, detail=f"{target_day.isoformat()} is not archived")
+        flt = view_events_archive_service.EventFilter(
+            asset_id=asset_id, contributor_id=contributor_id, since=since, until=until,
+        )
+        return StreamingResponse(
+            view_events_archive_service.ndjson_lines(stream, flt, offset=offset, limit=limit),
+            media_type="application/x-ndjson",
+            headers={"X-Archive-Sha256": stream.tomb.sha256},
+        )
+    return view_events_archive_service.retrieve_day(
+        target_day,
+        asset_id=asset_id,
+        contributor_id=contributor_id,
+        since=since,
+        until=until,
+        offset=offset,
+        limit=limit,
+    )
 
 
 @router.get(
@@ -189,6 +235,40 @@ async def views_archive_list() -> dict[str, Any]:
     return view_events_archive_service.stats()
 
 
+# ---------------------------------------------------------------------------
+# GET /api/views/range
+# ---------------------------------------------------------------------------
+
+@router.get(
+    "/views/range",
+    summary="View totals over a long date range, hot and cold tier",
+    description=(
+        "Per-asset views, anonymous views and estimated unique viewers "
+        "for the UTC days [since, until]. Archived days are answered from "
+        "cached per-day summaries of the cold tier (fetched in parallel "
+        "the first time), the rest from the daily rollups; each day is "
+        "counted from exactly one tier. With asset_id the answer covers "
+        "just those assets plus a daily breakdown; without, the top "
+        "`limit` assets by views. One request builds a bounded number of "
+        "missing summaries; archived days beyond that are listed under "
+        "`missing` and counted from the rollups until a later request "
+        "summarises them."
+    ),
+)
+def views_range(
+    since: date = Query(..., description="First UTC day (YYYY-MM-DD)"),
+    until: date | None = Query(None, description="Last UTC day, inclusive (default: today)"),
+    asset_id: list[str] | None = Query(None, description="Restrict to these assets (repeatable)"),
+    limit: int = Query(50, ge=1, le=500, description="Assets to return when asset_id is not given"),
+) -> dict[str, Any]:
+    until = until or datetime.now(timezone.utc).date()
+    if since > until:
+        raise HTTPException(status_code=400, detail="since must not be after until")
+    if (until - since).days >= 3660:
+        raise HTTPException(status_code=400, detail="range is limited to 10 years")
+    return view_archive_query.query_range(since, until, asset_ids=asset_id, limit=limit)
+
+
 # ---------------------------------------------------------------------------
 # GET /api/views/trending
 # ---------------------------------------------------------------------------
@@ -6,10 +6,10 @@ import os
 from contextlib import contextmanager
 from typing import Any
 
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import NullPool
 
+from app.services import unified_db
 from app.services.agent_run_state.models import AgentRunStateRecord, Base
 
 _ENGINE_CACHE: dict[str, Any] = {"url": "", "engine": None, "sessionmaker": None}
@@ -22,11 +22,7 @@ def _database_url() -> str:
 
 
 def _create_engine(url: str):
-    kwargs: dict[str, Any] = {"pool_pre_ping": True}
-    if url.startswith("sqlite"):
-        kwargs["connect_args"] = {"check_same_thread": False}
-        kwargs["poolclass"] = NullPool
-    return create_engine(url, **kwargs)
+    return unified_db.shared_engine(url, owner="agent_run_state", cache=_ENGINE_CACHE)
 
 
 def _table_exists(engine: Any, table_name: str) -> bool:
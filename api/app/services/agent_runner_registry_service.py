@@ -33,9 +33,10 @@ else:
     def _unlock(f):
         fcntl.flock(f.fileno(), fcntl.LOCK_UN)
 
-from sqlalchemy import DateTime, Integer, String, Text, create_engine, inspect
+from sqlalchemy import DateTime, Integer, String, Text, inspect
 from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, sessionmaker
-from sqlalchemy.pool import NullPool
+
+from app.services import unified_db
 
 logger = logging.getLogger(__name__)
 
@@ -159,11 +160,7 @@ def _is_online(lease_expires_at: datetime | None, now: datetime | None = None) -
 
 
 def _create_engine(url: str):
-    kwargs: dict[str, Any] = {"pool_pre_ping": True}
-    if url.startswith("sqlite"):
-        kwargs["connect_args"] = {"check_same_thread": False}
-        kwargs["poolclass"] = NullPool
-    return create_engine(url, **kwargs)
+    return unified_db.shared_engine(url, owner="agent_runner_registry", cache=_ENGINE_CACHE)
 
 
 def _table_exists(engine: Any, table_name: str) -> bool:
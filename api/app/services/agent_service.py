@@ -27,6 +27,7 @@ from app.services.agent_service_store import (
     _default_store_path,
     _store_path,
     _now,
+    pending_generation,
 )
 
 # Executor / integration
@@ -39,7 +40,7 @@ from app.services.agent_service_executor import (
 )
 
 # CRUD
-from app.services.agent_service_crud import create_task, get_task, update_task
+from app.services.agent_service_crud import claim_next_task, create_task, get_task, update_task
 
 # List / counts
 from app.services.agent_service_list import (
@@ -1,9 +1,10 @@
 """Agent task CRUD: create_task, get_task, update_task, claim, resolve_route, target state."""
 
 import logging
+import threading
 from typing import Any, Optional
 
-from app.config_loader import get_bool
+from app.config_loader import get_bool, get_int
 from app.models.agent import AgentTaskCreate, TaskStatus, TaskType
 
 from app.services import agent_routing_service as routing_service
@@ -26,6 +27,7 @@ from app.services.agent_routing.prompt_templates_loader import build_default_tas
 from app.services.agent_service_store import (
     TaskClaimConflictError,
     _ensure_store_loaded,
+    _deserialize_task,
     _generate_id,
     _load_task_from_db,
     _now,
@@ -33,6 +35,7 @@ from app.services.agent_service_store import (
     _sanitize_task_output,
     _serialize_task,
     _store,
+    note_pending_task,
 )
 from app.services.agent_service_task_derive import (
     apply_agent_graph_state_contract,
@@ -48,6 +51,7 @@ log = logging.getLogger(__name__)
 
 _TARGET_STATE_DEFAULT_WINDOW_SEC = 900
 _TARGET_STATE_MAX_TEXT = 600
+_MEMORY_CLAIM_LOCK = threading.Lock()
 
 
 def _normalize_evidence_list(raw: Any) -> list[str]:
@@ -402,6 +406,8 @@ def create_task(data: AgentTaskCreate) -> dict[str, Any]:
         agent_task_store_service.upsert_task(_serialize_task(task))
     else:
         _save_store_to_disk()
+    if task["status"] == TaskStatus.PENDING:
+        note_pending_task()
     return task
 
 
@@ -564,4 +570,94 @@ def update_task(
         agent_task_store_service.upsert_task(_serialize_task(task))
     else:
         _save_store_to_disk()
+    if task.get("status") == TaskStatus.PENDING and previous_status_value != "pending":
+        note_pending_task()
     return task
+
+
+def _normalize_repo_url(url: str) -> str:
+    return url.lower().replace("https://", "").replace("http://", "").rstrip("/")
+
+
+def _claim_filter(
+    exclude_idea_ids: Optional[list[str]],
+    repo_urls: Optional[list[str]],
+):
+    """Runner-side eligibility: skip ideas it is already working and repos it cannot push to.
+
+    Tasks without a workspace_git_url are always eligible; repo_urls=None
+    means the caller accepts any repository.
+    """
+    excluded = {str(i) for i in exclude_idea_ids or [] if str(i).strip()}
+    allowed = None if repo_urls is None else {_normalize_repo_url(str(u)) for u in repo_urls if str(u).strip()}
+
+    def accept(task: dict[str, Any]) -> bool:
+        ctx = task.get("context") if isinstance(task.get("context"), dict) else {}
+        idea_id = str(ctx.get("idea_id") or "")
+        if idea_id and idea_id in excluded:
+            return False
+        repo = _normalize_repo_url(str(ctx.get("workspace_git_url") or ""))
+        return not repo or allowed is None or repo in allowed
+
+    return accept
+
+
+def claim_next_task(
+    worker_id: str,
+    *,
+    task_types: Optional[list[TaskType]] = None,
+    tiers: Optional[list[str]] = None,
+    workspace_id: Optional[str] = None,
+    exclude_idea_ids: Optional[list[str]] = None,
+    repo_urls: Optional[list[str]] = None,
+) -> Optional[dict]:
+    """Claim the oldest pending task matching the filters for worker_id, or None.
+
+    With the task database the pick-and-claim is a single atomic step in
+    agent_task_store_service.claim_next_task, so concurrent runners never
+    receive the same task. The claimed task then goes through update_task
+    like a PATCH to running, which is idempotent for its own claimant.
+    """
+    claimant = normalize_worker_id(worker_id)
+    type_values = [t.value if isinstance(t, TaskType) else str(t) for t in task_types or []]
+    accept = _claim_filter(exclude_idea_ids, repo_urls)
+    if agent_task_store_service.enabled():
+        raw = agent_task_store_service.claim_next_task(
+            worker_id=claimant,
+            task_types=type_values or None,
+            tiers=tiers or None,
+            workspace_id=workspace_id,
+            accept=accept,
+            window=get_int("agent_tasks", "claim_candidate_window", 25),
+        )
+        task = _deserialize_task(raw) if raw else None
+        if task is None:
+            return None
+        _store[task["id"]] = task
+        return update_task(task["id"], status=TaskStatus.RUNNING, worker_id=claimant)
+
+    with _MEMORY_CLAIM_LOCK:
+        _ensure_store_loaded(include_output=False)
+        lookup: dict[str, str] | None = None
+        candidates = sorted(
+            (t for t in _store.values() if t.get("status") == TaskStatus.PENDING),
+            key=lambda t: t["created_at"],
+        )
+        for task in candidates:
+            if task.get("claimed_by") not in (None, claimant):
+                continue
+            if type_values and status_value(task.get("task_type")) not in type_values:
+                continue
+            if tiers and task.get("tier") not in tiers:
+                continue
+            if workspace_id:
+                from app.services.agent_service_list import _build_idea_workspace_lookup, _task_matches_workspace
+
+                if lookup is None:
+                    lookup = _build_idea_workspace_lookup()
+                if not _task_matches_workspace(task, workspace_id, lookup):
+                    continue
+            if not accept(task):
+                continue
+            return update_task(task["id"], status=TaskStatus.RUNNING, worker_id=claimant)
+    return None
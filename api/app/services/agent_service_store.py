@@ -29,6 +29,18 @@ _store_loaded_test_context: str | None = None
 _store_loaded_includes_output = False
 _store_loaded_at_monotonic = 0.0
 
+# Bumped whenever this process makes a task pending; claim-next long-polls
+# watch it to wake before their next full poll.
+_pending_signal: dict[str, int] = {"generation": 0}
+
+
+def note_pending_task() -> None:
+    _pending_signal["generation"] += 1
+
+
+def pending_generation() -> int:
+    return _pending_signal["generation"]
+
 
 def _default_store_path() -> Path:
     return Path(__file__).resolve().parents[2] / "logs" / "agent_tasks.json"
@@ -3,15 +3,16 @@
 from __future__ import annotations
 
 import json
+import threading
 from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Callable
 
-from sqlalchemy import DateTime, Integer, String, Text, create_engine, func, inspect
+from sqlalchemy import DateTime, Integer, String, Text, func, inspect, or_, update
 from sqlalchemy.orm import DeclarativeBase, Mapped, Session, load_only, mapped_column, sessionmaker
-from sqlalchemy.pool import NullPool
 
 from app.config_loader import database_url, get_bool, get_str
+from app.services import unified_db
 
 
 class Base(DeclarativeBase):
@@ -48,6 +49,9 @@ class AgentTaskRecord(Base):
 _ENGINE_CACHE: dict[str, Any] = {"url": "", "engine": None, "sessionmaker": None}
 _SCHEMA_INITIALIZED = False
 _SCHEMA_INITIALIZED_URL = ""
+# Serializes claim_next_task within this process on backends without
+# row locks; SQLite itself serializes the conditional UPDATE across processes.
+_CLAIM_LOCK = threading.Lock()
 
 
 def _database_url() -> str:
@@ -66,11 +70,7 @@ def enabled() -> bool:
 
 
 def _create_engine(url: str):
-    kwargs: dict[str, Any] = {"pool_pre_ping": True}
-    if url.startswith("sqlite"):
-        kwargs["connect_args"] = {"check_same_thread": False}
-        kwargs["poolclass"] = NullPool
-    return create_engine(url, **kwargs)
+    return unified_db.shared_engine(url, owner="agent_task_store", cache=_ENGINE_CACHE)
 
 
 def _table_exists(engine: Any, table_name: str) -> bool:
@@ -498,6 +498,112 @@ def upsert_task(payload: dict[str, Any]) -> None:
             row.workspace_id = normalized_ws or None
 
 
+def _pending_candidates_query(
+    session: Session,
+    *,
+    worker_id: str,
+    task_types: list[str] | None,
+    tiers: list[str] | None,
+    workspace_id: str | None,
+):
+    query = session.query(AgentTaskRecord).filter(
+        AgentTaskRecord.status == "pending",
+        or_(AgentTaskRecord.claimed_by.is_(None), AgentTaskRecord.claimed_by == worker_id),
+    )
+    if task_types:
+        query = query.filter(AgentTaskRecord.task_type.in_([str(t) for t in task_types]))
+    if tiers:
+        query = query.filter(AgentTaskRecord.tier.in_([str(t) for t in tiers]))
+    ws = str(workspace_id or "").strip()
+    if ws == "coherence-network":
+        query = query.filter((AgentTaskRecord.workspace_id == ws) | (AgentTaskRecord.workspace_id.is_(None)))
+    elif ws:
+        query = query.filter(AgentTaskRecord.workspace_id == ws)
+    return query.order_by(AgentTaskRecord.created_at.asc(), AgentTaskRecord.id.asc())
+
+
+def _mark_claimed(row: AgentTaskRecord, worker_id: str, now: datetime) -> None:
+    if row.claimed_by != worker_id or row.claimed_at is None:
+        row.claimed_at = now
+    row.status = "running"
+    row.claimed_by = worker_id
+    row.started_at = row.started_at or now
+    row.updated_at = now
+
+
+def claim_next_task(
+    *,
+    worker_id: str,
+    task_types: list[str] | None = None,
+    tiers: list[str] | None = None,
+    workspace_id: str | None = None,
+    accept: Callable[[dict[str, Any]], bool] | None = None,
+    window: int = 25,
+) -> dict[str, Any] | None:
+    """Atomically move the oldest matching pending task to running for worker_id.
+
+    Looks at up to `window` pending rows (oldest first) and claims the first
+    one `accept` agrees to. On PostgreSQL the candidates are selected FOR
+    UPDATE SKIP LOCKED, so concurrent claimers each lock a disjoint set and
+    never block on one another. Elsewhere (SQLite) the claim is a
+    conditional UPDATE on status/claimed_by, which only one writer can win.
+    Returns the claimed task payload, or None when nothing matched.
+    """
+    if not enabled():
+        return None
+    ensure_schema()
+    engine = _engine()
+    bounded_window = max(1, min(int(window), 500))
+    filters = {"worker_id": worker_id, "task_types": task_types, "tiers": tiers, "workspace_id": workspace_id}
+    if engine is not None and engine.dialect.name == "postgresql":
+        with _session() as session:
+            rows = (
+                _pending_candidates_query(session, **filters)
+                .limit(bounded_window)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            for row in rows:
+                if accept is not None and not accept(_row_to_payload(row, include_output=False)):
+                    continue
+                _mark_claimed(row, worker_id, datetime.now(timezone.utc))
+                session.flush()
+                return _row_to_payload(row)
+        return None
+
+    with _CLAIM_LOCK:
+        with _session() as session:
+            rows = _pending_candidates_query(session, **filters).limit(bounded_window).all()
+            for row in rows:
+                if accept is not None and not accept(_row_to_payload(row, include_output=False)):
+                    continue
+                now = datetime.now(timezone.utc)
+                result = session.execute(
+                    update(AgentTaskRecord)
+                    .where(
+                        AgentTaskRecord.id == row.id,
+                        AgentTaskRecord.status == "pending",
+                        or_(AgentTaskRecord.claimed_by.is_(None), AgentTaskRecord.claimed_by == worker_id),
+                    )
+                    .values(
+                        status="running",
+                        claimed_by=worker_id,
+                        claimed_at=func.coalesce(AgentTaskRecord.claimed_at, now)
+                        if row.claimed_by == worker_id
+                        else now,
+                        started_at=func.coalesce(AgentTaskRecord.started_at, now),
+                        updated_at=now,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount != 1:
+                    continue  # another process won this row
+                session.commit()
+                claimed = session.get(AgentTaskRecord, row.id, populate_existing=True)
+                return _row_to_payload(claimed) if claimed is not None else None
+    return None
+
+
 def clear_tasks() -> None:
     if not enabled():
         return
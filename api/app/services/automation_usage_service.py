@@ -19,10 +19,9 @@ from typing import Any, Callable
 from urllib.parse import urlparse
 
 import httpx
-from sqlalchemy import create_engine, text
-from sqlalchemy.pool import NullPool
+from sqlalchemy import text
 
-from app.config_loader import database_url, get_bool, get_float, get_int, get_str
+from app.config_loader import api_config, database_url, get_bool, get_float, get_int, get_str
 from app.models.automation_usage import (
     ProviderValidationReport,
     ProviderValidationRow,
@@ -42,6 +41,7 @@ from app.services import (
     agent_service,
     quality_awareness_service,
     telemetry_persistence_service,
+    unified_db,
 )
 
 logger = logging.getLogger(__name__)
@@ -71,6 +71,8 @@ def invalidate_cache() -> None:
     _CURSOR_CLI_CONTEXT_CACHE["payload"] = {}
     _CLAUDE_CLI_CONTEXT_CACHE["expires_at"] = 0.0
     _CLAUDE_CLI_CONTEXT_CACHE["payload"] = {}
+    with _PROVIDER_PROBE_LOCK:
+        _PROVIDER_PROBE_FUTURES.clear()
 
 
 def _automation_endpoint_cache_max_workers() -> int:
@@ -87,6 +89,15 @@ _ENDPOINT_CACHE_REFRESH_POOL = ThreadPoolExecutor(
     max_workers=_automation_endpoint_cache_max_workers(),
     thread_name_prefix="automation-endpoint-cache-refresh",
 )
+# One worker per provider snapshot builder; a probe still running past its
+# deadline is reused by the next collection, so builders never pile up.
+_PROVIDER_PROBE_POOL = ThreadPoolExecutor(
+    max_workers=8,
+    thread_name_prefix="automation-provider-probe",
+)
+_PROVIDER_PROBE_FUTURES: dict[str, Future[ProviderUsageSnapshot]] = {}
+_PROVIDER_PROBE_TIMINGS: dict[str, dict[str, Any]] = {}
+_PROVIDER_PROBE_LOCK = threading.Lock()
 _DB_HOST_EGRESS_SAMPLE_CACHE: dict[str, Any] = {
     "url": "",
     "sample": None,
@@ -94,7 +105,7 @@ _DB_HOST_EGRESS_SAMPLE_CACHE: dict[str, Any] = {
     "expires_at": 0.0,
 }
 _DB_HOST_EGRESS_SAMPLE_CACHE_TTL_SECONDS = 60.0
-_DB_HOST_EGRESS_ENGINE_CACHE: dict[str, Any] = {"url": "", "engine": None}
+_DB_HOST_EGRESS_ENGINE_CACHE: dict[str, Any] = {"url": "", "engine": None, "sessionmaker": None}
 _RUNTIME_EVENTS_WINDOW_CACHE: dict[tuple[int, str | None, int], dict[str, Any]] = {}
 _WORKER_PROVIDER_WINDOW_COUNTS_CACHE: dict[tuple[int, int], dict[str, Any]] = {}
 _USAGE_SUMMARY_CACHE: dict[str, Any] = {"expires_at": 0.0, "summary": None}
@@ -3632,18 +3643,18 @@ def _save_db_host_tracker_state(key: str, payload: dict[str, Any]) -> None:
 
 
 def _db_host_egress_engine(db_url: str):
+    # A slow database should fail the probe within
+    # DB_EGRESS_DB_CONNECT_TIMEOUT_SECONDS rather than the app's connect
+    # timeout, so on PostgreSQL the registry gives it a pool of its own,
+    # listed in pool_stats() under owner "db_egress".
     if _DB_HOST_EGRESS_ENGINE_CACHE["engine"] is not None and _DB_HOST_EGRESS_ENGINE_CACHE["url"] == db_url:
         return _DB_HOST_EGRESS_ENGINE_CACHE["engine"]
-    kwargs: dict[str, Any] = {"pool_pre_ping": True}
-    if db_url.startswith("sqlite"):
-        kwargs["connect_args"] = {"check_same_thread": False}
-        kwargs["poolclass"] = NullPool
-    elif db_url.startswith("postgres"):
-        kwargs["connect_args"] = {
-            "connect_timeout": max(1, min(_int_env("DB_EGRESS_DB_CONNECT_TIMEOUT_SECONDS", 3), 15))
-        }
-        kwargs["poolclass"] = NullPool
-    engine = create_engine(db_url, **kwargs)
+    engine = unified_db.shared_engine(
+        db_url,
+        owner="db_egress",
+        cache=_DB_HOST_EGRESS_ENGINE_CACHE,
+        connect_timeout=max(1, min(_int_env("DB_EGRESS_DB_CONNECT_TIMEOUT_SECONDS", 3), 15)),
+    )
     _DB_HOST_EGRESS_ENGINE_CACHE["url"] = db_url
     _DB_HOST_EGRESS_ENGINE_CACHE["engine"] = engine
     return engine
@@ -4247,20 +4258,181 @@ def _build_gemini_snapshot() -> ProviderUsageSnapshot:
     )
 
 
-def _collect_provider_snapshots() -> list[ProviderUsageSnapshot]:
-    active_usage = _active_provider_usage_counts()
-    providers = [
-        _build_internal_snapshot(),
-        _build_openai_snapshot(),
-        _build_claude_snapshot(),
-        _build_cursor_snapshot(),
-        _build_gemini_snapshot(),
-        _build_github_snapshot(),
-        _build_db_host_snapshot(),
+def _provider_probe_deadline_seconds(provider: str) -> float:
+    overrides = api_config("automation_usage", "provider_probe_deadlines", {})
+    value = get_float("automation_usage", "provider_probe_deadline_seconds", 10.0)
+    if isinstance(overrides, dict) and provider in overrides:
+        try:
+            value = float(overrides[provider])
+        except (TypeError, ValueError):
+            pass
+    return max(0.5, min(value, 120.0))
+
+
+def _provider_snapshot_builders() -> list[tuple[str, str, Callable[[], ProviderUsageSnapshot]]]:
+    builders: list[tuple[str, str, Callable[[], ProviderUsageSnapshot]]] = [
+        ("coherence-internal", "internal", _build_internal_snapshot),
+        ("openai", "openai", _build_openai_snapshot),
+        ("claude", "custom", _build_claude_snapshot),
+        ("cursor", "custom", _build_cursor_snapshot),
+        ("gemini", "custom", _build_gemini_snapshot),
+        ("github", "github", _build_github_snapshot),
+        ("db-host", "custom", _build_db_host_snapshot),
     ]
     if _supabase_tracking_enabled():
-        providers.append(_build_supabase_snapshot())
-    for snapshot in providers:
+        builders.append(("supabase", "custom", _build_supabase_snapshot))
+    return builders
+
+
+def _probe_timing_entry(provider: str) -> dict[str, Any]:
+    """Timing row for ``provider``; call with ``_PROVIDER_PROBE_LOCK`` held."""
+    return _PROVIDER_PROBE_TIMINGS.setdefault(
+        provider,
+        {"provider": provider, "runs": 0, "errors": 0, "timeouts": 0, "total_ms": 0.0, "max_ms": 0.0},
+    )
+
+
+def _record_probe_timing(provider: str, elapsed_ms: float, outcome: str, deadline_seconds: float) -> None:
+    with _PROVIDER_PROBE_LOCK:
+        entry = _probe_timing_entry(provider)
+        entry["runs"] += 1
+        entry["errors"] += 1 if outcome == "error" else 0
+        entry["total_ms"] += elapsed_ms
+        entry["max_ms"] = round(max(entry["max_ms"], elapsed_ms), 1)
+        entry["last_ms"] = round(elapsed_ms, 1)
+        entry["last_outcome"] = outcome
+        entry["last_at"] = datetime.now(timezone.utc).isoformat()
+        entry["deadline_seconds"] = deadline_seconds
+
+
+def _timed_probe(
+    provider: str, build: Callable[[], ProviderUsageSnapshot], deadline_seconds: float
+) -> ProviderUsageSnapshot:
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        snapshot = build()
+        outcome = "ok"
+    finally:
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        if outcome == "ok" and elapsed_ms > deadline_seconds * 1000.0:
+            outcome = "late"
+        _record_probe_timing(provider, elapsed_ms, outcome, deadline_seconds)
+    snapshot.raw["probe_ms"] = round(elapsed_ms, 1)
+    return snapshot
+
+
+def _start_provider_probe(
+    provider: str, build: Callable[[], ProviderUsageSnapshot], deadline_seconds: float
+) -> Future[ProviderUsageSnapshot]:
+    """Submit ``build``, or hand back the probe from an earlier collection.
+
+    A probe that missed its deadline keeps running and stays registered
+    here until a collection consumes its result.
+    """
+    with _PROVIDER_PROBE_LOCK:
+        future = _PROVIDER_PROBE_FUTURES.get(provider)
+        if future is None:
+            future = _PROVIDER_PROBE_POOL.submit(_timed_probe, provider, build, deadline_seconds)
+            _PROVIDER_PROBE_FUTURES[provider] = future
+        return future
+
+
+def _release_provider_probe(provider: str, future: Future[ProviderUsageSnapshot]) -> None:
+    with _PROVIDER_PROBE_LOCK:
+        if _PROVIDER_PROBE_FUTURES.get(provider) is future:
+            del _PROVIDER_PROBE_FUTURES[provider]
+
+
+def _stale_provider_snapshot(
+    provider: str,
+    kind: str,
+    last: ProviderUsageSnapshot | None,
+    deadline_seconds: float,
+) -> ProviderUsageSnapshot:
+    missed = f"probe missed its {deadline_seconds:.1f}s deadline"
+    if last is None:
+        return ProviderUsageSnapshot(
+            id=f"provider_{provider.replace('-', '_')}_stale_{int(time.time())}",
+            provider=provider,
+            kind=kind,
+            status="unavailable",
+            notes=[f"{missed}; no stored snapshot to fall back on"],
+            raw={"stale": True, "probe_deadline_seconds": deadline_seconds},
+        )
+    stale = last.model_copy(deep=True)
+    collected_at = last.collected_at.isoformat()
+    stale.notes = list(dict.fromkeys([*stale.notes, f"{missed}; showing the snapshot collected at {collected_at}"]))
+    stale.raw = {**stale.raw, "stale": True, "stale_since": collected_at, "probe_deadline_seconds": deadline_seconds}
+    return stale
+
+
+def provider_probe_timings() -> dict[str, Any]:
+    """Per-provider snapshot probe timings, slowest last run first."""
+    with _PROVIDER_PROBE_LOCK:
+        rows = [dict(entry) for entry in _PROVIDER_PROBE_TIMINGS.values()]
+        in_flight = sorted(p for p, future in _PROVIDER_PROBE_FUTURES.items() if not future.done())
+    for row in rows:
+        total_ms = row.pop("total_ms")
+        row["avg_ms"] = round(total_ms / row["runs"], 1) if row["runs"] else None
+    rows.sort(key=lambda row: row.get("last_ms") or 0.0, reverse=True)
+    return {"providers": rows, "in_flight": in_flight}
+
+
+def _collect_provider_snapshots() -> list[ProviderUsageSnapshot]:
+    """Build every provider's snapshot concurrently, each against its own deadline.
+
+    Builders shell out to CLIs and call provider APIs, so running them in
+    turn made the overview as slow as the sum of their worst cases. Each one
+    now runs on the probe pool. A provider that misses its deadline
+    (``automation_usage.provider_probe_deadline_seconds``, overridable per
+    provider in ``automation_usage.provider_probe_deadlines``) is reported
+    from its last stored snapshot, marked ``raw.stale``. Its probe keeps
+    running, and the next collection picks up the result. Stale snapshots
+    are not stored again.
+    """
+    active_usage = _active_provider_usage_counts()
+    started = time.monotonic()
+    probes = []
+    for provider, kind, build in _provider_snapshot_builders():
+        deadline_seconds = _provider_probe_deadline_seconds(provider)
+        future = _start_provider_probe(provider, build, deadline_seconds)
+        probes.append((provider, kind, future, deadline_seconds))
+
+    providers: list[ProviderUsageSnapshot] = []
+    fresh: list[ProviderUsageSnapshot] = []
+    last_stored: dict[str, ProviderUsageSnapshot] | None = None
+    for provider, kind, future, deadline_seconds in probes:
+        remaining = max(0.0, started + deadline_seconds - time.monotonic())
+        try:
+            snapshot = future.result(timeout=remaining)
+        except TimeoutError:
+            if future.done():
+                _release_provider_probe(provider, future)
+                raise
+            with _PROVIDER_PROBE_LOCK:
+                _probe_timing_entry(provider)["timeouts"] += 1
+            logger.warning(
+                "automation_usage: %s probe missed its %.1fs deadline; using last stored snapshot",
+                provider,
+                deadline_seconds,
+            )
+            if last_stored is None:
+                last_stored = _latest_provider_snapshots()
+            providers.append(
+                _stale_provider_snapshot(
+                    provider, kind, last_stored.get(_provider_family_name(provider)), deadline_seconds
+                )
+            )
+            continue
+        except Exception:
+            _release_provider_probe(provider, future)
+            raise
+        _release_provider_probe(provider, future)
+        providers.append(snapshot)
+        fresh.append(snapshot)
+
+    for snapshot in fresh:
         active_count = int(active_usage.get(_normalize_provider_name(snapshot.provider), 0))
         if active_count > 0:
             has_metric = any(metric.id == "runtime_task_runs" for metric in snapshot.metrics)
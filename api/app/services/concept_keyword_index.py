@@ -0,0 +1,243 @@
+"""Process-local token → concept inverted index for resonance scoring.
+
+resonance_service scores a presence, or a free-text query, against the
+vision concepts by keyword overlap. It used to re-read the concept rows
+and re-tokenise every story on each call. That read was
+`list_nodes(type="concept", limit=500)`, so past 500 concepts the oldest
+ones were silently never scored.
+
+This module keeps every concept's keyword set (name + description +
+story_content through extract_keywords) plus a posting list per token.
+`overlaps(tokens, min_shared)` walks only the postings of the query's
+tokens. A call touches just the concepts that share a token with the
+query, and returns those sharing at least `min_shared`.
+
+Freshness mirrors graph_adjacency:
+  - graph_service bumps graph_generation row CONCEPT_GENERATION_ROW_ID in
+    the same transaction as every concept create / update / delete, then
+    hands the committed node to `note_concept_upserted` /
+    `note_concept_deleted`. When the index sits exactly one generation
+    behind, the change is applied in place; otherwise it is marked stale.
+  - Reads re-check the counter at most every
+    resonance.concept_index_check_seconds (default 1s), so another
+    worker's edits are picked up with one primary-key read and a reload.
+  - resonance.concept_index_max_age_seconds (default 300s) forces a
+    reload as a backstop for writers that bypass graph_service.
+
+resonance.concept_index=false builds a throwaway index on every call.
+The results are the same, at the old per-call cost.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from app.config_loader import get_bool, get_float
+from app.models.graph import Node
+from app.services import unified_db
+from app.services.graph_adjacency import (
+    CONCEPT_GENERATION_ROW_ID,
+    _ensure_generation_row,
+    _read_generation,
+)
+from app.services.news_resonance_service import extract_keywords
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ConceptEntry:
+    """What resonance scoring needs from one concept node."""
+
+    id: str
+    name: str
+    hz: Any
+    updated_at: str
+    keywords: frozenset[str]
+
+
+def concept_keywords(node: dict[str, Any]) -> set[str]:
+    """The words that describe what this concept holds.
+
+    Concepts have a rich ``story_content`` (the KB markdown body) in
+    their description field, plus the concept name itself. Both feed
+    the spectrum.
+    """
+    text_parts: list[str] = [
+        str(node.get("name") or ""),
+        str(node.get("description") or ""),
+        str(node.get("story_content") or ""),
+    ]
+    text = " ".join(p for p in text_parts if p)
+    return extract_keywords(text)
+
+
+def _entry(node: dict[str, Any]) -> ConceptEntry:
+    frequency = node.get("sacred_frequency")
+    return ConceptEntry(
+        id=node["id"],
+        name=node.get("name") or node["id"],
+        hz=frequency.get("hz") if isinstance(frequency, dict) else frequency,
+        updated_at=node.get("updated_at") or "",
+        keywords=frozenset(concept_keywords(node)),
+    )
+
+
+class ConceptKeywordIndex:
+    """Per-concept keyword sets and token posting lists for one database."""
+
+    __slots__ = ("url", "generation", "loaded_at", "checked_at", "entries", "postings")
+
+    def __init__(self, url: str, generation: int) -> None:
+        now = time.monotonic()
+        self.url = url
+        self.generation = generation
+        self.loaded_at = now
+        self.checked_at = now
+        self.entries: dict[str, ConceptEntry] = {}
+        self.postings: dict[str, set[str]] = {}
+
+    def put(self, node: dict[str, Any]) -> None:
+        self.remove(node["id"])
+        entry = _entry(node)
+        self.entries[entry.id] = entry
+        for token in entry.keywords:
+            self.postings.setdefault(token, set()).add(entry.id)
+
+    def remove(self, concept_id: str) -> None:
+        entry = self.entries.pop(concept_id, None)
+        if entry is None:
+            return
+        for token in entry.keywords:
+            ids = self.postings.get(token)
+            if ids is not None:
+                ids.discard(concept_id)
+                if not ids:
+                    del self.postings[token]
+
+    def overlaps(self, tokens: Iterable[str], min_shared: int) -> list[tuple[ConceptEntry, frozenset[str]]]:
+        hits: dict[str, list[str]] = {}
+        for token in set(tokens):
+            for concept_id in self.postings.get(token, ()):
+                hits.setdefault(concept_id, []).append(token)
+        found = [
+            (self.entries[concept_id], frozenset(shared))
+            for concept_id, shared in hits.items()
+            if len(shared) >= min_shared
+        ]
+        # Most recently updated first, the order list_nodes used to give,
+        # so callers' stable score sorts break ties the same way.
+        found.sort(key=lambda item: (item[0].updated_at, item[0].id), reverse=True)
+        return found
+
+
+_LOCK = threading.RLock()
+_STATE: dict[str, Any] = {"index": None, "stale": False}
+
+
+def _enabled() -> bool:
+    return get_bool("resonance", "concept_index", True)
+
+
+def _load(url: str) -> ConceptKeywordIndex:
+    _ensure_generation_row(url, CONCEPT_GENERATION_ROW_ID)
+    with unified_db.session() as s:
+        index = ConceptKeywordIndex(url, _read_generation(s, CONCEPT_GENERATION_ROW_ID))
+        rows = (
+            s.query(Node)
+            .filter(Node.type == "concept")
+            .filter(~Node.id.like("anonymous-meeting:%"))
+            .yield_per(1000)
+        )
+        for node in rows:
+            index.put(node.to_dict())
+    log.info(
+        "concept keyword index loaded generation=%s concepts=%s tokens=%s",
+        index.generation, len(index.entries), len(index.postings),
+    )
+    return index
+
+
+def _current() -> ConceptKeywordIndex:
+    """Return a fresh-enough index, loading or reloading it as needed.
+
+    Caller holds _LOCK.
+    """
+    url = unified_db.database_url()
+    if not _enabled():
+        return _load(url)
+    index: ConceptKeywordIndex | None = _STATE["index"]
+    now = time.monotonic()
+    if index is not None and index.url == url and not _STATE["stale"]:
+        max_age = get_float("resonance", "concept_index_max_age_seconds", 300.0)
+        if now - index.loaded_at < max_age:
+            if now - index.checked_at < get_float("resonance", "concept_index_check_seconds", 1.0):
+                return index
+            with unified_db.session() as s:
+                generation = _read_generation(s, CONCEPT_GENERATION_ROW_ID)
+            index.checked_at = now
+            if generation == index.generation:
+                return index
+    index = _load(url)
+    _STATE["index"] = index
+    _STATE["stale"] = False
+    return index
+
+
+def _apply(generation: int, mutate) -> None:
+    with _LOCK:
+        index: ConceptKeywordIndex | None = _STATE["index"]
+        if index is None:
+            return
+        if index.url != unified_db.database_url() or generation != index.generation + 1:
+            # Another writer landed in between; reload on the next read.
+            _STATE["stale"] = True
+            return
+        mutate(index)
+        index.generation = generation
+
+
+def note_concept_upserted(node: dict[str, Any], generation: int) -> None:
+    """Apply a committed concept create/update to the local index."""
+    _apply(generation, lambda index: index.put(node))
+
+
+def note_concept_deleted(concept_id: str, generation: int) -> None:
+    """Apply a committed concept delete to the local index."""
+    _apply(generation, lambda index: index.remove(concept_id))
+
+
+def invalidate() -> None:
+    """Force a full reload on the next read."""
+    with _LOCK:
+        _STATE["stale"] = True
+
+
+def overlaps(tokens: Iterable[str], min_shared: int) -> list[tuple[ConceptEntry, frozenset[str]]]:
+    """Concepts sharing at least min_shared of tokens, with the shared tokens.
+
+    Ordered most recently updated first.
+    """
+    with _LOCK:
+        return _current().overlaps(tokens, min_shared)
+
+
+def stats() -> dict[str, Any]:
+    """Index shape for diagnostics."""
+    with _LOCK:
+        index: ConceptKeywordIndex | None = _STATE["index"]
+        if index is None:
+            return {"enabled": _enabled(), "loaded": False}
+        return {
+            "enabled": _enabled(),
+            "loaded": True,
+            "generation": index.generation,
+            "stale": bool(_STATE["stale"]),
+            "concepts": len(index.entries),
+            "tokens": len(index.postings),
+            "age_seconds": round(time.monotonic() - index.loaded_at, 3),
+        }
@@ -0,0 +1,417 @@
+"""Vectorized CRK + OT-φ backend for batches of symbol pairs.
+
+concept_resonance_kernel.py is the reference implementation: a line-by-line
+port of the C# module, one pair at a time, in pure Python. Scanning all
+idea pairs with it is dominated by the interpreter (nested loops to build
+the Sinkhorn kernel and up to OT_MAX_ITERS matrix-vector products per band).
+
+This module computes the same `ResonanceResult` for many pairs at once with
+NumPy:
+
+- every symbol in the batch is packed once into padded component arrays
+  (band id, ω, k, φ, a), so all-pairs work reuses the packing;
+- CRK evaluates every (h1, h2) pair, every band and every τ of a chunk of
+  pairs as one array expression;
+- OT-φ stacks one Sinkhorn problem per (pair, shared band), compacted to
+  that band's components, and iterates them together as batched
+  matrix-vector products. The reference's `max(K·v, OT_STABILITY_FLOOR)`
+  clamp bounds every scaling by 1/OT_STABILITY_FLOOR, so kernels that
+  underflow in `exp(-C/ε)` give zero transport rather than 0/0 or inf·0,
+  exactly as in the reference. Each problem stops on the reference's
+  convergence rule and drops out of the working set.
+
+Results match `compare_concepts` to rounding (see
+tests/test_concept_resonance_vectorized.py). NumPy is optional: without it,
+or with backend="reference", `compare_concepts_batch` loops over
+`compare_concepts`.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Optional, Sequence
+
+from app.services.concept_resonance_kernel import (
+    ALPHA_OMEGA,
+    BETA_K,
+    GAMMA_PHASE,
+    OT_CONVERGENCE_TOL,
+    OT_EPSILON,
+    OT_MAX_ITERS,
+    OT_STABILITY_FLOOR,
+    SIGMA_K,
+    SIGMA_OMEGA,
+    ConceptSymbol,
+    ResonanceResult,
+    _try_get_geometry,
+    compare_concepts,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ships with the API image
+    np = None
+
+# Upper bound on elements per (pair, band|τ, i, j) tensor; pairs are chunked to fit.
+_BATCH_ELEMENT_BUDGET = 1 << 21
+
+# |Δω| beyond which the CRK ω-kernel falls under the reference's 1e-12 cut-off.
+_MATCH_REACH = SIGMA_OMEGA * math.sqrt(2.0 * math.log(1e12))
+
+SymbolPair = tuple[ConceptSymbol, ConceptSymbol]
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def compare_concepts_batch(
+    pairs: Sequence[SymbolPair],
+    tau_grid: Optional[list[float]] = None,
+    backend: str = "auto",
+) -> list[ResonanceResult]:
+    """`compare_concepts` for every (s1, s2) in pairs, in order.
+
+    backend: "auto" (NumPy when installed), "numpy", or "reference".
+    """
+    if backend not in ("auto", "numpy", "reference"):
+        raise ValueError(f"unknown backend: {backend}")
+    if backend == "numpy" and np is None:
+        raise RuntimeError("numpy backend requested but numpy is not installed")
+    if not pairs:
+        return []
+    if backend == "reference" or np is None:
+        return [compare_concepts(s1, s2, tau_grid) for s1, s2 in pairs]
+
+    table = _SymbolTable.for_pairs(pairs)
+    taus = np.asarray(tau_grid if tau_grid else [0.0], dtype=float)
+    cells = table.width * table.width * max(len(taus), table.band_count, 1)
+    chunk = max(1, _BATCH_ELEMENT_BUDGET // cells)
+
+    results: list[ResonanceResult] = []
+    for start in range(0, len(pairs), chunk):
+        ia = table.left[start:start + chunk]
+        ib = table.right[start:start + chunk]
+        crk = _crk(table, ia, ib, taus)
+        d_ot, used_ot = _ot_phi(table, ia, ib)
+        for c, d, used in zip(crk.tolist(), d_ot.tolist(), used_ot.tolist()):
+            results.append(_result(c, d, used))
+    return results
+
+
+def coherence_upper_bounds(
+    left: Sequence[ConceptSymbol],
+    right: Sequence[ConceptSymbol],
+) -> "np.ndarray":
+    """(len(left), len(right)) upper bounds on `compare_concepts(l, r).coherence`.
+
+    Cheap first stage for all-pairs search. Components are bucketed by
+    (band, ω) with buckets as wide as the ω-kernel's reach (beyond it the
+    reference drops the term as ≤ 1e-12), so every term CRK can count lies
+    in the same or a neighbouring bucket. Bounding the kernel by the band
+    weight and |Σ| by Σ|·| gives, for any τ:
+
+        coherence ≤ crk ≤ Σ_band w · Σ_shared buckets |a1|·|a2| / (‖s1‖·‖s2‖)
+
+    with the reference's exact norms. Pairs where both symbols carry
+    geometry are bounded by 1.0. Unique keyword harmonics land in distinct
+    buckets, so the bound stays close to the exact score.
+    """
+    if np is None:
+        raise RuntimeError("coherence_upper_bounds requires numpy")
+    table = _SymbolTable(list(left) + list(right))
+    nl, nr = len(left), len(right)
+    if not nl or not nr:
+        return np.zeros((nl, nr))
+    ia, ib = np.arange(nl), np.arange(nl, nl + nr)
+    bands = max(table.band_count, 1)
+
+    # |a| summed per (symbol, band, bucket).
+    buckets = np.floor(table.omega / _MATCH_REACH).astype(np.int64)
+    cells: list[dict[tuple[int, int], dict[int, float]]] = [{}, {}]
+    for rows, side in ((ia, cells[0]), (ib, cells[1])):
+        for local, row in enumerate(rows.tolist()):
+            for col in np.flatnonzero(table.band[row] >= 0).tolist():
+                key = (int(table.band[row, col]), int(buckets[row, col]))
+                slot = side.setdefault(key, {})
+                slot[local] = slot.get(local, 0.0) + abs(float(table.amp[row, col]))
+
+    overlap = np.zeros((bands, nl, nr))
+    for (band, bucket), left_amps in cells[0].items():
+        rows = np.fromiter(left_amps.keys(), dtype=np.intp)
+        amps = np.fromiter(left_amps.values(), dtype=float)
+        for neighbour in (bucket - 1, bucket, bucket + 1):
+            right_amps = cells[1].get((band, neighbour))
+            if right_amps:
+                cols = np.fromiter(right_amps.keys(), dtype=np.intp)
+                overlap[band][np.ix_(rows, cols)] += np.outer(amps, np.fromiter(right_amps.values(), dtype=float))
+
+    # Reference band-weight lookup for every (l, r): l's table, then r's, else 1.0.
+    w1 = table.band_weight[ia][:, None, :]
+    w2 = table.band_weight[ib][None, :, :]
+    weights = np.where(np.isnan(w1), np.where(np.isnan(w2), 1.0, w2), w1)  # (nl, nr, B)
+    power = np.zeros((len(table.amp), bands))
+    for band in range(table.band_count):
+        power[:, band] = np.sum(np.where(table.band == band, table.amp * table.amp, 0.0), axis=1)
+    norm1 = np.einsum("lrb,lb->lr", weights, power[ia])
+    norm2 = np.einsum("lrb,rb->lr", weights, power[ib])
+    numerator = np.einsum("lrb,blr->lr", np.abs(weights), overlap)
+    denominator = np.sqrt(np.maximum(norm1, 0.0)) * np.sqrt(np.maximum(norm2, 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bound = np.where(denominator > 0, np.minimum(numerator / denominator, 1.0), 0.0)
+    both_geometry = (table.g_len[ia] > 0)[:, None] & (table.g_len[ib] > 0)[None, :]
+    return np.where(both_geometry, 1.0, bound)
+
+
+def _result(crk: float, d_ot: float, used_ot: bool) -> ResonanceResult:
+    d_res = math.sqrt(max(0.0, 1.0 - crk * crk))
+    coherence = crk * math.exp(-d_ot)
+    return ResonanceResult(
+        crk=round(crk, 6),
+        d_res=round(d_res, 6),
+        d_ot_phi=round(d_ot, 6),
+        coherence=round(coherence, 6),
+        d_codex=round(1.0 - coherence, 6),
+        used_ot=used_ot,
+    )
+
+
+class _SymbolTable:
+    """Padded per-symbol arrays for every distinct symbol in a batch."""
+
+    def __init__(self, symbols: Sequence[ConceptSymbol]) -> None:
+        self.left = self.right = np.zeros(0, dtype=np.intp)
+
+        bands: dict[str, int] = {}
+        for s in symbols:
+            for h in s.components:
+                bands.setdefault(h.band.lower(), len(bands))
+        self.band_count = len(bands)
+
+        count = len(symbols)
+        width = max([len(s.components) for s in symbols] + [1])
+        k_dim = max([len(h.k) for s in symbols for h in s.components if h.k] + [1])
+        g_dim = max([len(s.geometry.g) for s in symbols if s.geometry and s.geometry.g] + [1])
+        self.width = width
+
+        self.band = np.full((count, width), -1, dtype=np.intp)
+        self.omega = np.zeros((count, width))
+        self.phase = np.zeros((count, width))
+        self.amp = np.zeros((count, width))
+        self.k = np.zeros((count, width, k_dim))
+        self.k_len = np.zeros((count, width), dtype=np.intp)
+        # NaN marks "band not in this symbol's band_weights".
+        self.band_weight = np.full((count, max(self.band_count, 1)), np.nan)
+        self.mu = np.full(count, np.nan)
+        self.g = np.zeros((count, g_dim))
+        self.g_len = np.zeros(count, dtype=np.intp)
+        self.lam = np.zeros(count)
+
+        for row, s in enumerate(symbols):
+            for col, h in enumerate(s.components):
+                self.band[row, col] = bands[h.band.lower()]
+                self.omega[row, col] = h.omega
+                self.phase[row, col] = h.phase
+                self.amp[row, col] = h.amplitude
+                if h.k:
+                    self.k[row, col, :len(h.k)] = h.k
+                    self.k_len[row, col] = len(h.k)
+            for name, weight in (s.band_weights or {}).items():
+                slot = bands.get(name.lower())
+                # First matching key wins, like _get_band_weight.
+                if slot is not None and np.isnan(self.band_weight[row, slot]):
+                    self.band_weight[row, slot] = weight
+            if s.mu is not None:
+                self.mu[row] = s.mu
+            g, lam, has_g = _try_get_geometry(s)
+            if has_g:
+                self.g[row, :len(g)] = g
+                self.g_len[row] = len(g)
+                self.lam[row] = lam
+
+    @classmethod
+    def for_pairs(cls, pairs: Sequence[SymbolPair]) -> "_SymbolTable":
+        """Table of the distinct symbols in pairs, with left/right row indices per pair."""
+        index: dict[int, int] = {}
+        symbols: list[ConceptSymbol] = []
+        left: list[int] = []
+        right: list[int] = []
+        for s1, s2 in pairs:
+            for s, side in ((s1, left), (s2, right)):
+                slot = index.get(id(s))
+                if slot is None:
+                    slot = index[id(s)] = len(symbols)
+                    symbols.append(s)
+                side.append(slot)
+        table = cls(symbols)
+        table.left = np.asarray(left, dtype=np.intp)
+        table.right = np.asarray(right, dtype=np.intp)
+        return table
+
+    def pair_band_weights(self, first: "np.ndarray", second: "np.ndarray") -> "np.ndarray":
+        """(pairs, bands) weights looked up in `first`'s table, then `second`'s, else 1.0."""
+        w1 = self.band_weight[first]
+        w2 = self.band_weight[second]
+        return np.where(np.isnan(w1), np.where(np.isnan(w2), 1.0, w2), w1)
+
+
+def _gather(weights: "np.ndarray", band: "np.ndarray") -> "np.ndarray":
+    return np.where(band >= 0, np.take_along_axis(weights, np.maximum(band, 0), axis=1), 0.0)
+
+
+def _crk(table: _SymbolTable, ia: "np.ndarray", ib: "np.ndarray", taus: "np.ndarray") -> "np.ndarray":
+    band1, band2 = table.band[ia], table.band[ib]
+    amp1, amp2 = table.amp[ia], table.amp[ib]
+    omega1 = table.omega[ia]
+
+    weights = table.pair_band_weights(ia, ib)
+    w1 = _gather(weights, band1)
+    w2 = _gather(weights, band2)
+    norm1 = np.sum(w1 * amp1 * amp1, axis=1)
+    norm2 = np.sum(w2 * amp2 * amp2, axis=1)
+
+    same_band = (band1[:, :, None] == band2[:, None, :]) & (band1[:, :, None] >= 0)
+    d_omega = omega1[:, :, None] - table.omega[ib][:, None, :]
+    w_omega = np.exp(-0.5 * (d_omega * d_omega) / (SIGMA_OMEGA * SIGMA_OMEGA))
+
+    k_len1, k_len2 = table.k_len[ia], table.k_len[ib]
+    k_match = (k_len1[:, :, None] > 0) & (k_len1[:, :, None] == k_len2[:, None, :])
+    dk = table.k[ia][:, :, None, :] - table.k[ib][:, None, :, :]
+    w_k = np.where(k_match, np.exp(-0.5 * np.sum(dk * dk, axis=-1) / (SIGMA_K * SIGMA_K)), 1.0)
+
+    kernel = w1[:, :, None] * w_omega * w_k
+    kernel = np.where(same_band & (kernel > 1e-12), kernel, 0.0)
+    weight = kernel * amp1[:, :, None] * amp2[:, None, :]
+
+    # (pairs, τ, i, j) phase-aligned correlation; cos/sin are 2π-periodic so
+    # the reference's wrap to [-π, π] is implicit.
+    d_phase = table.phase[ia][:, :, None] - table.phase[ib][:, None, :]
+    angle = d_phase[:, None, :, :] - omega1[:, None, :, None] * taus[None, :, None, None]
+    num_real = np.einsum("pij,ptij->pt", weight, np.cos(angle))
+    num_imag = np.einsum("pij,ptij->pt", weight, np.sin(angle))
+    spec_mag = np.sqrt(num_real * num_real + num_imag * num_imag)
+
+    g1, g2 = table.g[ia], table.g[ib]
+    n1r = np.sqrt(np.maximum(np.sum(g1 * g1, axis=1), 0.0))
+    n2r = np.sqrt(np.maximum(np.sum(g2 * g2, axis=1), 0.0))
+    scale = table.lam[ia] * table.lam[ib]
+    g_len1 = table.g_len[ia]
+    has_geo = (g_len1 > 0) & (g_len1 == table.g_len[ib]) & (scale > 0.0) & (n1r > 0) & (n2r > 0)
+    mu1, mu2 = table.mu[ia], table.mu[ib]
+    mu = np.where(np.isnan(mu1), np.where(np.isnan(mu2), 0.0, mu2), mu1)
+    norms = np.where(has_geo, n1r * n2r, 1.0)
+    geo_corr = np.sum(g1 * g2, axis=1) / norms
+    geo_num = np.where(has_geo, mu * scale * geo_corr, 0.0)[:, None] * spec_mag
+    geo_den = np.where(has_geo, mu * scale * norms, 0.0)
+
+    denominator = (np.sqrt(np.maximum(norm1, 0.0)) * np.sqrt(np.maximum(norm2, 0.0)) + geo_den)[:, None]
+    valid = denominator > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        score = np.clip((spec_mag + geo_num) / np.where(valid, denominator, 1.0), 0.0, 1.0)
+    score = np.where(valid & ~np.isnan(score), score, 0.0)
+    return np.max(score, axis=1, initial=0.0)
+
+
+def _compact(members: "np.ndarray", width: int) -> tuple["np.ndarray", "np.ndarray"]:
+    """Component slots of each problem's band moved to the front, trimmed to width."""
+    order = np.argsort(~members, axis=1, kind="stable")[:, :width]
+    return order, np.take_along_axis(members, order, axis=1)
+
+
+def _sinkhorn(
+    kernel: "np.ndarray",
+    p: "np.ndarray",
+    q: "np.ndarray",
+    n: "np.ndarray",
+    m: "np.ndarray",
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """Sinkhorn scalings (u, v) for a stack of zero-padded (n, m) problems.
+
+    Mirrors `_sinkhorn_distance` step for step, with the K·v / Kᵀ·u products
+    as batched matrix-vector products. Problems leave the working set as soon
+    as they meet its convergence rule, so the few slow ones do not keep the
+    whole batch iterating.
+    """
+    u = np.where(np.arange(p.shape[1]) < n[:, None], 1.0 / n[:, None], 0.0)
+    v = np.where(np.arange(q.shape[1]) < m[:, None], 1.0 / m[:, None], 0.0)
+    out_u, out_v = u.copy(), v.copy()
+    kernel_t = np.swapaxes(kernel, 1, 2)
+    work = np.arange(len(n))
+    sizes = (n + m).astype(float)
+    prev_err = np.full(len(n), np.inf)
+    for _it in range(OT_MAX_ITERS):
+        if not len(work):
+            break
+        new_u = p / np.maximum(np.matmul(kernel, v[:, :, None])[:, :, 0], OT_STABILITY_FLOOR)
+        err = np.sum(np.abs(new_u - u), axis=1)
+        new_v = q / np.maximum(np.matmul(kernel_t, new_u[:, :, None])[:, :, 0], OT_STABILITY_FLOOR)
+        err = (err + np.sum(np.abs(new_v - v), axis=1)) / sizes
+        u, v = new_u, new_v
+
+        done = (err < OT_CONVERGENCE_TOL) | (np.abs(prev_err - err) < OT_CONVERGENCE_TOL * 1e-2)
+        out_u[work] = u
+        out_v[work] = v
+        if done.any():
+            keep = ~done
+            work, kernel, kernel_t, p, q = work[keep], kernel[keep], kernel_t[keep], p[keep], q[keep]
+            u, v, sizes, err = u[keep], v[keep], sizes[keep], err[keep]
+        prev_err = err
+    return out_u, out_v
+
+
+def _ot_phi(table: _SymbolTable, ia: "np.ndarray", ib: "np.ndarray") -> tuple["np.ndarray", "np.ndarray"]:
+    """Per-band Sinkhorn for every (pair, shared band), then the weighted band average."""
+    pair_count = len(ia)
+    distance = np.zeros((pair_count, max(table.band_count, 1)))
+    ok = np.zeros(distance.shape, dtype=bool)
+
+    band_ids = np.arange(table.band_count)
+    in_band1 = table.band[ia][:, None, :] == band_ids[None, :, None]  # (P, B, N)
+    in_band2 = table.band[ib][:, None, :] == band_ids[None, :, None]  # (P, B, M)
+    mass1 = np.where(in_band1, np.maximum(table.amp[ia], 0.0)[:, None, :], 0.0)
+    mass2 = np.where(in_band2, np.maximum(table.amp[ib], 0.0)[:, None, :], 0.0)
+    total1 = np.sum(mass1, axis=2)
+    total2 = np.sum(mass2, axis=2)
+    qp, qb = np.nonzero((total1 > 0.0) & (total2 > 0.0))
+    if len(qp):
+        n = np.sum(in_band1[qp, qb], axis=1)
+        m = np.sum(in_band2[qp, qb], axis=1)
+        rows, row_ok = _compact(in_band1[qp, qb], int(n.max()))
+        cols, col_ok = _compact(in_band2[qp, qb], int(m.max()))
+        left, right = ia[qp], ib[qp]
+
+        # Ground cost C[i,j] = α|Δω| + β||Δk|| + γ|Δφ_wrapped| per problem.
+        omega1 = np.take_along_axis(table.omega[left], rows, axis=1)
+        omega2 = np.take_along_axis(table.omega[right], cols, axis=1)
+        phase1 = np.take_along_axis(table.phase[left], rows, axis=1)
+        phase2 = np.take_along_axis(table.phase[right], cols, axis=1)
+        k1 = np.take_along_axis(table.k[left], rows[:, :, None], axis=1)
+        k2 = np.take_along_axis(table.k[right], cols[:, :, None], axis=1)
+        k_len1 = np.take_along_axis(table.k_len[left], rows, axis=1)
+        k_len2 = np.take_along_axis(table.k_len[right], cols, axis=1)
+
+        d_omega = np.abs(omega1[:, :, None] - omega2[:, None, :])
+        k_match = (k_len1[:, :, None] > 0) & (k_len1[:, :, None] == k_len2[:, None, :])
+        dk = k1[:, :, None, :] - k2[:, None, :, :]
+        d_k = np.where(k_match, np.sqrt(np.sum(dk * dk, axis=-1)), 0.0)
+        d_phi = np.remainder(phase1[:, :, None] - phase2[:, None, :] + math.pi, 2.0 * math.pi) - math.pi
+        cost = ALPHA_OMEGA * d_omega + BETA_K * d_k + GAMMA_PHASE * np.abs(d_phi)
+
+        cell = row_ok[:, :, None] & col_ok[:, None, :]
+        kernel = np.where(cell, np.exp(-cost / max(OT_EPSILON, 1e-12)), 0.0)
+        p = np.take_along_axis(mass1[qp, qb], rows, axis=1) / total1[qp, qb][:, None]
+        q = np.take_along_axis(mass2[qp, qb], cols, axis=1) / total2[qp, qb][:, None]
+
+        u, v = _sinkhorn(kernel, p, q, n, m)
+        with np.errstate(invalid="ignore", over="ignore"):
+            d = np.sum(u[:, :, None] * kernel * v[:, None, :] * cost, axis=(1, 2))
+        distance[qp, qb] = np.maximum(np.where(np.isfinite(d), d, 0.0), 0.0)
+        ok[qp, qb] = np.isfinite(d)
+
+    band_weight = 0.5 * (table.pair_band_weights(ia, ib) + table.pair_band_weights(ib, ia))
+    band_weight = np.where(ok, band_weight, 0.0)
+    total_weight = np.sum(band_weight, axis=1)
+    total_weighted = np.sum(band_weight * distance, axis=1)
+    used = np.any(ok, axis=1)
+    d = np.where(total_weight > 0, total_weighted / np.where(total_weight > 0, total_weight, 1.0), total_weighted)
+    return np.where(used, np.maximum(d, 0.0), 0.0), used
@@ -25,6 +25,8 @@ class FederationServiceContract:
                 "list_instances",
                 "get_instance",
                 "receive_payload",
+                "queue_sync_job",
+                "get_sync_job",
                 "list_sync_history",
                 "register_or_update_node",
                 "heartbeat_node",
@@ -46,6 +48,7 @@ class FederationServiceContract:
                 "GET /api/federation/instances",
                 "GET /api/federation/instances/{instance_id}",
                 "POST /api/federation/sync",
+                "GET /api/federation/sync/jobs/{job_id}",
                 "GET /api/federation/sync/history",
                 "POST /api/federation/nodes",
                 "POST /api/federation/nodes/{node_id}/heartbeat",
@@ -24,12 +24,23 @@ What the service does NOT do:
     attestations only; sovereignty is preserved on both sides
   - Couple peers together — one failing peer's exception is caught and
     bounded; the rest of the loop continues
+
+A sweep polls peers concurrently (at most federation.peer_poll_concurrency
+at a time) and each peer's three GETs concurrently, so it takes about as
+long as the slowest peer rather than the sum of all of them. Each peer's
+recent history sets its per-request timeout (a few times its slowest
+recent answer, never below federation.peer_poll_min_timeout_s) and, after
+consecutive unreachable polls, an exponential backoff during which sweeps
+skip it instead of waiting out another timeout.
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import time
+from collections import deque
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
@@ -39,6 +50,7 @@ import httpx
 from sqlalchemy import DateTime, Index, String, Text
 from sqlalchemy.orm import Mapped, Session, mapped_column
 
+from app.config_loader import get_float, get_int
 from app.models.federation import PeerCanonicalEntry
 from app.services import federation_service
 from app.services import federation_substrate_service
@@ -103,6 +115,7 @@ class PeerPollResult:
     aligned: int = 0
     diverged: int = 0
     discovered: int = 0
+    probe_ms: dict[str, float] = field(default_factory=dict)
     notes: list[str] = field(default_factory=list)
 
     def to_dict(self) -> dict[str, Any]:
@@ -116,6 +129,7 @@ class PeerPollResult:
             "aligned": self.aligned,
             "diverged": self.diverged,
             "discovered": self.discovered,
+            "probe_ms": dict(self.probe_ms),
             "notes": list(self.notes),
         }
 
@@ -128,6 +142,78 @@ class PeerPollResult:
 # whole loop; long enough that a healthy peer on a slow link still answers.
 DEFAULT_TIMEOUT_S = 5.0
 
+# How many successful probe latencies per peer feed its adaptive timeout.
+_LATENCY_HISTORY = 20
+# Adaptive timeout = this many times the slowest recent answer.
+_TIMEOUT_HEADROOM = 3.0
+
+
+def _concurrency() -> int:
+    return max(1, get_int("federation", "peer_poll_concurrency", 8))
+
+
+def _min_timeout_s() -> float:
+    return max(0.1, get_float("federation", "peer_poll_min_timeout_s", 1.0))
+
+
+# ---------------------------------------------------------------------------
+# Poll history — per-peer latency and failure streak, process-local
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _PeerHealth:
+    latencies_s: deque = field(default_factory=lambda: deque(maxlen=_LATENCY_HISTORY))
+    consecutive_failures: int = 0
+    retry_at: float = 0.0  # time.monotonic() before which sweeps skip the peer
+
+
+_HEALTH: dict[str, _PeerHealth] = {}
+
+
+def _adaptive_timeout(instance_id: str, ceiling_s: float) -> float:
+    """Per-request timeout from recent answers; the ceiling until we have any."""
+    health = _HEALTH.get(instance_id)
+    if health is None or not health.latencies_s:
+        return ceiling_s
+    return min(ceiling_s, max(_min_timeout_s(), _TIMEOUT_HEADROOM * max(health.latencies_s)))
+
+
+def _backoff_s(consecutive_failures: int) -> float:
+    base = max(0.0, get_float("federation", "peer_poll_backoff_base_s", 60.0))
+    ceiling = max(base, get_float("federation", "peer_poll_backoff_max_s", 1800.0))
+    return min(ceiling, base * (2 ** max(0, consecutive_failures - 1)))
+
+
+def _record_poll_history(result: PeerPollResult) -> None:
+    """Fold one finished poll into the peer's history.
+
+    A poll counts as a failure only when every probe was unreachable; a
+    peer that answers, even with a refusal, is alive and resets the streak.
+    """
+    health = _HEALTH.setdefault(result.peer_instance_id, _PeerHealth())
+    health.latencies_s.extend(ms / 1000.0 for ms in result.probe_ms.values())
+    statuses = (result.pulse_status, result.capabilities_status, result.substrate_status)
+    if all(status == "unreachable" for status in statuses):
+        health.consecutive_failures += 1
+        health.retry_at = time.monotonic() + _backoff_s(health.consecutive_failures)
+    else:
+        health.consecutive_failures = 0
+        health.retry_at = 0.0
+
+
+def peer_poll_health() -> dict[str, dict[str, Any]]:
+    """Per-peer adaptive timeout, failure streak and remaining backoff."""
+    now = time.monotonic()
+    return {
+        peer_id: {
+            "timeout_s": round(_adaptive_timeout(peer_id, DEFAULT_TIMEOUT_S), 3),
+            "consecutive_failures": health.consecutive_failures,
+            "backoff_remaining_s": round(max(0.0, health.retry_at - now), 3),
+        }
+        for peer_id, health in _HEALTH.items()
+    }
+
 
 # ---------------------------------------------------------------------------
 # Schema helpers
@@ -176,12 +262,30 @@ def _classify_http_response(response: httpx.Response) -> str:
 # ---------------------------------------------------------------------------
 
 
+async def _timed_get(
+    client: httpx.AsyncClient, url: str, timeout_s: float, result: PeerPollResult, probe: str
+) -> httpx.Response:
+    """GET with a per-request timeout, noting how long the peer took.
+
+    A timeout is noted too, so the next adaptive timeout grows past it
+    rather than cutting a slowing peer off at the same point forever.
+    """
+    started = time.perf_counter()
+    try:
+        response = await client.get(url, timeout=timeout_s)
+    except httpx.TimeoutException:
+        result.probe_ms[probe] = round((time.perf_counter() - started) * 1000.0, 3)
+        raise
+    result.probe_ms[probe] = round((time.perf_counter() - started) * 1000.0, 3)
+    return response
+
+
 async def _poll_pulse(
-    client: httpx.AsyncClient, base_url: str, result: PeerPollResult
+    client: httpx.AsyncClient, base_url: str, result: PeerPollResult, timeout_s: float
 ) -> dict[str, Any] | None:
     url = f"{base_url}/api/pulse/now"
     try:
-        response = await client.get(url)
+        response = await _timed_get(client, url, timeout_s, result, "pulse")
     except httpx.TimeoutException:
         result.pulse_status = "unreachable"
         result.notes.append("pulse: timeout")
@@ -210,11 +314,11 @@ async def _poll_pulse(
 
 
 async def _poll_capabilities(
-    client: httpx.AsyncClient, base_url: str, result: PeerPollResult
+    client: httpx.AsyncClient, base_url: str, result: PeerPollResult, timeout_s: float
 ) -> dict[str, Any] | None:
     url = f"{base_url}/api/federation/capabilities/self"
     try:
-        response = await client.get(url)
+        response = await _timed_get(client, url, timeout_s, result, "capabilities")
     except httpx.TimeoutException:
         result.capabilities_status = "unreachable"
         result.notes.append("capabilities: timeout")
@@ -243,11 +347,11 @@ async def _poll_capabilities(
 
 
 async def _poll_canonicals(
-    client: httpx.AsyncClient, base_url: str, result: PeerPollResult
+    client: httpx.AsyncClient, base_url: str, result: PeerPollResult, timeout_s: float
 ) -> list[dict[str, Any]] | None:
     url = f"{base_url}/api/federation/substrate/canonicals"
     try:
-        response = await client.get(url)
+        response = await _timed_get(client, url, timeout_s, result, "substrate")
     except httpx.TimeoutException:
         result.substrate_status = "unreachable"
         result.notes.append("substrate: timeout")
@@ -377,14 +481,17 @@ async def poll_peer(
     instance_id: str,
     *,
     client: httpx.AsyncClient | None = None,
-    timeout_s: float = DEFAULT_TIMEOUT_S,
+    timeout_s: float | None = None,
 ) -> PeerPollResult:
     """Poll one peer's three read-only endpoints; record what they share.
 
-    The `client` argument is optional — tests inject a mock transport; in
-    production the service opens its own AsyncClient with the configured
-    timeout. Either way, every outbound is a GET; the service never writes
-    to the peer.
+    The three GETs run concurrently; their local writes then happen one
+    after another in the usual order. `timeout_s` caps each request; left
+    as None the peer's adaptive timeout (bounded by DEFAULT_TIMEOUT_S) is
+    used. The `client` argument is optional — tests inject a mock
+    transport; in production the service opens its own AsyncClient.
+    Either way, every outbound is a GET; the service never writes to the
+    peer.
     """
     _ensure_schema()
     peer = federation_service.get_instance(instance_id)
@@ -404,68 +511,91 @@ async def poll_peer(
         result.notes.append("peer has no endpoint_url")
         return result
 
+    request_timeout = _adaptive_timeout(
+        instance_id, DEFAULT_TIMEOUT_S if timeout_s is None else timeout_s
+    )
     owns_client = client is None
     if owns_client:
-        client = httpx.AsyncClient(timeout=timeout_s)
+        client = httpx.AsyncClient(timeout=request_timeout)
 
     try:
-        pulse_body = await _poll_pulse(client, base_url, result)
-        if pulse_body is not None:
-            try:
-                instance_pulse_service.record_peer_pulse(instance_id, pulse_body)
-            except Exception as exc:
-                result.pulse_status = "error"
-                result.notes.append(f"pulse: local write failed ({type(exc).__name__})")
-
-        cap_body = await _poll_capabilities(client, base_url, result)
-        if cap_body is not None:
-            try:
-                _record_capability_manifest(instance_id, cap_body)
-            except Exception as exc:
-                result.capabilities_status = "error"
-                result.notes.append(
-                    f"capabilities: local write failed ({type(exc).__name__})"
-                )
-
-        canonicals = await _poll_canonicals(client, base_url, result)
-        if canonicals is not None:
-            try:
-                _record_substrate_alignment(instance_id, canonicals, result)
-            except Exception as exc:
-                result.substrate_status = "error"
-                result.notes.append(
-                    f"substrate: local write failed ({type(exc).__name__})"
-                )
+        pulse_body, cap_body, canonicals = await asyncio.gather(
+            _poll_pulse(client, base_url, result, request_timeout),
+            _poll_capabilities(client, base_url, result, request_timeout),
+            _poll_canonicals(client, base_url, result, request_timeout),
+        )
     finally:
         if owns_client:
             await client.aclose()
 
+    if pulse_body is not None:
+        try:
+            instance_pulse_service.record_peer_pulse(instance_id, pulse_body)
+        except Exception as exc:
+            result.pulse_status = "error"
+            result.notes.append(f"pulse: local write failed ({type(exc).__name__})")
+
+    if cap_body is not None:
+        try:
+            _record_capability_manifest(instance_id, cap_body)
+        except Exception as exc:
+            result.capabilities_status = "error"
+            result.notes.append(
+                f"capabilities: local write failed ({type(exc).__name__})"
+            )
+
+    if canonicals is not None:
+        try:
+            _record_substrate_alignment(instance_id, canonicals, result)
+        except Exception as exc:
+            result.substrate_status = "error"
+            result.notes.append(
+                f"substrate: local write failed ({type(exc).__name__})"
+            )
+
+    _record_poll_history(result)
     return result
 
 
 async def poll_all_peers(
     *,
-    timeout_s: float = DEFAULT_TIMEOUT_S,
+    timeout_s: float | None = None,
     instance_ids: Iterable[str] | None = None,
+    client: httpx.AsyncClient | None = None,
 ) -> dict[str, PeerPollResult]:
-    """Iterate over registered peers; return per-peer results.
+    """Poll registered peers concurrently; return per-peer results.
 
+    At most federation.peer_poll_concurrency peers are in flight at once.
     Each peer's poll is wrapped in its own try/except so one failing peer
-    cannot break the rest of the loop. `instance_ids` lets a caller (or
-    test) narrow the loop to a specific subset; default is "every
-    registered instance."
+    cannot break the rest of the sweep, and a peer still backing off after
+    consecutive unreachable polls is skipped with a note instead of being
+    waited on. `instance_ids` lets a caller (or test) narrow the sweep to
+    a specific subset; default is "every registered instance."
     """
     _ensure_schema()
     if instance_ids is None:
         targets = [inst.instance_id for inst in federation_service.list_instances()]
     else:
-        targets = list(instance_ids)
+        targets = list(dict.fromkeys(instance_ids))
 
-    results: dict[str, PeerPollResult] = {}
-    async with httpx.AsyncClient(timeout=timeout_s) as client:
-        for peer_id in targets:
+    concurrency = _concurrency()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _one(peer_id: str, shared: httpx.AsyncClient) -> PeerPollResult:
+        health = _HEALTH.get(peer_id)
+        if health is not None and health.retry_at > time.monotonic():
+            skipped = PeerPollResult(
+                peer_instance_id=peer_id,
+                polled_at=datetime.now(timezone.utc).isoformat(),
+            )
+            skipped.notes.append(
+                f"backoff: {health.consecutive_failures} unreachable polls, "
+                f"retry in {health.retry_at - time.monotonic():.0f}s"
+            )
+            return skipped
+        async with semaphore:
             try:
-                results[peer_id] = await poll_peer(peer_id, client=client)
+                return await poll_peer(peer_id, client=shared, timeout_s=timeout_s)
             except Exception as exc:
                 logger.warning(
                     "poll_peer raised for %s: %s", peer_id, exc, exc_info=True
@@ -475,8 +605,20 @@ async def poll_all_peers(
                     polled_at=datetime.now(timezone.utc).isoformat(),
                 )
                 fallback.notes.append(f"poll: {type(exc).__name__}")
-                results[peer_id] = fallback
-    return results
+                return fallback
+
+    owns_client = client is None
+    if owns_client:
+        client = httpx.AsyncClient(
+            timeout=DEFAULT_TIMEOUT_S if timeout_s is None else timeout_s,
+            limits=httpx.Limits(max_connections=concurrency * 3),
+        )
+    try:
+        polled = await asyncio.gather(*(_one(peer_id, client) for peer_id in targets))
+    finally:
+        if owns_client:
+            await client.aclose()
+    return dict(zip(targets, polled))
 
 
 # ---------------------------------------------------------------------------
@@ -537,6 +679,7 @@ def list_last_polled() -> dict[str, str | None]:
 
 def _reset_for_tests() -> None:
     """Clear peer-poll local tissue so each test starts from clean ground."""
+    _HEALTH.clear()
     _ensure_schema()
     with _session() as session:
         session.query(PeerCapabilityRecord).delete()
@@ -556,6 +699,7 @@ __all__ = [
     "PeerPollResult",
     "get_last_capability_observation",
     "list_last_polled",
+    "peer_poll_health",
     "poll_all_peers",
     "poll_peer",
 ]
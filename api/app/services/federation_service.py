@@ -12,8 +12,10 @@ import hashlib
 import hmac
 import json
 import logging
+import threading
 from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
+from typing import Any
 from uuid import uuid4
 
 logger = logging.getLogger(__name__)
@@ -33,6 +35,7 @@ from app.models.federation import (
     FederationNodeRegisterResponse,
     FederationStrategyEffectivenessReportRequest,
     FederationNodeHeartbeatResponse,
+    FederationSyncJob,
     FederationSyncResult,
     SignedCapabilityManifest,
     VALID_STRATEGY_TYPES,
@@ -401,138 +404,109 @@ _SUBSTANCE_PROPOSAL_KINDS: tuple[tuple[str, str, str], ...] = (
 )
 
 
-def receive_payload(payload: FederatedPayload) -> FederationSyncResult:
-    """Main entry point: receive data from a remote instance.
-
-    Two layers travel together:
-
-    - **Telemetry** (lineage_links, usage_events) — small structured
-      observations. Each becomes a governance ChangeRequest with
-      ``auto_apply_on_approval=True``: once two approvals clear, the
-      applier writes the link/event into the local lineage graph.
-    - **Substance** (concept_proposals, spec_proposals, idea_proposals,
-      teaching_proposals) — body-level material the peer would like this
-      body to absorb. Each becomes a governance ChangeRequest with
-      ``auto_apply_on_approval=False``: the proposal is held by governance
-      and a maintainer walks it into the repo as a PR. Substance never
-      writes directly into the deployed corpus.
-
-    Both layers require an instance with trust_level ≥ pending and
-    enforce required_approvals ≥ 2 (see governance_service).
-    """
-    result = FederationSyncResult(source_instance_id=payload.source_instance_id)
-
-    proposal_total = sum(
-        len(getattr(payload, attr)) for attr, _ft, _label in _SUBSTANCE_PROPOSAL_KINDS
+def payload_item_count(payload: FederatedPayload) -> int:
+    """Telemetry plus substance items carried by one payload."""
+    return (
+        len(payload.lineage_links)
+        + len(payload.usage_events)
+        + sum(len(getattr(payload, attr)) for attr, _ft, _label in _SUBSTANCE_PROPOSAL_KINDS)
     )
 
-    # 1. Validate registration
+
+def _validate_source(payload: FederatedPayload, result: FederationSyncResult) -> FederatedInstance | None:
+    """Registration and trust gate, checked once per payload."""
     instance = get_instance(payload.source_instance_id)
     if instance is None:
         result.errors.append(
             f"Instance '{payload.source_instance_id}' is not registered"
         )
-        result.rejected = (
-            len(payload.lineage_links) + len(payload.usage_events) + proposal_total
-        )
-        return result
+        result.rejected = payload_item_count(payload)
+        return None
 
     if not check_trust_level(payload.source_instance_id, required_level="pending"):
         raise ValueError(f"Instance trust level too low")
+    return instance
 
-    result.links_received = len(payload.lineage_links)
-    result.events_received = len(payload.usage_events)
-    result.proposals_received = proposal_total
-    governance_created = 0
 
-    # 2. Create governance requests for lineage links
-    for link_data in payload.lineage_links:
+def _change_request_items(
+    payload: FederatedPayload, result: FederationSyncResult
+) -> list[ChangeRequestCreate]:
+    """One governance ChangeRequestCreate per link, event and proposal.
+
+    Telemetry is auto-applied once two approvals clear; substance is held
+    by governance (auto_apply_on_approval=False) and a maintainer walks it
+    into the repo. An item that fails validation is reported in
+    result.errors and left out; the rest still go in.
+    """
+    source = payload.source_instance_id
+    proposer_id = f"federation:{source}"
+    items: list[ChangeRequestCreate] = []
+
+    def _add(federation_type: str, title: str, data: Any, auto_apply: bool) -> None:
         try:
-            cr = governance_service.create_change_request(
+            items.append(
                 ChangeRequestCreate(
                     request_type=ChangeRequestType.FEDERATION_IMPORT,
-                    title=f"Federation import: lineage link from {payload.source_instance_id}",
+                    title=title,
                     payload={
-                        "federation_type": "lineage_link",
-                        "source_instance_id": payload.source_instance_id,
-                        "data": link_data,
+                        "federation_type": federation_type,
+                        "source_instance_id": source,
+                        "data": data,
                     },
-                    proposer_id=f"federation:{payload.source_instance_id}",
+                    proposer_id=proposer_id,
                     proposer_type=ActorType.MACHINE,
-                    auto_apply_on_approval=True,
+                    auto_apply_on_approval=auto_apply,
                 )
             )
-            governance_created += 1
-            result.accepted += 1
         except Exception as exc:
-            logger.warning("Federation lineage_link import failed", exc_info=True)
-            result.errors.append(f"lineage_link error: {exc}")
+            logger.warning("Federation %s import failed", federation_type, exc_info=True)
+            result.errors.append(f"{federation_type} error: {exc}")
 
-    # 3. Create governance requests for usage events
+    for link_data in payload.lineage_links:
+        _add("lineage_link", f"Federation import: lineage link from {source}", link_data, True)
     for event_data in payload.usage_events:
-        try:
-            cr = governance_service.create_change_request(
-                ChangeRequestCreate(
-                    request_type=ChangeRequestType.FEDERATION_IMPORT,
-                    title=f"Federation import: usage event from {payload.source_instance_id}",
-                    payload={
-                        "federation_type": "usage_event",
-                        "source_instance_id": payload.source_instance_id,
-                        "data": event_data,
-                    },
-                    proposer_id=f"federation:{payload.source_instance_id}",
-                    proposer_type=ActorType.MACHINE,
-                    auto_apply_on_approval=True,
-                )
-            )
-            governance_created += 1
-            result.accepted += 1
-        except Exception as exc:
-            logger.warning("Federation usage_event import failed", exc_info=True)
-            result.errors.append(f"usage_event error: {exc}")
-
-    # 4. Create governance requests for substance proposals.
-    #
-    # auto_apply_on_approval is False: the applier records the proposal as
-    # "stored", and a maintainer walks it into the repo. Substance is held
-    # by governance, not written by the API.
+        _add("usage_event", f"Federation import: usage event from {source}", event_data, True)
     for attr, federation_type, label in _SUBSTANCE_PROPOSAL_KINDS:
         for item in getattr(payload, attr):
             item_id = (item or {}).get("id") if isinstance(item, dict) else None
             id_suffix = f" '{item_id}'" if item_id else ""
-            try:
-                cr = governance_service.create_change_request(
-                    ChangeRequestCreate(
-                        request_type=ChangeRequestType.FEDERATION_IMPORT,
-                        title=(
-                            f"Federation proposal: {label}{id_suffix} "
-                            f"from {payload.source_instance_id}"
-                        ),
-                        payload={
-                            "federation_type": federation_type,
-                            "source_instance_id": payload.source_instance_id,
-                            "data": item,
-                        },
-                        proposer_id=f"federation:{payload.source_instance_id}",
-                        proposer_type=ActorType.MACHINE,
-                        auto_apply_on_approval=False,
-                    )
-                )
-                governance_created += 1
-                result.accepted += 1
-            except Exception as exc:
-                logger.warning(
-                    "Federation %s import failed", federation_type, exc_info=True
-                )
-                result.errors.append(f"{federation_type} error: {exc}")
+            _add(
+                federation_type,
+                f"Federation proposal: {label}{id_suffix} from {source}",
+                item,
+                False,
+            )
+    return items
+
 
-    result.governance_requests_created = governance_created
+def _ingest_payload(
+    payload: FederatedPayload, instance: FederatedInstance, result: FederationSyncResult
+) -> FederationSyncResult:
+    result.links_received = len(payload.lineage_links)
+    result.events_received = len(payload.usage_events)
+    result.proposals_received = sum(
+        len(getattr(payload, attr)) for attr, _ft, _label in _SUBSTANCE_PROPOSAL_KINDS
+    )
 
-    # 5. Update last_sync_at on the instance
+    # All change requests go in with one transaction; items matching a
+    # request from this peer that is still open are skipped, so a peer
+    # re-sending the same batch does not open a second vote.
+    items = _change_request_items(payload, result)
+    try:
+        created, skipped = governance_service.create_change_requests_bulk(items)
+    except Exception as exc:
+        logger.warning("Federation bulk import failed", exc_info=True)
+        result.errors.append(f"governance intake error: {exc}")
+        created, skipped = [], 0
+    result.governance_requests_created = len(created)
+    result.accepted = len(created)
+    result.duplicates_skipped = skipped
+
+    # Update last_sync_at on the instance
     instance.last_sync_at = datetime.now().isoformat()
     register_instance(instance)
 
-    # 6. Store payload for audit
+    # Store payload for audit
     now_iso = datetime.now().isoformat()
     with _session() as s:
         rec = FederationSyncHistoryRecord(
@@ -553,6 +527,96 @@ def receive_payload(payload: FederatedPayload) -> FederationSyncResult:
     return result
 
 
+def receive_payload(payload: FederatedPayload) -> FederationSyncResult:
+    """Main entry point: receive data from a remote instance.
+
+    Two layers travel together:
+
+    - **Telemetry** (lineage_links, usage_events) — small structured
+      observations. Each becomes a governance ChangeRequest with
+      ``auto_apply_on_approval=True``: once two approvals clear, the
+      applier writes the link/event into the local lineage graph.
+    - **Substance** (concept_proposals, spec_proposals, idea_proposals,
+      teaching_proposals) — body-level material the peer would like this
+      body to absorb. Each becomes a governance ChangeRequest with
+      ``auto_apply_on_approval=False``: the proposal is held by governance
+      and a maintainer walks it into the repo as a PR. Substance never
+      writes directly into the deployed corpus.
+
+    Both layers require an instance with trust_level ≥ pending and
+    enforce required_approvals ≥ 2 (see governance_service).
+    """
+    result = FederationSyncResult(source_instance_id=payload.source_instance_id)
+    instance = _validate_source(payload, result)
+    if instance is None:
+        return result
+    return _ingest_payload(payload, instance, result)
+
+
+# ---------------------------------------------------------------------------
+# Background intake for large payloads
+# ---------------------------------------------------------------------------
+
+_SYNC_JOBS: dict[str, FederationSyncJob] = {}
+_SYNC_JOBS_LOCK = threading.Lock()
+
+
+def sync_async_threshold() -> int:
+    """Payloads with more items than this are ingested as a background job."""
+    return max(1, get_int("federation", "sync_async_threshold", default=2000))
+
+
+def queue_sync_job(payload: FederatedPayload) -> tuple[FederationSyncResult, FederationSyncJob | None]:
+    """Validate the source now and register a job to ingest the payload later.
+
+    Returns the immediate result and the queued job; the job is None when
+    the source was rejected, in which case the result says why.
+    """
+    result = FederationSyncResult(source_instance_id=payload.source_instance_id)
+    if _validate_source(payload, result) is None:
+        return result, None
+    job = FederationSyncJob(
+        job_id=f"syncjob_{uuid4().hex[:12]}",
+        source_instance_id=payload.source_instance_id,
+        items=payload_item_count(payload),
+        created_at=datetime.now(timezone.utc).isoformat(),
+    )
+    with _SYNC_JOBS_LOCK:
+        _SYNC_JOBS[job.job_id] = job
+        keep = max(1, get_int("federation", "sync_job_history", default=100))
+        for stale_id in list(_SYNC_JOBS)[:-keep]:
+            if _SYNC_JOBS[stale_id].status in ("completed", "failed"):
+                del _SYNC_JOBS[stale_id]
+    result.job_id = job.job_id
+    return result, job
+
+
+def run_sync_job(job_id: str, payload: FederatedPayload) -> None:
+    """Ingest a queued payload; the outcome lands on the job."""
+    with _SYNC_JOBS_LOCK:
+        job = _SYNC_JOBS.get(job_id)
+        if job is None:
+            return
+        job.status = "running"
+    try:
+        result = FederationSyncResult(source_instance_id=payload.source_instance_id, job_id=job_id)
+        instance = _validate_source(payload, result)
+        if instance is not None:
+            _ingest_payload(payload, instance, result)
+        job.result = result
+        job.status = "completed"
+    except Exception as exc:
+        logger.warning("Federation sync job %s failed", job_id, exc_info=True)
+        job.error = str(exc)
+        job.status = "failed"
+    job.finished_at = datetime.now(timezone.utc).isoformat()
+
+
+def get_sync_job(job_id: str) -> FederationSyncJob | None:
+    with _SYNC_JOBS_LOCK:
+        return _SYNC_JOBS.get(job_id)
+
+
 # ---------------------------------------------------------------------------
 # Sync history
 # ---------------------------------------------------------------------------
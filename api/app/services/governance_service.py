@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 from contextlib import contextmanager
@@ -9,7 +10,7 @@ from datetime import datetime, timezone
 from typing import Any
 from uuid import uuid4
 
-from sqlalchemy import Boolean, DateTime, Integer, String, Text, create_engine
+from sqlalchemy import Boolean, DateTime, Integer, String, Text, create_engine, insert
 from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, sessionmaker
 from sqlalchemy.pool import NullPool
 
@@ -364,6 +365,102 @@ def create_change_request(data: ChangeRequestCreate) -> ChangeRequest:
     return request
 
 
+def change_request_fingerprint(request_type: str, proposer_id: str, payload: dict[str, Any]) -> str:
+    """Stable identity of a request's content, used to skip duplicates of open requests."""
+    canonical = json.dumps(
+        {"request_type": request_type, "proposer_id": proposer_id, "payload": payload},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def create_change_requests_bulk(
+    items: list[ChangeRequestCreate],
+    *,
+    chunk_size: int = 500,
+) -> tuple[list[ChangeRequest], int]:
+    """Create many change requests in one transaction; returns (created, duplicates_skipped).
+
+    Same semantics per item as create_change_request, but rows go in with
+    batched INSERTs, and an item whose content matches a request from the
+    same proposer that is still open — or an earlier item in this batch —
+    is skipped instead of opening a second vote on the same thing.
+    """
+    ensure_schema()
+    if not items:
+        return [], 0
+    now = datetime.now(timezone.utc)
+    default_approvals = _default_required_approvals()
+    proposer_ids = {item.proposer_id for item in items}
+    request_types = {item.request_type.value for item in items}
+    created: list[ChangeRequest] = []
+    skipped = 0
+    with _session() as session:
+        seen: set[str] = set()
+        open_rows = (
+            session.query(
+                ChangeRequestRecord.request_type,
+                ChangeRequestRecord.proposer_id,
+                ChangeRequestRecord.payload_json,
+            )
+            .filter(
+                ChangeRequestRecord.status == ChangeRequestStatus.OPEN.value,
+                ChangeRequestRecord.proposer_id.in_(proposer_ids),
+                ChangeRequestRecord.request_type.in_(request_types),
+            )
+            .all()
+        )
+        for request_type, proposer_id, payload_json in open_rows:
+            seen.add(change_request_fingerprint(request_type, proposer_id, _load_payload(payload_json)))
+
+        rows: list[dict[str, Any]] = []
+        for data in items:
+            fingerprint = change_request_fingerprint(data.request_type.value, data.proposer_id, data.payload)
+            if fingerprint in seen:
+                skipped += 1
+                continue
+            seen.add(fingerprint)
+            required_approvals = data.required_approvals or default_approvals
+            if data.request_type == ChangeRequestType.FEDERATION_IMPORT and required_approvals < 2:
+                required_approvals = 2
+            request = ChangeRequest(
+                request_type=data.request_type,
+                title=data.title,
+                payload=data.payload,
+                proposer_id=data.proposer_id,
+                proposer_type=data.proposer_type,
+                required_approvals=required_approvals,
+                auto_apply_on_approval=data.auto_apply_on_approval,
+                status=ChangeRequestStatus.OPEN,
+                approvals=0,
+                rejections=0,
+                created_at=now,
+                updated_at=now,
+            )
+            created.append(request)
+            rows.append(
+                {
+                    "id": request.id,
+                    "request_type": request.request_type.value,
+                    "title": request.title,
+                    "payload_json": json.dumps(request.payload),
+                    "proposer_id": request.proposer_id,
+                    "proposer_type": request.proposer_type.value,
+                    "required_approvals": request.required_approvals,
+                    "auto_apply_on_approval": request.auto_apply_on_approval,
+                    "status": request.status.value,
+                    "approvals": 0,
+                    "rejections": 0,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+        for start in range(0, len(rows), max(1, chunk_size)):
+            session.execute(insert(ChangeRequestRecord), rows[start : start + chunk_size])
+    return created, skipped
+
+
 def _upsert_vote(session: Session, change_request_id: str, data: ChangeRequestVoteCreate) -> None:
     existing_vote = (
         session.query(ChangeRequestVoteRecord)
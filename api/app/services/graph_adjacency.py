@@ -0,0 +1,322 @@
+"""Process-local adjacency snapshot of graph_edges.
+
+The graph is read far more often than it changes, yet every neighbour,
+path and subgraph read used to go back to graph_edges. This module keeps
+a CSR-style index of the edge table in memory: node ids are interned to
+compact integers, and each node carries array-backed lists of edge slots
+keyed by edge type, one set for outgoing and one for incoming edges.
+Only topology lives here — node rows are still hydrated from the DB by
+primary key, so node edits never make the snapshot stale.
+
+Freshness:
+  - graph_service bumps the `graph_generation` row inside the same
+    transaction as every edge write, then hands the committed delta to
+    `note_edge_upserted` / `note_edge_deleted` / `note_node_deleted`.
+    When the local snapshot sits exactly one generation behind, the
+    delta is applied in place; otherwise it is marked stale.
+  - Reads re-check the generation row at most every
+    graph.adjacency_check_seconds (default 1s), so another worker's
+    writes are picked up with one primary-key read and a reload.
+  - graph.adjacency_max_age_seconds (default 300s) forces a reload as a
+    backstop for writers that touch graph_edges without bumping the
+    generation (out-of-process tools).
+
+graph.adjacency_snapshot=false turns the snapshot off; every caller then
+falls back to its DB query.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from array import array
+from typing import Any, Iterable
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.config_loader import get_bool, get_float
+from app.models.graph import Edge, GraphGeneration
+from app.services import unified_db
+from app.services.graph_traversal import Expander
+
+log = logging.getLogger(__name__)
+
+_GENERATION_ROW_ID = 1
+# Second counter, bumped on concept-node writes (see concept_keyword_index).
+CONCEPT_GENERATION_ROW_ID = 2
+
+
+class AdjacencySnapshot:
+    """Interned node ids + per-type edge-slot arrays for one database."""
+
+    __slots__ = (
+        "url", "generation", "loaded_at", "checked_at",
+        "ids", "index", "edges", "edge_slot", "out", "inc",
+    )
+
+    def __init__(self, url: str, generation: int) -> None:
+        now = time.monotonic()
+        self.url = url
+        self.generation = generation
+        self.loaded_at = now
+        self.checked_at = now
+        self.ids: list[str] = []
+        self.index: dict[str, int] = {}
+        # Edge slot -> Edge.to_dict() payload; None once deleted. Slots are
+        # never reused, the next full load compacts them.
+        self.edges: list[dict[str, Any] | None] = []
+        self.edge_slot: dict[str, int] = {}
+        self.out: list[dict[str, array]] = []
+        self.inc: list[dict[str, array]] = []
+
+    def _intern(self, node_id: str) -> int:
+        nid = self.index.get(node_id)
+        if nid is None:
+            nid = len(self.ids)
+            self.ids.append(node_id)
+            self.index[node_id] = nid
+            self.out.append({})
+            self.inc.append({})
+        return nid
+
+    def add_edge(self, edge: dict[str, Any]) -> None:
+        slot = self.edge_slot.get(edge["id"])
+        if slot is not None:
+            # from/to/type never change on an existing edge; only the payload.
+            self.edges[slot] = edge
+            return
+        slot = len(self.edges)
+        self.edges.append(edge)
+        self.edge_slot[edge["id"]] = slot
+        src = self._intern(edge["from_id"])
+        dst = self._intern(edge["to_id"])
+        self.out[src].setdefault(edge["type"], array("l")).append(slot)
+        self.inc[dst].setdefault(edge["type"], array("l")).append(slot)
+
+    def remove_edge(self, edge_id: str) -> None:
+        slot = self.edge_slot.pop(edge_id, None)
+        if slot is None:
+            return
+        edge = self.edges[slot]
+        self.edges[slot] = None
+        if edge is None:
+            return
+        for lists, node_id in ((self.out, edge["from_id"]), (self.inc, edge["to_id"])):
+            nid = self.index.get(node_id)
+            slots = lists[nid].get(edge["type"]) if nid is not None else None
+            if slots is not None and slot in slots:
+                slots.remove(slot)
+                if not slots:
+                    del lists[nid][edge["type"]]
+
+    def remove_node(self, node_id: str) -> None:
+        for edge in self.edges_touching(node_id, "both", None):
+            self.remove_edge(edge["id"])
+
+    def edges_touching(
+        self,
+        node_id: str,
+        direction: str,
+        edge_types: Iterable[str] | None,
+    ) -> list[dict[str, Any]]:
+        nid = self.index.get(node_id)
+        if nid is None:
+            return []
+        sides: list[dict[str, array]] = []
+        if direction in ("outgoing", "both"):
+            sides.append(self.out[nid])
+        if direction in ("incoming", "both"):
+            sides.append(self.inc[nid])
+        wanted = set(edge_types) if edge_types else None
+        slots: set[int] = set()
+        for by_type in sides:
+            for edge_type, arr in by_type.items():
+                if wanted is None or edge_type in wanted:
+                    slots.update(arr)
+        # Callers decorate the dicts they get back; hand out copies.
+        return [dict(self.edges[slot]) for slot in sorted(slots) if self.edges[slot] is not None]
+
+
+_LOCK = threading.RLock()
+_STATE: dict[str, Any] = {"snapshot": None, "stale": False}
+_GENERATION_ROW_READY: set[tuple[str, int]] = set()
+
+
+def _enabled() -> bool:
+    return get_bool("graph", "adjacency_snapshot", True)
+
+
+def _ensure_generation_row(url: str, row_id: int = _GENERATION_ROW_ID) -> None:
+    if (url, row_id) in _GENERATION_ROW_READY:
+        return
+    with unified_db.session() as s:
+        if s.get(GraphGeneration, row_id) is None:
+            s.add(GraphGeneration(id=row_id, value=0))
+            try:
+                s.commit()
+            except IntegrityError:
+                s.rollback()  # another worker created it first
+    _GENERATION_ROW_READY.add((url, row_id))
+
+
+def _read_generation(s, row_id: int = _GENERATION_ROW_ID) -> int:
+    value = s.execute(
+        select(GraphGeneration.value).where(GraphGeneration.id == row_id)
+    ).scalar()
+    return int(value or 0)
+
+
+def bump_generation(s, row_id: int = _GENERATION_ROW_ID) -> int:
+    """Advance the graph generation inside the caller's transaction.
+
+    Call this from any code path that writes graph_edges, before commit.
+    Returns the new generation, which the caller passes to the matching
+    `note_*` function once the transaction has committed. Pass
+    row_id=CONCEPT_GENERATION_ROW_ID for concept-node writes instead.
+    """
+    result = s.execute(
+        update(GraphGeneration)
+        .where(GraphGeneration.id == row_id)
+        .values(value=GraphGeneration.value + 1)
+    )
+    if not result.rowcount:
+        # First write against a fresh database. Insert in the caller's
+        # transaction: a second session could block on its write lock.
+        s.add(GraphGeneration(id=row_id, value=1))
+        s.flush()
+        return 1
+    return _read_generation(s, row_id)
+
+
+def _load(url: str) -> AdjacencySnapshot:
+    _ensure_generation_row(url)
+    with unified_db.session() as s:
+        snap = AdjacencySnapshot(url, _read_generation(s))
+        for edge in s.query(Edge).order_by(Edge.id).yield_per(5000):
+            snap.add_edge(edge.to_dict())
+    log.info(
+        "graph adjacency snapshot loaded generation=%s nodes=%s edges=%s",
+        snap.generation, len(snap.ids), len(snap.edge_slot),
+    )
+    return snap
+
+
+def _current() -> AdjacencySnapshot | None:
+    """Return a fresh-enough snapshot, loading or reloading it as needed.
+
+    Caller holds _LOCK. Returns None when disabled or when the edge table
+    can't be read, so callers fall back to their DB query.
+    """
+    if not _enabled():
+        return None
+    url = unified_db.database_url()
+    snap: AdjacencySnapshot | None = _STATE["snapshot"]
+    now = time.monotonic()
+    try:
+        if snap is not None and snap.url == url and not _STATE["stale"]:
+            max_age = get_float("graph", "adjacency_max_age_seconds", 300.0)
+            if now - snap.loaded_at < max_age:
+                if now - snap.checked_at < get_float("graph", "adjacency_check_seconds", 1.0):
+                    return snap
+                with unified_db.session() as s:
+                    generation = _read_generation(s)
+                snap.checked_at = now
+                if generation == snap.generation:
+                    return snap
+        snap = _load(url)
+    except Exception:
+        log.warning("graph adjacency snapshot unavailable; reading from DB", exc_info=True)
+        _STATE["snapshot"] = None
+        return None
+    _STATE["snapshot"] = snap
+    _STATE["stale"] = False
+    return snap
+
+
+def _apply(generation: int, mutate) -> None:
+    with _LOCK:
+        snap: AdjacencySnapshot | None = _STATE["snapshot"]
+        if snap is None:
+            return
+        if snap.url != unified_db.database_url() or generation != snap.generation + 1:
+            # Another writer landed in between; reload on the next read.
+            _STATE["stale"] = True
+            return
+        mutate(snap)
+        snap.generation = generation
+
+
+def note_edge_upserted(edge: dict[str, Any], generation: int) -> None:
+    """Apply a committed edge insert/update to the local snapshot."""
+    _apply(generation, lambda snap: snap.add_edge(edge))
+
+
+def note_edge_deleted(edge_id: str, generation: int) -> None:
+    """Apply a committed edge delete to the local snapshot."""
+    _apply(generation, lambda snap: snap.remove_edge(edge_id))
+
+
+def note_node_deleted(node_id: str, generation: int) -> None:
+    """Drop every edge touching a deleted node from the local snapshot."""
+    _apply(generation, lambda snap: snap.remove_node(node_id))
+
+
+def invalidate() -> None:
+    """Force a full reload on the next read."""
+    with _LOCK:
+        _STATE["stale"] = True
+
+
+def edges_touching(
+    node_id: str,
+    direction: str = "both",
+    edge_type: str | None = None,
+) -> list[dict[str, Any]] | None:
+    """Edge dicts touching node_id from memory, or None to fall back to the DB."""
+    with _LOCK:
+        snap = _current()
+        if snap is None:
+            return None
+        return snap.edges_touching(node_id, direction, [edge_type] if edge_type else None)
+
+
+def expander(edge_types: list[str] | None = None) -> Expander | None:
+    """A graph_traversal expander served from memory, or None if disabled."""
+    with _LOCK:
+        snap = _current()
+    if snap is None:
+        return None
+
+    # One walk reads one snapshot; local deltas still apply to it in place.
+    def expand(frontier: set[str], limit: int | None) -> list[dict[str, Any]]:
+        with _LOCK:
+            seen: set[str] = set()
+            out: list[dict[str, Any]] = []
+            for node_id in frontier:
+                for edge in snap.edges_touching(node_id, "both", edge_types):
+                    if edge["id"] not in seen:
+                        seen.add(edge["id"])
+                        out.append(edge)
+        out.sort(key=lambda e: (-(e.get("strength") or 0.0), e["id"]))
+        return out if limit is None else out[:limit]
+
+    return expand
+
+
+def stats() -> dict[str, Any]:
+    """Snapshot shape for diagnostics."""
+    with _LOCK:
+        snap: AdjacencySnapshot | None = _STATE["snapshot"]
+        if snap is None:
+            return {"enabled": _enabled(), "loaded": False}
+        return {
+            "enabled": _enabled(),
+            "loaded": True,
+            "generation": snap.generation,
+            "stale": bool(_STATE["stale"]),
+            "nodes": len(snap.ids),
+            "edges": len(snap.edge_slot),
+            "age_seconds": round(time.monotonic() - snap.loaded_at, 3),
+        }
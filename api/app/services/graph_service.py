@@ -23,6 +23,7 @@ from app.models.graph import (
     CANONICAL_EDGE_TYPE_SET, CANONICAL_NODE_TYPE_SET, NODE_TYPE_SET,
     LIFECYCLE_DEFAULTS,
 )
+from app.services import concept_keyword_index, graph_adjacency, graph_traversal
 from app.services.unified_db import session
 from app.config.edge_types import CANONICAL_EDGE_TYPES
 
@@ -157,6 +158,13 @@ def _record_revision(
         log.exception("Failed to record NodeRevision for %s", node.id)
 
 
+def _bump_concept_generation(s, node_type: str) -> int | None:
+    """Bump the concept counter for a concept-node write; None for other types."""
+    if node_type != "concept":
+        return None
+    return graph_adjacency.bump_generation(s, graph_adjacency.CONCEPT_GENERATION_ROW_ID)
+
+
 def create_node(
     *,
     id: str | None = None,
@@ -211,9 +219,13 @@ def create_node(
                 author=author,
                 fields_changed=["__create__"],
             )
+            concept_generation = _bump_concept_generation(s, type)
             s.commit()
             s.refresh(node)
-            return node.to_dict()
+            payload = node.to_dict()
+            if concept_generation is not None:
+                concept_keyword_index.note_concept_upserted(payload, concept_generation)
+            return payload
         except IntegrityError:
             s.rollback()
             log.warning("Node %s already exists", node_id)
@@ -325,9 +337,13 @@ def update_node(
                 author=_author,
                 fields_changed=fields_changed,
             )
+        concept_generation = _bump_concept_generation(s, node.type)
         s.commit()
         s.refresh(node)
-        return node.to_dict()
+        payload = node.to_dict()
+        if concept_generation is not None:
+            concept_keyword_index.note_concept_upserted(payload, concept_generation)
+        return payload
 
 
 def list_node_revisions(
@@ -366,11 +382,16 @@ def delete_node(node_id: str) -> bool:
         if not node:
             return False
         # Delete connected edges
+        generation = graph_adjacency.bump_generation(s)
         s.query(Edge).filter(
             or_(Edge.from_id == node_id, Edge.to_id == node_id)
         ).delete(synchronize_session=False)
+        concept_generation = _bump_concept_generation(s, node.type)
         s.delete(node)
         s.commit()
+        graph_adjacency.note_node_deleted(node_id, generation)
+        if concept_generation is not None:
+            concept_keyword_index.note_concept_deleted(node_id, concept_generation)
         return True
 
 
@@ -479,9 +500,12 @@ def create_edge(
         )
         s.add(edge)
         try:
+            generation = graph_adjacency.bump_generation(s)
             s.commit()
             s.refresh(edge)
-            return edge.to_dict()
+            payload = edge.to_dict()
+            graph_adjacency.note_edge_upserted(payload, generation)
+            return payload
         except IntegrityError:
             s.rollback()
             # Edge already exists — update strength instead
@@ -490,9 +514,12 @@ def create_edge(
             ).first()
             if existing:
                 existing.strength = strength
+                generation = graph_adjacency.bump_generation(s)
                 s.commit()
                 s.refresh(existing)
-                return existing.to_dict()
+                payload = existing.to_dict()
+                graph_adjacency.note_edge_upserted(payload, generation)
+                return payload
             return {"error": "edge_exists"}
 
 
@@ -511,40 +538,25 @@ def get_edges(
     spectrum-colored chip without a follow-up fetch per edge.
     """
     with session() as s:
-        if direction == "outgoing":
-            q = s.query(Edge).filter(Edge.from_id == node_id)
-        elif direction == "incoming":
-            q = s.query(Edge).filter(Edge.to_id == node_id)
-        else:
-            q = s.query(Edge).filter(
-                or_(Edge.from_id == node_id, Edge.to_id == node_id)
-            )
-
-        if edge_type:
-            q = q.filter(Edge.type == edge_type)
-
-        edges = q.order_by(Edge.created_at.desc()).all()
+        edges = _touching_edges(s, node_id, direction, edge_type)
 
         # Batch-load referenced nodes so the response is single-query
         # in addition to the edge query (no N+1).
         ref_ids: set[str] = set()
         for e in edges:
-            ref_ids.add(e.from_id)
-            ref_ids.add(e.to_id)
+            ref_ids.add(e["from_id"])
+            ref_ids.add(e["to_id"])
         nodes_map: dict[str, Node] = (
             {n.id: n for n in s.query(Node).filter(Node.id.in_(ref_ids)).all()}
             if ref_ids
             else {}
         )
 
-        out: list[dict[str, Any]] = []
-        for e in edges:
-            d = e.to_dict()
-            d["from_node"] = _node_stub(nodes_map.get(e.from_id))
-            d["to_node"] = _node_stub(nodes_map.get(e.to_id))
-            d["canonical"] = e.type in CANONICAL_EDGE_TYPES
-            out.append(d)
-        return out
+        for d in edges:
+            d["from_node"] = _node_stub(nodes_map.get(d["from_id"]))
+            d["to_node"] = _node_stub(nodes_map.get(d["to_id"]))
+            d["canonical"] = d["type"] in CANONICAL_EDGE_TYPES
+        return edges
 
 
 def delete_edge(edge_id: str) -> bool:
@@ -554,7 +566,9 @@ def delete_edge(edge_id: str) -> bool:
         if not edge:
             return False
         s.delete(edge)
+        generation = graph_adjacency.bump_generation(s)
         s.commit()
+        graph_adjacency.note_edge_deleted(edge_id, generation)
         return True
 
 
@@ -570,9 +584,12 @@ def update_edge(edge_id: str, **updates) -> dict[str, Any] | None:
             edge.properties = merged
         if "strength" in updates:
             edge.strength = updates["strength"]
+        generation = graph_adjacency.bump_generation(s)
         s.commit()
         s.refresh(edge)
-        return edge.to_dict()
+        payload = edge.to_dict()
+        graph_adjacency.note_edge_upserted(payload, generation)
+        return payload
 
 
 def create_provenance_edge(
@@ -599,10 +616,13 @@ def create_provenance_edge(
             merged.update(properties)
             existing.properties = merged
             existing.strength = strength
+            generation = graph_adjacency.bump_generation(s)
             s.commit()
             s.refresh(existing)
+            payload = existing.to_dict()
+            graph_adjacency.note_edge_upserted(payload, generation)
             _invalidate_profiles(from_id, to_id)
-            return existing.to_dict()
+            return payload
 
         edge = Edge(
             id=str(uuid.uuid4())[:12],
@@ -614,10 +634,13 @@ def create_provenance_edge(
             created_by=created_by,
         )
         s.add(edge)
+        generation = graph_adjacency.bump_generation(s)
         s.commit()
         s.refresh(edge)
+        payload = edge.to_dict()
+        graph_adjacency.note_edge_upserted(payload, generation)
         _invalidate_profiles(from_id, to_id)
-        return edge.to_dict()
+        return payload
 
 
 def _invalidate_profiles(*entity_ids: str) -> None:
@@ -633,6 +656,35 @@ def _invalidate_profiles(*entity_ids: str) -> None:
 # ── Graph queries ────────────────────────────────────────────────────
 
 
+def _touching_edges(
+    s,
+    node_id: str,
+    direction: str = "both",
+    edge_type: str | None = None,
+) -> list[dict[str, Any]]:
+    """Edge dicts touching node_id, newest first.
+
+    Served from the in-memory adjacency snapshot when it is available;
+    otherwise one edge query in the requested direction.
+    """
+    cached = graph_adjacency.edges_touching(node_id, direction, edge_type)
+    if cached is not None:
+        cached.sort(key=lambda e: e.get("created_at") or "", reverse=True)
+        return cached
+
+    if direction == "outgoing":
+        q = s.query(Edge).filter(Edge.from_id == node_id)
+    elif direction == "incoming":
+        q = s.query(Edge).filter(Edge.to_id == node_id)
+    else:
+        q = s.query(Edge).filter(
+            or_(Edge.from_id == node_id, Edge.to_id == node_id)
+        )
+    if edge_type:
+        q = q.filter(Edge.type == edge_type)
+    return [e.to_dict() for e in q.order_by(Edge.created_at.desc()).all()]
+
+
 def get_neighbors(
     node_id: str,
     edge_type: str | None = None,
@@ -652,27 +704,15 @@ def get_neighbors(
 
     with session() as s:
         # Get connected node IDs via edges in the requested direction
-        if direction == "outgoing":
-            edge_q = s.query(Edge).filter(Edge.from_id == node_id)
-        elif direction == "incoming":
-            edge_q = s.query(Edge).filter(Edge.to_id == node_id)
-        else:
-            edge_q = s.query(Edge).filter(
-                or_(Edge.from_id == node_id, Edge.to_id == node_id)
-            )
-
-        if edge_type:
-            edge_q = edge_q.filter(Edge.type == edge_type)
-
         neighbor_ids = set()
         neighbor_edge_map: dict[str, dict] = {}
-        for edge in edge_q.all():
-            other = edge.to_id if edge.from_id == node_id else edge.from_id
+        for edge in _touching_edges(s, node_id, direction, edge_type):
+            other = edge["to_id"] if edge["from_id"] == node_id else edge["from_id"]
             neighbor_ids.add(other)
             if other not in neighbor_edge_map:
                 neighbor_edge_map[other] = {
-                    "edge_type": edge.type,
-                    "direction": "outgoing" if edge.from_id == node_id else "incoming",
+                    "edge_type": edge["type"],
+                    "direction": "outgoing" if edge["from_id"] == node_id else "incoming",
                 }
 
         if not neighbor_ids:
@@ -698,68 +738,58 @@ def get_neighbors(
         return neighbors
 
 
-def get_path(from_id: str, to_id: str, max_depth: int = 5) -> list[dict[str, Any]] | None:
-    """Find shortest path between two nodes via BFS. Returns list of edges or None."""
+def get_path(
+    from_id: str,
+    to_id: str,
+    max_depth: int = 5,
+    max_nodes: int | None = None,
+) -> list[dict[str, Any]] | None:
+    """Find shortest path between two nodes. Returns list of edges or None.
+
+    Bidirectional BFS over graph_traversal: each hop expands a whole
+    frontier in one query, from whichever end is currently smaller.
+    `max_nodes` bounds how many nodes the search may visit before it
+    gives up (defaults to graph.traversal_max_nodes).
+    """
+    budget = graph_traversal.default_budget()
+    if max_nodes is not None:
+        budget = graph_traversal.TraversalBudget(max_nodes=max_nodes, max_edges=budget.max_edges)
     with session() as s:
-        visited = {from_id}
-        queue = [(from_id, [])]
-
-        for _ in range(max_depth):
-            next_queue = []
-            for current_id, path in queue:
-                edges = s.query(Edge).filter(
-                    or_(Edge.from_id == current_id, Edge.to_id == current_id)
-                ).all()
-                for edge in edges:
-                    other = edge.to_id if edge.from_id == current_id else edge.from_id
-                    if other == to_id:
-                        return path + [edge.to_dict()]
-                    if other not in visited:
-                        visited.add(other)
-                        next_queue.append((other, path + [edge.to_dict()]))
-            queue = next_queue
-            if not queue:
-                break
-
-        return None  # No path found
+        expand = graph_adjacency.expander() or graph_traversal.db_expander(s)
+        return graph_traversal.shortest_path(from_id, to_id, max_depth, expand, budget)
 
 
 def get_subgraph(
     center_id: str,
     depth: int = 1,
     edge_types: list[str] | None = None,
+    max_nodes: int | None = None,
+    max_edges: int | None = None,
 ) -> dict[str, Any]:
-    """Get a subgraph centered on a node. Returns nodes + edges within depth."""
+    """Get a subgraph centered on a node. Returns nodes + edges within depth.
+
+    One edge query per hop (graph_traversal). Node and edge budgets
+    default to graph.traversal_max_nodes / traversal_max_edges; when a
+    budget stops the walk early the response carries truncated=True.
+    """
+    default = graph_traversal.default_budget()
+    budget = graph_traversal.TraversalBudget(
+        max_nodes=max_nodes or default.max_nodes,
+        max_edges=max_edges or default.max_edges,
+    )
     with session() as s:
-        nodes_seen = {center_id}
-        edges_collected = []
-        frontier = {center_id}
-
-        for _ in range(depth):
-            if not frontier:
-                break
-            next_frontier = set()
-            for nid in frontier:
-                edge_q = s.query(Edge).filter(
-                    or_(Edge.from_id == nid, Edge.to_id == nid)
-                )
-                if edge_types:
-                    edge_q = edge_q.filter(Edge.type.in_(edge_types))
-                for edge in edge_q.all():
-                    edges_collected.append(edge.to_dict())
-                    other = edge.to_id if edge.from_id == nid else edge.from_id
-                    if other not in nodes_seen:
-                        nodes_seen.add(other)
-                        next_frontier.add(other)
-            frontier = next_frontier
-
-        # Fetch all nodes
-        all_nodes = s.query(Node).filter(Node.id.in_(nodes_seen)).all()
+        expand = (
+            graph_adjacency.expander(edge_types)
+            or graph_traversal.db_expander(s, edge_types)
+        )
+        walk = graph_traversal.expand_subgraph(center_id, depth, expand, budget)
+        all_nodes = s.query(Node).filter(Node.id.in_(walk["node_ids"])).all()
         return {
             "nodes": [n.to_dict() for n in all_nodes],
-            "edges": edges_collected,
+            "edges": walk["edges"],
             "center": center_id,
             "depth": depth,
+            "truncated": walk["truncated"],
         }
 
 
@@ -816,9 +846,12 @@ def create_edge_strict(
         )
         s.add(edge)
         try:
+            generation = graph_adjacency.bump_generation(s)
             s.commit()
             s.refresh(edge)
-            return edge.to_dict()
+            payload = edge.to_dict()
+            graph_adjacency.note_edge_upserted(payload, generation)
+            return payload
         except IntegrityError:
             s.rollback()
             return {"error": "edge_exists"}
@@ -884,41 +917,45 @@ def list_edges_for_entity(
 ) -> dict[str, Any]:
     """List edges for a given entity with optional type and direction filters."""
     with session() as s:
-        if direction == "outgoing":
-            q = s.query(Edge).filter(Edge.from_id == entity_id)
-        elif direction == "incoming":
-            q = s.query(Edge).filter(Edge.to_id == entity_id)
+        cached = graph_adjacency.edges_touching(entity_id, direction, edge_type)
+        if cached is not None:
+            cached.sort(key=lambda e: e.get("created_at") or "", reverse=True)
+            total = len(cached)
+            edges = cached[offset:offset + limit]
         else:
-            q = s.query(Edge).filter(
-                or_(Edge.from_id == entity_id, Edge.to_id == entity_id)
-            )
+            if direction == "outgoing":
+                q = s.query(Edge).filter(Edge.from_id == entity_id)
+            elif direction == "incoming":
+                q = s.query(Edge).filter(Edge.to_id == entity_id)
+            else:
+                q = s.query(Edge).filter(
+                    or_(Edge.from_id == entity_id, Edge.to_id == entity_id)
+                )
 
-        if edge_type:
-            q = q.filter(Edge.type == edge_type)
+            if edge_type:
+                q = q.filter(Edge.type == edge_type)
 
-        total = q.count()
-        edges = q.order_by(Edge.created_at.desc()).offset(offset).limit(limit).all()
+            total = q.count()
+            edges = [
+                e.to_dict()
+                for e in q.order_by(Edge.created_at.desc()).offset(offset).limit(limit).all()
+            ]
 
         # Batch-load nodes
         node_ids = set()
         for e in edges:
-            node_ids.add(e.from_id)
-            node_ids.add(e.to_id)
+            node_ids.add(e["from_id"])
+            node_ids.add(e["to_id"])
         nodes_map: dict[str, Node] = {
             n.id: n for n in s.query(Node).filter(Node.id.in_(node_ids)).all()
         }
 
-        items = []
-        for e in edges:
-            d = e.to_dict()
-            fn = nodes_map.get(e.from_id)
-            tn = nodes_map.get(e.to_id)
-            d["from_node"] = _node_stub(fn)
-            d["to_node"] = _node_stub(tn)
-            d["canonical"] = e.type in CANONICAL_EDGE_TYPES
-            items.append(d)
+        for d in edges:
+            d["from_node"] = _node_stub(nodes_map.get(d["from_id"]))
+            d["to_node"] = _node_stub(nodes_map.get(d["to_id"]))
+            d["canonical"] = d["type"] in CANONICAL_EDGE_TYPES
 
-        return {"items": items, "total": total, "limit": limit, "offset": offset}
+        return {"items": edges, "total": total, "limit": limit, "offset": offset}
 
 
 def get_neighbors_enriched(
@@ -929,27 +966,31 @@ def get_neighbors_enriched(
 ) -> dict[str, Any]:
     """Get neighboring nodes with edge context for the API /entities/{id}/neighbors endpoint."""
     with session() as s:
-        edge_q = s.query(Edge).filter(
-            or_(Edge.from_id == node_id, Edge.to_id == node_id)
-        )
-        if edge_type:
-            edge_q = edge_q.filter(Edge.type == edge_type)
-
-        edges = edge_q.limit(limit * 2).all()  # over-fetch before node_type filter
+        cached = graph_adjacency.edges_touching(node_id, "both", edge_type)
+        if cached is not None:
+            edges = cached[:limit * 2]
+        else:
+            edge_q = s.query(Edge).filter(
+                or_(Edge.from_id == node_id, Edge.to_id == node_id)
+            )
+            if edge_type:
+                edge_q = edge_q.filter(Edge.type == edge_type)
+            # over-fetch before node_type filter
+            edges = [e.to_dict() for e in edge_q.limit(limit * 2).all()]
 
         # Build neighbor list
         neighbor_map: dict[str, dict] = {}
         for edge in edges:
-            other_id = edge.to_id if edge.from_id == node_id else edge.from_id
-            direction = "outgoing" if edge.from_id == node_id else "incoming"
+            other_id = edge["to_id"] if edge["from_id"] == node_id else edge["from_id"]
+            direction = "outgoing" if edge["from_id"] == node_id else "incoming"
             if other_id not in neighbor_map:
                 neighbor_map[other_id] = {
                     "node": None,
                     "via_edge": {
-                        "id": edge.id,
-                        "type": edge.type,
+                        "id": edge["id"],
+                        "type": edge["type"],
                         "direction": direction,
-                        "strength": edge.strength,
+                        "strength": edge["strength"],
                     },
                 }
 
@@ -0,0 +1,217 @@
+"""Set-based traversal over graph_edges — one query per hop, not per node.
+
+`graph_service.get_subgraph` and `get_path` used to issue one Edge query
+for every node on the frontier, so a depth-3 walk around a well-linked
+contributor turned into hundreds of round trips. The walks here expand
+the whole frontier at once through an *expander*: a callable that takes
+a set of node ids and returns every edge touching any of them. The
+default expander is one `IN (...)` query per hop (chunked to stay under
+bind-parameter limits), which is portable across SQLite and Postgres.
+
+Every walk carries a `TraversalBudget` so a call against the live graph
+has bounded latency: once the node or edge budget is spent the walk
+stops and reports `truncated=True` instead of reading further.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+from sqlalchemy import or_
+
+from app.config_loader import get_int
+from app.models.graph import Edge
+
+# One frontier chunk binds each id twice (from_id IN, to_id IN). 400 keeps
+# a chunk well below SQLite's historical 999-parameter ceiling.
+_IN_CHUNK = 400
+
+# An expander returns edge dicts (Edge.to_dict() shape) touching any id in
+# the frontier, strongest first. `limit` caps how many it may return;
+# None means no cap.
+Expander = Callable[[set[str], "int | None"], list[dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class TraversalBudget:
+    """Upper bounds on what one walk may visit."""
+
+    max_nodes: int
+    max_edges: int
+
+
+def default_budget() -> TraversalBudget:
+    """Budget from config (graph.traversal_max_nodes / traversal_max_edges)."""
+    return TraversalBudget(
+        max_nodes=max(1, get_int("graph", "traversal_max_nodes", 2000)),
+        max_edges=max(1, get_int("graph", "traversal_max_edges", 5000)),
+    )
+
+
+def _chunks(ids: Iterable[str], size: int = _IN_CHUNK) -> Iterable[list[str]]:
+    ordered = sorted(ids)
+    for start in range(0, len(ordered), size):
+        yield ordered[start:start + size]
+
+
+def db_expander(s, edge_types: list[str] | None = None) -> Expander:
+    """Expander backed by one `IN (...)` Edge query per frontier chunk."""
+
+    def expand(frontier: set[str], limit: int | None) -> list[dict[str, Any]]:
+        out: list[dict[str, Any]] = []
+        seen: set[str] = set()
+        for chunk in _chunks(frontier):
+            q = s.query(Edge).filter(
+                or_(Edge.from_id.in_(chunk), Edge.to_id.in_(chunk))
+            )
+            if edge_types:
+                q = q.filter(Edge.type.in_(edge_types))
+            q = q.order_by(Edge.strength.desc(), Edge.id)
+            if limit is not None:
+                q = q.limit(max(0, limit - len(out)))
+            for edge in q.all():
+                # An edge joining two chunks comes back once per chunk.
+                if edge.id in seen:
+                    continue
+                seen.add(edge.id)
+                out.append(edge.to_dict())
+            if limit is not None and len(out) >= limit:
+                break
+        return out
+
+    return expand
+
+
+def expand_subgraph(
+    center_id: str,
+    depth: int,
+    expand: Expander,
+    budget: TraversalBudget,
+) -> dict[str, Any]:
+    """Breadth-first walk from center_id, one expander call per hop.
+
+    Returns {"node_ids", "edges", "truncated"}. Each edge appears once.
+    Edges whose far end would exceed the node budget are dropped, and the
+    walk stops as soon as the edge budget is spent.
+    """
+    nodes_seen: set[str] = {center_id}
+    node_order: list[str] = [center_id]
+    edges: list[dict[str, Any]] = []
+    edge_ids: set[str] = set()
+    frontier: set[str] = {center_id}
+    truncated = False
+
+    for _ in range(depth):
+        if not frontier:
+            break
+        remaining = budget.max_edges - len(edges)
+        if remaining <= 0:
+            truncated = True
+            break
+        # Edges back to the previous layer come back again; leave room for
+        # them, plus one so an over-budget hop is detectable.
+        batch = expand(frontier, remaining + len(edge_ids) + 1)
+        next_frontier: set[str] = set()
+        for edge in batch:
+            if edge["id"] in edge_ids:
+                continue
+            if len(edges) >= budget.max_edges:
+                truncated = True
+                break
+            new_ends = [
+                nid for nid in {edge["from_id"], edge["to_id"]} if nid not in nodes_seen
+            ]
+            if new_ends and len(nodes_seen) + len(new_ends) > budget.max_nodes:
+                truncated = True
+                continue
+            for nid in sorted(new_ends):
+                nodes_seen.add(nid)
+                node_order.append(nid)
+                next_frontier.add(nid)
+            edge_ids.add(edge["id"])
+            edges.append(edge)
+        if truncated:
+            break
+        frontier = next_frontier
+
+    return {"node_ids": node_order, "edges": edges, "truncated": truncated}
+
+
+def shortest_path(
+    from_id: str,
+    to_id: str,
+    max_depth: int,
+    expand: Expander,
+    budget: TraversalBudget,
+) -> list[dict[str, Any]] | None:
+    """Bidirectional BFS; returns the edge list from from_id to to_id or None.
+
+    Each round expands whichever side has the smaller frontier. The first
+    round in which the two visited sets touch yields a shortest path: no
+    node was shared before it, so no shorter path can exist. Returns None
+    when the sides don't meet within max_depth hops or the node budget
+    is spent first.
+    """
+    if from_id == to_id:
+        return []
+
+    # node -> (previous node, edge that reached it); roots map to None.
+    fwd: dict[str, tuple[str, dict[str, Any]] | None] = {from_id: None}
+    bwd: dict[str, tuple[str, dict[str, Any]] | None] = {to_id: None}
+    fwd_frontier: set[str] = {from_id}
+    bwd_frontier: set[str] = {to_id}
+    hops = 0
+
+    while hops < max_depth and fwd_frontier and bwd_frontier:
+        forward = len(fwd_frontier) <= len(bwd_frontier)
+        frontier = fwd_frontier if forward else bwd_frontier
+        parents, other = (fwd, bwd) if forward else (bwd, fwd)
+
+        next_frontier: set[str] = set()
+        meet: str | None = None
+        for edge in expand(frontier, None):
+            for here, there in (
+                (edge["from_id"], edge["to_id"]),
+                (edge["to_id"], edge["from_id"]),
+            ):
+                if here not in frontier or there in parents:
+                    continue
+                parents[there] = (here, edge)
+                next_frontier.add(there)
+                if meet is None and there in other:
+                    meet = there
+        hops += 1
+
+        if meet is not None:
+            return _stitch(meet, fwd, bwd)
+        if len(fwd) + len(bwd) > budget.max_nodes:
+            return None
+        if forward:
+            fwd_frontier = next_frontier
+        else:
+            bwd_frontier = next_frontier
+
+    return None
+
+
+def _stitch(
+    meet: str,
+    fwd: dict[str, tuple[str, dict[str, Any]] | None],
+    bwd: dict[str, tuple[str, dict[str, Any]] | None],
+) -> list[dict[str, Any]]:
+    head: list[dict[str, Any]] = []
+    node = meet
+    while fwd[node] is not None:
+        prev, edge = fwd[node]
+        head.append(edge)
+        node = prev
+    head.reverse()
+
+    tail: list[dict[str, Any]] = []
+    node = meet
+    while bwd[node] is not None:
+        nxt, edge = bwd[node]
+        tail.append(edge)
+        node = nxt
+    return head + tail
@@ -12,6 +12,11 @@ Key design decisions:
 - Domain is inferred from tags + interfaces; cross-domain pairs are surfaced
 - A resonance event log tracks discoveries so proof grows over time
 - Results are cached per-idea to keep p95 latency under 50ms at 500 ideas
+- Searches are two-stage: coherence_upper_bounds (band/frequency bucketing)
+  ranks and prunes candidate pairs, then exact CRK + OT-φ runs on the
+  shortlist until no remaining bound can enter the top results
+- scan_resonance(incremental=True) only scores pairs touching ideas created
+  or edited since the last scan, keeping the proof surfaces current
 """
 
 from __future__ import annotations
@@ -20,6 +25,7 @@ import logging
 import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from operator import attrgetter
 from typing import Optional
 
 from app.services.concept_resonance_kernel import (
@@ -27,6 +33,11 @@ from app.services.concept_resonance_kernel import (
     text_to_symbol,
     ResonanceResult,
 )
+from app.services.concept_resonance_vectorized import (
+    coherence_upper_bounds,
+    compare_concepts_batch,
+    numpy_available,
+)
 
 log = logging.getLogger(__name__)
 
@@ -47,11 +58,25 @@ _symbol_cache: dict[str, tuple[object, float]] = {}
 # Resonance event log: list of ResonanceEvent dicts (append-only)
 _resonance_events: list[dict] = []
 
-# Pair-level result cache: {(id_a, id_b): ResonancePair}
-_pair_cache: dict[tuple[str, str], "ResonancePair"] = {}
+# Pair-level result cache: {(id_a, id_b): ResonancePair}. None marks a
+# known miss: scored below threshold, or pruned by its stage-1 bound.
+_pair_cache: dict[tuple[str, str], Optional[ResonancePair]] = {}
 
 CACHE_TTL_SECONDS = 300  # 5 minutes
 
+# Text each idea's symbol was built from: {idea_id: text}. A different text
+# means the idea was edited and its cached symbol and pairs are stale.
+_idea_fingerprints: dict[str, str] = {}
+
+# Ideas created or edited since the last scan_resonance covered them
+_dirty_ideas: set[str] = set()
+
+# Shortlisted pairs are scored exactly in batches of this size
+EXACT_BATCH_SIZE = 64
+
+# Coherence is rounded to 6 places; bounds are compared with this slack
+_BOUND_SLACK = 1e-6
+
 
 # ── Data structures ──────────────────────────────────────────────────────────
 
@@ -73,6 +98,16 @@ class ResonancePair:
     discovered_at: str  # ISO 8601
 
 
+@dataclass
+class ResonanceScan:
+    """Outcome of one scan_resonance run."""
+    ideas_scanned: int
+    ideas_changed: int
+    pairs_scored: int
+    pairs_pruned: int
+    pairs: list[ResonancePair]
+
+
 @dataclass
 class ResonanceProof:
     """Evidence that structural resonance is working over time."""
@@ -120,17 +155,125 @@ def _get_or_build_symbol(idea_id: str, name: str, description: str,
     if cached and (now - cached[1]) < CACHE_TTL_SECONDS:
         return cached[0]
 
-    text = f"{name} {description} {' '.join(tags)} {' '.join(interfaces)}"
-    symbol = text_to_symbol(text)
+    symbol = text_to_symbol(_symbol_text(name, description, tags, interfaces))
     _symbol_cache[idea_id] = (symbol, now)
     return symbol
 
 
+def _symbol_text(name: str, description: str, tags: list[str], interfaces: list[str]) -> str:
+    return f"{name} {description} {' '.join(tags)} {' '.join(interfaces)}"
+
+
+def _idea_text(idea: dict) -> str:
+    return _symbol_text(
+        idea.get("name", ""),
+        idea.get("description", ""),
+        idea.get("tags", []),
+        idea.get("interfaces", []),
+    )
+
+
+def _idea_symbol(idea: dict) -> object:
+    return _get_or_build_symbol(
+        idea["id"],
+        idea.get("name", ""),
+        idea.get("description", ""),
+        idea.get("tags", []),
+        idea.get("interfaces", []),
+    )
+
+
 def _cache_key(id_a: str, id_b: str) -> tuple[str, str]:
     """Canonical pair key (sorted so (a,b) == (b,a))."""
     return (min(id_a, id_b), max(id_a, id_b))
 
 
+def _is_cross_domain(domain_a: list[str], domain_b: list[str]) -> bool:
+    set_a = set(domain_a)
+    set_b = set(domain_b)
+    return bool(set_a and set_b and not set_a.issubset(set_b) and not set_b.issubset(set_a))
+
+
+def _sync_ideas(ideas: list[dict]) -> None:
+    """Drop cached symbols and pairs of ideas whose text changed; mark new or edited ideas dirty."""
+    for idea in ideas:
+        idea_id = idea["id"]
+        text = _idea_text(idea)
+        previous = _idea_fingerprints.get(idea_id)
+        if previous == text:
+            continue
+        if previous is not None:
+            invalidate_idea_cache(idea_id)
+        _idea_fingerprints[idea_id] = text
+        _dirty_ideas.add(idea_id)
+
+
+def _pair_bounds(symbols: list, index_pairs: list[tuple[int, int]]) -> list[float]:
+    """Stage 1: coherence upper bound per (i, j); 1.0 everywhere without numpy."""
+    if not index_pairs or not numpy_available():
+        return [1.0] * len(index_pairs)
+    rows = sorted({i for i, _ in index_pairs})
+    cols = sorted({j for _, j in index_pairs})
+    row_at = {i: k for k, i in enumerate(rows)}
+    col_at = {j: k for k, j in enumerate(cols)}
+    matrix = coherence_upper_bounds([symbols[i] for i in rows], [symbols[j] for j in cols])
+    return [float(matrix[row_at[i], col_at[j]]) for i, j in index_pairs]
+
+
+def _top_pairs(
+    ideas: list[dict],
+    domains: list[list[str]],
+    candidates: list[tuple[int, int]],
+    limit: int,
+    floor: float,
+) -> list[ResonancePair]:
+    """Best `limit` candidate pairs by (cross_domain, coherence) with coherence >= floor.
+
+    Cached pairs are used as-is. Uncached ones are ranked by their stage-1
+    bound and scored exactly in that order; scoring stops once `limit`
+    results rank at or above the best remaining bound, so the answer is
+    the one a full scan would give.
+    """
+    found: list[ResonancePair] = []
+    pending: list[tuple[bool, float, int, int]] = []
+    uncached: list[tuple[int, int]] = []
+    for i, j in candidates:
+        key = _cache_key(ideas[i]["id"], ideas[j]["id"])
+        if key in _pair_cache:
+            pair = _pair_cache[key]
+            if pair is not None and pair.coherence >= floor:
+                found.append(pair)
+        else:
+            uncached.append((i, j))
+
+    symbols = [_idea_symbol(idea) for idea in ideas]
+    for (i, j), bound in zip(uncached, _pair_bounds(symbols, uncached)):
+        cross = _is_cross_domain(domains[i], domains[j])
+        threshold = CROSS_DOMAIN_MIN_COHERENCE if cross else MIN_COHERENCE
+        if bound + _BOUND_SLACK < threshold:
+            _pair_cache[_cache_key(ideas[i]["id"], ideas[j]["id"])] = None
+        elif bound + _BOUND_SLACK >= floor:
+            pending.append((cross, bound + _BOUND_SLACK, i, j))
+    pending.sort(reverse=True)
+
+    rank = attrgetter("cross_domain", "coherence")
+    batch_size = max(EXACT_BATCH_SIZE, limit)
+    pos = 0
+    while pos < len(pending):
+        if len(found) >= limit:
+            found.sort(key=rank, reverse=True)
+            if rank(found[limit - 1]) >= pending[pos][:2]:
+                break
+        batch = pending[pos:pos + batch_size]
+        pos += len(batch)
+        results = compare_concepts_batch([(symbols[i], symbols[j]) for _, _, i, j in batch])
+        for (_, _, i, j), result in zip(batch, results):
+            pair = _record_pair(ideas[i], ideas[j], result)
+            if pair is not None and pair.coherence >= floor:
+                found.append(pair)
+    return found
+
+
 # ── Core functions ────────────────────────────────────────────────────────────
 
 def compute_pair_resonance(
@@ -141,6 +284,7 @@ def compute_pair_resonance(
 
     Returns a ResonancePair if coherence exceeds the threshold, else None.
     """
+    _sync_ideas([idea_a, idea_b])
     id_a = idea_a["id"]
     id_b = idea_b["id"]
 
@@ -149,33 +293,24 @@ def compute_pair_resonance(
     if cached is not None:
         return cached
 
-    sym_a = _get_or_build_symbol(
-        id_a,
-        idea_a.get("name", ""),
-        idea_a.get("description", ""),
-        idea_a.get("tags", []),
-        idea_a.get("interfaces", []),
-    )
-    sym_b = _get_or_build_symbol(
-        id_b,
-        idea_b.get("name", ""),
-        idea_b.get("description", ""),
-        idea_b.get("tags", []),
-        idea_b.get("interfaces", []),
-    )
+    result: ResonanceResult = compare_concepts(_idea_symbol(idea_a), _idea_symbol(idea_b))
+    return _record_pair(idea_a, idea_b, result)
+
 
-    result: ResonanceResult = compare_concepts(sym_a, sym_b)
+def _record_pair(idea_a: dict, idea_b: dict, result: ResonanceResult) -> Optional[ResonancePair]:
+    """Cache a comparison result as a ResonancePair (or None below threshold) and log discoveries."""
+    id_a = idea_a["id"]
+    id_b = idea_b["id"]
+    key = _cache_key(id_a, id_b)
 
     domain_a = _infer_domains(idea_a.get("tags", []), idea_a.get("interfaces", []))
     domain_b = _infer_domains(idea_b.get("tags", []), idea_b.get("interfaces", []))
 
-    set_a = set(domain_a)
-    set_b = set(domain_b)
-    cross_domain = bool(set_a and set_b and not set_a.issubset(set_b) and not set_b.issubset(set_a))
+    cross_domain = _is_cross_domain(domain_a, domain_b)
 
     threshold = CROSS_DOMAIN_MIN_COHERENCE if cross_domain else MIN_COHERENCE
     if result.coherence < threshold:
-        _pair_cache[key] = None  # type: ignore[assignment]
+        _pair_cache[key] = None
         return None
 
     pair = ResonancePair(
@@ -230,23 +365,17 @@ def find_resonant_ideas(
     analogous problems.
     """
     source_id = source_idea["id"]
-    pairs: list[ResonancePair] = []
+    ideas = [source_idea] + [c for c in all_ideas if c["id"] != source_id]
+    _sync_ideas(ideas)
+    domains = [_infer_domains(idea.get("tags", []), idea.get("interfaces", [])) for idea in ideas]
 
     effective_min = max(min_coherence, CROSS_DOMAIN_MIN_COHERENCE if cross_domain_only else MIN_COHERENCE)
 
-    for candidate in all_ideas:
-        if candidate["id"] == source_id:
-            continue
-
-        pair = compute_pair_resonance(source_idea, candidate)
-        if pair is None:
-            continue
-        if pair.coherence < effective_min:
-            continue
-        if cross_domain_only and not pair.cross_domain:
-            continue
-
-        pairs.append(pair)
+    candidates = [
+        (0, j) for j in range(1, len(ideas))
+        if not cross_domain_only or _is_cross_domain(domains[0], domains[j])
+    ]
+    pairs = _top_pairs(ideas, domains, candidates, limit, effective_min)
 
     # Sort: cross-domain first, then by coherence descending
     pairs.sort(key=lambda p: (p.cross_domain, p.coherence), reverse=True)
@@ -260,24 +389,79 @@ def get_cross_domain_pairs(
 ) -> list[ResonancePair]:
     """Scan all idea pairs and return cross-domain resonances.
 
-    This is O(n²) but cached. For n=500 ideas with CRK at ~0.1ms/pair,
-    a full scan takes ~25s — only run on demand, never in hot paths.
+    Only cross-domain pairs are candidates. Stage 1 bounds every uncached
+    pair in one vectorized pass; exact CRK + OT-φ (compare_concepts_batch)
+    then runs in bound order until the top `limit` are settled, so a cold
+    500-idea portfolio costs a shortlist rather than ~125k comparisons.
     Cache results per-pair indefinitely (TTL via _pair_cache).
     """
-    cross_pairs: list[ResonancePair] = []
     effective_min = max(min_coherence, CROSS_DOMAIN_MIN_COHERENCE)
+    _sync_ideas(all_ideas)
+    domains = [_infer_domains(idea.get("tags", []), idea.get("interfaces", [])) for idea in all_ideas]
     n = len(all_ideas)
 
-    for i in range(n):
-        for j in range(i + 1, n):
-            pair = compute_pair_resonance(all_ideas[i], all_ideas[j])
-            if pair and pair.cross_domain and pair.coherence >= effective_min:
-                cross_pairs.append(pair)
+    candidates = [
+        (i, j) for i in range(n) for j in range(i + 1, n)
+        if _is_cross_domain(domains[i], domains[j])
+    ]
+    cross_pairs = _top_pairs(all_ideas, domains, candidates, limit, effective_min)
 
     cross_pairs.sort(key=lambda p: (p.strong, p.coherence), reverse=True)
     return cross_pairs[:limit]
 
 
+def scan_resonance(
+    all_ideas: list[dict],
+    min_coherence: float = 0.0,
+    limit: int = 500,
+    incremental: bool = True,
+) -> ResonanceScan:
+    """Score and log every resonant pair, feeding the event log and proof.
+
+    incremental=True only touches pairs involving ideas created or edited
+    since the last scan (pairs between unchanged ideas are already in
+    _pair_cache); incremental=False rescans every uncached pair. Pairs whose
+    stage-1 bound is under their threshold are cached as misses without
+    running the exact kernel.
+    """
+    _sync_ideas(all_ideas)
+    targets = {
+        i for i, idea in enumerate(all_ideas)
+        if not incremental or idea["id"] in _dirty_ideas
+    }
+    n = len(all_ideas)
+    uncached = [
+        (i, j) for i in range(n) for j in range(i + 1, n)
+        if (i in targets or j in targets)
+        and _cache_key(all_ideas[i]["id"], all_ideas[j]["id"]) not in _pair_cache
+    ]
+
+    symbols = [_idea_symbol(idea) for idea in all_ideas]
+    domains = [_infer_domains(idea.get("tags", []), idea.get("interfaces", [])) for idea in all_ideas]
+    shortlist: list[tuple[int, int]] = []
+    pruned = 0
+    for (i, j), bound in zip(uncached, _pair_bounds(symbols, uncached)):
+        threshold = CROSS_DOMAIN_MIN_COHERENCE if _is_cross_domain(domains[i], domains[j]) else MIN_COHERENCE
+        if bound + _BOUND_SLACK < threshold:
+            _pair_cache[_cache_key(all_ideas[i]["id"], all_ideas[j]["id"])] = None
+            pruned += 1
+        else:
+            shortlist.append((i, j))
+
+    results = compare_concepts_batch([(symbols[i], symbols[j]) for i, j in shortlist])
+    for (i, j), result in zip(shortlist, results):
+        _record_pair(all_ideas[i], all_ideas[j], result)
+    _dirty_ideas.difference_update(all_ideas[i]["id"] for i in targets)
+
+    return ResonanceScan(
+        ideas_scanned=n,
+        ideas_changed=len(targets),
+        pairs_scored=len(shortlist),
+        pairs_pruned=pruned,
+        pairs=get_cross_domain_pairs(all_ideas, limit=limit, min_coherence=min_coherence),
+    )
+
+
 def get_resonance_proof(all_ideas: list[dict]) -> ResonanceProof:
     """Summarize evidence that structural resonance is working.
 
@@ -335,11 +519,16 @@ def get_resonance_proof(all_ideas: list[dict]) -> ResonanceProof:
 
 
 def invalidate_idea_cache(idea_id: str) -> None:
-    """Remove cached symbol and all pairs involving this idea."""
+    """Remove cached symbol and all pairs involving this idea.
+
+    Misses go too, bound-pruned ones included: a pruned pair is only
+    skipped by later scans while its None entry stays in the cache.
+    """
     _symbol_cache.pop(idea_id, None)
-    to_remove = [k for k in _pair_cache if k[0] == idea_id or k[1] == idea_id]
+    _idea_fingerprints.pop(idea_id, None)
+    to_remove = [k for k in _pair_cache if idea_id in k]
     for k in to_remove:
-        _pair_cache.pop(k, None)
+        del _pair_cache[k]
 
 
 def get_event_log(limit: int = 50) -> list[dict]:
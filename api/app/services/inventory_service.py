@@ -4308,10 +4308,12 @@ def _iter_api_route_leaves(
 
 def _discover_api_endpoints_from_runtime() -> list[dict[str, Any]]:
     try:
+        from app.core import lazy_routers
         from app.main import app as main_app
     except Exception:
         return []
 
+    lazy_routers.load_all(main_app)
     grouped: dict[str, dict[str, Any]] = {}
     for path, route in _iter_api_route_leaves(main_app.routes):
         if not (path.startswith("/api") or path.startswith("/v1")):
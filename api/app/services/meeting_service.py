@@ -29,6 +29,7 @@ import uuid
 from sqlalchemy import func, select
 
 from app.models.graph import Edge, Node
+from app.services import graph_adjacency
 from app.services import unified_db as _udb
 
 
@@ -247,6 +248,8 @@ def _upsert_edge(
         Edge.type == edge_type,
     ).first()
     props = dict(properties or {})
+    # The caller commits; other readers see the new generation then.
+    graph_adjacency.bump_generation(s)
     if edge is None:
         edge = Edge(
             id=str(uuid.uuid4())[:12],
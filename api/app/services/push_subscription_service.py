@@ -69,7 +69,7 @@ def _session():
 
 
 def _ensure_schema() -> None:
-    _udb.engine()
+    _udb.ensure_schema()
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,284 @@
+"""Write-behind buffer in front of the asset_reads_daily counters.
+
+`record_read` used to read, bump and commit today's asset_reads_daily row
+inside the request path, one transaction per read. A popular asset turned
+every read into an UPDATE on the same hot row. Reads are now coalesced
+here per (asset, day): the read count and the per-concept counts add up
+in memory. A background flusher writes them as one batched upsert every
+read_tracking.buffer_flush_interval_ms.
+
+Loss bound: reaching read_tracking.buffer_max_pending increments wakes
+the flusher at once instead of waiting out the interval. While twice
+that many are held, further reads are dropped and counted, so a crash
+loses at most 2 x buffer_max_pending reads, or one flush interval's
+worth, whichever is smaller. Nothing on the request path writes to the
+database. `shutdown()` flushes what is left; main.py calls it when the
+app stops, and atexit does too. A failed flush puts its increments back
+as long as that stays within the bound; the rest are counted as dropped.
+
+Readers of asset_reads_daily call `wait_for_writes()` first: the flusher
+writes what this process buffered before the read, and the reader waits
+up to read_tracking.buffer_read_wait_ms for it (not at all on the event
+loop). Reads buffered by other workers are not covered. Archival calls
+`drain()`, which writes everything on the calling thread.
+read_tracking.write_behind=false writes every read synchronously through
+the same upsert. `stats()` reports the buffer depth, flushes and drops.
+The thread itself is a write_behind.WriteBehind.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from datetime import date
+from typing import Any
+
+from sqlalchemy import and_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from app.config_loader import get_bool, get_float, get_int
+from app.services.write_behind import WriteBehind
+
+logger = logging.getLogger(__name__)
+
+_UPSERT_CHUNK = 500
+
+
+class _Pending:
+    __slots__ = ("reads", "concepts")
+
+    def __init__(self) -> None:
+        self.reads = 0
+        self.concepts: dict[str, int] = {}
+
+    def add(self, reads: int, concepts: dict[str, int]) -> None:
+        self.reads += reads
+        for concept_id, n in concepts.items():
+            self.concepts[concept_id] = self.concepts.get(concept_id, 0) + n
+
+
+_Batch = dict[tuple[str, date], _Pending]
+
+_PENDING: _Batch = {}
+_STATE: dict[str, Any] = {"increments": 0, "url": None}
+_STATS: dict[str, Any] = {
+    "added": 0,
+    "flushed": 0,
+    "dropped": 0,
+    "failed_flushes": 0,
+    "batches": 0,
+    "early_flushes": 0,
+    "max_pending": 0,
+    "last_batch_rows": 0,
+    "last_flush_ms": 0.0,
+}
+
+
+def enabled() -> bool:
+    return get_bool("read_tracking", "write_behind", True)
+
+
+def _max_pending() -> int:
+    return max(1, get_int("read_tracking", "buffer_max_pending", 5000))
+
+
+def _flush_interval_seconds() -> float:
+    return max(0.01, get_float("read_tracking", "buffer_flush_interval_ms", 1000.0) / 1000.0)
+
+
+def _read_wait_seconds() -> float:
+    return max(0.0, get_float("read_tracking", "buffer_read_wait_ms", 500.0) / 1000.0)
+
+
+def _database_url() -> str:
+    from app.services.unified_db import database_url
+    return database_url()
+
+
+def _upsert_reads(s: Any, keys: list[tuple[str, date]], batch: _Batch) -> None:
+    """Create the day rows or add to their read counts, one atomic statement per chunk."""
+    from app.services.read_tracking_service import AssetReadDaily
+
+    table = AssetReadDaily.__table__
+    dialect = s.get_bind().dialect.name
+    if dialect not in ("postgresql", "sqlite"):
+        for key in keys:
+            row = s.get(AssetReadDaily, key, with_for_update=True)
+            if row is None:
+                s.add(AssetReadDaily(
+                    asset_id=key[0], day=key[1], read_count=batch[key].reads, cc_distributed=0, concepts="{}",
+                ))
+                s.flush()
+            else:
+                row.read_count = (row.read_count or 0) + batch[key].reads
+        return
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    for i in range(0, len(keys), _UPSERT_CHUNK):
+        stmt = insert(table).values([
+            {"asset_id": asset_id, "day": day, "read_count": batch[(asset_id, day)].reads,
+             "cc_distributed": 0, "concepts": "{}"}
+            for asset_id, day in keys[i:i + _UPSERT_CHUNK]
+        ])
+        s.execute(stmt.on_conflict_do_update(
+            index_elements=[table.c.asset_id, table.c.day],
+            set_={"read_count": table.c.read_count + stmt.excluded.read_count},
+        ))
+
+
+def _write(batch: _Batch) -> None:
+    """Upsert a coalesced batch into asset_reads_daily in one transaction."""
+    from app.services.read_tracking_service import AssetReadDaily
+    from app.services.unified_db import session
+
+    table = AssetReadDaily.__table__
+    keys = sorted(batch)
+    for attempt in range(2):
+        try:
+            with session() as s:
+                _upsert_reads(s, keys, batch)
+                # The upsert above holds these rows until commit, so this
+                # read-merge-write cannot interleave with another writer's.
+                for asset_id, day in keys:
+                    pending = batch[(asset_id, day)]
+                    if not pending.concepts:
+                        continue
+                    where = and_(table.c.asset_id == asset_id, table.c.day == day)
+                    concepts = json.loads(s.execute(select(table.c.concepts).where(where)).scalar() or "{}")
+                    for concept_id, n in pending.concepts.items():
+                        concepts[concept_id] = concepts.get(concept_id, 0) + n
+                    s.execute(update(table).where(where).values(concepts=json.dumps(concepts)))
+                s.commit()
+            return
+        except IntegrityError:
+            if attempt:
+                raise
+            # Only the fallback path for other dialects gets here: another
+            # worker created one of the rows first; its row is visible
+            # now, so the second pass updates it.
+
+
+def add(asset_id: str, day: date, concept_id: str | None = None) -> None:
+    """Count one read of asset_id on day, optionally tagged with a concept."""
+    concepts = {concept_id: 1} if concept_id else {}
+    if not enabled():
+        single = _Pending()
+        single.add(1, concepts)
+        _write({(asset_id, day): single})
+        return
+    url = _database_url()
+    with _COND:
+        if _STATE["url"] != url and _PENDING:
+            # The database changed under us (tests, reconfiguration);
+            # the old increments have nowhere to go.
+            _STATS["dropped"] += _STATE["increments"]
+            _PENDING.clear()
+            _STATE["increments"] = 0
+        _STATE["url"] = url
+        if _STATE["increments"] >= 2 * _max_pending():
+            _STATS["dropped"] += 1
+            return
+        pending = _PENDING.get((asset_id, day))
+        if pending is None:
+            pending = _PENDING[(asset_id, day)] = _Pending()
+        pending.add(1, concepts)
+        _STATE["increments"] += 1
+        _STATS["added"] += 1
+        _STATS["max_pending"] = max(_STATS["max_pending"], _STATE["increments"])
+        full = _STATE["increments"] == _max_pending()
+        if full:
+            _STATS["early_flushes"] += 1
+    if full:
+        _WRITER.wake()
+    else:
+        _WRITER.ensure_started()
+
+
+def _take() -> tuple[_Batch, int, str | None]:
+    with _COND:
+        batch = dict(_PENDING)
+        increments = _STATE["increments"]
+        _PENDING.clear()
+        _STATE["increments"] = 0
+        return batch, increments, _STATE["url"]
+
+
+def _restore(batch: _Batch, increments: int) -> None:
+    with _COND:
+        if _STATE["increments"] + increments > _max_pending():
+            _STATS["dropped"] += increments
+            logger.warning("read_counter_buffer: dropping %d read increments after failed flush", increments)
+            return
+        for key, pending in batch.items():
+            current = _PENDING.get(key)
+            if current is None:
+                _PENDING[key] = pending
+            else:
+                current.add(pending.reads, pending.concepts)
+        _STATE["increments"] += increments
+
+
+def _flush_batch() -> int:
+    """Write the buffered increments; the number written."""
+    batch, increments, url = _take()
+    if not batch:
+        return 0
+    if url != _database_url():
+        with _COND:
+            _STATS["dropped"] += increments
+        return 0
+    started = time.perf_counter()
+    try:
+        _write(batch)
+    except Exception:
+        logger.warning("read_counter_buffer: flush of %d rows failed", len(batch), exc_info=True)
+        with _COND:
+            _STATS["failed_flushes"] += 1
+        _restore(batch, increments)
+        return 0
+    with _COND:
+        _STATS["batches"] += 1
+        _STATS["flushed"] += increments
+        _STATS["last_batch_rows"] = len(batch)
+        _STATS["last_flush_ms"] = round((time.perf_counter() - started) * 1000.0, 3)
+    return increments
+
+
+_WRITER = WriteBehind(
+    "read-counter-flusher",
+    _flush_batch,
+    pending=lambda: bool(_PENDING),
+    interval=_flush_interval_seconds,
+)
+_COND = _WRITER.cond
+
+
+def drain() -> int:
+    """Flush everything buffered so far on the calling thread.
+
+    Returns the number of read increments written.
+    """
+    return _WRITER.drain()
+
+
+def wait_for_writes() -> bool:
+    """Let the flusher write what this process buffered so far; False if it didn't in time."""
+    return _WRITER.wait_for_writes(_read_wait_seconds())
+
+
+def shutdown(timeout: float = 5.0) -> None:
+    """Stop the flusher after it has written everything still buffered."""
+    _WRITER.shutdown(timeout)
+
+
+def stats() -> dict[str, Any]:
+    with _COND:
+        payload = dict(_STATS)
+        payload["pending_rows"] = len(_PENDING)
+        payload["pending_increments"] = _STATE["increments"]
+    payload["capacity"] = _max_pending()
+    payload["flush_interval_ms"] = round(_flush_interval_seconds() * 1000.0, 1)
+    payload["enabled"] = enabled()
+    payload["flusher_alive"] = _WRITER.alive
+    return payload
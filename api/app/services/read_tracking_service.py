@@ -48,6 +48,8 @@ from uuid import uuid4
 from sqlalchemy import Boolean, Column, Date, DateTime, Integer, Numeric, String, Text, func
 from sqlalchemy.orm import mapped_column
 
+from app.config_loader import get_bool
+
 log = logging.getLogger(__name__)
 
 _ready = False
@@ -57,9 +59,9 @@ def _ensure_ready() -> None:
     global _ready
     if _ready:
         return
-    _ready = True
     from app.services.unified_db import ensure_schema
     ensure_schema()
+    _ready = True
 
 
 def _session():
@@ -67,11 +69,23 @@ def _session():
     return session()
 
 
+def _database_url() -> str:
+    from app.services.unified_db import database_url
+    return database_url()
+
+
+def _use_rollups() -> bool:
+    """Trending and view stats read view_rollups unless switched back to
+    the exact raw-table queries with read_tracking.rollups=false."""
+    return get_bool("read_tracking", "rollups", True)
+
+
 # ---------------------------------------------------------------------------
 # ORM Models
 # ---------------------------------------------------------------------------
 
 from app.services.unified_db import Base
+from app.services import read_counter_buffer, view_rollups
 
 
 class AssetReadDaily(Base):
@@ -189,7 +203,8 @@ def record_read(
 
     1. Legacy DB-backed counter shape: ``record_read(asset_id, concept_id,
        contributor_id)`` — increments today's per-asset row in the
-       ``asset_reads_daily`` table. Used by middleware and the views router.
+       ``asset_reads_daily`` table (through the read_counter_buffer
+       write-behind). Used by middleware and the views router.
 
     2. Story-protocol R5 event shape: ``record_read(asset_id,
        reader_id=..., read_type='free'|'paid', payment_token=...,
@@ -201,7 +216,6 @@ def record_read(
     populates the event log. ``cc_amount`` defaults to ``base_cc`` for paid
     reads and 0 for free reads.
     """
-    import json
 
     # Effective reader is reader_id with contributor_id as fallback.
     effective_reader = reader_id or contributor_id
@@ -278,28 +292,12 @@ def record_read(
 
     # DB-backed daily counter — best-effort, swallowed exceptions keep the
     # read path non-blocking even when the DB layer isn't ready (e.g. in
-    # pure-logic unit tests that don't spin up unified_db).
+    # pure-logic unit tests that don't spin up unified_db). The increment
+    # is coalesced in read_counter_buffer and upserted in batches.
     today = date.today()
     try:
         _ensure_ready()
-        with _session() as s:
-            row = s.query(AssetReadDaily).filter_by(asset_id=asset_id, day=today).first()
-            if row:
-                row.read_count = (row.read_count or 0) + 1
-                if concept_id:
-                    concepts = json.loads(row.concepts or "{}")
-                    concepts[concept_id] = concepts.get(concept_id, 0) + 1
-                    row.concepts = json.dumps(concepts)
-            else:
-                concepts = {concept_id: 1} if concept_id else {}
-                s.add(AssetReadDaily(
-                    asset_id=asset_id,
-                    day=today,
-                    read_count=1,
-                    cc_distributed=0,
-                    concepts=json.dumps(concepts),
-                ))
-            s.commit()
+        read_counter_buffer.add(asset_id, today, concept_id)
     except Exception as e:
         log.debug("read_tracking: DB counter skipped for %s: %s", asset_id, e)
 
@@ -318,9 +316,14 @@ def record_view(
     source_page: str | None = None,
     referrer_contributor_id: str | None = None,
 ) -> str | None:
-    """Record a single view event. Returns the event ID, or None on failure."""
+    """Record a single view event. Returns the event ID, or None on failure.
+
+    The view is folded into its hour and day rollup rows in the same
+    transaction, so trending and stats never see one without the other.
+    """
     _ensure_ready()
     event_id = str(uuid4())
+    created_at = datetime.now(timezone.utc)
     try:
         with _session() as s:
             s.add(AssetViewEvent(
@@ -331,7 +334,9 @@ def record_view(
                 session_fingerprint=session_fingerprint,
                 source_page=source_page,
                 referrer_contributor_id=referrer_contributor_id,
+                created_at=created_at,
             ))
+            view_rollups.fold_views(s, [(asset_id, contributor_id, referrer_contributor_id, created_at)])
             s.commit()
         return event_id
     except Exception as e:
@@ -339,11 +344,36 @@ def record_view(
         return None
 
 
+def _top_referrers(referrer_counts: Mapping[str, int]) -> list[dict[str, Any]]:
+    return sorted(
+        [{"contributor_id": k, "referral_count": v} for k, v in referrer_counts.items()],
+        key=lambda x: x["referral_count"],
+        reverse=True,
+    )[:10]
+
+
 def get_asset_view_stats(asset_id: str, days: int = 30) -> dict[str, Any]:
-    """View stats for an asset: totals, uniques, daily breakdown, top referrers."""
+    """View stats for an asset: totals, uniques, daily breakdown, top referrers.
+
+    Served from view_rollups; unique_contributors is a sketch estimate
+    there and an exact COUNT(DISTINCT) in the raw fallback.
+    """
     _ensure_ready()
     since = datetime.now(timezone.utc) - timedelta(days=days)
 
+    if _use_rollups():
+        with _session() as s:
+            totals = view_rollups.asset_totals(s, _database_url(), [asset_id], since)[asset_id]
+        return {
+            "asset_id": asset_id,
+            "days": days,
+            "total_views": totals.view_count,
+            "unique_contributors": totals.sketch.estimate(),
+            "anonymous_views": totals.anonymous_count,
+            "daily_breakdown": dict(sorted(totals.daily.items())),
+            "top_referrers": _top_referrers(totals.referrers),
+        }
+
     with _session() as s:
         base = s.query(AssetViewEvent).filter(
             AssetViewEvent.asset_id == asset_id,
@@ -385,11 +415,7 @@ def get_asset_view_stats(asset_id: str, days: int = 30) -> dict[str, Any]:
         for row in rows:
             if row.referrer_contributor_id:
                 referrer_counts[row.referrer_contributor_id] += 1
-        top_referrers = sorted(
-            [{"contributor_id": k, "referral_count": v} for k, v in referrer_counts.items()],
-            key=lambda x: x["referral_count"],
-            reverse=True,
-        )[:10]
+        top_referrers = _top_referrers(referrer_counts)
 
     return {
         "asset_id": asset_id,
@@ -492,10 +518,34 @@ def get_contributor_trail(
 
 
 def get_trending(limit: int = 20, days: int = 7) -> list[dict[str, Any]]:
-    """Assets ranked by view velocity (views per day over the period)."""
+    """Assets ranked by view velocity (views per day over the period).
+
+    Ranks on rollup view counts, then merges viewer sketches only for
+    the assets that made the cut.
+    """
     _ensure_ready()
     since = datetime.now(timezone.utc) - timedelta(days=days)
 
+    if _use_rollups():
+        url = _database_url()
+        with _session() as s:
+            counts = view_rollups.view_counts(s, url, since)
+            ranked = sorted(
+                ((aid, n) for aid, n in counts.items() if n > 0),
+                key=lambda item: (-item[1], item[0]),
+            )[:limit]
+            totals = view_rollups.asset_totals(s, url, [aid for aid, _ in ranked], since)
+        return [
+            {
+                "asset_id": aid,
+                "view_count": totals[aid].view_count,
+                "unique_viewers": totals[aid].sketch.estimate(),
+                "velocity": round(totals[aid].view_count / max(days, 1), 2),
+                "days": days,
+            }
+            for aid, _ in ranked
+        ]
+
     with _session() as s:
         results = (
             s.query(
@@ -554,6 +604,7 @@ def get_discovery_chain(asset_id: str) -> list[dict[str, Any]]:
 def get_daily_reads(asset_id: str, day: date) -> dict[str, Any] | None:
     """Get daily read data for an asset."""
     _ensure_ready()
+    read_counter_buffer.wait_for_writes()
     with _session() as s:
         row = s.query(AssetReadDaily).filter_by(asset_id=asset_id, day=day).first()
         return row.to_dict() if row else None
@@ -562,6 +613,7 @@ def get_daily_reads(asset_id: str, day: date) -> dict[str, Any] | None:
 def get_reads_range(asset_id: str, from_date: date, to_date: date) -> list[dict[str, Any]]:
     """Get read data for a date range."""
     _ensure_ready()
+    read_counter_buffer.wait_for_writes()
     with _session() as s:
         rows = (
             s.query(AssetReadDaily)
@@ -577,6 +629,7 @@ def get_reads_range(asset_id: str, from_date: date, to_date: date) -> list[dict[
 def get_all_reads_for_date(day: date) -> list[dict[str, Any]]:
     """Get all asset reads for a specific date (for daily hash computation)."""
     _ensure_ready()
+    read_counter_buffer.wait_for_writes()
     with _session() as s:
         rows = s.query(AssetReadDaily).filter_by(day=day).all()
         return [r.to_dict() for r in rows]
@@ -595,6 +648,7 @@ RETENTION_DAYS = 90
 def get_table_stats() -> dict[str, Any]:
     """Get read sensing table stats for monitoring."""
     _ensure_ready()
+    read_counter_buffer.wait_for_writes()
     with _session() as s:
         total_rows = s.query(AssetReadDaily).count()
         from sqlalchemy import func
@@ -622,6 +676,7 @@ def archive_old_reads(before_date: date | None = None) -> dict[str, Any]:
     """
     import json
     _ensure_ready()
+    read_counter_buffer.drain()
     if before_date is None:
         before_date = date.today() - __import__("datetime").timedelta(days=RETENTION_DAYS)
 
@@ -657,6 +712,7 @@ def archive_old_reads(before_date: date | None = None) -> dict[str, Any]:
 def delete_archived_reads(before_date: date) -> int:
     """Delete reads older than the given date. Only call after confirming archive upload."""
     _ensure_ready()
+    read_counter_buffer.drain()
     with _session() as s:
         count = s.query(AssetReadDaily).filter(AssetReadDaily.day < before_date).delete()
         s.commit()
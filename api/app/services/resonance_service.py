@@ -29,7 +29,7 @@ from __future__ import annotations
 import re
 from typing import Any
 
-from app.services import graph_service
+from app.services import concept_keyword_index, graph_service
 from app.services.news_resonance_service import extract_keywords
 
 
@@ -114,22 +114,6 @@ def _presence_keywords(node: dict[str, Any]) -> set[str]:
     return extract_keywords(text)
 
 
-def _concept_keywords(node: dict[str, Any]) -> set[str]:
-    """The words that describe what this concept holds.
-
-    Concepts have a rich ``story_content`` (the KB markdown body) in
-    their description field, plus the concept name itself. Both feed
-    the spectrum.
-    """
-    text_parts: list[str] = [
-        str(node.get("name") or ""),
-        str(node.get("description") or ""),
-        str(node.get("story_content") or ""),
-    ]
-    text = " ".join(p for p in text_parts if p)
-    return extract_keywords(text)
-
-
 def compute_resonance(presence_id: str) -> list[dict[str, Any]]:
     """Return the ranked list of concepts this presence resonates with.
 
@@ -147,18 +131,14 @@ def compute_resonance(presence_id: str) -> list[dict[str, Any]]:
     if not p_kw:
         return []
 
-    concepts = graph_service.list_nodes(type="concept", limit=500).get("items", [])
+    # Generic tokens never reach the concept side of the overlap: the
+    # query set has none, so postings on the raw concept keywords count
+    # exactly the shared meaningful tokens. A single shared word — even a
+    # non-generic one — is almost always a coincidental English
+    # collision; real resonance shows up as multiple aligned tokens.
+    matches = concept_keyword_index.overlaps(p_kw, MIN_MEANINGFUL_OVERLAP)
     scored: list[dict[str, Any]] = []
-    for concept in concepts:
-        c_kw = _concept_keywords(concept) - GENERIC_TOKENS
-        if not c_kw:
-            continue
-        shared = p_kw & c_kw
-        if len(shared) < MIN_MEANINGFUL_OVERLAP:
-            # A single shared word — even a non-generic one — is almost
-            # always a coincidental English collision. Real resonance
-            # shows up as multiple aligned tokens.
-            continue
+    for concept, shared in matches:
         # How much of the presence's spectrum echoes inside the concept.
         # Normalizing by the presence (not the concept) means a concept
         # with a long story_content doesn't drown out real signal — and
@@ -169,8 +149,8 @@ def compute_resonance(presence_id: str) -> list[dict[str, Any]]:
         if score < RESONANCE_MIN_SCORE:
             continue
         scored.append({
-            "concept_id": concept["id"],
-            "concept_name": concept.get("name") or concept["id"],
+            "concept_id": concept.id,
+            "concept_name": concept.name,
             "score": score,
             "shared_tokens": sorted(shared)[:12],
         })
@@ -204,23 +184,15 @@ def resolve_query(query: str, limit: int = 12) -> dict[str, Any]:
 
     # Score concepts
     concepts_scored: list[dict[str, Any]] = []
-    for c in graph_service.list_nodes(type="concept", limit=500).get("items", []):
-        c_kw = _concept_keywords(c)
-        if not c_kw:
-            continue
-        shared = keywords & c_kw
-        if len(shared) < 2:
-            continue
+    for c, shared in concept_keyword_index.overlaps(keywords, MIN_MEANINGFUL_OVERLAP):
         # Normalise by query-keyword count so we ask "how much of the
         # query's frequency this concept carries" — matches the intuition.
         score = round(len(shared) / max(len(keywords), 1), 3)
         concepts_scored.append({
-            "id": c["id"],
-            "name": c.get("name") or c["id"],
+            "id": c.id,
+            "name": c.name,
             "type": "concept",
-            "hz": (c.get("sacred_frequency") or {}).get("hz")
-                  if isinstance(c.get("sacred_frequency"), dict)
-                  else c.get("sacred_frequency"),
+            "hz": c.hz,
             "score": score,
             "shared_tokens": sorted(shared)[:12],
         })
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -11,6 +12,11 @@ from app.config_loader import get_str
 
 logger = logging.getLogger(__name__)
 
+# Parsed registry keyed by registry_signature(); the file is re-read only
+# when its path, size or mtime changes.
+_REGISTRY_CACHE: dict = {"signature": None, "base": None}
+_REGISTRY_CACHE_LOCK = threading.Lock()
+
 
 def _default_registry() -> dict:
     return {
@@ -44,18 +50,41 @@ def _registry_path() -> Path:
     return repo_level
 
 
-def get_canonical_routes() -> dict:
+def registry_signature() -> tuple:
+    """(path, size, mtime_ns) of the registry file; changes whenever it does.
+
+    Callers that compile the registry (runtime route matching) key their
+    compiled form on this instead of re-reading the file.
+    """
     path = _registry_path()
+    try:
+        stat = path.stat()
+    except OSError:
+        return (str(path), None, None)
+    return (str(path), int(stat.st_size), int(stat.st_mtime_ns))
+
+
+def _load_base(path: Path) -> dict:
     if not path.exists():
-        base = _default_registry()
-    else:
-        try:
-            with path.open(encoding="utf-8") as f:
-                data = json.load(f)
-            base = data if isinstance(data, dict) else _default_registry()
-        except (OSError, json.JSONDecodeError):
-            logger.warning("Route registry load failed, using defaults", exc_info=True)
-            base = _default_registry()
+        return _default_registry()
+    try:
+        with path.open(encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else _default_registry()
+    except (OSError, json.JSONDecodeError):
+        logger.warning("Route registry load failed, using defaults", exc_info=True)
+        return _default_registry()
+
+
+def get_canonical_routes() -> dict:
+    signature = registry_signature()
+    with _REGISTRY_CACHE_LOCK:
+        if _REGISTRY_CACHE["signature"] == signature:
+            base = _REGISTRY_CACHE["base"]
+        else:
+            base = _load_base(Path(signature[0]))
+            _REGISTRY_CACHE["signature"] = signature
+            _REGISTRY_CACHE["base"] = base
 
     return {
         "generated_at": datetime.now(timezone.utc).isoformat(),
@@ -1,51 +0,0 @@
-"""Idea resolution for runtime telemetry."""
-
-from __future__ import annotations
-
-from app.services import idea_lineage_service, value_lineage_service
-
-from app.services.runtime.routes import match_canonical_route, normalize_endpoint
-from app.services.runtime.store import load_idea_map
-
-
-def resolve_origin_idea_id(idea_id: str | None) -> str:
-    return idea_lineage_service.resolve_origin_idea_id(idea_id)
-
-
-def resolve_idea_id(
-    endpoint: str,
-    explicit_idea_id: str | None = None,
-    method: str | None = None,
-) -> str:
-    if explicit_idea_id:
-        return explicit_idea_id
-
-    canonical = match_canonical_route(endpoint, method=method)
-    if isinstance(canonical, dict):
-        canonical_idea_id = str(canonical.get("idea_id") or "").strip()
-        if canonical_idea_id:
-            return canonical_idea_id
-
-    normalized_endpoint = normalize_endpoint(endpoint, method=method)
-    map_data = load_idea_map()
-    prefix_map = map_data.get("prefix_map") if isinstance(map_data.get("prefix_map"), dict) else {}
-    for prefix, idea_id in prefix_map.items():
-        if isinstance(prefix, str) and isinstance(idea_id, str) and normalized_endpoint.startswith(prefix):
-            return idea_id
-
-    marker = "/api/value-lineage/links/"
-    if marker in endpoint:
-        tail = endpoint.split(marker, 1)[1]
-        lineage_id = tail.split("/", 1)[0]
-        link = value_lineage_service.get_link(lineage_id)
-        if link:
-            return link.idea_id
-
-    if normalized_endpoint.startswith("/api"):
-        return "oss-interface-alignment"
-    if normalized_endpoint.startswith("/v1"):
-        return "portfolio-governance"
-    if normalized_endpoint.startswith("/"):
-        return "oss-interface-alignment"
-
-    return "unmapped"
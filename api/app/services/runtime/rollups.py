@@ -0,0 +1,396 @@
+"""Per-minute and per-hour rollups of runtime events.
+
+Endpoint, idea and attention summaries used to re-aggregate up to 2000
+raw events per call, which on a busy instance covers minutes rather than
+the requested window. Every recorded event is now also folded into two
+rollup rows — one for its minute, one for its hour — keyed by
+(endpoint, method, source, idea, status, paid) and carrying the weighted
+event count, runtime, runtime cost and paid-tool cost.
+
+A window read takes hour rows for the whole hours inside it and minute
+rows for the ragged edges, so it is exact to the minute while minute
+rows are retained (runtime.rollup_minute_retention_hours, default 48)
+and to the hour beyond that, up to runtime.rollup_hour_retention_days
+(default 31).
+
+With the runtime database the rows live in runtime_event_rollups and are
+written in the same transaction as the event; a freshly created table is
+backfilled from runtime_events once. File-backed deployments keep the
+rows in process memory, built from the event log on first read.
+
+File mode is single-worker: after that first read a process only folds
+in the events it records itself, so with several workers each one's
+summaries miss the others' later events. Run more than one worker only
+with the runtime database.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable
+
+from app.config_loader import get_float
+from app.models.runtime import RuntimeEvent
+from app.services import runtime_event_store
+
+GRANULARITIES: dict[str, int] = {"minute": 60, "hour": 3600}
+_PRUNE_INTERVAL_SECONDS = 600.0
+
+
+@dataclass(frozen=True)
+class RollupKey:
+    endpoint: str
+    method: str
+    source: str
+    idea_id: str
+    status_code: int
+    paid: bool
+
+
+@dataclass
+class RollupMeasures:
+    event_count: int = 0
+    runtime_ms: float = 0.0
+    runtime_cost: float = 0.0
+    paid_cost: float = 0.0
+
+    def copy(self) -> "RollupMeasures":
+        return RollupMeasures(self.event_count, self.runtime_ms, self.runtime_cost, self.paid_cost)
+
+    def add(self, other: "RollupMeasures") -> None:
+        self.event_count += other.event_count
+        self.runtime_ms += other.runtime_ms
+        self.runtime_cost += other.runtime_cost
+        self.paid_cost += other.paid_cost
+
+
+EventLoader = Callable[[datetime, datetime], Iterable[RuntimeEvent]]
+
+
+# ---------------------------------------------------------------------------
+# Folding one event
+# ---------------------------------------------------------------------------
+
+
+def event_count_weight(event: RuntimeEvent) -> int:
+    metadata = event.metadata if isinstance(event.metadata, dict) else {}
+    raw_count = metadata.get("event_count") or metadata.get("sample_count") or 1
+    try:
+        return max(1, int(raw_count))
+    except (TypeError, ValueError):
+        return 1
+
+
+def event_total_runtime_ms(event: RuntimeEvent) -> float:
+    metadata = event.metadata if isinstance(event.metadata, dict) else {}
+    raw_total = metadata.get("total_runtime_ms")
+    if raw_total is not None:
+        try:
+            return max(0.0, float(raw_total))
+        except (TypeError, ValueError):
+            pass
+    return float(event.runtime_ms or 0.0) * event_count_weight(event)
+
+
+def event_total_runtime_cost(event: RuntimeEvent) -> float:
+    metadata = event.metadata if isinstance(event.metadata, dict) else {}
+    raw_total = metadata.get("total_runtime_cost_estimate")
+    if raw_total is not None:
+        try:
+            return max(0.0, float(raw_total))
+        except (TypeError, ValueError):
+            pass
+    return float(event.runtime_cost_estimate or 0.0) * event_count_weight(event)
+
+
+def _paid_runtime_cost(event: RuntimeEvent, weight: int) -> float:
+    metadata = event.metadata if isinstance(event.metadata, dict) else {}
+    raw_runtime_cost = metadata.get("runtime_cost_usd")
+    if raw_runtime_cost is not None:
+        try:
+            return float(raw_runtime_cost) * weight
+        except (TypeError, ValueError):
+            pass
+    return event_total_runtime_cost(event)
+
+
+def fold(event: RuntimeEvent) -> tuple[RollupKey, RollupMeasures]:
+    metadata = event.metadata if isinstance(event.metadata, dict) else {}
+    weight = event_count_weight(event)
+    paid = bool(metadata.get("is_paid_provider"))
+    key = RollupKey(
+        endpoint=str(event.endpoint),
+        method=str(event.method or "").upper(),
+        source=str(event.source),
+        idea_id=str(event.idea_id or "unmapped"),
+        status_code=int(event.status_code),
+        paid=paid,
+    )
+    measures = RollupMeasures(
+        event_count=weight,
+        runtime_ms=event_total_runtime_ms(event),
+        runtime_cost=event_total_runtime_cost(event),
+        paid_cost=_paid_runtime_cost(event, weight) if paid else 0.0,
+    )
+    return key, measures
+
+
+def _epoch(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _floor(ts: float, step: int) -> int:
+    return int(ts // step) * step
+
+
+def bucket_rows(event: RuntimeEvent) -> list[dict[str, Any]]:
+    """The minute and hour rows one event adds, as store column dicts."""
+    key, measures = fold(event)
+    ts = _epoch(event.recorded_at)
+    return [
+        _row(granularity, _floor(ts, step), key, measures)
+        for granularity, step in GRANULARITIES.items()
+    ]
+
+
+def _row(granularity: str, bucket_start: int, key: RollupKey, measures: RollupMeasures) -> dict[str, Any]:
+    return {
+        "granularity": granularity,
+        "bucket_start": bucket_start,
+        "endpoint": key.endpoint,
+        "method": key.method,
+        "source": key.source,
+        "idea_id": key.idea_id,
+        "status_code": key.status_code,
+        "paid": 1 if key.paid else 0,
+        "event_count": measures.event_count,
+        "runtime_ms": measures.runtime_ms,
+        "runtime_cost": measures.runtime_cost,
+        "paid_cost": measures.paid_cost,
+    }
+
+
+def _from_row(row: dict[str, Any]) -> tuple[RollupKey, RollupMeasures]:
+    return (
+        RollupKey(
+            endpoint=str(row["endpoint"]),
+            method=str(row["method"]),
+            source=str(row["source"]),
+            idea_id=str(row["idea_id"]),
+            status_code=int(row["status_code"]),
+            paid=bool(row["paid"]),
+        ),
+        RollupMeasures(
+            event_count=int(row["event_count"]),
+            runtime_ms=float(row["runtime_ms"]),
+            runtime_cost=float(row["runtime_cost"]),
+            paid_cost=float(row["paid_cost"]),
+        ),
+    )
+
+
+def aggregate(pairs: Iterable[tuple[RollupKey, RollupMeasures]]) -> dict[RollupKey, RollupMeasures]:
+    out: dict[RollupKey, RollupMeasures] = {}
+    for key, measures in pairs:
+        total = out.get(key)
+        if total is None:
+            out[key] = measures.copy()
+        else:
+            total.add(measures)
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Window planning and retention
+# ---------------------------------------------------------------------------
+
+
+def _minute_retention_seconds() -> float:
+    return max(2.0, get_float("runtime", "rollup_minute_retention_hours", 48.0)) * 3600.0
+
+
+def _hour_retention_seconds() -> float:
+    return max(1.0, get_float("runtime", "rollup_hour_retention_days", 31.0)) * 86400.0
+
+
+def plan_window(since_ts: float, now_ts: float) -> list[tuple[str, int, int]]:
+    """Half-open (granularity, start, end) ranges that tile [since, now]."""
+    start = _floor(since_ts, 60)
+    end = _floor(now_ts, 60) + 60
+    hour_hi = _floor(now_ts, 3600)
+    if start < now_ts - _minute_retention_seconds():
+        hour_lo = _floor(start, 3600)
+        start = hour_lo
+    else:
+        hour_lo = -(-start // 3600) * 3600
+    if hour_lo >= hour_hi:
+        return [("minute", start, end)]
+    ranges: list[tuple[str, int, int]] = []
+    if start < hour_lo:
+        ranges.append(("minute", start, hour_lo))
+    ranges.append(("hour", hour_lo, hour_hi))
+    ranges.append(("minute", hour_hi, end))
+    return ranges
+
+
+def _retention_cutoffs(now_ts: float) -> dict[str, int]:
+    return {
+        "minute": _floor(now_ts - _minute_retention_seconds(), 60),
+        "hour": _floor(now_ts - _hour_retention_seconds(), 3600),
+    }
+
+
+# ---------------------------------------------------------------------------
+# In-process rollups for file-backed deployments
+# ---------------------------------------------------------------------------
+
+
+class MemoryRollups:
+    """granularity -> bucket_start -> key -> measures, for this process's events.
+
+    Built once from the shared log, then fed only by record_file_event in
+    this process — see the single-worker note at the top of the module.
+    """
+
+    def __init__(self) -> None:
+        self.buckets: dict[str, dict[int, dict[RollupKey, RollupMeasures]]] = {
+            granularity: {} for granularity in GRANULARITIES
+        }
+
+    def add_event(self, event: RuntimeEvent) -> None:
+        key, measures = fold(event)
+        ts = _epoch(event.recorded_at)
+        for granularity, step in GRANULARITIES.items():
+            bucket = self.buckets[granularity].setdefault(_floor(ts, step), {})
+            total = bucket.get(key)
+            if total is None:
+                bucket[key] = measures.copy()
+            else:
+                total.add(measures)
+
+    def read(self, ranges: list[tuple[str, int, int]]) -> list[tuple[RollupKey, RollupMeasures]]:
+        out: list[tuple[RollupKey, RollupMeasures]] = []
+        for granularity, start, end in ranges:
+            for bucket_start, bucket in self.buckets[granularity].items():
+                if start <= bucket_start < end:
+                    out.extend(bucket.items())
+        return out
+
+    def prune(self, cutoffs: dict[str, int]) -> None:
+        for granularity, cutoff in cutoffs.items():
+            stale = [start for start in self.buckets[granularity] if start < cutoff]
+            for start in stale:
+                del self.buckets[granularity][start]
+
+
+_LOCK = threading.RLock()
+_BACKFILL_LOCK = threading.Lock()
+_MEMORY: dict[str, Any] = {"store_key": None, "rollups": None, "pruned_at": 0.0}
+_DB_PRUNED_AT: dict[str, float] = {"at": 0.0}
+
+
+def record_file_event(store_key: str, event: RuntimeEvent, append: Callable[[], None]) -> None:
+    """Persist one file-mode event and fold it into the built rollups.
+
+    Both happen under the rollup lock so a concurrent first build cannot
+    see the event in the log and then count it again here.
+    """
+    with _LOCK:
+        append()
+        if _MEMORY["store_key"] == store_key and _MEMORY["rollups"] is not None:
+            _MEMORY["rollups"].add_event(event)
+
+
+def _memory_rollups(store_key: str, load_events: EventLoader, now_ts: float) -> MemoryRollups:
+    rollups: MemoryRollups | None = _MEMORY["rollups"]
+    if _MEMORY["store_key"] == store_key and rollups is not None:
+        if now_ts - float(_MEMORY["pruned_at"]) >= _PRUNE_INTERVAL_SECONDS:
+            rollups.prune(_retention_cutoffs(now_ts))
+            _MEMORY["pruned_at"] = now_ts
+        return rollups
+    rollups = MemoryRollups()
+    now = datetime.fromtimestamp(now_ts, tz=timezone.utc)
+    since = datetime.fromtimestamp(now_ts - _hour_retention_seconds(), tz=timezone.utc)
+    for event in load_events(since, now):
+        rollups.add_event(event)
+    _MEMORY.update({"store_key": store_key, "rollups": rollups, "pruned_at": now_ts})
+    return rollups
+
+
+def reset() -> None:
+    with _LOCK:
+        _MEMORY.update({"store_key": None, "rollups": None, "pruned_at": 0.0})
+        _DB_PRUNED_AT["at"] = 0.0
+
+
+# ---------------------------------------------------------------------------
+# Reads
+# ---------------------------------------------------------------------------
+
+
+def _backfill_db(load_events: EventLoader) -> None:
+    """Fold pre-rollup events into a freshly created table, once.
+
+    The marker is cleared only after the rows commit, so a failed load or
+    write is retried by the next read instead of leaving the hours before
+    the table existed empty.
+    """
+    if runtime_event_store.pending_rollup_backfill() is None:
+        return
+    with _BACKFILL_LOCK:
+        until = runtime_event_store.pending_rollup_backfill()
+        if until is None:
+            return
+        _backfill_db_until(load_events, until)
+
+
+def _backfill_db_until(load_events: EventLoader, until: datetime) -> None:
+    since = datetime.fromtimestamp(_epoch(until) - _hour_retention_seconds(), tz=timezone.utc)
+    merged: dict[tuple[str, int, RollupKey], RollupMeasures] = {}
+    for event in load_events(since, until):
+        key, measures = fold(event)
+        ts = _epoch(event.recorded_at)
+        for granularity, step in GRANULARITIES.items():
+            slot = (granularity, _floor(ts, step), key)
+            total = merged.get(slot)
+            if total is None:
+                merged[slot] = measures.copy()
+            else:
+                total.add(measures)
+    written = runtime_event_store.write_rollups(
+        _row(granularity, bucket_start, key, measures)
+        for (granularity, bucket_start, key), measures in merged.items()
+    )
+    if written:
+        runtime_event_store.finish_rollup_backfill(until)
+
+
+def window(
+    since: datetime,
+    *,
+    store_key: str,
+    load_events: EventLoader,
+    source: str | None = None,
+    now: datetime | None = None,
+) -> dict[RollupKey, RollupMeasures]:
+    """Aggregated rollups for every event recorded in [since, now]."""
+    now_ts = _epoch(now) if now is not None else time.time()
+    ranges = plan_window(_epoch(since), now_ts)
+    source_value = str(source or "").strip().lower() or None
+    if runtime_event_store.enabled():
+        _backfill_db(load_events)
+        if now_ts - _DB_PRUNED_AT["at"] >= _PRUNE_INTERVAL_SECONDS:
+            _DB_PRUNED_AT["at"] = now_ts
+            runtime_event_store.prune_rollups(_retention_cutoffs(now_ts))
+        pairs = [_from_row(row) for row in runtime_event_store.list_rollups(ranges, source=source_value)]
+    else:
+        with _LOCK:
+            pairs = _memory_rollups(store_key, load_events, now_ts).read(ranges)
+        if source_value:
+            pairs = [(key, measures) for key, measures in pairs if key.source.lower() == source_value]
+    return aggregate(pairs)
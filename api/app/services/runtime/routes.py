@@ -1,9 +1,19 @@
-"""Route matching and endpoint normalization for runtime telemetry."""
+"""Route matching and endpoint normalization for runtime telemetry.
+
+Every recorded event and every listed row is normalized against the
+canonical route registry, so matching is compiled once per registry
+version: exact templates go into a dict, and the templated ones fold
+into a single alternation regex per request method whose branches keep
+registry order (the first template that matches wins, as before). The
+runtime idea map compiles the same way into a longest-prefix table.
+"""
 
 from __future__ import annotations
 
 import re
-from typing import Any
+import threading
+from pathlib import Path
+from typing import Any, Callable
 
 from app.services import route_registry_service
 
@@ -42,25 +52,124 @@ def method_allowed(route: dict, method: str | None) -> bool:
     }
 
 
+def _route_methods(route: dict) -> frozenset[str] | None:
+    methods = route.get("methods")
+    if not isinstance(methods, list) or not methods:
+        return None
+    return frozenset(m.strip().upper() for m in methods if isinstance(m, str) and m.strip())
+
+
+class CompiledRoutes:
+    """Canonical API routes compiled for per-event matching."""
+
+    def __init__(self, routes: list[dict]) -> None:
+        self._exact: dict[str, list[tuple[dict, frozenset[str] | None]]] = {}
+        self._templated: list[tuple[dict, frozenset[str] | None, str]] = []
+        for row in routes:
+            template = str(row.get("path") or "").strip()
+            methods = _route_methods(row)
+            self._exact.setdefault(template, []).append((row, methods))
+            if "{" in template and "}" in template:
+                body = template_regex(template)[1:-1]  # strip ^ and $
+                self._templated.append((row, methods, body))
+        self._by_method: dict[str | None, tuple[re.Pattern[str] | None, list[dict]]] = {}
+
+    @staticmethod
+    def _allows(methods: frozenset[str] | None, method: str | None) -> bool:
+        return method is None or methods is None or method in methods
+
+    def _pattern_for(self, method: str | None) -> tuple[re.Pattern[str] | None, list[dict]]:
+        compiled = self._by_method.get(method)
+        if compiled is None:
+            rows: list[dict] = []
+            branches: list[str] = []
+            for row, methods, body in self._templated:
+                if self._allows(methods, method):
+                    branches.append(f"(?P<r{len(rows)}>{body})")
+                    rows.append(row)
+            pattern = re.compile("|".join(branches)) if branches else None
+            compiled = (pattern, rows)
+            self._by_method[method] = compiled
+        return compiled
+
+    def match(self, path: str, method: str | None = None) -> dict | None:
+        key = method.strip().upper() if method else None
+        for row, methods in self._exact.get(path, ()):
+            if self._allows(methods, key):
+                return row
+        pattern, rows = self._pattern_for(key)
+        if pattern is None:
+            return None
+        found = pattern.fullmatch(path)
+        if found is None:
+            return None
+        return rows[int(found.lastgroup[1:])]
+
+
+_COMPILED_LOCK = threading.Lock()
+_COMPILED: dict[str, Any] = {"signature": None, "routes": None}
+
+
+def compiled_routes() -> CompiledRoutes:
+    """The registry's compiled matcher, rebuilt only when the registry changes."""
+    signature = route_registry_service.registry_signature()
+    with _COMPILED_LOCK:
+        if _COMPILED["signature"] != signature or _COMPILED["routes"] is None:
+            _COMPILED["routes"] = CompiledRoutes(canonical_api_routes())
+            _COMPILED["signature"] = signature
+        return _COMPILED["routes"]
+
+
 def match_canonical_route(endpoint: str, method: str | None = None) -> dict | None:
-    path = normalize_path(endpoint)
-    routes = canonical_api_routes()
-
-    for row in routes:
-        template = str(row.get("path") or "").strip()
-        if template == path and method_allowed(row, method):
-            return row
-
-    for row in routes:
-        template = str(row.get("path") or "").strip()
-        if "{" not in template or "}" not in template:
-            continue
-        if not method_allowed(row, method):
-            continue
-        if re.match(template_regex(template), path):
-            return row
-
-    return None
+    return compiled_routes().match(normalize_path(endpoint), method)
+
+
+class PrefixTable:
+    """Longest-prefix lookup over a {prefix: idea_id} map.
+
+    One dict probe per distinct prefix length, longest first, instead of
+    a startswith() scan over every entry.
+    """
+
+    def __init__(self, prefix_map: dict) -> None:
+        self._ideas = {
+            prefix: idea_id
+            for prefix, idea_id in prefix_map.items()
+            if isinstance(prefix, str) and isinstance(idea_id, str)
+        }
+        self._lengths = sorted({len(prefix) for prefix in self._ideas}, reverse=True)
+
+    def lookup(self, path: str) -> str | None:
+        for length in self._lengths:
+            if length <= len(path):
+                idea_id = self._ideas.get(path[:length])
+                if idea_id is not None:
+                    return idea_id
+        return None
+
+
+_PREFIX_LOCK = threading.Lock()
+_PREFIX_TABLES: dict[str, tuple[tuple, PrefixTable]] = {}
+
+
+def idea_prefix_table(path: Path, load: Callable[[], dict]) -> PrefixTable:
+    """Compiled prefix table for the idea map at `path`, cached on its mtime."""
+    try:
+        stat = path.stat()
+        signature: tuple = (int(stat.st_size), int(stat.st_mtime_ns))
+    except OSError:
+        signature = (None, None)
+    key = str(path)
+    with _PREFIX_LOCK:
+        cached = _PREFIX_TABLES.get(key)
+        if cached is not None and cached[0] == signature and signature[0] is not None:
+            return cached[1]
+    map_data = load()
+    prefix_map = map_data.get("prefix_map") if isinstance(map_data.get("prefix_map"), dict) else {}
+    table = PrefixTable(prefix_map)
+    with _PREFIX_LOCK:
+        _PREFIX_TABLES[key] = (signature, table)
+    return table
 
 
 def normalize_endpoint(endpoint: str, method: str | None = None) -> str:
@@ -0,0 +1,568 @@
+"""Append-only segmented log for file-backed runtime events.
+
+When no runtime database is configured, events used to live in one JSON
+document that every `record_event` read, appended to and rewrote under
+a global lock — O(total events) per request. This log keeps them as
+JSON lines in a directory of segments beside the configured events path:
+
+    runtime_events.json          legacy document, imported once
+    runtime_events.segments/
+        seg-00000001.jsonl       sealed
+        seg-00000002.jsonl       active
+        index.json               offset index of scanned segments
+
+- `append` writes one line to the active segment. The lock is held only
+  for that write, so appends are constant time.
+- The active segment rotates once it reaches
+  runtime.event_log_segment_max_bytes or has been open for
+  runtime.event_log_segment_max_seconds.
+- index.json keeps, per segment, the scanned size, the recorded_at range
+  and a sparse block index (byte offset + newest recorded_at for every
+  _BLOCK_LINES lines). `read` skips whole segments and blocks older than
+  `since`. An entry is trusted only up to its scanned size; bytes
+  appended later (by this or another process) are scanned incrementally.
+- `compact` drops sealed segments older than
+  runtime.event_log_retention_days (0 keeps everything) and merges runs
+  of small sealed segments up to the segment size. It runs in the
+  background after every rotation.
+
+Several worker processes can share one directory, and each keeps its
+own active segment. A writer holds a shared flock on its active segment
+for as long as it has it open. Compaction holds an exclusive flock on
+compact.lock and takes a non-blocking exclusive flock on every segment
+it drops or merges. A segment some writer still holds is skipped and
+ends the current merge run. Without fcntl (Windows) the locks are
+no-ops, and only one writer process per directory is supported.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from app.config_loader import get_float, get_int
+
+if sys.platform == "win32":
+    fcntl = None
+else:
+    import fcntl
+
+logger = logging.getLogger(__name__)
+
+_BLOCK_LINES = 256
+_SEGMENT_PREFIX = "seg-"
+_SEGMENT_SUFFIX = ".jsonl"
+_INDEX_NAME = "index.json"
+_COMPACT_LOCK_NAME = "compact.lock"
+
+_LOCK = threading.RLock()
+_COMPACT_LOCK = threading.Lock()
+_ACTIVE: dict[str, Any] = {"dir": None, "seq": 0, "handle": None, "opened_at": 0.0}
+_INDEX: dict[str, Any] = {"dir": None, "entries": {}, "dirty": False}
+
+
+def _segment_max_bytes() -> int:
+    return max(4096, get_int("runtime", "event_log_segment_max_bytes", 8 * 1024 * 1024))
+
+
+def _segment_max_seconds() -> float:
+    return max(0.0, get_float("runtime", "event_log_segment_max_seconds", 3600.0))
+
+
+def _retention_days() -> float:
+    return max(0.0, get_float("runtime", "event_log_retention_days", 0.0))
+
+
+def segments_dir(events_path: Path) -> Path:
+    return events_path.with_name(f"{events_path.stem}.segments")
+
+
+def _segment_path(directory: Path, seq: int) -> Path:
+    return directory / f"{_SEGMENT_PREFIX}{seq:08d}{_SEGMENT_SUFFIX}"
+
+
+def _segment_seq(path: Path) -> int:
+    try:
+        return int(path.name[len(_SEGMENT_PREFIX):-len(_SEGMENT_SUFFIX)])
+    except ValueError:
+        return -1
+
+
+def _list_segments(directory: Path) -> list[Path]:
+    if not directory.is_dir():
+        return []
+    rows = [
+        path
+        for path in directory.glob(f"{_SEGMENT_PREFIX}*{_SEGMENT_SUFFIX}")
+        if _segment_seq(path) >= 0
+    ]
+    rows.sort(key=_segment_seq)
+    return rows
+
+
+def _timestamp(raw: Any) -> float | None:
+    if isinstance(raw, datetime):
+        value = raw
+    elif isinstance(raw, str) and raw:
+        try:
+            value = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    else:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _line_timestamp(line: bytes) -> tuple[dict | None, float | None]:
+    try:
+        row = json.loads(line)
+    except (ValueError, UnicodeDecodeError):
+        return None, None
+    if not isinstance(row, dict):
+        return None, None
+    return row, _timestamp(row.get("recorded_at"))
+
+
+# ---------------------------------------------------------------------------
+# Cross-process segment locks
+# ---------------------------------------------------------------------------
+
+
+def _lock_shared(handle: BinaryIO) -> None:
+    """Block until no compaction holds ``handle``'s segment, then pin it."""
+    if fcntl is not None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_SH)
+
+
+def _try_lock_exclusive(handle: BinaryIO) -> bool:
+    """True when no writer (in any process) has the segment open."""
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def _same_file(handle: BinaryIO, path: Path) -> bool:
+    try:
+        return os.path.samestat(os.fstat(handle.fileno()), path.stat())
+    except OSError:
+        return False
+
+
+def _claim_sealed(stack: ExitStack, path: Path) -> bool:
+    """Exclusively lock a sealed segment for the rest of ``stack``.
+
+    False when the file is gone, was replaced, or a writer still holds it.
+    """
+    try:
+        handle = stack.enter_context(path.open("rb"))
+    except OSError:
+        return False
+    return _try_lock_exclusive(handle) and _same_file(handle, path)
+
+
+# ---------------------------------------------------------------------------
+# Offset index
+# ---------------------------------------------------------------------------
+
+
+def _empty_entry() -> dict[str, Any]:
+    return {"size": 0, "count": 0, "min_ts": None, "max_ts": None, "blocks": [], "tail_lines": 0}
+
+
+def _scan(path: Path, prior: dict[str, Any] | None) -> dict[str, Any]:
+    """Extend `prior` with every complete line past its scanned size."""
+    entry = dict(prior) if prior else _empty_entry()
+    entry["blocks"] = [list(block) for block in entry.get("blocks", [])]
+    with path.open("rb") as handle:
+        handle.seek(int(entry["size"]))
+        offset = int(entry["size"])
+        for line in handle:
+            if not line.endswith(b"\n"):
+                break  # a writer is mid-line; pick it up on the next scan
+            _, ts = _line_timestamp(line)
+            if entry["tail_lines"] == 0 or entry["tail_lines"] >= _BLOCK_LINES:
+                entry["blocks"].append([offset, ts])
+                entry["tail_lines"] = 0
+            entry["tail_lines"] += 1
+            entry["count"] += 1
+            if ts is not None:
+                block = entry["blocks"][-1]
+                block[1] = ts if block[1] is None else max(block[1], ts)
+                entry["min_ts"] = ts if entry["min_ts"] is None else min(entry["min_ts"], ts)
+                entry["max_ts"] = ts if entry["max_ts"] is None else max(entry["max_ts"], ts)
+            offset += len(line)
+    entry["size"] = offset
+    return entry
+
+
+def _load_index(directory: Path) -> None:
+    if _INDEX["dir"] == directory:
+        return
+    entries: dict[str, Any] = {}
+    try:
+        raw = json.loads((directory / _INDEX_NAME).read_text(encoding="utf-8"))
+        if isinstance(raw, dict) and isinstance(raw.get("segments"), dict):
+            entries = raw["segments"]
+    except (OSError, ValueError):
+        pass
+    _INDEX.update({"dir": directory, "entries": entries, "dirty": False})
+
+
+def _save_index(directory: Path) -> None:
+    if _INDEX["dir"] != directory or not _INDEX["dirty"]:
+        return
+    target = directory / _INDEX_NAME
+    tmp = target.with_suffix(f".tmp{os.getpid()}")
+    try:
+        tmp.write_text(json.dumps({"segments": _INDEX["entries"]}), encoding="utf-8")
+        os.replace(tmp, target)
+        _INDEX["dirty"] = False
+    except OSError:
+        logger.warning("runtime_event_log: could not write %s", target, exc_info=True)
+
+
+def _entry(path: Path) -> dict[str, Any]:
+    """Index entry for one segment, scanning only bytes not yet indexed."""
+    entries = _INDEX["entries"]
+    prior = entries.get(path.name)
+    try:
+        size = path.stat().st_size
+    except OSError:
+        entries.pop(path.name, None)
+        return _empty_entry()
+    if prior is not None and int(prior.get("size", -1)) == size:
+        return prior
+    if prior is not None and int(prior.get("size", 0)) > size:
+        prior = None  # rewritten underneath us
+    entry = _scan(path, prior)
+    entries[path.name] = entry
+    _INDEX["dirty"] = True
+    return entry
+
+
+def _drop_entry(path: Path) -> None:
+    if _INDEX["entries"].pop(path.name, None) is not None:
+        _INDEX["dirty"] = True
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+
+def _import_legacy(events_path: Path, directory: Path) -> None:
+    """Seed the first segment from the legacy single-document store."""
+    if _list_segments(directory) or not events_path.is_file():
+        return
+    try:
+        data = json.loads(events_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return
+    events = data.get("events") if isinstance(data, dict) else None
+    if not isinstance(events, list) or not events:
+        return
+    rows = [row for row in events if isinstance(row, dict)]
+    rows.sort(key=lambda row: _timestamp(row.get("recorded_at")) or 0.0)
+    directory.mkdir(parents=True, exist_ok=True)
+    with _segment_path(directory, 1).open("ab") as handle:
+        for row in rows:
+            handle.write(_encode(row))
+    logger.info("runtime_event_log: imported %d legacy events from %s", len(rows), events_path)
+
+
+def _encode(event: dict[str, Any]) -> bytes:
+    return (json.dumps(event, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+
+def _close_active() -> None:
+    handle: BinaryIO | None = _ACTIVE["handle"]
+    if handle is not None:
+        try:
+            handle.close()
+        except OSError:
+            pass
+    _ACTIVE.update({"dir": None, "seq": 0, "handle": None, "opened_at": 0.0})
+
+
+def _open_segment(directory: Path, seq: int) -> None:
+    path = _segment_path(directory, seq)
+    while True:
+        handle = path.open("ab")
+        _lock_shared(handle)
+        # Compaction may have merged or dropped the file between open and
+        # lock; appending to that inode would lose the events.
+        if _same_file(handle, path):
+            break
+        handle.close()
+    opened_at = time.time()
+    try:
+        with path.open("rb") as existing:
+            _, ts = _line_timestamp(existing.readline())
+            if ts is not None:
+                opened_at = ts
+    except OSError:
+        pass
+    _ACTIVE.update({
+        "dir": directory,
+        "seq": seq,
+        "handle": handle,
+        "opened_at": opened_at,
+    })
+
+
+def _active_handle(events_path: Path) -> BinaryIO:
+    directory = segments_dir(events_path)
+    if _ACTIVE["dir"] != directory or _ACTIVE["handle"] is None:
+        _close_active()
+        directory.mkdir(parents=True, exist_ok=True)
+        _import_legacy(events_path, directory)
+        segments = _list_segments(directory)
+        _open_segment(directory, _segment_seq(segments[-1]) if segments else 1)
+    return _ACTIVE["handle"]
+
+
+def _should_rotate(handle: BinaryIO) -> bool:
+    if handle.tell() >= _segment_max_bytes():
+        return True
+    max_seconds = _segment_max_seconds()
+    return max_seconds > 0 and time.time() - float(_ACTIVE["opened_at"]) >= max_seconds
+
+
+def _rotate() -> None:
+    directory: Path = _ACTIVE["dir"]
+    segments = _list_segments(directory)
+    last = _segment_seq(segments[-1]) if segments else int(_ACTIVE["seq"])
+    _close_active()
+    _open_segment(directory, max(last, 0) + 1)
+    threading.Thread(
+        target=_compact_quietly, args=(directory,), name="runtime-event-log-compact", daemon=True
+    ).start()
+
+
+def append(events_path: Path, event: dict[str, Any]) -> None:
+    """Append one event to the active segment."""
+    line = _encode(event)
+    with _LOCK:
+        handle = _active_handle(events_path)
+        handle.write(line)
+        handle.flush()
+        if _should_rotate(handle):
+            _rotate()
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+
+def _read_segment(path: Path, entry: dict[str, Any], since_ts: float | None) -> list[tuple[float, dict]]:
+    start = 0
+    if since_ts is not None:
+        start = int(entry["size"])
+        for offset, block_max in entry.get("blocks", []):
+            if block_max is None or block_max >= since_ts:
+                start = int(offset)
+                break
+    rows: list[tuple[float, dict]] = []
+    try:
+        with path.open("rb") as handle:
+            handle.seek(start)
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    break
+                row, ts = _line_timestamp(line)
+                if row is None:
+                    continue
+                if since_ts is not None and (ts is None or ts < since_ts):
+                    continue
+                rows.append((ts if ts is not None else 0.0, row))
+    except OSError:
+        return []  # removed by compaction after we listed it
+    return rows
+
+
+def read(
+    events_path: Path,
+    *,
+    since: datetime | None = None,
+    limit: int | None = None,
+) -> list[dict[str, Any]]:
+    """Events recorded at or after `since`, oldest first.
+
+    With `limit`, the result is guaranteed to contain the `limit` newest
+    matching events (it may contain more); segments that cannot reach
+    into that window are never opened.
+    """
+    directory = segments_dir(events_path)
+    since_ts = _timestamp(since) if since is not None else None
+    with _LOCK:
+        if not _list_segments(directory):
+            _import_legacy(events_path, directory)
+        _load_index(directory)
+        indexed = [(path, _entry(path)) for path in _list_segments(directory)]
+        _save_index(directory)
+
+    collected: list[tuple[float, dict]] = []
+    for path, entry in reversed(indexed):
+        max_ts = entry.get("max_ts")
+        if since_ts is not None and max_ts is not None and max_ts < since_ts:
+            continue
+        if limit is not None and len(collected) >= limit and max_ts is not None:
+            floor = heapq.nlargest(limit, (ts for ts, _ in collected))[-1]
+            if max_ts < floor:
+                continue
+        collected.extend(_read_segment(path, entry, since_ts))
+
+    seen: set[str] = set()
+    out: list[dict[str, Any]] = []
+    for _, row in sorted(collected, key=lambda item: item[0]):
+        event_id = row.get("id")
+        if isinstance(event_id, str):
+            # A merge between listing and reading can surface a row twice.
+            if event_id in seen:
+                continue
+            seen.add(event_id)
+        out.append(row)
+    return out
+
+
+def signature(events_path: Path) -> dict[str, Any]:
+    """Cheap change signature: segment count plus the newest segment's stat."""
+    segments = _list_segments(segments_dir(events_path))
+    if not segments:
+        return {"exists": False, "segments": 0, "size": 0, "mtime_ns": 0}
+    try:
+        stat = segments[-1].stat()
+    except OSError:
+        return {"exists": False, "segments": len(segments), "size": 0, "mtime_ns": 0}
+    return {
+        "exists": True,
+        "segments": len(segments),
+        "active": segments[-1].name,
+        "size": int(stat.st_size),
+        "mtime_ns": int(stat.st_mtime_ns),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Compaction
+# ---------------------------------------------------------------------------
+
+
+def _compact_quietly(directory: Path) -> None:
+    try:
+        compact_dir(directory)
+    except Exception:
+        logger.warning("runtime_event_log: compaction failed for %s", directory, exc_info=True)
+
+
+def compact(events_path: Path, *, now: float | None = None) -> dict[str, int]:
+    return compact_dir(segments_dir(events_path), now=now)
+
+
+def compact_dir(directory: Path, *, now: float | None = None) -> dict[str, int]:
+    """Drop expired sealed segments and merge runs of small ones.
+
+    Only sealed segments are touched: the newest one is always skipped,
+    and so is any segment whose writer, here or in another process,
+    still holds its shared lock.
+    """
+    stats = {"dropped": 0, "merged": 0}
+    if not directory.is_dir():
+        return stats
+    with _COMPACT_LOCK, ExitStack() as stack:
+        guard = stack.enter_context((directory / _COMPACT_LOCK_NAME).open("ab"))
+        if fcntl is not None:
+            fcntl.flock(guard.fileno(), fcntl.LOCK_EX)
+        with _LOCK:
+            _load_index(directory)
+            candidates = [(path, _entry(path)) for path in _list_segments(directory)[:-1]]
+        # None marks a segment still being written; merge runs stop there.
+        sealed: list[tuple[Path, dict[str, Any]] | None] = [
+            (path, entry) if _claim_sealed(stack, path) else None
+            for path, entry in candidates
+        ]
+
+        retention = _retention_days()
+        if retention > 0:
+            cutoff = (now if now is not None else time.time()) - retention * 86400.0
+            kept: list[tuple[Path, dict[str, Any]] | None] = []
+            for item in sealed:
+                if item is None:
+                    kept.append(None)
+                    continue
+                path, entry = item
+                max_ts = entry.get("max_ts")
+                if max_ts is not None and max_ts < cutoff:
+                    with _LOCK:
+                        path.unlink(missing_ok=True)
+                        _drop_entry(path)
+                    stats["dropped"] += 1
+                else:
+                    kept.append(item)
+            sealed = kept
+
+        max_bytes = _segment_max_bytes()
+        runs: list[list[Path]] = []
+        run: list[Path] = []
+        run_bytes = 0
+        for item in sealed:
+            if item is None:
+                if len(run) > 1:
+                    runs.append(run)
+                run, run_bytes = [], 0
+                continue
+            path, entry = item
+            size = int(entry.get("size", 0))
+            if run and run_bytes + size <= max_bytes:
+                run.append(path)
+                run_bytes += size
+                continue
+            if len(run) > 1:
+                runs.append(run)
+            run, run_bytes = [path], size
+        if len(run) > 1:
+            runs.append(run)
+
+        for run in runs:
+            head = run[0]
+            tmp = head.with_suffix(f".merge{os.getpid()}")
+            with tmp.open("wb") as out:
+                for path in run:
+                    with path.open("rb") as src:
+                        for line in src:
+                            if line.endswith(b"\n"):
+                                out.write(line)
+            with _LOCK:
+                os.replace(tmp, head)
+                _drop_entry(head)
+                for path in run[1:]:
+                    path.unlink(missing_ok=True)
+                    _drop_entry(path)
+            stats["merged"] += len(run) - 1
+
+        with _LOCK:
+            _save_index(directory)
+    return stats
+
+
+def reset() -> None:
+    """Close the active segment and forget cached index state."""
+    with _LOCK:
+        _close_active()
+        _INDEX.update({"dir": None, "entries": {}, "dirty": False})
@@ -0,0 +1,181 @@
+"""Bounded in-process queue in front of the runtime event database.
+
+`record_event` used to open a session and commit one row per call, so
+under load every request paid for its own telemetry transaction. With
+the runtime database enabled, events are now queued here and a single
+background flusher writes them with `runtime_event_store.write_events`
+(one bulk INSERT plus merged rollup upserts per batch) whenever
+runtime.ingest_batch_size events are waiting or
+runtime.ingest_flush_interval_ms has passed.
+
+When the queue fills up:
+
+- past runtime.ingest_sample_watermark of capacity, only one event in
+  runtime.ingest_sample_rate is kept, and it carries the weight of the
+  ones skipped (metadata event_count / total_runtime_ms /
+  total_runtime_cost_estimate, which every summary already honours);
+- at capacity, a caller on a worker thread waits up to
+  runtime.ingest_block_timeout_ms for room (backpressure) and the event
+  is dropped after that. On the event loop thread it is dropped at once.
+
+Readers call `wait_for_writes()` before querying the store: the flusher
+writes what this process queued before the read, and the reader waits up
+to runtime.ingest_read_wait_ms for it without writing anything itself
+(not at all on the event loop). Events queued by other workers are not
+covered. `drain()` writes everything on the calling thread; `shutdown()`
+drains and stops the flusher, and main.py calls it when the app stops.
+`stats()` reports depth, drops and sampling. The thread itself is a
+write_behind.WriteBehind.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Any
+
+from app.config_loader import get_bool, get_float, get_int
+from app.models.runtime import RuntimeEvent
+from app.services import runtime_event_store
+from app.services.runtime import rollups as runtime_rollups
+from app.services.write_behind import WriteBehind, on_event_loop
+
+_QUEUE: deque[RuntimeEvent] = deque()
+_STATE: dict[str, Any] = {"sample_tick": 0}
+_STATS: dict[str, Any] = {
+    "enqueued": 0,
+    "written": 0,
+    "dropped": 0,
+    "sampled_out": 0,
+    "failed": 0,
+    "batches": 0,
+    "max_depth": 0,
+    "last_batch_size": 0,
+    "last_flush_ms": 0.0,
+}
+
+
+def enabled() -> bool:
+    return get_bool("runtime", "ingest_queue_enabled", True)
+
+
+def _capacity() -> int:
+    return max(1, get_int("runtime", "ingest_queue_max", 10000))
+
+
+def _batch_size() -> int:
+    return max(1, get_int("runtime", "ingest_batch_size", 200))
+
+
+def _flush_interval_seconds() -> float:
+    return max(0.01, get_float("runtime", "ingest_flush_interval_ms", 250.0) / 1000.0)
+
+
+def _read_wait_seconds() -> float:
+    return max(0.0, get_float("runtime", "ingest_read_wait_ms", 500.0) / 1000.0)
+
+
+def _scale_weight(event: RuntimeEvent, factor: int) -> RuntimeEvent:
+    metadata = dict(event.metadata) if isinstance(event.metadata, dict) else {}
+    metadata["event_count"] = runtime_rollups.event_count_weight(event) * factor
+    metadata["total_runtime_ms"] = runtime_rollups.event_total_runtime_ms(event) * factor
+    metadata["total_runtime_cost_estimate"] = runtime_rollups.event_total_runtime_cost(event) * factor
+    metadata["ingest_sample_rate"] = factor
+    return event.model_copy(update={"metadata": metadata})
+
+
+def enqueue(event: RuntimeEvent) -> bool:
+    """Queue one event for the flusher. False when it was sampled out or dropped."""
+    capacity = _capacity()
+    watermark = int(capacity * min(max(get_float("runtime", "ingest_sample_watermark", 0.8), 0.0), 1.0))
+    rate = max(1, get_int("runtime", "ingest_sample_rate", 10))
+    with _COND:
+        if rate > 1 and len(_QUEUE) >= watermark:
+            _STATE["sample_tick"] = (_STATE["sample_tick"] + 1) % rate
+            if _STATE["sample_tick"]:
+                _STATS["sampled_out"] += 1
+                return False
+            event = _scale_weight(event, rate)
+        if len(_QUEUE) >= capacity:
+            _COND.notify_all()
+            block_ms = 0.0 if on_event_loop() else get_float("runtime", "ingest_block_timeout_ms", 50.0)
+            deadline = time.monotonic() + max(0.0, block_ms) / 1000.0
+            while len(_QUEUE) >= capacity:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not _COND.wait(remaining):
+                    if len(_QUEUE) >= capacity:
+                        _STATS["dropped"] += 1
+                        return False
+        _QUEUE.append(event)
+        _STATS["enqueued"] += 1
+        _STATS["max_depth"] = max(_STATS["max_depth"], len(_QUEUE))
+        if len(_QUEUE) >= _batch_size():
+            _COND.notify_all()
+    _WRITER.ensure_started()
+    return True
+
+
+def _take(limit: int) -> list[RuntimeEvent]:
+    with _COND:
+        batch = [_QUEUE.popleft() for _ in range(min(limit, len(_QUEUE)))]
+        if batch:
+            _COND.notify_all()  # wake producers waiting for room
+        return batch
+
+
+def _write(batch: list[RuntimeEvent]) -> None:
+    started = time.perf_counter()
+    ok = runtime_event_store.write_events(
+        batch,
+        rollups=(row for event in batch for row in runtime_rollups.bucket_rows(event)),
+    )
+    with _COND:
+        _STATS["batches"] += 1
+        _STATS["last_batch_size"] = len(batch)
+        _STATS["last_flush_ms"] = round((time.perf_counter() - started) * 1000.0, 3)
+        if ok:
+            _STATS["written"] += len(batch)
+        else:
+            _STATS["failed"] += len(batch)
+
+
+def _flush_batch() -> int:
+    batch = _take(_batch_size())
+    if batch:
+        _write(batch)
+    return len(batch)
+
+
+_WRITER = WriteBehind(
+    "runtime-event-flusher",
+    _flush_batch,
+    pending=lambda: bool(_QUEUE),
+    interval=_flush_interval_seconds,
+    ready=lambda: len(_QUEUE) >= _batch_size(),
+)
+_COND = _WRITER.cond
+
+
+def drain() -> int:
+    """Write everything queued so far on the calling thread."""
+    return _WRITER.drain()
+
+
+def wait_for_writes() -> bool:
+    """Let the flusher write what this process queued so far; False if it didn't in time."""
+    return _WRITER.wait_for_writes(_read_wait_seconds())
+
+
+def shutdown(timeout: float = 5.0) -> None:
+    """Stop the flusher after it has written everything still queued."""
+    _WRITER.shutdown(timeout)
+
+
+def stats() -> dict[str, Any]:
+    with _COND:
+        payload = dict(_STATS)
+        payload["depth"] = len(_QUEUE)
+    payload["capacity"] = _capacity()
+    payload["enabled"] = enabled()
+    payload["flusher_alive"] = _WRITER.alive
+    return payload
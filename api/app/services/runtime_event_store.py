@@ -5,16 +5,30 @@ from __future__ import annotations
 import json
 import logging
 from contextlib import contextmanager
-from datetime import datetime, timezone
-from typing import Any
-
-from sqlalchemy import DateTime, Float, Integer, String, Text, create_engine, func, inspect
-from sqlalchemy.exc import SQLAlchemyError
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Iterator
+
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Float,
+    Integer,
+    String,
+    Text,
+    and_,
+    func,
+    insert,
+    inspect,
+    or_,
+    tuple_,
+    update,
+)
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, sessionmaker
-from sqlalchemy.pool import NullPool
 
 from app.config_loader import api_config, database_url, get_str
 from app.models.runtime import RuntimeEvent
+from app.services import unified_db
 
 logger = logging.getLogger(__name__)
 
@@ -45,9 +59,39 @@ class RuntimeEventRecord(Base):
     )
 
 
+class RuntimeEventRollupRecord(Base):
+    """Weighted totals of runtime events for one minute or hour bucket.
+
+    Maintained by write_event; see app/services/runtime/rollups.py.
+    """
+
+    __tablename__ = "runtime_event_rollups"
+
+    granularity: Mapped[str] = mapped_column(String(8), primary_key=True)
+    bucket_start: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    endpoint: Mapped[str] = mapped_column(String, primary_key=True)
+    method: Mapped[str] = mapped_column(String(16), primary_key=True)
+    source: Mapped[str] = mapped_column(String, primary_key=True)
+    idea_id: Mapped[str] = mapped_column(String, primary_key=True)
+    status_code: Mapped[int] = mapped_column(Integer, primary_key=True)
+    paid: Mapped[int] = mapped_column(Integer, primary_key=True)
+    event_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    runtime_ms: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    runtime_cost: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    paid_cost: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+
+_ROLLUP_KEY_COLUMNS = (
+    "granularity", "bucket_start", "endpoint", "method", "source", "idea_id", "status_code", "paid",
+)
+_ROLLUP_MEASURE_COLUMNS = ("event_count", "runtime_ms", "runtime_cost", "paid_cost")
+
 _ENGINE_CACHE: dict[str, Any] = {"url": "", "engine": None, "sessionmaker": None}
 _SCHEMA_INITIALIZED = False
 _SCHEMA_INITIALIZED_URL = ""
+# Set when this process created runtime_event_rollups next to existing
+# events: rollups for events recorded before this instant are backfilled once.
+_ROLLUP_BACKFILL: dict[str, datetime | None] = {"until": None}
 
 
 def _database_url() -> str:
@@ -85,11 +129,7 @@ def backend_info() -> dict[str, Any]:
 
 
 def _create_engine(url: str):
-    kwargs: dict[str, Any] = {"pool_pre_ping": True}
-    if url.startswith("sqlite"):
-        kwargs["connect_args"] = {"check_same_thread": False}
-        kwargs["poolclass"] = NullPool
-    return create_engine(url, **kwargs)
+    return unified_db.shared_engine(url, owner="runtime_event_store", cache=_ENGINE_CACHE)
 
 
 def _engine():
@@ -116,6 +156,23 @@ def _table_exists(engine: Any, table_name: str) -> bool:
         return False
 
 
+def _backfill_horizon(engine: Any) -> datetime | None:
+    """Just past the newest event stored before rollups existed.
+
+    Events are stamped before they are written, so a wall-clock instant
+    would also catch in-flight events whose rollups are written with them.
+    """
+    with engine.connect() as conn:
+        newest = conn.execute(func.max(RuntimeEventRecord.recorded_at).select()).scalar()
+    if newest is None:
+        return None
+    if isinstance(newest, str):
+        newest = datetime.fromisoformat(newest)
+    if newest.tzinfo is None:
+        newest = newest.replace(tzinfo=timezone.utc)
+    return newest + timedelta(microseconds=1)
+
+
 def ensure_schema() -> None:
     global _SCHEMA_INITIALIZED, _SCHEMA_INITIALIZED_URL
     url = _database_url()
@@ -125,7 +182,11 @@ def ensure_schema() -> None:
     engine = _engine()
     if engine is None or not url:
         return
-    if not _table_exists(engine, "runtime_events"):
+    has_events = _table_exists(engine, "runtime_events")
+    has_rollups = _table_exists(engine, "runtime_event_rollups")
+    if not has_events or not has_rollups:
+        if has_events and not has_rollups:
+            _ROLLUP_BACKFILL["until"] = _backfill_horizon(engine)
         Base.metadata.create_all(bind=engine)
     _SCHEMA_INITIALIZED = True
     _SCHEMA_INITIALIZED_URL = url
@@ -150,27 +211,162 @@ def _session() -> Session:
         session.close()
 
 
-def write_event(event: RuntimeEvent) -> None:
+def _add_rollups(session: Session, rows: Iterable[dict[str, Any]]) -> None:
+    """Add each row's measures onto its bucket, inserting missing buckets."""
+    table = RuntimeEventRollupRecord
+    for row in rows:
+        stmt = (
+            update(table)
+            .where(*(getattr(table, column) == row[column] for column in _ROLLUP_KEY_COLUMNS))
+            .values({column: getattr(table, column) + row[column] for column in _ROLLUP_MEASURE_COLUMNS})
+        )
+        if session.execute(stmt).rowcount:
+            continue
+        try:
+            with session.begin_nested():
+                session.add(table(**row))
+        except IntegrityError:
+            # Another writer created the bucket between our UPDATE and INSERT.
+            session.execute(stmt)
+
+
+def _event_row(event: RuntimeEvent) -> dict[str, Any]:
+    return {
+        "id": event.id,
+        "source": event.source,
+        "endpoint": event.endpoint,
+        "raw_endpoint": event.raw_endpoint or event.endpoint,
+        "method": event.method,
+        "status_code": int(event.status_code),
+        "runtime_ms": float(event.runtime_ms),
+        "idea_id": event.idea_id,
+        "origin_idea_id": event.origin_idea_id,
+        "metadata_json": json.dumps(event.metadata or {}),
+        "runtime_cost_estimate": float(event.runtime_cost_estimate),
+        "recorded_at": event.recorded_at,
+    }
+
+
+def _merge_rollups(rows: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Sum rows that land on the same bucket so each bucket is upserted once."""
+    merged: dict[tuple, dict[str, Any]] = {}
+    for row in rows:
+        key = tuple(row[column] for column in _ROLLUP_KEY_COLUMNS)
+        total = merged.get(key)
+        if total is None:
+            merged[key] = dict(row)
+            continue
+        for column in _ROLLUP_MEASURE_COLUMNS:
+            total[column] += row[column]
+    return list(merged.values())
+
+
+def write_events(events: list[RuntimeEvent], rollups: Iterable[dict[str, Any]] | None = None) -> bool:
+    """Insert a batch of events and their rollups in one transaction."""
+    if not events:
+        return True
+    try:
+        ensure_schema()
+        with _session() as session:
+            session.execute(insert(RuntimeEventRecord), [_event_row(event) for event in events])
+            if rollups is not None:
+                _add_rollups(session, _merge_rollups(rollups))
+    except SQLAlchemyError as exc:
+        logger.warning("runtime_event_store write failed; dropping %d events: %s", len(events), exc)
+        return False
+    return True
+
+
+def write_event(event: RuntimeEvent, rollups: list[dict[str, Any]] | None = None) -> None:
+    write_events([event], rollups)
+
+
+def write_rollups(rows: Iterable[dict[str, Any]]) -> bool:
+    """Add rows in one transaction; False if it did not commit."""
     try:
         ensure_schema()
         with _session() as session:
-            row = RuntimeEventRecord(
-                id=event.id,
-                source=event.source,
-                endpoint=event.endpoint,
-                raw_endpoint=event.raw_endpoint or event.endpoint,
-                method=event.method,
-                status_code=int(event.status_code),
-                runtime_ms=float(event.runtime_ms),
-                idea_id=event.idea_id,
-                origin_idea_id=event.origin_idea_id,
-                metadata_json=json.dumps(event.metadata or {}),
-                runtime_cost_estimate=float(event.runtime_cost_estimate),
-                recorded_at=event.recorded_at,
+            _add_rollups(session, rows)
+    except SQLAlchemyError as exc:
+        logger.warning("runtime_event_store rollup write failed: %s", exc)
+        return False
+    return True
+
+
+def list_rollups(
+    ranges: list[tuple[str, int, int]],
+    source: str | None = None,
+) -> list[dict[str, Any]]:
+    """Rollup rows inside any of the half-open (granularity, start, end) ranges."""
+    if not ranges:
+        return []
+    table = RuntimeEventRollupRecord
+    try:
+        ensure_schema()
+        with _session() as session:
+            query = session.query(table).filter(
+                or_(*(
+                    and_(table.granularity == granularity, table.bucket_start >= start, table.bucket_start < end)
+                    for granularity, start, end in ranges
+                ))
             )
-            session.add(row)
+            if source:
+                query = query.filter(func.lower(table.source) == source.lower())
+            rows = query.all()
     except SQLAlchemyError as exc:
-        logger.warning("runtime_event_store write failed; dropping event: %s", exc)
+        logger.warning("runtime_event_store rollup read failed; returning no rollups: %s", exc)
+        return []
+    return [
+        {column: getattr(row, column) for column in _ROLLUP_KEY_COLUMNS + _ROLLUP_MEASURE_COLUMNS}
+        for row in rows
+    ]
+
+
+def prune_rollups(cutoffs: dict[str, int]) -> None:
+    """Delete rollup buckets that start before their granularity's cutoff."""
+    table = RuntimeEventRollupRecord
+    try:
+        ensure_schema()
+        with _session() as session:
+            for granularity, cutoff in cutoffs.items():
+                session.query(table).filter(
+                    table.granularity == granularity, table.bucket_start < int(cutoff)
+                ).delete(synchronize_session=False)
+    except SQLAlchemyError as exc:
+        logger.warning("runtime_event_store rollup prune failed: %s", exc)
+
+
+def pending_rollup_backfill() -> datetime | None:
+    """The instant rollups started being written, while a created table awaits its backfill."""
+    return _ROLLUP_BACKFILL["until"]
+
+
+def finish_rollup_backfill(until: datetime) -> None:
+    """Clear the marker once the backfill up to `until` has committed."""
+    if _ROLLUP_BACKFILL["until"] == until:
+        _ROLLUP_BACKFILL["until"] = None
+
+
+def iter_events(since: datetime, until: datetime, *, batch_size: int = 1000) -> Iterator[RuntimeEvent]:
+    """Every event with since <= recorded_at < until, oldest first, in keyset pages."""
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if until.tzinfo is None:
+        until = until.replace(tzinfo=timezone.utc)
+    ensure_schema()
+    table = RuntimeEventRecord
+    cursor: tuple[datetime, str] | None = None
+    while True:
+        with _session() as session:
+            query = session.query(table).filter(table.recorded_at >= since, table.recorded_at < until)
+            if cursor is not None:
+                query = query.filter(tuple_(table.recorded_at, table.id) > tuple_(*cursor))
+            rows = query.order_by(table.recorded_at, table.id).limit(batch_size).all()
+        if not rows:
+            return
+        for row in rows:
+            yield _to_event(row)
+        cursor = (rows[-1].recorded_at, rows[-1].id)
 
 
 def list_events(
@@ -207,34 +403,33 @@ def list_events(
         logger.warning("runtime_event_store read failed; returning no events: %s", exc)
         return []
 
-    out: list[RuntimeEvent] = []
-    for row in rows:
-        try:
-            metadata = json.loads(row.metadata_json) if row.metadata_json else {}
-        except Exception:
-            metadata = {}
-        recorded_at = row.recorded_at
-        if recorded_at.tzinfo is None:
-            # SQLite commonly returns naive datetimes even when timezone=True.
-            # Normalize to UTC so summary windows can compare safely.
-            recorded_at = recorded_at.replace(tzinfo=timezone.utc)
-        out.append(
-            RuntimeEvent(
-                id=row.id,
-                source=row.source,  # type: ignore[arg-type]
-                endpoint=row.endpoint,
-                raw_endpoint=row.raw_endpoint,
-                method=row.method,
-                status_code=int(row.status_code),
-                runtime_ms=float(row.runtime_ms),
-                idea_id=row.idea_id,
-                origin_idea_id=row.origin_idea_id,
-                metadata=metadata if isinstance(metadata, dict) else {},
-                runtime_cost_estimate=float(row.runtime_cost_estimate),
-                recorded_at=recorded_at,
-            )
-        )
-    return out
+    return [_to_event(row) for row in rows]
+
+
+def _to_event(row: RuntimeEventRecord) -> RuntimeEvent:
+    try:
+        metadata = json.loads(row.metadata_json) if row.metadata_json else {}
+    except Exception:
+        metadata = {}
+    recorded_at = row.recorded_at
+    if recorded_at.tzinfo is None:
+        # SQLite commonly returns naive datetimes even when timezone=True.
+        # Normalize to UTC so summary windows can compare safely.
+        recorded_at = recorded_at.replace(tzinfo=timezone.utc)
+    return RuntimeEvent(
+        id=row.id,
+        source=row.source,  # type: ignore[arg-type]
+        endpoint=row.endpoint,
+        raw_endpoint=row.raw_endpoint,
+        method=row.method,
+        status_code=int(row.status_code),
+        runtime_ms=float(row.runtime_ms),
+        idea_id=row.idea_id,
+        origin_idea_id=row.origin_idea_id,
+        metadata=metadata if isinstance(metadata, dict) else {},
+        runtime_cost_estimate=float(row.runtime_cost_estimate),
+        recorded_at=recorded_at,
+    )
 
 
 def checkpoint(*, exclude_endpoints: list[str] | None = None) -> dict[str, Any]:
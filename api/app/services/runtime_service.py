@@ -7,7 +7,6 @@ import time
 import base64
 import hashlib
 import logging
-import re
 import threading
 from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any, Callable
@@ -33,13 +32,16 @@ from app.models.runtime import (
 from app.services import (
     agent_task_store_service,
     idea_lineage_service,
-    route_registry_service,
     runtime_exerciser_service,
+    runtime_event_log,
+    runtime_event_queue,
     runtime_event_store,
     runtime_web_view_service,
     telemetry_persistence_service,
     value_lineage_service,
 )
+from app.services.runtime import rollups as runtime_rollups
+from app.services.runtime import routes as runtime_routes
 
 logger = logging.getLogger(__name__)
 
@@ -48,15 +50,17 @@ _RUNTIME_EVENTS_CACHE: dict[str, Any] = {
     "expires_at": 0.0,
     "cache_key": "",
     "rows": [],
+    "generation": 0,
 }
 _RUNTIME_EVENTS_CACHE_TTL_SECONDS = 30.0
-_RUNTIME_EVENTS_FILE_LOCK = threading.Lock()
-
 _LIVE_CHANGE_CACHE: dict[str, Any] = {
     "expires_at": 0.0,
     "payload": {},
 }
 _LIVE_CHANGE_CACHE_TTL_SECONDS = 5.0
+# The runtime router runs in worker threads (event_loop.offload_router), so
+# these multi-key caches are read and replaced as a whole under one lock.
+_RUNTIME_CACHE_LOCK = threading.Lock()
 
 _RUNTIME_ENDPOINT_CACHE_NAMESPACE = "runtime_endpoint_cache_v1"
 _RUNTIME_ENDPOINT_CACHE_DEFAULT_TTL_SECONDS = 120.0
@@ -409,8 +413,10 @@ def _coerce_runtime_event_rows(payload: Any, *, limit: int) -> list[RuntimeEvent
 
 
 def _invalidate_runtime_events_cache() -> None:
-    _RUNTIME_EVENTS_CACHE["expires_at"] = 0.0
-    _RUNTIME_EVENTS_CACHE["rows"] = []
+    with _RUNTIME_CACHE_LOCK:
+        _RUNTIME_EVENTS_CACHE["expires_at"] = 0.0
+        _RUNTIME_EVENTS_CACHE["rows"] = []
+        _RUNTIME_EVENTS_CACHE["generation"] += 1
 
     try:
         from app.services import automation_usage_service
@@ -419,45 +425,30 @@ def _invalidate_runtime_events_cache() -> None:
     except (ImportError, Exception):
         pass
 
-    _RUNTIME_EVENTS_CACHE["rows"] = []
+
+def _store_runtime_events_cache(generation: int, cache_key: str, rows: list[RuntimeEvent], now: float) -> None:
+    """Cache ``rows`` unless an invalidation landed while they were being read."""
+    with _RUNTIME_CACHE_LOCK:
+        if _RUNTIME_EVENTS_CACHE["generation"] != generation:
+            return
+        _RUNTIME_EVENTS_CACHE["expires_at"] = now + _RUNTIME_EVENTS_CACHE_TTL_SECONDS
+        _RUNTIME_EVENTS_CACHE["cache_key"] = cache_key
+        _RUNTIME_EVENTS_CACHE["rows"] = rows
 
 
 def _ensure_events_store() -> None:
     if runtime_event_store.enabled():
         runtime_event_store.ensure_schema()
         return
-    path = _events_path()
-    if path.exists():
-        return
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps({"events": []}, indent=2), encoding="utf-8")
+    runtime_event_log.segments_dir(_events_path()).mkdir(parents=True, exist_ok=True)
 
 
-def _read_store() -> dict:
+def _read_store(since: datetime | None = None, limit: int | None = None) -> dict:
     if runtime_event_store.enabled():
-        rows = runtime_event_store.list_events(limit=5000)
+        runtime_event_queue.wait_for_writes()
+        rows = runtime_event_store.list_events(limit=5000, since=since)
         return {"events": [row.model_dump(mode="json") for row in rows]}
-    _ensure_events_store()
-    path = _events_path()
-    try:
-        with path.open(encoding="utf-8") as f:
-            data = json.load(f)
-    except (OSError, json.JSONDecodeError):
-        return {"events": []}
-    if not isinstance(data, dict):
-        return {"events": []}
-    events = data.get("events") if isinstance(data.get("events"), list) else []
-    return {"events": events}
-
-
-def _write_store(data: dict) -> None:
-    if runtime_event_store.enabled():
-        # Writes happen via record_event() for DB-backed storage.
-        return
-    path = _events_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    return {"events": runtime_event_log.read(_events_path(), since=since, limit=limit)}
 
 
 def _default_idea_map() -> dict:
@@ -506,49 +497,9 @@ def _normalize_path(endpoint: str) -> str:
     return path if path.startswith("/") else f"/{path}"
 
 
-def _canonical_api_routes() -> list[dict]:
-    routes = route_registry_service.get_canonical_routes().get("api_routes", [])
-    if not isinstance(routes, list):
-        return []
-    return [row for row in routes if isinstance(row, dict) and isinstance(row.get("path"), str)]
-
-
-def _template_regex(template: str) -> str:
-    escaped = re.escape(template)
-    return "^" + re.sub(r"\\\{[^{}]+\\\}", r"[^/]+", escaped) + "$"
-
-
-def _method_allowed(route: dict, method: str | None) -> bool:
-    if not method:
-        return True
-    methods = route.get("methods")
-    if not isinstance(methods, list) or not methods:
-        return True
-    normalized = method.strip().upper()
-    return normalized in {
-        m.strip().upper() for m in methods if isinstance(m, str) and m.strip()
-    }
-
-
 def _match_canonical_route(endpoint: str, method: str | None = None) -> dict | None:
-    path = _normalize_path(endpoint)
-    routes = _canonical_api_routes()
-
-    for row in routes:
-        template = str(row.get("path") or "").strip()
-        if template == path and _method_allowed(row, method):
-            return row
-
-    for row in routes:
-        template = str(row.get("path") or "").strip()
-        if "{" not in template or "}" not in template:
-            continue
-        if not _method_allowed(row, method):
-            continue
-        if re.match(_template_regex(template), path):
-            return row
-
-    return None
+    # Compiled once per registry version; see app.services.runtime.routes.
+    return runtime_routes.compiled_routes().match(_normalize_path(endpoint), method)
 
 
 def normalize_endpoint(endpoint: str, method: str | None = None) -> str:
@@ -580,11 +531,9 @@ def resolve_idea_id(
             return canonical_idea_id
 
     normalized_endpoint = normalize_endpoint(endpoint, method=method)
-    map_data = _load_idea_map()
-    prefix_map = map_data.get("prefix_map") if isinstance(map_data.get("prefix_map"), dict) else {}
-    for prefix, idea_id in prefix_map.items():
-        if isinstance(prefix, str) and isinstance(idea_id, str) and normalized_endpoint.startswith(prefix):
-            return idea_id
+    mapped = runtime_routes.idea_prefix_table(_idea_map_path(), _load_idea_map).lookup(normalized_endpoint)
+    if mapped is not None:
+        return mapped
 
     # Derive idea from lineage endpoint references where possible.
     marker = "/api/value-lineage/links/"
@@ -628,12 +577,16 @@ def record_event(payload: RuntimeEventCreate) -> RuntimeEvent:
         runtime_cost_estimate=runtime_cost,
     )
     if runtime_event_store.enabled():
-        runtime_event_store.write_event(event)
+        if runtime_event_queue.enabled():
+            runtime_event_queue.enqueue(event)
+        else:
+            runtime_event_store.write_event(event, rollups=runtime_rollups.bucket_rows(event))
     else:
-        with _RUNTIME_EVENTS_FILE_LOCK:
-            data = _read_store()
-            data["events"].append(event.model_dump(mode="json"))
-            _write_store(data)
+        runtime_rollups.record_file_event(
+            _runtime_events_store_cache_key(),
+            event,
+            lambda: runtime_event_log.append(_events_path(), event.model_dump(mode="json")),
+        )
     _invalidate_runtime_events_cache()
     return event
 
@@ -651,14 +604,20 @@ def list_events(
         requested_limit, since, source_value or None, prefix_value or None
     )
     now = time.time()
-    if (
-        _RUNTIME_EVENTS_CACHE.get("expires_at", 0.0) > now
-        and _RUNTIME_EVENTS_CACHE.get("cache_key") == cache_key
-        and isinstance(_RUNTIME_EVENTS_CACHE.get("rows"), list)
-    ):
-        return [row.model_copy(deep=True) for row in _RUNTIME_EVENTS_CACHE["rows"][:requested_limit]]
+    with _RUNTIME_CACHE_LOCK:
+        generation = _RUNTIME_EVENTS_CACHE["generation"]
+        cached = (
+            _RUNTIME_EVENTS_CACHE["rows"]
+            if _RUNTIME_EVENTS_CACHE.get("expires_at", 0.0) > now
+            and _RUNTIME_EVENTS_CACHE.get("cache_key") == cache_key
+            and isinstance(_RUNTIME_EVENTS_CACHE.get("rows"), list)
+            else None
+        )
+    if cached is not None:
+        return [row.model_copy(deep=True) for row in cached[:requested_limit]]
 
     if runtime_event_store.enabled():
+        runtime_event_queue.wait_for_writes()
         rows = runtime_event_store.list_events(
             limit=max(1, min(requested_limit, 5000)),
             since=since,
@@ -682,12 +641,10 @@ def list_events(
                 continue
         out.sort(key=lambda x: x.recorded_at, reverse=True)
         out = out[:requested_limit]
-        _RUNTIME_EVENTS_CACHE["expires_at"] = now + _RUNTIME_EVENTS_CACHE_TTL_SECONDS
-        _RUNTIME_EVENTS_CACHE["cache_key"] = cache_key
-        _RUNTIME_EVENTS_CACHE["rows"] = out
+        _store_runtime_events_cache(generation, cache_key, out, now)
         return out
 
-    data = _read_store()
+    data = _read_store(since=since, limit=None if source_value or prefix_value else requested_limit)
     out: list[RuntimeEvent] = []
     for raw in data["events"]:
         try:
@@ -706,9 +663,7 @@ def list_events(
             continue
     out.sort(key=lambda x: x.recorded_at, reverse=True)
     out = out[:requested_limit]
-    _RUNTIME_EVENTS_CACHE["expires_at"] = now + _RUNTIME_EVENTS_CACHE_TTL_SECONDS
-    _RUNTIME_EVENTS_CACHE["cache_key"] = cache_key
-    _RUNTIME_EVENTS_CACHE["rows"] = out
+    _store_runtime_events_cache(generation, cache_key, out, now)
     return out
 
 
@@ -742,16 +697,16 @@ def cached_runtime_events(
 
 def live_change_token(force_refresh: bool = False) -> dict[str, Any]:
     now = time.time()
-    if (
-        not force_refresh
-        and isinstance(_LIVE_CHANGE_CACHE.get("payload"), dict)
-        and float(_LIVE_CHANGE_CACHE.get("expires_at") or 0.0) > now
-    ):
-        return dict(_LIVE_CHANGE_CACHE["payload"])
+    with _RUNTIME_CACHE_LOCK:
+        cached = _LIVE_CHANGE_CACHE.get("payload")
+        fresh = float(_LIVE_CHANGE_CACHE.get("expires_at") or 0.0) > now
+    if not force_refresh and isinstance(cached, dict) and fresh:
+        return dict(cached)
 
     runtime_checkpoint: dict[str, Any]
     try:
         if runtime_event_store.enabled():
+            runtime_event_queue.wait_for_writes()
             runtime_checkpoint = runtime_event_store.checkpoint(
                 exclude_endpoints=["/api/runtime/change-token"],
             )
@@ -760,7 +715,7 @@ def live_change_token(force_refresh: bool = False) -> dict[str, Any]:
                 "enabled": False,
                 "count": None,
                 "max_recorded_at": None,
-                "file": _path_signature(_events_path()),
+                "file": runtime_event_log.signature(_events_path()),
             }
     except Exception as exc:
         runtime_checkpoint = {"error": str(exc), "enabled": runtime_event_store.enabled()}
@@ -802,40 +757,61 @@ def live_change_token(force_refresh: bool = False) -> dict[str, Any]:
         "generated_at": datetime.now(timezone.utc).isoformat(),
         "components": components,
     }
-    _LIVE_CHANGE_CACHE["expires_at"] = now + _LIVE_CHANGE_CACHE_TTL_SECONDS
-    _LIVE_CHANGE_CACHE["payload"] = payload
+    with _RUNTIME_CACHE_LOCK:
+        _LIVE_CHANGE_CACHE["expires_at"] = now + _LIVE_CHANGE_CACHE_TTL_SECONDS
+        _LIVE_CHANGE_CACHE["payload"] = payload
     return dict(payload)
 
 
-def _event_count_weight(event: RuntimeEvent) -> int:
-    metadata = event.metadata if isinstance(event.metadata, dict) else {}
-    raw_count = metadata.get("event_count") or metadata.get("sample_count") or 1
-    try:
-        return max(1, int(raw_count))
-    except (TypeError, ValueError):
-        return 1
+_event_count_weight = runtime_rollups.event_count_weight
+_event_total_runtime_ms = runtime_rollups.event_total_runtime_ms
+_event_total_runtime_cost = runtime_rollups.event_total_runtime_cost
 
 
-def _event_total_runtime_ms(event: RuntimeEvent) -> float:
-    metadata = event.metadata if isinstance(event.metadata, dict) else {}
-    raw_total = metadata.get("total_runtime_ms")
-    if raw_total is not None:
-        try:
-            return max(0.0, float(raw_total))
-        except (TypeError, ValueError):
-            pass
-    return float(event.runtime_ms or 0.0) * _event_count_weight(event)
+def _rollup_events(since: datetime, until: datetime):
+    """Raw events in [since, until) for building or backfilling rollups."""
+    if runtime_event_store.enabled():
+        events = runtime_event_store.iter_events(since, until)
+    else:
+        events = _file_events(since)
+    for event in events:
+        if event.recorded_at.tzinfo is None:
+            event.recorded_at = event.recorded_at.replace(tzinfo=timezone.utc)
+        if event.recorded_at >= until:
+            continue
+        event.endpoint = normalize_endpoint(event.endpoint, event.method)
+        yield event
 
 
-def _event_total_runtime_cost(event: RuntimeEvent) -> float:
-    metadata = event.metadata if isinstance(event.metadata, dict) else {}
-    raw_total = metadata.get("total_runtime_cost_estimate")
-    if raw_total is not None:
+def _file_events(since: datetime):
+    for raw in runtime_event_log.read(_events_path(), since=since):
         try:
-            return max(0.0, float(raw_total))
-        except (TypeError, ValueError):
-            pass
-    return float(event.runtime_cost_estimate or 0.0) * _event_count_weight(event)
+            yield RuntimeEvent(**raw)
+        except Exception:
+            continue
+
+
+def _window_rollups(
+    cutoff: datetime,
+    *,
+    source: str | None = None,
+    event_rows: list[RuntimeEvent] | None = None,
+) -> dict[runtime_rollups.RollupKey, runtime_rollups.RollupMeasures]:
+    """Rollups for events since cutoff: from the maintained tables, or folded from event_rows."""
+    if event_rows is None:
+        runtime_event_queue.wait_for_writes()
+        return runtime_rollups.window(
+            cutoff,
+            store_key=_runtime_events_store_cache_key(),
+            load_events=_rollup_events,
+            source=source,
+        )
+    source_value = str(source or "").strip().lower()
+    return runtime_rollups.aggregate(
+        runtime_rollups.fold(row)
+        for row in event_rows
+        if row.recorded_at >= cutoff and (not source_value or str(row.source).lower() == source_value)
+    )
 
 
 def summarize_by_idea(
@@ -845,25 +821,23 @@ def summarize_by_idea(
     summary_offset: int = 0,
     event_rows: list[RuntimeEvent] | None = None,
 ) -> list[IdeaRuntimeSummary]:
+    # event_limit is kept for callers; rollups cover the whole window.
     window_seconds = max(60, min(seconds, 60 * 60 * 24 * 30))
     cutoff = datetime.now(timezone.utc) - timedelta(seconds=window_seconds)
-    if event_rows is None:
-        rows = list_events(limit=max(1, min(int(event_limit), 5000)), since=cutoff)
-    else:
-        rows = [row for row in event_rows if row.recorded_at >= cutoff]
+    rollups = _window_rollups(cutoff, event_rows=event_rows)
 
-    grouped: dict[str, list[RuntimeEvent]] = {}
-    for event in rows:
-        grouped.setdefault(event.idea_id or "unmapped", []).append(event)
+    grouped: dict[str, list[tuple[runtime_rollups.RollupKey, runtime_rollups.RollupMeasures]]] = {}
+    for key, measures in rollups.items():
+        grouped.setdefault(key.idea_id, []).append((key, measures))
 
     summaries: list[IdeaRuntimeSummary] = []
-    for idea_id, events in grouped.items():
-        event_count = sum(_event_count_weight(e) for e in events)
-        total_runtime = round(sum(_event_total_runtime_ms(e) for e in events), 4)
-        total_cost = round(sum(_event_total_runtime_cost(e) for e in events), 8)
+    for idea_id, cells in grouped.items():
+        event_count = sum(m.event_count for _, m in cells)
+        total_runtime = round(sum(m.runtime_ms for _, m in cells), 4)
+        total_cost = round(sum(m.runtime_cost for _, m in cells), 8)
         by_source: dict[str, int] = {}
-        for event in events:
-            by_source[event.source] = by_source.get(event.source, 0) + _event_count_weight(event)
+        for key, measures in cells:
+            by_source[key.source] = by_source.get(key.source, 0) + measures.event_count
         summaries.append(
             IdeaRuntimeSummary(
                 idea_id=idea_id,
@@ -1601,19 +1575,19 @@ def summarize_by_endpoint(
     seconds: int = 3600,
     summary_limit: int = 500,
     source: str | None = None,
+    event_rows: list[RuntimeEvent] | None = None,
 ) -> list[EndpointRuntimeSummary]:
     window_seconds = max(60, min(seconds, 60 * 60 * 24 * 30))
     cutoff = datetime.now(timezone.utc) - timedelta(seconds=window_seconds)
-    source_value = str(source or "").strip().lower() or None
-    rows = list_events(limit=2000, since=cutoff, source=source_value)
+    rollups = _window_rollups(cutoff, source=source, event_rows=event_rows)
 
-    grouped: dict[str, list[RuntimeEvent]] = {}
-    for event in rows:
-        grouped.setdefault(event.endpoint, []).append(event)
+    grouped: dict[str, list[tuple[runtime_rollups.RollupKey, runtime_rollups.RollupMeasures]]] = {}
+    for key, measures in rollups.items():
+        grouped.setdefault(key.endpoint, []).append((key, measures))
 
     summaries: list[EndpointRuntimeSummary] = []
-    for endpoint, events in grouped.items():
-        methods = sorted({e.method.upper() for e in events})
+    for endpoint, cells in grouped.items():
+        methods = sorted({key.method for key, _ in cells})
         by_source: dict[str, int] = {}
         status_counts: dict[str, int] = {}
         idea_counts: dict[str, int] = {}
@@ -1622,34 +1596,28 @@ def summarize_by_endpoint(
         paid_tool_runtime_ms = 0.0
         paid_tool_runtime_cost = 0.0
         event_count = 0
+        total_runtime = 0.0
+        total_cost = 0.0
 
-        for event in events:
-            weight = _event_count_weight(event)
+        for key, measures in cells:
+            weight = measures.event_count
             event_count += weight
-            by_source[event.source] = by_source.get(event.source, 0) + weight
-            status_key = str(event.status_code)
+            total_runtime += measures.runtime_ms
+            total_cost += measures.runtime_cost
+            by_source[key.source] = by_source.get(key.source, 0) + weight
+            status_key = str(key.status_code)
             status_counts[status_key] = status_counts.get(status_key, 0) + weight
-            idea_key = str(event.idea_id or "unmapped")
-            idea_counts[idea_key] = idea_counts.get(idea_key, 0) + weight
-
-            metadata = event.metadata if isinstance(event.metadata, dict) else {}
-            if bool(metadata.get("is_paid_provider")):
+            idea_counts[key.idea_id] = idea_counts.get(key.idea_id, 0) + weight
+            if key.paid:
                 paid_tool_event_count += weight
-                paid_tool_runtime_ms += _event_total_runtime_ms(event)
-                raw_runtime_cost = metadata.get("runtime_cost_usd")
-                if raw_runtime_cost is not None:
-                    try:
-                        paid_tool_runtime_cost += float(raw_runtime_cost) * weight
-                    except (TypeError, ValueError):
-                        paid_tool_runtime_cost += _event_total_runtime_cost(event)
-                else:
-                    paid_tool_runtime_cost += _event_total_runtime_cost(event)
-                if event.status_code >= 400:
+                paid_tool_runtime_ms += measures.runtime_ms
+                paid_tool_runtime_cost += measures.paid_cost
+                if key.status_code >= 400:
                     paid_tool_failure_count += weight
 
         primary_idea_id = max(idea_counts.items(), key=lambda item: item[1])[0]
-        total_runtime = round(sum(_event_total_runtime_ms(e) for e in events), 4)
-        total_cost = round(sum(_event_total_runtime_cost(e) for e in events), 8)
+        total_runtime = round(total_runtime, 4)
+        total_cost = round(total_cost, 8)
         paid_tool_ratio = float(paid_tool_event_count) / float(event_count) if event_count else 0.0
         paid_tool_average_runtime_ms = (
             round((paid_tool_runtime_ms / paid_tool_event_count), 4) if paid_tool_event_count else 0.0
@@ -1905,20 +1873,6 @@ def _endpoint_attention_status_counts(
     return success_count, failure_count
 
 
-def _endpoint_attention_paid_counts(
-    endpoint_events: list[RuntimeEvent],
-) -> tuple[int, int]:
-    paid_tool_event_count = 0
-    paid_tool_failure_count = 0
-    for event in endpoint_events:
-        metadata = event.metadata if isinstance(event.metadata, dict) else {}
-        if bool(metadata.get("is_paid_provider")):
-            paid_tool_event_count += 1
-            if event.status_code >= 400:
-                paid_tool_failure_count += 1
-    return paid_tool_event_count, paid_tool_failure_count
-
-
 def _build_endpoint_attention_row(
     row: EndpointRuntimeSummary,
     *,
@@ -1939,7 +1893,8 @@ def _build_endpoint_attention_row(
     recent_success_streak = _recent_success_streak(endpoint_events)
     failure_recovered = bool(failure_count > 0 and recent_success_streak >= success_streak_target)
 
-    paid_tool_event_count, paid_tool_failure_count = _endpoint_attention_paid_counts(endpoint_events)
+    paid_tool_event_count = int(row.paid_tool_event_count)
+    paid_tool_failure_count = int(row.paid_tool_failure_count)
 
     paid_ratio = float(paid_tool_event_count) / float(event_count) if event_count else 0.0
     friction_density_raw = (float(friction_count) / float(event_count)) if event_count else 0.0
@@ -2019,6 +1974,8 @@ def summarize_endpoint_attention(
     friction_by_endpoint = _endpoint_friction_counts(window_seconds)
     idea_rows = _load_idea_value_rows()
 
+    # Raw events are only needed for the recent success streak, which looks
+    # at the newest few events per endpoint; the counts come from rollups.
     window_start = datetime.now(timezone.utc) - timedelta(seconds=window_seconds)
     attention_events = list_events(limit=2000, since=window_start)
     by_endpoint: dict[str, list[RuntimeEvent]] = {}
@@ -31,9 +31,11 @@ from app.services.substrate.kernel import (
     find_downstream_cells,
     find_equivalent_cells,
     get_level,
+    intern_many,
     intern_node,
     lattice_stats,
     lookup_cell,
+    lookup_cells,
     lookup_node,
     make_cell,
     make_composite_blueprint,
@@ -67,6 +69,7 @@ from app.services.substrate.resonance import (
     find_cells_via_resonance,
     geometric_form_cell,
     harmonic_at_edge,
+    harmonic_at_edges,
     harmonic_cell,
     hz_cell,
     near_edge,
@@ -107,6 +110,7 @@ from app.services.substrate.markdown_frontend import (
     BID_word,
     artifact_kind_hz,
     frontmatter_to_blueprint,
+    frontmatters_to_blueprints,
     ingest_concept_file,
     ingest_git_artifact,
     ingest_guide_file,
@@ -121,6 +125,7 @@ from app.services.substrate.markdown_frontend import (
     ingest_spec_file,
     ingest_task,
     ingest_word_cell,
+    ingest_word_cells,
     lemma_pos_key,
     tokenize_words,
     ingest_transmission_file,
@@ -143,9 +148,11 @@ __all__ = [
     "find_downstream_cells",
     "find_equivalent_cells",
     "get_level",
+    "intern_many",
     "intern_node",
     "lattice_stats",
     "lookup_cell",
+    "lookup_cells",
     "lookup_node",
     "make_cell",
     "make_composite_blueprint",
@@ -176,6 +183,7 @@ __all__ = [
     # frontends
     "artifact_kind_hz",
     "frontmatter_to_blueprint",
+    "frontmatters_to_blueprints",
     "ingest_concept_file",
     "ingest_git_artifact",
     "ingest_guide_file",
@@ -190,6 +198,7 @@ __all__ = [
     "ingest_spec_file",
     "ingest_task",
     "ingest_word_cell",
+    "ingest_word_cells",
     "lemma_pos_key",
     "tokenize_words",
     "ingest_transmission_file",
@@ -221,6 +230,7 @@ __all__ = [
     "find_cells_via_resonance",
     "geometric_form_cell",
     "harmonic_at_edge",
+    "harmonic_at_edges",
     "harmonic_cell",
     "hz_cell",
     "near_edge",
@@ -16,17 +16,27 @@ category vocabulary lives in category.py.
 """
 from __future__ import annotations
 
+import logging
+import threading
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 
 from typing import Callable
 
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy import event, exists, func, tuple_, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session, aliased
 
 from app.services.substrate.category import Level, RType
-from app.services.substrate.orm import SubstrateNamedCellORM, SubstrateNodeORM
+from app.services.substrate.orm import (
+    SubstrateInstanceSeqORM,
+    SubstrateNamedCellORM,
+    SubstrateNodeChildORM,
+    SubstrateNodeORM,
+)
 
+log = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
 # Mutation callbacks — for reactive subscriptions (?on_change) to auto-fire
@@ -122,7 +132,7 @@ def serialize_tree(category: NodeID, children: List[NodeID]) -> str:
 # ---------------------------------------------------------------------------
 
 
-def _bump_seen_count(session: Session, existing: "SubstrateNodeORM") -> None:
+def _bump_seen_count(session: Session, existing: "SubstrateNodeORM | NodeID") -> None:
     """Increment a node's re-intern tally with a single atomic statement.
 
     `count` is bookkeeping ("how many times this shape was seen") — NOT part of
@@ -148,6 +158,77 @@ def _bump_seen_count(session: Session, existing: "SubstrateNodeORM") -> None:
     session.flush()
 
 
+# Shapes already resolved in this session: (package, level, domain,
+# serialized) -> NodeID. Interned shapes are never rewritten, so an entry
+# stays true until the transaction that produced it rolls back. Bulk
+# ingestion re-interns the same warm words and fields thousands of times;
+# the cache turns each repeat into just the count bump.
+_SHAPE_CACHE_KEY = "substrate_shape_cache"
+_SHAPE_CACHE_MAX = 65536
+
+
+def _shape_cache(session: Session) -> dict:
+    cache = session.info.get(_SHAPE_CACHE_KEY)
+    if cache is None or len(cache) >= _SHAPE_CACHE_MAX:
+        cache = session.info[_SHAPE_CACHE_KEY] = {}
+    return cache
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_shape_cache(session: Session, previous_transaction) -> None:
+    # Shapes inserted by the rolled-back transaction no longer exist.
+    session.info.pop(_SHAPE_CACHE_KEY, None)
+
+
+def _allocate_instance(
+    session: Session, package: int, level: int, type_: int, n: int = 1,
+) -> int:
+    """Reserve `n` instance numbers for (package, level, type_), in one statement.
+
+    Returns the last number reserved; the block is last-n+1 .. last.
+    Replaces COUNT(*) over every shape of the type. The counter row is
+    updated inside the caller's transaction, and the row lock taken by
+    the UPDATE lasts until that transaction commits or rolls back. So
+    concurrent ingesters that mint new shapes of the same type serialize
+    on this row for the rest of their transactions. In exchange, a
+    rollback hands the numbers back and leaves no gaps. First use of a
+    key seeds the row from MAX(instance).
+    """
+    key = (
+        (SubstrateInstanceSeqORM.package == package)
+        & (SubstrateInstanceSeqORM.level == level)
+        & (SubstrateInstanceSeqORM.type_ == type_)
+    )
+    allocated = session.execute(
+        update(SubstrateInstanceSeqORM)
+        .where(key)
+        .values(last_instance=SubstrateInstanceSeqORM.last_instance + n)
+        .returning(SubstrateInstanceSeqORM.last_instance)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+    if allocated is not None:
+        return allocated
+    current = (
+        session.query(func.max(SubstrateNodeORM.instance))
+        .filter_by(package=package, level=level, type_=type_)
+        .scalar()
+    ) or 0
+    session.add(
+        SubstrateInstanceSeqORM(
+            package=package, level=level, type_=type_, last_instance=current + n,
+        )
+    )
+    session.flush()
+    return current + n
+
+
+def _shape_level(category: NodeID, children: List[NodeID]) -> int:
+    level = get_level(category.level, [c.level for c in children])
+    if children and level <= Level.BASIC:
+        level = Level.COMPLEX_1
+    return level
+
+
 def intern_node(
     session: Session,
     domain: str,
@@ -160,7 +241,9 @@ def intern_node(
     existing if a structurally identical shape was already interned.
 
     SELECT-first pattern: we look up by (package, level, domain, serialized)
-    before inserting, so the path stays in one transaction. Multi-process
+    before inserting, so the path stays in one transaction. Shapes seen
+    earlier in the same session skip the SELECT (see _shape_cache). Fresh
+    instance numbers come from substrate_instance_seq. Multi-process
     safety relies on SERIALIZABLE isolation (Postgres) or the SQLite global
     write lock; in practice the body runs single-process so collisions are
     rare. The UNIQUE constraint is a backstop.
@@ -170,13 +253,17 @@ def intern_node(
     if not children and category.level <= Level.BASIC:
         return category
 
-    level = get_level(category.level, [c.level for c in children])
-    if children and level <= Level.BASIC:
-        level = Level.COMPLEX_1
-
+    level = _shape_level(category, children)
     serialized = serialize_tree(category, children)
     package = category.package
 
+    cache = _shape_cache(session)
+    cache_key = (package, level, domain, serialized)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        _bump_seen_count(session, cached)
+        return cached
+
     # SELECT first — same-shape lookup, all-in-one-transaction visibility.
     existing = (
         session.query(SubstrateNodeORM)
@@ -187,19 +274,14 @@ def intern_node(
     )
     if existing is not None:
         _bump_seen_count(session, existing)
-        return NodeID(
+        found = NodeID(
             existing.package, existing.level, existing.type_, existing.instance
         )
-
-    # Allocate a fresh instance number for (package, level, type).
-    existing_for_type = (
-        session.query(SubstrateNodeORM)
-        .filter_by(package=package, level=level, type_=category.type_)
-        .count()
-    )
-    instance = existing_for_type + 1
+        cache[cache_key] = found
+        return found
 
     try:
+        instance = _allocate_instance(session, package, level, category.type_)
         node = SubstrateNodeORM(
             package=package,
             level=level,
@@ -211,8 +293,11 @@ def intern_node(
         )
         session.add(node)
         session.flush()
+        _record_children(session, node.node_id, [category, *children])
         _fire_mutation_callbacks(session)
-        return NodeID(package, level, category.type_, instance)
+        fresh = NodeID(package, level, category.type_, instance)
+        cache[cache_key] = fresh
+        return fresh
     except IntegrityError:
         # Race lost — another process inserted the same shape. Re-query.
         session.rollback()
@@ -231,6 +316,317 @@ def intern_node(
         )
 
 
+# Bound parameters per IN chunk — each key binds up to four values, and
+# SQLite's historical ceiling is 999.
+_BATCH_CHUNK = 200
+
+
+def intern_many(
+    session: Session,
+    domain: str,
+    shapes: Sequence[Tuple[NodeID, List[NodeID]]],
+) -> List[NodeID]:
+    """Intern a batch of (category, children) shapes; NodeIDs in input order.
+
+    Same result as calling intern_node once per shape, at batch cost:
+    duplicates inside the batch collapse, already-interned shapes resolve
+    in one query per chunk, fresh shapes get one instance block per
+    (package, level, type) and are inserted together, `count` moves by
+    one UPDATE per increment, and mutation callbacks fire once.
+
+    Children must already be interned — a caller composing nested shapes
+    interns the inner layer first and passes the results in.
+    """
+    results: List[Optional[NodeID]] = [None] * len(shapes)
+    cache = _shape_cache(session)
+    # cache key -> (category, children, input positions)
+    pending: dict = {}
+    for i, (category, children) in enumerate(shapes):
+        if not children and category.level <= Level.BASIC:
+            results[i] = category
+            continue
+        key = (
+            category.package,
+            _shape_level(category, children),
+            domain,
+            serialize_tree(category, children),
+        )
+        entry = pending.get(key)
+        if entry is None:
+            pending[key] = (category, list(children), [i])
+        else:
+            entry[2].append(i)
+    if not pending:
+        return results  # type: ignore[return-value]
+
+    resolved: dict = {key: cache[key] for key in pending if key in cache}
+    unresolved = [key for key in pending if key not in resolved]
+    for start in range(0, len(unresolved), _BATCH_CHUNK):
+        chunk = unresolved[start:start + _BATCH_CHUNK]
+        wanted = set(chunk)
+        rows = (
+            session.query(SubstrateNodeORM)
+            .filter(
+                SubstrateNodeORM.domain == domain,
+                SubstrateNodeORM.serialized.in_({key[3] for key in chunk}),
+            )
+            .all()
+        )
+        for row in rows:
+            key = (row.package, row.level, row.domain, row.serialized)
+            if key in wanted:
+                resolved[key] = NodeID(row.package, row.level, row.type_, row.instance)
+
+    fresh = [key for key in pending if key not in resolved]
+    try:
+        # Shapes already in the lattice: one UPDATE per distinct increment.
+        by_increment: dict = {}
+        for key, node in resolved.items():
+            by_increment.setdefault(len(pending[key][2]), []).append(node)
+        for increment, nodes in by_increment.items():
+            for start in range(0, len(nodes), _BATCH_CHUNK):
+                chunk = nodes[start:start + _BATCH_CHUNK]
+                session.query(SubstrateNodeORM).filter(
+                    tuple_(
+                        SubstrateNodeORM.package,
+                        SubstrateNodeORM.level,
+                        SubstrateNodeORM.type_,
+                        SubstrateNodeORM.instance,
+                    ).in_([(n.package, n.level, n.type_, n.instance) for n in chunk])
+                ).update(
+                    {SubstrateNodeORM.count: SubstrateNodeORM.count + increment},
+                    synchronize_session=False,
+                )
+
+        # Fresh shapes: one instance block per (package, level, type), handed
+        # out in input order so numbering matches sequential intern_node.
+        by_type: dict = {}
+        for key in fresh:
+            by_type.setdefault((key[0], key[1], pending[key][0].type_), []).append(key)
+        rows_by_key: dict = {}
+        for (package, level, type_), keys in by_type.items():
+            last = _allocate_instance(session, package, level, type_, len(keys))
+            for instance, key in enumerate(keys, start=last - len(keys) + 1):
+                rows_by_key[key] = SubstrateNodeORM(
+                    package=package,
+                    level=level,
+                    type_=type_,
+                    instance=instance,
+                    serialized=key[3],
+                    domain=domain,
+                    count=len(pending[key][2]),
+                )
+        if rows_by_key:
+            session.add_all(rows_by_key[key] for key in fresh)
+            session.flush()
+            session.add_all(
+                SubstrateNodeChildORM(
+                    parent_db_id=rows_by_key[key].node_id,
+                    position=position,
+                    child_package=part.package,
+                    child_level=part.level,
+                    child_type=part.type_,
+                    child_instance=part.instance,
+                )
+                for key in fresh
+                for position, part in enumerate(
+                    [pending[key][0], *pending[key][1]]
+                )
+            )
+        session.flush()
+    except IntegrityError:
+        # Race lost on some shape — fall back to the one-at-a-time path,
+        # which re-resolves each shape after the rollback.
+        session.rollback()
+        return [intern_node(session, domain, cat, list(ch)) for cat, ch in shapes]
+
+    for key, row in rows_by_key.items():
+        resolved[key] = NodeID(row.package, row.level, row.type_, row.instance)
+    for key, (_, _, positions) in pending.items():
+        node = resolved[key]
+        cache[key] = node
+        for i in positions:
+            results[i] = node
+    if rows_by_key:
+        _fire_mutation_callbacks(session)
+    return results  # type: ignore[return-value]
+
+
+# ---------------------------------------------------------------------------
+# Reverse child index — which composites carry a given child?
+# ---------------------------------------------------------------------------
+#
+# `serialized` stays the canonical identity. substrate_node_children mirrors
+# each composite's positions (0 = category, 1..n = children) so reverse walks
+# (downstream cells, resonance sources, signatures) are indexed lookups
+# rather than `serialized LIKE '%<ref>%'` scans — which also matched
+# prefixes (1.1.9.12 inside 1.1.9.123).
+
+
+_CHILD_INDEX_READY: set = set()
+_CHILD_INDEX_LOCK = threading.Lock()
+
+
+def _record_children(session: Session, parent_db_id: int, parts: List[NodeID]) -> None:
+    session.add_all(
+        SubstrateNodeChildORM(
+            parent_db_id=parent_db_id,
+            position=position,
+            child_package=part.package,
+            child_level=part.level,
+            child_type=part.type_,
+            child_instance=part.instance,
+        )
+        for position, part in enumerate(parts)
+    )
+    session.flush()
+
+
+def _parse_serialized(serialized: str) -> Optional[List[NodeID]]:
+    """serialize_tree's inverse: [category, *children], or None if not composite."""
+    parts = serialized.split("+")
+    if len(parts) < 2:
+        return None
+    out: List[NodeID] = []
+    for part in parts:
+        tokens = part.split(".")
+        if len(tokens) != 4:
+            return None
+        try:
+            out.append(NodeID(*(int(t) for t in tokens)))
+        except ValueError:
+            return None
+    return out
+
+
+def backfill_node_children(session: Session, *, batch_size: int = 1000) -> int:
+    """Fill substrate_node_children for composites interned before it existed.
+
+    Idempotent: only rows with no child entries are touched, so it can run
+    on every deploy. Returns the number of composites indexed. See
+    app/db/migrations/add_substrate_node_children.sql.
+    """
+    indexed = 0
+    last_id = 0
+    while True:
+        rows = (
+            session.query(SubstrateNodeORM.node_id, SubstrateNodeORM.serialized)
+            .filter(
+                SubstrateNodeORM.node_id > last_id,
+                SubstrateNodeORM.level > Level.BASIC,
+                ~exists().where(SubstrateNodeChildORM.parent_db_id == SubstrateNodeORM.node_id),
+            )
+            .order_by(SubstrateNodeORM.node_id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            return indexed
+        for node_id, serialized in rows:
+            last_id = node_id
+            parts = _parse_serialized(serialized)
+            if parts is None:
+                continue
+            _record_children(session, node_id, parts)
+            indexed += 1
+
+
+def _ensure_child_index(session: Session) -> None:
+    """Backfill once per process per database before the first reverse walk.
+
+    The backfill runs in a session of its own and the database is only
+    marked ready once that session commits, so a caller that rolls back
+    can't leave the index empty for the life of the process. When the
+    separate session can't do it (the caller is bound to a connection, or
+    holds SQLite's write lock), this walk backfills inside the caller's
+    session and the next walk tries again.
+    """
+    bind = session.get_bind()
+    key = str(bind.url)
+    if key in _CHILD_INDEX_READY:
+        return
+    with _CHILD_INDEX_LOCK:
+        if key in _CHILD_INDEX_READY:
+            return
+        if isinstance(bind, Engine):
+            try:
+                with Session(bind=bind) as own:
+                    backfill_node_children(own)
+                    own.commit()
+            except SQLAlchemyError:
+                log.warning("child index backfill failed; retrying on next walk", exc_info=True)
+            else:
+                _CHILD_INDEX_READY.add(key)
+                return
+        backfill_node_children(session)
+
+
+def find_parents_with_child(
+    session: Session,
+    child: NodeID,
+    *,
+    position: Optional[int] = None,
+    domain: Optional[str] = None,
+    type_: Optional[int] = None,
+    category: Optional[NodeID] = None,
+) -> List[int]:
+    """DB ids of composites carrying `child` as a participant (position >= 1).
+
+    `position` pins the child to one slot; `domain` / `type_` filter the
+    parent row; `category` requires that head (position 0).
+    """
+    _ensure_child_index(session)
+    q = session.query(SubstrateNodeChildORM.parent_db_id).filter(
+        SubstrateNodeChildORM.child_package == child.package,
+        SubstrateNodeChildORM.child_level == child.level,
+        SubstrateNodeChildORM.child_type == child.type_,
+        SubstrateNodeChildORM.child_instance == child.instance,
+    )
+    if position is None:
+        q = q.filter(SubstrateNodeChildORM.position >= 1)
+    else:
+        q = q.filter(SubstrateNodeChildORM.position == position)
+    if domain is not None or type_ is not None:
+        q = q.join(
+            SubstrateNodeORM,
+            SubstrateNodeORM.node_id == SubstrateNodeChildORM.parent_db_id,
+        )
+        if domain is not None:
+            q = q.filter(SubstrateNodeORM.domain == domain)
+        if type_ is not None:
+            q = q.filter(SubstrateNodeORM.type_ == type_)
+    if category is not None:
+        head = aliased(SubstrateNodeChildORM)
+        q = q.join(
+            head,
+            (head.parent_db_id == SubstrateNodeChildORM.parent_db_id) & (head.position == 0),
+        ).filter(
+            head.child_package == category.package,
+            head.child_level == category.level,
+            head.child_type == category.type_,
+            head.child_instance == category.instance,
+        )
+    return sorted({row[0] for row in q.all()})
+
+
+def children_of(session: Session, parent_db_ids: List[int]) -> dict:
+    """parent db id -> [category, *children] NodeIDs, read from the child index."""
+    out: dict = {pid: [] for pid in parent_db_ids}
+    if not parent_db_ids:
+        return out
+    rows = (
+        session.query(SubstrateNodeChildORM)
+        .filter(SubstrateNodeChildORM.parent_db_id.in_(parent_db_ids))
+        .order_by(SubstrateNodeChildORM.parent_db_id, SubstrateNodeChildORM.position)
+        .all()
+    )
+    for row in rows:
+        out[row.parent_db_id].append(
+            NodeID(row.child_package, row.child_level, row.child_type, row.child_instance)
+        )
+    return out
+
+
 def lookup_node(session: Session, node_id: NodeID) -> Optional[SubstrateNodeORM]:
     """Read a node by its NodeID."""
     return (
@@ -405,6 +801,18 @@ def lookup_cell(session: Session, domain: str, name: str) -> Optional[NamedCell]
     return _orm_to_cell(session, cell_orm)
 
 
+def lookup_cells(session: Session, cell_ids: Sequence[int]) -> dict[int, NamedCell]:
+    """{cell_id: NamedCell} for the cells among `cell_ids` that exist, in one query."""
+    if not cell_ids:
+        return {}
+    rows = (
+        session.query(SubstrateNamedCellORM)
+        .filter(SubstrateNamedCellORM.cell_id.in_(set(cell_ids)))
+        .all()
+    )
+    return {r.cell_id: _orm_to_cell(session, r) for r in rows}
+
+
 # ---------------------------------------------------------------------------
 # Views — BML-style detached interfaces
 # ---------------------------------------------------------------------------
@@ -558,41 +966,22 @@ def find_downstream_cells(
     category whose children contain `RType.REF` references).
 
     Closes GAP-T1 named in docs/coherence-substrate/recipe-branching-sense.form.
-    Walks `substrate_nodes.serialized` for recipes whose source position
-    matches this cell's cell_ref string, returns the cells in the target
-    positions. De-duplicates and skips self-references.
+    Looks up recipes carrying this cell's cell_ref in a participant
+    position through the reverse child index, returns the cells in the
+    other positions. De-duplicates and skips self-references.
     """
     source_ref = NodeID(1, Level.TRIVIAL, RType.REF, source_cell_id)
-    source_ref_str = str(source_ref)
-
-    rows = (
-        session.query(SubstrateNodeORM)
-        .filter(
-            SubstrateNodeORM.domain == DOMAIN_RECIPE,
-            SubstrateNodeORM.serialized.like(f"%{source_ref_str}%"),
-        )
-        .all()
-    )
+    parent_ids = find_parents_with_child(session, source_ref, domain=DOMAIN_RECIPE)
 
     target_ids: set = set()
-    for row in rows:
-        parts = row.serialized.split("+")
-        if not parts:
-            continue
-        # source must appear in a non-head position to count (head is the
-        # recipe category, not a participant cell).
-        if source_ref_str not in parts[1:]:
-            continue
+    for parts in children_of(session, parent_ids).values():
+        # parts[0] is the recipe category, not a participant cell.
         for part in parts[1:]:
-            if part == source_ref_str:
+            if part == source_ref:
                 continue
             # Cell-ref children carry the shape "1.1.9.<cell_id>".
-            tokens = part.split(".")
-            if len(tokens) == 4 and tokens[0] == "1" and tokens[1] == "1" and tokens[2] == "9":
-                try:
-                    target_ids.add(int(tokens[3]))
-                except ValueError:
-                    continue
+            if part.package == 1 and part.level == Level.TRIVIAL and part.type_ == RType.REF:
+                target_ids.add(part.instance)
 
     if not target_ids:
         return []
@@ -242,6 +242,23 @@ def named_field_recipe(
     )
 
 
+def named_field_recipes(
+    session: Session, fields: List[Tuple[str, NodeID]]
+) -> List[NodeID]:
+    """`named_field_recipe` for a whole block of (key, value recipe) pairs.
+
+    Interns every LET in one `intern_many` batch — same NodeIDs, one
+    round of queries instead of one per field.
+    """
+    from app.services.substrate.kernel import DOMAIN_RECIPE, intern_many
+    let = RID_block_let()
+    return intern_many(
+        session,
+        DOMAIN_RECIPE,
+        [(let, [substrate_slug_recipe(session, key), value]) for key, value in fields],
+    )
+
+
 def list_recipe(session: Session, element_recipe_ids: List[NodeID]) -> NodeID:
     """Compose a list as R_Block.SEQUENCE with one child per element.
 
@@ -293,25 +310,91 @@ def structured_value_recipe(session: Session, value: Any) -> NodeID:
         return substrate_string_recipe(session, value)
 
     if isinstance(value, list):
-        children = [structured_value_recipe(session, item) for item in value]
-        return list_recipe(session, children)
+        return structured_value_recipes(session, [value])[0]
 
     if isinstance(value, dict):
         # A dict becomes R_Block.DO with one R_Block.LET per key.
-        from app.services.substrate.kernel import DOMAIN_RECIPE, intern_node
-        pairs = []
-        for k in sorted(value.keys()):
-            v_recipe = structured_value_recipe(session, value[k])
-            pairs.append(named_field_recipe(session, str(k), v_recipe))
-        if not pairs:
+        if not value:
             return NodeID(1, Level.TRIVIAL, RType.EMPTY, 0)
-        return intern_node(session, DOMAIN_RECIPE, RID_block_do(), pairs)
+        return structured_value_recipes(session, [value])[0]
 
     # Unknown type — fall back to string repr (preserves recoverability)
     inst = intern_string_instance(session, repr(value))
     return NodeID(1, Level.TRIVIAL, RType.STRING, inst)
 
 
+def _string_leaves(values: List[Any]) -> List[str]:
+    """Every string `structured_value_recipe` interns for `values`, keys included."""
+    found: List[str] = []
+    stack = list(values)
+    while stack:
+        value = stack.pop()
+        if value is None or isinstance(value, bool):
+            continue
+        if isinstance(value, int):
+            if value < 0:
+                found.append(str(value))
+        elif isinstance(value, float):
+            found.append(repr(value))
+        elif isinstance(value, str):
+            found.append(value)
+        elif isinstance(value, list):
+            stack.extend(value)
+        elif isinstance(value, dict):
+            found.extend(str(k) for k in value)
+            stack.extend(value.values())
+        else:
+            found.append(repr(value))
+    return found
+
+
+def structured_value_recipes(session: Session, values: List[Any]) -> List[NodeID]:
+    """`structured_value_recipe` for many values; NodeIDs in input order.
+
+    Every string in the batch resolves through one
+    `intern_string_instances` call. Lists and dicts are composed one depth
+    at a time: all children of a depth in one recursive call, then one
+    `intern_many` for the LETs and one for the SEQUENCE / DO shapes.
+    """
+    from app.services.substrate.kernel import DOMAIN_RECIPE, intern_many
+    from app.services.substrate.substrate_strings import intern_string_instances
+
+    intern_string_instances(session, _string_leaves(values))
+    results: List[Optional[NodeID]] = [None] * len(values)
+    # (position, sorted dict keys or None for a list, first child, child count)
+    composites: List[Tuple[int, Optional[List[str]], int, int]] = []
+    child_values: List[Any] = []
+    for i, value in enumerate(values):
+        if isinstance(value, list):
+            composites.append((i, None, len(child_values), len(value)))
+            child_values.extend(value)
+        elif isinstance(value, dict) and value:
+            keys = sorted(value.keys())
+            composites.append((i, [str(k) for k in keys], len(child_values), len(keys)))
+            child_values.extend(value[k] for k in keys)
+        else:
+            results[i] = structured_value_recipe(session, value)
+    if not composites:
+        return results  # type: ignore[return-value]
+
+    child_ids = structured_value_recipes(session, child_values) if child_values else []
+    lets = iter(named_field_recipes(session, [
+        field
+        for _, keys, start, n in composites
+        if keys is not None
+        for field in zip(keys, child_ids[start:start + n])
+    ]))
+    shapes = [
+        (RID_block_sequence(), child_ids[start:start + n])
+        if keys is None
+        else (RID_block_do(), [next(lets) for _ in range(n)])
+        for _, keys, start, n in composites
+    ]
+    for (i, _, _, _), node in zip(composites, intern_many(session, DOMAIN_RECIPE, shapes)):
+        results[i] = node
+    return results  # type: ignore[return-value]
+
+
 def frontmatter_to_structured_ctor(
     session: Session,
     frontmatter: Dict[str, Any],
@@ -346,17 +429,15 @@ def frontmatter_to_structured_ctor(
     """
     from app.services.substrate.kernel import DOMAIN_RECIPE, intern_node
 
-    pairs = []
-    for key in sorted((frontmatter or {}).keys()):
-        value_recipe = structured_value_recipe(session, frontmatter[key])
-        pair = named_field_recipe(session, key, value_recipe)
-        pairs.append(pair)
+    keys = sorted((frontmatter or {}).keys())
+    fields = list(zip(keys, structured_value_recipes(session, [frontmatter[k] for k in keys])))
 
     if body is not None:
         body_recipe = body_to_section_recipe(session, body)
         if body_recipe is not None:
-            body_pair = named_field_recipe(session, "body", body_recipe)
-            pairs.append(body_pair)
+            fields.append(("body", body_recipe))
+
+    pairs = named_field_recipes(session, fields)
 
     if not pairs:
         return None
@@ -458,21 +539,40 @@ def frontmatter_to_blueprint(
     value itself — so two memories with the same set of frontmatter keys
     and the same per-key types share the same Blueprint NodeID.
     """
-    if not frontmatter:
-        return domain_bp
+    return frontmatters_to_blueprints(session, [frontmatter], domain_bp)[0]
 
-    # Sort keys for deterministic ordering — same shape → same serialization.
-    children = []
-    for key in sorted(frontmatter.keys()):
-        value = frontmatter[key]
-        member_bp = _value_to_blueprint(session, value)
-        # Wrap with a (key, value-type) pair so the key participates in
-        # structural identity. Different keys → different Blueprint.
-        key_bp = make_string_literal_blueprint(session, key)
-        pair_bp = make_composite_blueprint(session, BID_object(), [key_bp, member_bp])
-        children.append(pair_bp)
 
-    return make_composite_blueprint(session, domain_bp, children)
+def frontmatters_to_blueprints(
+    session: Session, frontmatters: List[Dict[str, Any]], domain_bp: NodeID
+) -> List[NodeID]:
+    """`frontmatter_to_blueprint` for many frontmatters under one domain blueprint.
+
+    Key literals, (key, value-type) pairs and the composites each go
+    through one `intern_many` for the whole batch.
+    """
+    from app.services.substrate.kernel import intern_many
+    from app.services.substrate.substrate_strings import intern_string_instances
+
+    # Sort keys for deterministic ordering — same shape → same serialization.
+    keyed = [sorted(fm.keys()) if fm else [] for fm in frontmatters]
+    instances = intern_string_instances(session, [k for keys in keyed for k in keys])
+    # Same shape as make_string_literal_blueprint.
+    key_bps = iter(intern_many(session, DOMAIN_BLUEPRINT, [
+        (BID_object(), [NodeID(1, Level.TRIVIAL, RType.STRING, instances[k])])
+        for keys in keyed
+        for k in keys
+    ]))
+    # Wrap with a (key, value-type) pair so the key participates in
+    # structural identity. Different keys → different Blueprint.
+    pair_bps = iter(intern_many(session, DOMAIN_BLUEPRINT, [
+        (BID_object(), [next(key_bps), _value_to_blueprint(session, fm[k])])
+        for fm, keys in zip(frontmatters, keyed)
+        for k in keys
+    ]))
+    composites = iter(intern_many(session, DOMAIN_BLUEPRINT, [
+        (domain_bp, [next(pair_bps) for _ in keys]) for keys in keyed if keys
+    ]))
+    return [next(composites) if keys else domain_bp for keys in keyed]
 
 
 def _value_to_blueprint(session: Session, value: Any) -> NodeID:
@@ -569,35 +669,54 @@ def section_content_to_word_sequence(
     Cross-idea queries like *"find all ideas whose body contains the word
     'tend' (hz=396 tending)"* become substrate-native.
     """
-    if not content or not content.strip():
-        return None
-    tokens = tokenize_words(content)
-    if not tokens:
-        return None
+    return section_contents_to_word_sequences(session, [content])[0]
 
-    elements: List[NodeID] = []
-    for t in tokens:
-        if t.get("kind") == "word":
-            word_cell, _, _ = ingest_word_cell(
-                session,
-                lemma=t["lemma"],
-                pos=t["pos"],
-                hz=t["hz"],
-                semantic_field=t["field"],
-                surface=t.get("surface"),
-            )
-            if word_cell is not None and word_cell.cell_id is not None:
-                elements.append(
-                    NodeID(1, Level.TRIVIAL, RType.REF, word_cell.cell_id)
-                )
-        elif t.get("kind") == "punct":
-            # Punct as a small string-recipe leaf — round-trip preserves
-            # the surface character.
-            elements.append(substrate_string_recipe(session, t.get("surface", "")))
 
-    if not elements:
-        return None
-    return list_recipe(session, elements)
+def section_contents_to_word_sequences(
+    session: Session, contents: List[str]
+) -> List[Optional[NodeID]]:
+    """`section_content_to_word_sequence` for every section of a body.
+
+    The word tokens of all sections go through one `ingest_word_cells`
+    call, punctuation through one string lookup, and the SEQUENCEs
+    through one `intern_many`.
+    """
+    from app.services.substrate.kernel import DOMAIN_RECIPE, intern_many
+    from app.services.substrate.substrate_strings import intern_string_instances
+
+    tokenized = [
+        tokenize_words(content) if content and content.strip() else []
+        for content in contents
+    ]
+    words = [t for tokens in tokenized for t in tokens if t.get("kind") == "word"]
+    cells = iter(ingest_word_cells(session, words))
+    intern_string_instances(session, [
+        t.get("surface", "")
+        for tokens in tokenized
+        for t in tokens
+        if t.get("kind") == "punct"
+    ])
+
+    sequences: List[List[NodeID]] = []
+    for tokens in tokenized:
+        elements: List[NodeID] = []
+        for t in tokens:
+            if t.get("kind") == "word":
+                word_cell, _, _ = next(cells)
+                if word_cell is not None and word_cell.cell_id is not None:
+                    elements.append(
+                        NodeID(1, Level.TRIVIAL, RType.REF, word_cell.cell_id)
+                    )
+            elif t.get("kind") == "punct":
+                # Punct as a small string-recipe leaf — round-trip preserves
+                # the surface character.
+                elements.append(substrate_string_recipe(session, t.get("surface", "")))
+        sequences.append(elements)
+
+    built = iter(intern_many(session, DOMAIN_RECIPE, [
+        (RID_block_sequence(), elements) for elements in sequences if elements
+    ]))
+    return [next(built) if elements else None for elements in sequences]
 
 
 def body_to_section_recipe(
@@ -622,20 +741,24 @@ def body_to_section_recipe(
 
     from app.services.substrate.kernel import DOMAIN_RECIPE, intern_node
 
-    pairs = []
+    headings = []
+    contents = []
     for i, m in enumerate(matches):
-        heading = m.group(1).strip()
+        headings.append(m.group(1).strip())
         content_start = m.end()
         content_end = matches[i + 1].start() if i + 1 < len(matches) else len(body)
-        content = body[content_start:content_end].strip()
-        v_recipe = section_content_to_word_sequence(session, content)
+        contents.append(body[content_start:content_end].strip())
+
+    fields = []
+    sequences = section_contents_to_word_sequences(session, contents)
+    for heading, v_recipe in zip(headings, sequences):
         if v_recipe is None:
             # Empty section — keep an empty string-recipe so the LET still
             # exists for navigation. The heading itself is the signal.
             v_recipe = substrate_string_recipe(session, "")
-        pair = named_field_recipe(session, heading, v_recipe)
-        pairs.append(pair)
+        fields.append((heading, v_recipe))
 
+    pairs = named_field_recipes(session, fields)
     if not pairs:
         return None
     return intern_node(session, DOMAIN_RECIPE, RID_block_do(), pairs)
@@ -730,7 +853,7 @@ def _author_spec_edges_from_frontmatter(
     """
     from app.services.substrate.kernel import (
         DOMAIN_RECIPE,
-        intern_node,
+        intern_many,
         lookup_cell as _lookup_cell,
     )
     from app.services.substrate.category import RRealize
@@ -738,6 +861,8 @@ def _author_spec_edges_from_frontmatter(
     if cell is None or cell.cell_id is None:
         return
 
+    edges: List[Tuple[NodeID, List[NodeID]]] = []
+
     idea_id_value = frontmatter.get("idea_id")
     if isinstance(idea_id_value, str) and idea_id_value.strip():
         idea_cell = _lookup_cell(session, "idea", idea_id_value.strip())
@@ -747,9 +872,9 @@ def _author_spec_edges_from_frontmatter(
             realize_cat = NodeID(
                 1, Level.BASIC, RBasic.REALIZE, RRealize.REALIZE
             )
-            intern_node(
-                session, DOMAIN_RECIPE, realize_cat, [source_ref, target_ref]
-            )
+            edges.append((realize_cat, [source_ref, target_ref]))
+
+    intern_many(session, DOMAIN_RECIPE, edges)
 
 
 def _author_idea_edges_from_frontmatter(
@@ -770,7 +895,7 @@ def _author_idea_edges_from_frontmatter(
     """
     from app.services.substrate.kernel import (
         DOMAIN_RECIPE,
-        intern_node,
+        intern_many,
         lookup_cell as _lookup_cell,
     )
     from app.services.substrate.category import RRealize
@@ -778,6 +903,8 @@ def _author_idea_edges_from_frontmatter(
     if cell is None or cell.cell_id is None:
         return
 
+    edges: List[Tuple[NodeID, List[NodeID]]] = []
+
     # specs[] — REALIZE recipes from each spec → this idea
     specs_list = frontmatter.get("specs")
     if isinstance(specs_list, list):
@@ -791,9 +918,7 @@ def _author_idea_edges_from_frontmatter(
             if spec_cell is None or spec_cell.cell_id is None:
                 continue
             source_ref = NodeID(1, Level.TRIVIAL, RType.REF, spec_cell.cell_id)
-            intern_node(
-                session, DOMAIN_RECIPE, realize_cat, [source_ref, idea_ref]
-            )
+            edges.append((realize_cat, [source_ref, idea_ref]))
 
     # absorbed_ideas[] — ABSORB recipes (RBasic.ABSORB category; instance=1 is
     # the canonical merge-into marker until an RAbsorb instance enum lands).
@@ -809,9 +934,9 @@ def _author_idea_edges_from_frontmatter(
                 continue
             source_ref = NodeID(1, Level.TRIVIAL, RType.REF, absorbed_cell.cell_id)
             target_ref = NodeID(1, Level.TRIVIAL, RType.REF, cell.cell_id)
-            intern_node(
-                session, DOMAIN_RECIPE, absorb_cat, [source_ref, target_ref]
-            )
+            edges.append((absorb_cat, [source_ref, target_ref]))
+
+    intern_many(session, DOMAIN_RECIPE, edges)
 
 
 def _slug_from_entry(entry: Any) -> Optional[str]:
@@ -885,7 +1010,7 @@ def _author_concept_edges_from_frontmatter(
     """
     from app.services.substrate.kernel import (
         DOMAIN_RECIPE,
-        intern_node,
+        intern_many,
         lookup_cell as _lookup_cell,
     )
     from app.services.substrate.category import RCompose
@@ -893,6 +1018,8 @@ def _author_concept_edges_from_frontmatter(
     if cell is None or cell.cell_id is None:
         return
 
+    edges: List[Tuple[NodeID, List[NodeID]]] = []
+
     # 1) parent — a single PARENT_OF cell-ref recipe.
     parent_slug = frontmatter.get("parent")
     if isinstance(parent_slug, str) and parent_slug.strip():
@@ -902,7 +1029,7 @@ def _author_concept_edges_from_frontmatter(
             source_ref = NodeID(1, Level.TRIVIAL, RType.REF, cell.cell_id)
             target_ref = NodeID(1, Level.TRIVIAL, RType.REF, parent_cell.cell_id)
             parent_of_cat = NodeID(1, Level.BASIC, RBasic.COMPOSE, RCompose.PARENT_OF)
-            intern_node(session, DOMAIN_RECIPE, parent_of_cat, [source_ref, target_ref])
+            edges.append((parent_of_cat, [source_ref, target_ref]))
 
     # 2) cross_refs — a list of CROSS_REF recipes (one per reference).
     cross_refs = frontmatter.get("cross_refs")
@@ -916,9 +1043,9 @@ def _author_concept_edges_from_frontmatter(
                 continue
             source_ref = NodeID(1, Level.TRIVIAL, RType.REF, cell.cell_id)
             target_ref = NodeID(1, Level.TRIVIAL, RType.REF, ref_cell.cell_id)
-            intern_node(
-                session, DOMAIN_RECIPE, cross_ref_cat, [source_ref, target_ref]
-            )
+            edges.append((cross_ref_cat, [source_ref, target_ref]))
+
+    intern_many(session, DOMAIN_RECIPE, edges)
 
     # 3) hz + geometry — route through the existing resonance authoring.
     geometry = frontmatter.get("geometry")
@@ -990,7 +1117,7 @@ def _author_presence_edges_from_frontmatter(
     """
     from app.services.substrate.kernel import (
         DOMAIN_RECIPE,
-        intern_node,
+        intern_many,
         lookup_cell as _lookup_cell,
     )
     from app.services.substrate.category import RTend, RTransmit
@@ -1013,6 +1140,7 @@ def _author_presence_edges_from_frontmatter(
     }
     source_ref = NodeID(1, Level.TRIVIAL, RType.REF, cell.cell_id)
 
+    edges: List[Tuple[NodeID, List[NodeID]]] = []
     for edge_kind, targets in edges_block.items():
         verb_cat = verb_map.get(edge_kind)
         if verb_cat is None or not isinstance(targets, list):
@@ -1031,9 +1159,9 @@ def _author_presence_edges_from_frontmatter(
             target_ref = NodeID(
                 1, Level.TRIVIAL, RType.REF, target_cell.cell_id
             )
-            intern_node(
-                session, DOMAIN_RECIPE, verb_cat, [source_ref, target_ref]
-            )
+            edges.append((verb_cat, [source_ref, target_ref]))
+
+    intern_many(session, DOMAIN_RECIPE, edges)
 
 
 def ingest_lineage_file(
@@ -1085,7 +1213,7 @@ def _author_lineage_edges_from_frontmatter(
     """
     from app.services.substrate.kernel import (
         DOMAIN_RECIPE,
-        intern_node,
+        intern_many,
         lookup_cell as _lookup_cell,
     )
     from app.services.substrate.category import RCompose, RTransmit
@@ -1093,6 +1221,8 @@ def _author_lineage_edges_from_frontmatter(
     if cell is None or cell.cell_id is None:
         return
 
+    edges: List[Tuple[NodeID, List[NodeID]]] = []
+
     def _resolve_any(slug: str) -> Optional[Any]:
         slug = slug.strip()
         if not slug:
@@ -1114,9 +1244,7 @@ def _author_lineage_edges_from_frontmatter(
             transmit_cat = NodeID(
                 1, Level.BASIC, RBasic.TRANSMIT, RTransmit.TRANSMIT_TO
             )
-            intern_node(
-                session, DOMAIN_RECIPE, transmit_cat, [from_ref, to_ref]
-            )
+            edges.append((transmit_cat, [from_ref, to_ref]))
 
     participants = frontmatter.get("participants")
     if isinstance(participants, list):
@@ -1130,9 +1258,9 @@ def _author_lineage_edges_from_frontmatter(
             if target is None:
                 continue
             target_ref = NodeID(1, Level.TRIVIAL, RType.REF, target.cell_id)
-            intern_node(
-                session, DOMAIN_RECIPE, cross_ref_cat, [source_ref, target_ref]
-            )
+            edges.append((cross_ref_cat, [source_ref, target_ref]))
+
+    intern_many(session, DOMAIN_RECIPE, edges)
 
 
 def ingest_transmission_file(
@@ -1816,37 +1944,70 @@ def ingest_word_cell(
     Closes GAP-W1+W2 plus the encoder half of P1/P2 for the WORD domain
     named in docs/coherence-substrate/prose-as-recipe.form.
     """
-    from app.services.substrate.resonance import (
-        author_geometry_signature as _author_geometry,
-    )
-
-    frontmatter: Dict[str, Any] = {
-        "lemma": lemma,
-        "pos": pos,
-        "hz": hz,
-        "semantic_field": semantic_field,
-    }
+    token: Dict[str, Any] = {"lemma": lemma, "pos": pos, "hz": hz, "field": semantic_field}
     if surface is not None:
-        frontmatter["surface"] = surface
+        token["surface"] = surface
+    return ingest_word_cells(session, [token])[0]
 
-    name = lemma_pos_key(lemma, pos)
-    blueprint_id = frontmatter_to_blueprint(session, frontmatter, BID_word())
-    ctor_id = frontmatter_to_structured_ctor(session, frontmatter)
-    access_id = body_to_access_recipe(session, "", blueprint_id)
-    cell = make_cell(
-        session,
-        name=name,
-        domain="word",
-        blueprint=blueprint_id,
-        access=access_id,
-        ctor=ctor_id,
-        source_path=None,
-    )
 
-    # Resonance signature: the word fires at its harmonic.
-    _author_geometry(session, cell.cell_id, {}, arity_hz=int(hz))
+def ingest_word_cells(
+    session: Session, tokens: List[Dict[str, Any]]
+) -> List[Tuple[Any, NodeID, NodeID]]:
+    """`ingest_word_cell` for a run of word tokens as `tokenize_words` emits them.
 
-    return cell, blueprint_id, ctor_id
+    Returns (cell, blueprint_id, ctor_id) per token, in order. Blueprints,
+    CTORs and HARMONIC_AT edges for all tokens are interned one layer at a
+    time through `intern_many`, so `count` still moves once per token.
+    Each distinct word-cell is bound once, to its last token's shapes —
+    what a token-by-token loop leaves behind.
+    """
+    from app.services.substrate.resonance import harmonic_at_edges, hz_cell
+
+    if not tokens:
+        return []
+    frontmatters: List[Dict[str, Any]] = []
+    for t in tokens:
+        frontmatter: Dict[str, Any] = {
+            "lemma": t["lemma"],
+            "pos": t["pos"],
+            "hz": t["hz"],
+            "semantic_field": t["field"],
+        }
+        if t.get("surface") is not None:
+            frontmatter["surface"] = t["surface"]
+        frontmatters.append(frontmatter)
+
+    blueprint_ids = frontmatters_to_blueprints(session, frontmatters, BID_word())
+    # A word's CTOR is its frontmatter as a structured dict value.
+    ctor_ids = structured_value_recipes(session, frontmatters)
+    access_id = body_to_access_recipe(session, "", BID_word())
+
+    names = [lemma_pos_key(t["lemma"], t["pos"]) for t in tokens]
+    last_token = {name: i for i, name in enumerate(names)}
+    cells = {
+        name: make_cell(
+            session,
+            name=name,
+            domain="word",
+            blueprint=blueprint_ids[i],
+            access=access_id,
+            ctor=ctor_ids[i],
+            source_path=None,
+        )
+        for name, i in last_token.items()
+    }
+
+    # Resonance signature: each word fires at its harmonic.
+    hz_cells = {hz: hz_cell(session, hz) for hz in dict.fromkeys(int(t["hz"]) for t in tokens)}
+    harmonic_at_edges(session, [
+        (cells[name].cell_id, hz_cells[int(t["hz"])].cell_id)
+        for name, t in zip(names, tokens)
+    ])
+
+    return [
+        (cells[name], blueprint_ids[i], ctor_ids[i])
+        for i, name in enumerate(names)
+    ]
 
 
 def artifact_kind_hz(kind: str) -> int:
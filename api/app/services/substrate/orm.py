@@ -1,6 +1,6 @@
 """SQLAlchemy ORM models for the coherence-substrate.
 
-Two tables form the kernel:
+Two tables form the kernel, plus a derived index and an allocator:
 
 - substrate_nodes: the per-level interning store. Identity is content-addressed
   by (package, level, domain, serialized). The UNIQUE constraint on those
@@ -11,7 +11,16 @@ Two tables form the kernel:
 - substrate_named_cells: the registry of named instances. Each cell is
   (Recipe access, Base blueprint, Name, CTOR recipe).
 
-Both tables work portably on SQLite and PostgreSQL (per CLAUDE.md schema
+- substrate_node_children: the reverse index over composite shapes. One
+  row per position of a composite's serialized form (position 0 is the
+  category, 1..n the children), so "which recipes carry this child?"
+  is an indexed lookup instead of a LIKE scan over `serialized`.
+
+- substrate_instance_seq: one counter row per (package, level, type), so a
+  fresh shape's instance number is a single atomic UPDATE instead of a
+  COUNT(*) over every shape of that type.
+
+All tables work portably on SQLite and PostgreSQL (per CLAUDE.md schema
 discipline). No JSONB, no SERIAL — everything is portable types.
 """
 from __future__ import annotations
@@ -99,3 +108,48 @@ class SubstrateNamedCellORM(Base):
         UniqueConstraint("domain", "name", name="uq_substrate_cell"),
         Index("ix_substrate_cell_blueprint", "blueprint_node_id"),
     )
+
+
+class SubstrateNodeChildORM(Base):
+    """One position of a composite shape, keyed for reverse lookup.
+
+    Derived from `SubstrateNodeORM.serialized` at intern time — the
+    serialized string stays canonical; these rows only make the walk
+    from a child back to its parents indexable. Position 0 holds the
+    category, positions 1..n the children in order.
+    """
+
+    __tablename__ = "substrate_node_children"
+
+    parent_db_id = Column(
+        Integer, ForeignKey("substrate_nodes.node_id"), primary_key=True
+    )
+    position = Column(Integer, primary_key=True)
+    child_package = Column(Integer, nullable=False)
+    child_level = Column(Integer, nullable=False)
+    child_type = Column(Integer, nullable=False)
+    child_instance = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index(
+            "ix_substrate_child_lookup",
+            "child_package", "child_level", "child_type", "child_instance",
+        ),
+    )
+
+
+class SubstrateInstanceSeqORM(Base):
+    """Last instance number handed out for one (package, level, type).
+
+    Seeded lazily from MAX(instance) the first time a key is allocated, so
+    lattices interned before the table existed continue without collision.
+    Incremented inside the interning transaction: a rolled-back intern
+    rolls its number back too, and instances stay dense.
+    """
+
+    __tablename__ = "substrate_instance_seq"
+
+    package = Column(Integer, primary_key=True)
+    level = Column(Integer, primary_key=True)
+    type_ = Column("type", Integer, primary_key=True)
+    last_instance = Column(Integer, nullable=False)
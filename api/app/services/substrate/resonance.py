@@ -50,10 +50,13 @@ from app.services.substrate.category import (
     RResonance,
     RType,
 )
+from app.services.substrate import resonance_index
 from app.services.substrate.kernel import (
+    DOMAIN_RECIPE,
     NamedCell,
     NodeID,
     Recipe,
+    intern_many,
     lookup_cell,
     make_cell,
 )
@@ -213,9 +216,11 @@ def _resonance_recipe(verb: RResonance, source: NodeID, target: NodeID) -> Recip
 
 
 def _edge(session: Session, verb: RResonance, source_db_id: int, target_db_id: int) -> NodeID:
-    return _resonance_recipe(
+    node_id = _resonance_recipe(
         verb, cell_ref(source_db_id), cell_ref(target_db_id)
     ).make_self_id(session)
+    resonance_index.note_edge(session, verb, source_db_id, target_db_id)
+    return node_id
 
 
 def shapes_edge(session: Session, source_db_id: int, target_db_id: int) -> NodeID:
@@ -228,6 +233,20 @@ def harmonic_at_edge(session: Session, source_db_id: int, hz_db_id: int) -> Node
     return _edge(session, RResonance.HARMONIC_AT, source_db_id, hz_db_id)
 
 
+def harmonic_at_edges(
+    session: Session, pairs: List[Tuple[int, int]]
+) -> List[NodeID]:
+    """`harmonic_at_edge` for many (source, hz cell) pairs, in one `intern_many`."""
+    verb = NodeID(1, Level.BASIC, RBasic.RESONANCE, RResonance.HARMONIC_AT)
+    node_ids = intern_many(session, DOMAIN_RECIPE, [
+        (verb, [cell_ref(source_db_id), cell_ref(hz_db_id)])
+        for source_db_id, hz_db_id in pairs
+    ])
+    for source_db_id, hz_db_id in dict.fromkeys(pairs):
+        resonance_index.note_edge(session, RResonance.HARMONIC_AT, source_db_id, hz_db_id)
+    return node_ids
+
+
 def embeds_in_edge(session: Session, source_db_id: int, dim_db_id: int) -> NodeID:
     """source -EMBEDS_IN-> dimension_cell. Returns interned Recipe NodeID."""
     return _edge(session, RResonance.EMBEDS_IN, source_db_id, dim_db_id)
@@ -404,43 +423,33 @@ def find_cells_via_resonance(
     target_db_id=triad_cell.cell_id)` returns every concept that authored a
     SHAPES edge to ~Triad — the cross-discipline triadic family.
 
-    Implementation walks `substrate_nodes.serialized`: a SHAPES edge serializes
-    as `"1.2.21.1+1.1.9.<src>+1.1.9.<tgt>"` where 1.2.21.1 is the SHAPES verb
-    category and 1.1.9.<id> is a cell_ref. The query matches verb-prefix +
-    target-suffix, then parses the source ref out.
+    A SHAPES edge is the recipe `<verb_category> + cell_ref(src) +
+    cell_ref(tgt)`, so the reverse child index answers this directly: every
+    resonance recipe headed by the verb with the target's cell_ref in
+    position 2, read back for the source in position 1.
     """
-    from app.services.substrate.orm import SubstrateNodeORM
-    from app.services.substrate.kernel import DOMAIN_RECIPE
+    from app.services.substrate.kernel import (
+        DOMAIN_RECIPE,
+        children_of,
+        find_parents_with_child,
+    )
 
-    # Category prefix is the verb's NodeID stringified, plus the child separator.
     verb_category = NodeID(1, Level.BASIC, RBasic.RESONANCE, verb)
-    verb_prefix = f"{verb_category}+"
-    # Target suffix is the cell_ref for the target.
-    target_ref = cell_ref(target_db_id)
-    target_suffix = f"+{target_ref}"
-
-    rows = (
-        session.query(SubstrateNodeORM)
-        .filter(
-            SubstrateNodeORM.domain == DOMAIN_RECIPE,
-            SubstrateNodeORM.type_ == RBasic.RESONANCE,
-            SubstrateNodeORM.serialized.like(f"{verb_prefix}%{target_suffix}"),
-        )
-        .all()
+    parent_ids = find_parents_with_child(
+        session,
+        cell_ref(target_db_id),
+        position=2,
+        domain=DOMAIN_RECIPE,
+        type_=RBasic.RESONANCE,
+        category=verb_category,
     )
 
     source_db_ids: List[int] = []
-    for row in rows:
-        # serialized = "<verb_category>+<source_ref>+<target_ref>"
-        parts = row.serialized.split("+")
+    for parts in children_of(session, parent_ids).values():
+        # parts = [verb_category, source_ref, target_ref]
         if len(parts) != 3:
             continue
-        src_ref_str = parts[1]  # "1.1.9.<src_db_id>"
-        try:
-            src_db_id = int(src_ref_str.split(".")[-1])
-        except ValueError:
-            continue
-        source_db_ids.append(src_db_id)
+        source_db_ids.append(parts[1].instance)
     return source_db_ids
 
 
@@ -540,43 +549,28 @@ def cell_resonance_signature(session: Session, cell_db_id: int) -> set:
     across all authored resonance axes — they sit at the same coordinate in
     the lattice's continuous coherence space.
     """
-    from app.services.substrate.orm import SubstrateNodeORM
-    from app.services.substrate.kernel import DOMAIN_RECIPE
-
-    source_ref_str = str(cell_ref(cell_db_id))
-
-    rows = (
-        session.query(SubstrateNodeORM)
-        .filter(
-            SubstrateNodeORM.domain == DOMAIN_RECIPE,
-            SubstrateNodeORM.type_ == RBasic.RESONANCE,
-            SubstrateNodeORM.serialized.like(f"%{source_ref_str}%"),
-        )
-        .all()
+    from app.services.substrate.kernel import (
+        DOMAIN_RECIPE,
+        children_of,
+        find_parents_with_child,
+    )
+
+    ref = cell_ref(cell_db_id)
+    parent_ids = find_parents_with_child(
+        session, ref, domain=DOMAIN_RECIPE, type_=RBasic.RESONANCE,
     )
 
     signature: set = set()
-    for row in rows:
-        parts = row.serialized.split("+")
+    for parts in children_of(session, parent_ids).values():
         if len(parts) != 3:
             continue
-        verb_str, src_ref_str, tgt_ref_str = parts
-        try:
-            verb_instance = int(verb_str.split(".")[-1])
-        except (ValueError, IndexError):
-            continue
-        if src_ref_str == source_ref_str:
-            try:
-                signature.add((verb_instance, int(tgt_ref_str.split(".")[-1])))
-            except (ValueError, IndexError):
-                continue
-        elif tgt_ref_str == source_ref_str:
+        verb, src, tgt = parts
+        if src == ref:
+            signature.add((verb.instance, tgt.instance))
+        elif tgt == ref:
             # Cell appears as target of a commutative edge — still in its
             # signature, normalized to (verb, other_db_id).
-            try:
-                signature.add((verb_instance, int(src_ref_str.split(".")[-1])))
-            except (ValueError, IndexError):
-                continue
+            signature.add((verb.instance, src.instance))
     return signature
 
 
@@ -0,0 +1,264 @@
+"""Sparse resonance-signature index — batched coherence over every cell.
+
+`coherence_score(A, B)` reads both signatures from SQL, so "which cells
+are most coherent with this concept?" used to cost two signature walks
+per candidate, O(N) queries per question. This module holds every
+cell's signature at once as a sparse incidence matrix:
+
+- rows are cells (NamedCell.cell_id),
+- columns are interned (verb_instance, other_cell_id) features,
+- `postings` is the transposed view: feature -> cells carrying it.
+
+A top-k query for one cell is a sparse row × matrixᵀ product: walk the
+postings of the cell's features, count the overlap per candidate, and
+turn each count into Jaccard with the row sizes. `all_pairs` is the
+same product over every row. Only cells that overlap on at least one
+feature are ever touched.
+
+The signature semantics are exactly `cell_resonance_signature`: a cell
+carries (verb, target) for every resonance edge it sources and
+(verb, source) for every edge it is the target of.
+
+Freshness: the index is built lazily per database bind. Every resonance
+edge authored through `resonance._edge` (so `author_geometry_signature`
+and all the edge constructors) updates the two affected rows in place
+when its session commits; rolled-back edges never reach it.
+substrate.resonance_index_max_age_seconds (default 300) rebuilds it as a
+backstop for writers outside this process.
+"""
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config_loader import get_float
+from app.services.substrate.category import RBasic
+from app.services.substrate.kernel import DOMAIN_RECIPE, children_of
+from app.services.substrate.orm import SubstrateNodeORM
+
+
+Feature = Tuple[int, int]  # (verb_instance, other_cell_id)
+
+
+class ResonanceIndex:
+    """Cells × (verb, other) incidence, stored row-wise and column-wise."""
+
+    def __init__(self) -> None:
+        self.built_at = time.monotonic()
+        self._feature_ids: Dict[Feature, int] = {}
+        self._features: List[Feature] = []
+        self.rows: Dict[int, Set[int]] = {}
+        self.postings: Dict[int, Set[int]] = {}
+
+    # -- construction ------------------------------------------------------
+
+    @classmethod
+    def build(cls, session: Session) -> "ResonanceIndex":
+        """One pass over every resonance recipe via the child index."""
+        index = cls()
+        parent_ids = [
+            row[0]
+            for row in session.query(SubstrateNodeORM.node_id).filter(
+                SubstrateNodeORM.domain == DOMAIN_RECIPE,
+                SubstrateNodeORM.type_ == RBasic.RESONANCE,
+            )
+        ]
+        for start in range(0, len(parent_ids), 500):
+            chunk = parent_ids[start:start + 500]
+            for parts in children_of(session, chunk).values():
+                if len(parts) != 3:
+                    continue
+                verb, src, tgt = parts
+                index.add_edge(verb.instance, src.instance, tgt.instance)
+        return index
+
+    def _fid(self, feature: Feature) -> int:
+        fid = self._feature_ids.get(feature)
+        if fid is None:
+            fid = len(self._features)
+            self._features.append(feature)
+            self._feature_ids[feature] = fid
+        return fid
+
+    def _add(self, cell_id: int, feature: Feature) -> None:
+        fid = self._fid(feature)
+        self.rows.setdefault(cell_id, set()).add(fid)
+        self.postings.setdefault(fid, set()).add(cell_id)
+
+    def add_edge(self, verb_instance: int, source_id: int, target_id: int) -> None:
+        """Incremental row update for one resonance edge."""
+        self._add(source_id, (verb_instance, target_id))
+        self._add(target_id, (verb_instance, source_id))
+
+    # -- reads -------------------------------------------------------------
+
+    def signature(self, cell_id: int) -> Set[Feature]:
+        return {self._features[fid] for fid in self.rows.get(cell_id, ())}
+
+    def score(self, cell_a: int, cell_b: int) -> float:
+        """Jaccard, identical to `coherence_score` (both empty -> 1.0)."""
+        a = self.rows.get(cell_a, set())
+        b = self.rows.get(cell_b, set())
+        union = len(a | b)
+        if not union:
+            return 1.0
+        return len(a & b) / union
+
+    def distance(self, cell_a: int, cell_b: int) -> int:
+        """Symmetric-difference size, identical to `coherence_distance`."""
+        return len(self.rows.get(cell_a, set()) ^ self.rows.get(cell_b, set()))
+
+    def _overlaps(self, cell_id: int) -> Counter:
+        counts: Counter = Counter()
+        for fid in self.rows.get(cell_id, ()):
+            counts.update(self.postings[fid])
+        counts.pop(cell_id, None)
+        return counts
+
+    def top_k(
+        self,
+        cell_id: int,
+        k: int = 10,
+        *,
+        min_score: float = 0.0,
+    ) -> List[Tuple[int, float]]:
+        """The k cells most coherent with cell_id, best first.
+
+        Cells sharing no feature score 0 and are never returned. Ties
+        break on the lower cell id so results are stable.
+        """
+        size = len(self.rows.get(cell_id, ()))
+        scored = []
+        for other, inter in self._overlaps(cell_id).items():
+            score = inter / (size + len(self.rows[other]) - inter)
+            if score >= min_score:
+                scored.append((score, other))
+        best = heapq.nsmallest(k, scored, key=lambda item: (-item[0], item[1]))
+        return [(other, score) for score, other in best]
+
+    def all_pairs(self, threshold: float, *, limit: Optional[int] = None) -> List[Tuple[int, int, float]]:
+        """Every (a, b, score) with a < b and score >= threshold, best first.
+
+        threshold must be > 0: pairs with no shared feature are never
+        enumerated.
+        """
+        if threshold <= 0:
+            raise ValueError("threshold must be > 0")
+        pairs: List[Tuple[int, int, float]] = []
+        for cell_id in sorted(self.rows):
+            size = len(self.rows[cell_id])
+            for other, inter in self._overlaps(cell_id).items():
+                if other <= cell_id:
+                    continue
+                score = inter / (size + len(self.rows[other]) - inter)
+                if score >= threshold:
+                    pairs.append((cell_id, other, score))
+        pairs.sort(key=lambda p: (-p[2], p[0], p[1]))
+        return pairs if limit is None else pairs[:limit]
+
+    def stats(self) -> dict:
+        return {
+            "cells": len(self.rows),
+            "features": len(self._features),
+            "nonzeros": sum(len(r) for r in self.rows.values()),
+            "age_seconds": round(time.monotonic() - self.built_at, 3),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Process-wide index, one per database bind
+# ---------------------------------------------------------------------------
+
+
+_LOCK = threading.RLock()
+_STATE: dict = {"bind": None, "index": None}
+
+
+def get_index(session: Session) -> ResonanceIndex:
+    """The index for this session's database, built or rebuilt as needed."""
+    bind = session.get_bind()
+    with _LOCK:
+        index: Optional[ResonanceIndex] = _STATE["index"]
+        max_age = get_float("substrate", "resonance_index_max_age_seconds", 300.0)
+        if (
+            index is None
+            or _STATE["bind"] is not bind
+            or time.monotonic() - index.built_at >= max_age
+        ):
+            index = ResonanceIndex.build(session)
+            _STATE["bind"] = bind
+            _STATE["index"] = index
+        return index
+
+
+_PENDING_EDGES_KEY = "resonance_index.pending_edges"
+
+
+def note_edge(session: Session, verb_instance: int, source_id: int, target_id: int) -> None:
+    """Fold a freshly authored resonance edge into the built index once it commits.
+
+    The edge waits in session.info until the session's after_commit hook;
+    a rollback drops it, so readers never score an edge that was undone.
+    """
+    pending = session.info.get(_PENDING_EDGES_KEY)
+    if pending is None:
+        pending = session.info[_PENDING_EDGES_KEY] = []
+        if not event.contains(session, "after_commit", _fold_committed_edges):
+            event.listen(session, "after_commit", _fold_committed_edges)
+            event.listen(session, "after_rollback", _drop_pending_edges)
+    pending.append((session.get_bind(), int(verb_instance), source_id, target_id))
+
+
+def _fold_committed_edges(session: Session) -> None:
+    pending = session.info.pop(_PENDING_EDGES_KEY, None)
+    if not pending:
+        return
+    with _LOCK:
+        index: Optional[ResonanceIndex] = _STATE["index"]
+        if index is None:
+            return
+        for bind, verb_instance, source_id, target_id in pending:
+            if _STATE["bind"] is bind:
+                index.add_edge(verb_instance, source_id, target_id)
+
+
+def _drop_pending_edges(session: Session) -> None:
+    session.info.pop(_PENDING_EDGES_KEY, None)
+
+
+def invalidate() -> None:
+    """Drop the index; the next read rebuilds it."""
+    with _LOCK:
+        _STATE["bind"] = None
+        _STATE["index"] = None
+
+
+def most_coherent(
+    session: Session,
+    cell_id: int,
+    k: int = 10,
+    *,
+    min_score: float = 0.0,
+) -> List[Tuple[int, float]]:
+    """[(cell_id, score)] for the k cells most coherent with cell_id."""
+    index = get_index(session)
+    with _LOCK:
+        return index.top_k(cell_id, k, min_score=min_score)
+
+
+def coherent_pairs(
+    session: Session,
+    threshold: float,
+    *,
+    limit: Optional[int] = None,
+) -> List[Tuple[int, int, float]]:
+    """[(cell_a, cell_b, score)] for every pair at or above threshold."""
+    index = get_index(session)
+    with _LOCK:
+        return index.all_pairs(threshold, limit=limit)
@@ -23,9 +23,10 @@ substrate is the source of truth.
 """
 from __future__ import annotations
 
-from typing import Optional
+from typing import Dict, Iterable, Optional
 
-from sqlalchemy import Column, Integer, Text, UniqueConstraint
+from sqlalchemy import Column, Integer, Text, UniqueConstraint, event
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.services.unified_db import Base
@@ -58,6 +59,29 @@ class SubstrateStringORM(Base):
 # ---------------------------------------------------------------------------
 
 
+# Strings resolved in this session: value -> instance. Rows are never
+# rewritten, so an entry stays true until its transaction rolls back.
+# Ingest resolves the same keys, lemmas and punctuation over and over.
+_STRING_CACHE_KEY = "substrate_string_cache"
+_STRING_CACHE_MAX = 65536
+
+# Values per IN chunk — one bound parameter each.
+_BATCH_CHUNK = 500
+
+
+def _string_cache(session: Session) -> Dict[str, int]:
+    cache = session.info.get(_STRING_CACHE_KEY)
+    if cache is None or len(cache) >= _STRING_CACHE_MAX:
+        cache = session.info[_STRING_CACHE_KEY] = {}
+    return cache
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_string_cache(session: Session, previous_transaction) -> None:
+    # Strings inserted by the rolled-back transaction no longer exist.
+    session.info.pop(_STRING_CACHE_KEY, None)
+
+
 def intern_string_instance(session: Session, value: str) -> int:
     """Get the substrate-resident instance for `value`. Allocates if new.
 
@@ -67,18 +91,24 @@ def intern_string_instance(session: Session, value: str) -> int:
     auto-increment counter (or by allocate-on-first-insert when no
     AUTOINCREMENT is available).
     """
+    cache = _string_cache(session)
+    cached = cache.get(value)
+    if cached is not None:
+        return cached
     existing = (
         session.query(SubstrateStringORM)
         .filter_by(value=value)
         .one_or_none()
     )
     if existing is not None:
+        cache[value] = existing.instance
         return existing.instance
 
     row = SubstrateStringORM(value=value)
     session.add(row)
     try:
         session.flush()
+        cache[value] = row.instance
         return row.instance
     except Exception:
         # Race lost — another process inserted the same value.
@@ -93,6 +123,36 @@ def intern_string_instance(session: Session, value: str) -> int:
         return existing.instance
 
 
+def intern_string_instances(session: Session, values: Iterable[str]) -> Dict[str, int]:
+    """`intern_string_instance` for many values: {value: instance}.
+
+    Known values resolve in one query per chunk and new ones are inserted
+    together, in first-seen order. Later single-value calls in the same
+    session are answered from the session cache.
+    """
+    cache = _string_cache(session)
+    wanted = list(dict.fromkeys(values))
+    missing = [v for v in wanted if v not in cache]
+    for start in range(0, len(missing), _BATCH_CHUNK):
+        chunk = missing[start:start + _BATCH_CHUNK]
+        for row in session.query(SubstrateStringORM).filter(
+            SubstrateStringORM.value.in_(chunk)
+        ):
+            cache[row.value] = row.instance
+    fresh = [SubstrateStringORM(value=v) for v in missing if v not in cache]
+    if fresh:
+        session.add_all(fresh)
+        try:
+            session.flush()
+        except IntegrityError:
+            # Race lost on some value — resolve one at a time after the rollback.
+            session.rollback()
+            return {v: intern_string_instance(session, v) for v in wanted}
+        for row in fresh:
+            cache[row.value] = row.instance
+    return {v: cache[v] for v in wanted}
+
+
 def lookup_string_value(session: Session, instance: int) -> Optional[str]:
     """Reverse lookup: given an instance number, return the original string."""
     row = (
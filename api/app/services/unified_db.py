@@ -6,6 +6,23 @@ All services import from here instead of managing their own connections.
 Configuration:
   - api/config/api.json and ~/.coherence-network/config.json provide database.url.
   - Otherwise defaults to sqlite:///data/coherence.db (works out of the box).
+
+Engine registry: every store that talks to a database (this module, the
+runtime event store, agent tasks, runner registry, agent run state,
+commit evidence) gets its engine from ``shared_engine(url, owner=...,
+cache=...)``. There is one engine, and so one connection pool, per URL
+no matter how many stores point at it. ``dispose_engine`` (and so
+``reset_engine``) clears every owner's cache that still holds the
+disposed engine, so no store keeps using it. The automation-usage egress
+probe is the exception: it keeps a NullPool engine of its own with a
+short connect timeout, so a slow database fails the probe fast.
+File-backed SQLite is pooled too. Each pooled connection runs the WAL
+pragmas once, when it is opened, not on every session. Pool sizing
+comes from the ``database`` config section: ``pool_size`` (5),
+``max_overflow`` (10), ``pool_timeout_seconds`` (30),
+``pool_recycle_seconds`` (1800), and ``connect_timeout_seconds`` (10,
+Postgres only). ``pool_stats()`` reports every pool, the stores using
+it, and its connect/checkout counters.
 """
 
 from __future__ import annotations
@@ -18,7 +35,7 @@ from typing import Any, Generator
 from sqlalchemy import create_engine, event
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import NullPool
+from sqlalchemy.engine import make_url
 
 from app.db.base import Base
 
@@ -29,7 +46,15 @@ from app.db.base import Base
 
 _ENGINE_CACHE: dict[str, Any] = {"url": "", "engine": None, "sessionmaker": None}
 _SCHEMA_LOCK = threading.Lock()
-_SCHEMA_INITIALIZED: dict[str, bool] = {}
+# url -> how many Base.metadata tables create_all has covered. Modules
+# imported later (lazily loaded routers and their services) can register
+# more tables; ensure_schema() runs create_all again when the count grows.
+_SCHEMA_INITIALIZED: dict[str, int] = {}
+
+# (url, connect_timeout) -> {"engine", "owners", "caches", "counters"};
+# see shared_engine().
+_ENGINES: dict[tuple[str, int | None], dict[str, Any]] = {}
+_ENGINES_LOCK = threading.Lock()
 
 
 def _normalize_engine_cache() -> dict[str, Any]:
@@ -81,18 +106,48 @@ POSTGRES_STARTUP_OPTIONS = (
 )
 
 
-def _create_engine(url: str):
-    kwargs: dict[str, Any] = {"pool_pre_ping": True}
+def _is_memory_sqlite(url: str) -> bool:
+    try:
+        database = make_url(url).database
+    except Exception:
+        return False
+    return database in (None, "", ":memory:") or "mode=memory" in url
+
+
+def _pool_settings() -> dict[str, Any]:
+    from app.config_loader import get_float, get_int
+
+    return {
+        "pool_size": max(1, get_int("database", "pool_size", 5)),
+        "max_overflow": max(0, get_int("database", "max_overflow", 10)),
+        "pool_timeout": max(0.1, get_float("database", "pool_timeout_seconds", 30.0)),
+        "pool_recycle": get_int("database", "pool_recycle_seconds", 1800),
+    }
+
+
+def _create_engine(url: str, connect_timeout: int | None = None):
+    kwargs: dict[str, Any] = {}
     if url.startswith("sqlite"):
         kwargs["connect_args"] = {"check_same_thread": False}
-        kwargs["poolclass"] = NullPool
+        if not _is_memory_sqlite(url):
+            # Pooled: a connection (and its pragmas) outlives the session.
+            kwargs.update(_pool_settings())
     elif url.startswith("postgres"):
         # Stone: bound how long any statement waits on a lock or sits idle in a
         # transaction, so a hot-row write can NEVER wedge the whole write lane
         # for hours (as substrate_nodes.count did, 3x on 2026-07-02, each time
         # needing a manual pg_terminate_backend). A blocked writer now fails
         # fast and the app retries; a stuck-open transaction is reaped.
-        kwargs["connect_args"] = {"options": POSTGRES_STARTUP_OPTIONS}
+        from app.config_loader import get_int
+
+        kwargs["pool_pre_ping"] = True
+        kwargs["connect_args"] = {
+            "options": POSTGRES_STARTUP_OPTIONS,
+            "connect_timeout": connect_timeout or max(1, get_int("database", "connect_timeout_seconds", 10)),
+        }
+        kwargs.update(_pool_settings())
+    else:
+        kwargs["pool_pre_ping"] = True
     eng = create_engine(url, **kwargs)
     # Enable WAL mode for SQLite — better concurrent read/write performance
     if url.startswith("sqlite"):
@@ -106,6 +161,104 @@ def _create_engine(url: str):
     return eng
 
 
+def _count_pool_events(eng, counters: dict[str, int]) -> None:
+    def bump(key: str):
+        def listener(*_args) -> None:
+            counters[key] += 1
+        return listener
+
+    for name, key in (
+        ("connect", "connects"),
+        ("checkout", "checkouts"),
+        ("checkin", "checkins"),
+        ("invalidate", "invalidations"),
+    ):
+        event.listen(eng, name, bump(key))
+
+
+def shared_engine(
+    url: str,
+    *,
+    owner: str = "unified_db",
+    cache: dict[str, Any] | None = None,
+    connect_timeout: int | None = None,
+):
+    """The one engine (and pool) for ``url``, created on first use.
+
+    ``owner`` names the store asking; it only shows up in ``pool_stats``.
+    ``cache`` is the store's {"url", "engine", "sessionmaker"} dict;
+    disposing the engine empties it so the store asks again.
+    ``connect_timeout`` (seconds, PostgreSQL only) overrides
+    database.connect_timeout_seconds; engines are keyed on it too, so a
+    caller that needs a shorter one gets its own registered pool.
+    """
+    if not url.startswith("postgres"):
+        connect_timeout = None
+    key = (url, connect_timeout)
+    with _ENGINES_LOCK:
+        entry = _ENGINES.get(key)
+        if entry is None:
+            counters = {"connects": 0, "checkouts": 0, "checkins": 0, "invalidations": 0, "disposals": 0}
+            eng = _create_engine(url, connect_timeout)
+            _count_pool_events(eng, counters)
+            entry = _ENGINES[key] = {"engine": eng, "owners": set(), "caches": [], "counters": counters}
+        entry["owners"].add(owner)
+        if cache is not None and not any(c is cache for c in entry["caches"]):
+            entry["caches"].append(cache)
+        return entry["engine"]
+
+
+def dispose_engine(url: str) -> None:
+    """Close the pooled connections for ``url`` and drop it from the registry.
+
+    Covers every engine registered for ``url``, whatever its connect
+    timeout. Every owner's cache still holding one is emptied; the next
+    ``shared_engine(url)`` builds a fresh one.
+    """
+    with _ENGINES_LOCK:
+        entries = [_ENGINES.pop(key) for key in [key for key in _ENGINES if key[0] == url]]
+    for entry in entries:
+        for cache in entry["caches"]:
+            if cache.get("engine") is entry["engine"]:
+                cache.update({"url": "", "engine": None, "sessionmaker": None})
+        entry["counters"]["disposals"] += 1
+        try:
+            entry["engine"].dispose()
+        except Exception:
+            pass
+
+
+def _redact_url(url: str) -> str:
+    try:
+        return make_url(url).render_as_string(hide_password=True)
+    except Exception:
+        return url
+
+
+def pool_stats() -> list[dict[str, Any]]:
+    """Live status and lifetime counters for every registered pool."""
+    with _ENGINES_LOCK:
+        entries = [(key, dict(e)) for key, e in _ENGINES.items()]
+    stats: list[dict[str, Any]] = []
+    for (url, connect_timeout), entry in sorted(entries, key=lambda item: (item[0][0], item[0][1] or 0)):
+        pool = entry["engine"].pool
+        row: dict[str, Any] = {
+            "url": _redact_url(url),
+            "owners": sorted(entry["owners"]),
+            "pool": type(pool).__name__,
+            **dict(entry["counters"]),
+        }
+        if connect_timeout is not None:
+            row["connect_timeout"] = connect_timeout
+        for key, method in (("size", "size"), ("checked_in", "checkedin"),
+                            ("checked_out", "checkedout"), ("overflow", "overflow")):
+            fn = getattr(pool, method, None)
+            if callable(fn):
+                row[key] = fn()
+        stats.append(row)
+    return stats
+
+
 def _create_all_idempotent(*, bind, url: str) -> None:
     try:
         Base.metadata.create_all(bind=bind, checkfirst=True)
@@ -123,7 +276,7 @@ def engine():
     url = database_url()
     if cache["engine"] is not None and cache["url"] == url:
         return cache["engine"]
-    eng = _create_engine(url)
+    eng = shared_engine(url, cache=cache)
     session_factory = sessionmaker(
         bind=eng, autocommit=False, autoflush=False, expire_on_commit=False,
     )
@@ -133,8 +286,9 @@ def engine():
     # Auto-create tables on new engine (safe: checkfirst=True)
     try:
         from app.services import unified_models  # noqa: F401
+        tables = len(Base.metadata.tables)
         _create_all_idempotent(bind=eng, url=url)
-        _SCHEMA_INITIALIZED[url] = True
+        _SCHEMA_INITIALIZED[url] = tables
     except Exception:
         pass
     return eng
@@ -162,7 +316,11 @@ def session() -> Generator[Session, None, None]:
 
 
 def ensure_schema() -> None:
-    """Create all registered tables if they don't exist."""
+    """Create all registered tables if they don't exist.
+
+    Cheap once the schema is current; tables registered since the last
+    pass are created on the next call.
+    """
     # Import unified_models to ensure all table definitions are registered
     try:
         from app.services import unified_models  # noqa: F401
@@ -171,20 +329,18 @@ def ensure_schema() -> None:
     eng = engine()
     url = database_url()
     with _SCHEMA_LOCK:
-        if _SCHEMA_INITIALIZED.get(url):
+        tables = len(Base.metadata.tables)
+        if _SCHEMA_INITIALIZED.get(url, 0) >= tables:
             return
         _create_all_idempotent(bind=eng, url=url)
-        _SCHEMA_INITIALIZED[url] = True
+        _SCHEMA_INITIALIZED[url] = tables
 
 
 def reset_engine() -> None:
     """Reset the engine cache. Useful for tests that switch databases."""
     cache = _normalize_engine_cache()
     if cache["engine"] is not None:
-        try:
-            cache["engine"].dispose()
-        except Exception:
-            pass
+        dispose_engine(cache["url"])
     cache["url"] = ""
     cache["engine"] = None
     cache["sessionmaker"] = None
@@ -101,10 +101,11 @@ from app.services.cc_treasury_service import (  # noqa: F401
 )
 
 # Graph models (Node + Edge universal data layer)
-from app.models.graph import Node, Edge  # noqa: F401
+from app.models.graph import Node, Edge, GraphGeneration  # noqa: F401
 
 # Read tracking + view event models
 from app.services.read_tracking_service import AssetReadDaily, AssetViewEvent  # noqa: F401
+from app.services.view_rollups import AssetViewRollup  # noqa: F401
 
 # Wallet models
 from app.services.wallet_service import WalletRecord  # noqa: F401
@@ -129,7 +130,9 @@ from app.services.proposal_service import ProposalRecord  # noqa: F401
 
 # Coherence-substrate — content-addressed numeric lattice (NUMS-shaped)
 from app.services.substrate.orm import (  # noqa: F401
+    SubstrateInstanceSeqORM,
     SubstrateNamedCellORM,
+    SubstrateNodeChildORM,
     SubstrateNodeORM,
 )
 from app.services.substrate.substrate_strings import (  # noqa: F401
@@ -0,0 +1,253 @@
+"""Long-range view queries across the hot rollups and the cold-tier archive.
+
+Answering "how many views did asset X get last quarter" once meant one
+``retrieve_day`` per archived day, fetched, verified and decoded in
+series. This module answers it as a single query. It merges two tiers:
+
+  · archived days come from per-day columnar summaries: per asset, the
+    view count, the anonymous count, referrer counts and a HyperLogLog
+    sketch of distinct viewers. A summary is built once from a streamed,
+    verified pass over the day's archive. It is written next to the gz
+    cache as ``summary-YYYY-MM-DD.json``, keyed by the tombstone
+    SHA-256, so a rewritten day (opt-out redaction) is summarised again.
+    Days with no summary yet are fetched in parallel, at most
+    ``view_archive.max_parallel_fetches`` at a time and at most
+    ``view_archive.max_summary_builds_per_request`` per query. Days past
+    that cap are reported under ``missing`` and summarised by the next
+    query that covers them.
+  · every other day comes from the ``day`` rollup rows.
+
+The rollup rows outlive the hot events they were folded from, so an
+archived day usually has both. The archive is the authority for the
+days it covers. Those days are excluded from the rollup read, so
+nothing is counted twice. An archived day that can't be fetched or
+verified falls back to its rollup rows, if any, and is reported under
+``days.fallback``; a day left for a later query (``missing``) does the
+same, so the answer is partial until every summary exists.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from app.config_loader import get_int
+from app.services import view_events_archive_service as archive
+from app.services import view_rollups
+from app.services.view_rollups import ViewerSketch, ViewTotals
+
+log = logging.getLogger(__name__)
+
+_SUMMARY_VERSION = 1
+
+
+def _max_parallel_fetches() -> int:
+    return max(1, min(get_int("view_archive", "max_parallel_fetches", 4), 16))
+
+
+def _max_summary_builds() -> int:
+    return max(1, get_int("view_archive", "max_summary_builds_per_request", 31))
+
+
+def _summary_path(day: date) -> Path:
+    return archive._CACHE_DIR / f"summary-{day.isoformat()}.json"
+
+
+def _encode_summary(tomb: archive.ViewEventsArchive, totals: dict[str, ViewTotals]) -> dict[str, Any]:
+    asset_ids = sorted(totals)
+    return {
+        "version": _SUMMARY_VERSION,
+        "day": tomb.day.isoformat(),
+        "sha256": tomb.sha256,
+        "asset_id": asset_ids,
+        "view_count": [totals[a].view_count for a in asset_ids],
+        "anonymous_count": [totals[a].anonymous_count for a in asset_ids],
+        "referrers": [totals[a].referrers for a in asset_ids],
+        "viewer_sketch": [base64.b64encode(totals[a].sketch.to_bytes()).decode("ascii") for a in asset_ids],
+    }
+
+
+def _decode_summary(payload: dict[str, Any], asset_ids: set[str] | None) -> dict[str, ViewTotals]:
+    day_key = payload["day"]
+    totals: dict[str, ViewTotals] = {}
+    for i, asset_id in enumerate(payload["asset_id"]):
+        if asset_ids is not None and asset_id not in asset_ids:
+            continue
+        count = int(payload["view_count"][i])
+        totals[asset_id] = ViewTotals(
+            view_count=count,
+            anonymous_count=int(payload["anonymous_count"][i]),
+            referrers=dict(payload["referrers"][i]),
+            sketch=ViewerSketch.from_bytes(base64.b64decode(payload["viewer_sketch"][i]) or None),
+            daily={day_key: count},
+        )
+    return totals
+
+
+def _load_summary(tomb: archive.ViewEventsArchive) -> dict[str, Any] | None:
+    path = _summary_path(tomb.day)
+    try:
+        payload = json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        log.warning("view_archive_query: unreadable summary %s: %s", path, e)
+        return None
+    if payload.get("version") != _SUMMARY_VERSION or payload.get("sha256") != tomb.sha256:
+        return None
+    return payload
+
+
+def _build_summary(tomb: archive.ViewEventsArchive) -> dict[str, Any]:
+    """Summarise one archived day from a verified streaming pass.
+
+    Raises ``ArchiveRetrievalError`` when the day can't be fetched or
+    verified; nothing is cached in that case.
+    """
+    totals: dict[str, ViewTotals] = {}
+    for ev in archive.DayStream(tomb).events():
+        asset_id = ev.get("asset_id")
+        if not asset_id:
+            continue
+        bucket = totals.get(asset_id)
+        if bucket is None:
+            bucket = totals[asset_id] = ViewTotals()
+        bucket.add_view(ev.get("contributor_id"), ev.get("referrer_contributor_id"), None)
+    payload = _encode_summary(tomb, totals)
+    path = _summary_path(tomb.day)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        part = path.with_name(f"{path.name}.{os.getpid()}.part")
+        part.write_text(json.dumps(payload, separators=(",", ":")))
+        os.replace(part, path)
+    except OSError as e:
+        log.warning("view_archive_query: could not write summary %s: %s", path, e)
+    return payload
+
+
+def _fetch(tomb: archive.ViewEventsArchive) -> tuple[date, dict[str, Any] | None, str | None]:
+    try:
+        return tomb.day, _build_summary(tomb), None
+    except archive.ArchiveRetrievalError as e:
+        log.warning("view_archive_query: archived day %s unavailable: %s", tomb.day, e)
+        return tomb.day, None, str(e)
+
+
+def _cold_totals(
+    tombs: list[archive.ViewEventsArchive],
+    asset_ids: set[str] | None,
+) -> tuple[dict[str, ViewTotals], list[date], dict[str, Any], list[date]]:
+    """Merged archive totals, the days they cover, what it took, and the days deferred."""
+    payloads: dict[date, dict[str, Any]] = {}
+    missing: list[archive.ViewEventsArchive] = []
+    for tomb in tombs:
+        payload = _load_summary(tomb)
+        if payload is None:
+            missing.append(tomb)
+        else:
+            payloads[tomb.day] = payload
+    missing.sort(key=lambda tomb: tomb.day)
+    deferred = [tomb.day for tomb in missing[_max_summary_builds():]]
+    missing = missing[:_max_summary_builds()]
+
+    failed: list[dict[str, str]] = []
+    if missing:
+        with ThreadPoolExecutor(
+            max_workers=min(_max_parallel_fetches(), len(missing)),
+            thread_name_prefix="view-archive-fetch",
+        ) as pool:
+            for day, payload, error in pool.map(_fetch, missing):
+                if payload is None:
+                    failed.append({"day": day.isoformat(), "error": error or "unavailable"})
+                else:
+                    payloads[day] = payload
+
+    totals: dict[str, ViewTotals] = {}
+    for day in sorted(payloads):
+        for asset_id, day_totals in _decode_summary(payloads[day], asset_ids).items():
+            bucket = totals.get(asset_id)
+            if bucket is None:
+                totals[asset_id] = day_totals
+            else:
+                bucket.merge(day_totals)
+    info = {
+        "archived": len(tombs),
+        "from_summary_cache": len(tombs) - len(missing) - len(deferred),
+        "fetched": len(missing) - len(failed),
+        "fallback": failed,
+    }
+    return totals, sorted(payloads), info, deferred
+
+
+def query_range(
+    first_day: date,
+    last_day: date,
+    asset_ids: list[str] | None = None,
+    limit: int | None = None,
+) -> dict[str, Any]:
+    """View totals per asset over the UTC days [first_day, last_day].
+
+    With ``asset_ids`` the result covers just those assets and carries a
+    per-day breakdown for each; without, it covers every asset seen,
+    ranked by views and cut to ``limit``. Unique viewer counts are
+    sketch estimates, as in the rollups. ``missing`` lists archived days
+    whose summaries were left for a later query by the per-request cap.
+    """
+    from app.services.unified_db import database_url, session
+
+    started = time.perf_counter()
+    wanted = set(asset_ids) if asset_ids is not None else None
+    tombs = archive.tombstones_between(first_day, last_day)
+    totals, covered, days_info, missing = _cold_totals(tombs, wanted)
+
+    with session() as s:
+        hot = view_rollups.day_totals(
+            s, database_url(), first_day, last_day,
+            asset_ids=asset_ids, skip_days=covered,
+        )
+    for asset_id, hot_totals in hot.items():
+        bucket = totals.get(asset_id)
+        if bucket is None:
+            totals[asset_id] = hot_totals
+        else:
+            bucket.merge(hot_totals)
+
+    if asset_ids is not None:
+        for asset_id in asset_ids:
+            totals.setdefault(asset_id, ViewTotals())
+    ranked = sorted(totals.items(), key=lambda item: (-item[1].view_count, item[0]))
+    if limit is not None and asset_ids is None:
+        ranked = ranked[:limit]
+
+    assets = []
+    for asset_id, t in ranked:
+        entry: dict[str, Any] = {
+            "asset_id": asset_id,
+            "total_views": t.view_count,
+            "anonymous_views": t.anonymous_count,
+            "unique_contributors": t.sketch.estimate(),
+        }
+        if asset_ids is not None:
+            entry["daily_views"] = [
+                {"date": day_key, "count": n} for day_key, n in sorted(t.daily.items())
+            ]
+        assets.append(entry)
+
+    span = (last_day - first_day).days + 1
+    days_info["hot"] = span - len(covered)
+    return {
+        "since": first_day.isoformat(),
+        "until": last_day.isoformat(),
+        "assets": assets,
+        "days": days_info,
+        "missing": [day.isoformat() for day in missing],
+        "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 1),
+    }
+
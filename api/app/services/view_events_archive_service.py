@@ -24,6 +24,8 @@ Surface:
   · ``upload_to_github_releases(...)`` — push to the cold tier
   · ``record_tombstone(...)`` — write the DB tombstone
   · ``retrieve_day(day)`` — fetch from cold tier, verify, decompress
+  · ``open_day(day)`` — the same, as a streaming ``DayStream``
+  · ``tombstones_between(first, last)`` — the archived days in a range
   · ``stats()`` — totals + provider breakdown for the health endpoint
 
 Re-key on ``day`` (UTC date). Each archive is one calendar day's
@@ -38,9 +40,13 @@ import json
 import logging
 import os
 import subprocess
+import tempfile
+import threading
 import time
 import urllib.request
 import urllib.error
+import zlib
+from dataclasses import dataclass
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Iterable
@@ -347,94 +353,423 @@ def get_tombstone(target_day: date) -> ViewEventsArchive | None:
         return row
 
 
-def retrieve_day(target_day: date) -> dict[str, Any]:
-    """Retrieve a day's archived events. Verifies SHA-256, caches
-    locally for repeat reads. Returns a manifest with the event list.
+class ArchiveRetrievalError(RuntimeError):
+    """An archived day could not be fetched, verified or decoded.
+
+    ``fetched`` says whether the payload arrived, so callers can keep the
+    response shape ``retrieve_day`` has always returned.
     """
-    tomb = get_tombstone(target_day)
-    if not tomb:
-        return {"day": target_day.isoformat(), "events": [], "found": False, "reason": "not archived"}
 
-    cache = _cache_path(target_day)
-    payload: bytes
-    fetched_from_cache = False
+    def __init__(self, message: str, *, fetched: bool) -> None:
+        super().__init__(message)
+        self.fetched = fetched
 
-    if cache.exists():
-        payload = cache.read_bytes()
-        if hashlib.sha256(payload).hexdigest() == tomb.sha256:
-            fetched_from_cache = True
+
+_STREAM_CHUNK_BYTES = 1 << 16
+_CREATED_AT_KEY = b'"created_at":"'
+
+
+class _HashingReader(io.RawIOBase):
+    """Raw reader that hashes, and optionally tees, every byte it passes on."""
+
+    def __init__(self, source, sink=None) -> None:
+        self._source = source
+        self._sink = sink
+        self.sha256 = hashlib.sha256()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        chunk = self._source.read(len(buffer))
+        n = len(chunk)
+        buffer[:n] = chunk
+        self.sha256.update(chunk)
+        if self._sink is not None:
+            self._sink.write(chunk)
+        return n
+
+    def drain(self) -> None:
+        """Consume what is left without decompressing it."""
+        scratch = bytearray(_STREAM_CHUNK_BYTES)
+        while self.readinto(scratch):
+            pass
+
+
+def _parse_created_at(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True)
+class EventFilter:
+    """Filters applied inside the decode loop, before ``json.loads``.
+
+    Archive lines are compact JSON (``serialise_day`` and
+    ``rewrite_archived_day`` both write ``separators=(",", ":")``), so a
+    field match is a byte-substring test on the raw line; lines without
+    the compact key fall back to a full parse.
+    """
+
+    asset_id: str | None = None
+    contributor_id: str | None = None
+    since: datetime | None = None
+    until: datetime | None = None
+
+    @property
+    def empty(self) -> bool:
+        return not (self.asset_id or self.contributor_id or self.since or self.until)
+
+    def _field_matches(self, line: bytes, key: str, value: str | None) -> bool:
+        if value is None:
+            return True
+        compact_key = f'"{key}":'.encode()
+        if compact_key in line:
+            return compact_key + json.dumps(value).encode() in line
+        return json.loads(line).get(key) == value
+
+    def created_at(self, line: bytes) -> datetime | None:
+        at = line.rfind(_CREATED_AT_KEY)
+        if at < 0:
+            raw = json.loads(line).get("created_at")
         else:
-            log.warning("archive: cached payload sha256 mismatch — re-fetching")
-            cache.unlink(missing_ok=True)
-            payload = b""
+            begin = at + len(_CREATED_AT_KEY)
+            raw = line[begin:line.index(b'"', begin)].decode()
+        return _parse_created_at(raw) if raw else None
+
+    def check(self, line: bytes) -> tuple[bool, bool]:
+        """(matches, past_until) for one raw line."""
+        if self.since or self.until:
+            created_at = self.created_at(line)
+            if created_at is not None:
+                if self.until and created_at >= self.until:
+                    return False, True
+                if self.since and created_at < self.since:
+                    return False, False
+        matches = (
+            self._field_matches(line, "asset_id", self.asset_id)
+            and self._field_matches(line, "contributor_id", self.contributor_id)
+        )
+        return matches, False
+
+
+class DayStream:
+    """One streaming, verified pass over an archived day.
 
-    fetch_seconds: float | None = None
-    if not fetched_from_cache:
-        t0 = time.perf_counter()
+    The gzipped JSONL comes from the local cache when present, otherwise
+    from the tombstone URL; a network fetch is teed into the cache as it
+    streams and only promoted into place once its SHA-256 checks out.
+    Decompression, filtering and hashing all happen in the same pass,
+    so memory stays at one line plus the zlib window. Integrity is
+    confirmed when the pass ends: a mismatch raises
+    ``ArchiveRetrievalError`` after the last line (and drops a bad
+    cache file so the next read re-fetches).
+
+    A caller that hands lines on before the pass ends (a streamed
+    response) calls ``verify()`` first. It checks the whole payload up
+    front, so a mismatch is raised before any line leaves.
+    """
+
+    def __init__(self, tomb: ViewEventsArchive) -> None:
+        self.tomb = tomb
+        self.fetched_from_cache = False
+        self.fetch_seconds: float | None = None
+        self.lines_scanned = 0
+        self._source = None
+        self._sink = None
+        self._part: Path | None = None
+        self._started = 0.0
+        self._stop = False
+        self.verified = False
+
+    def open(self) -> "DayStream":
+        cache = _cache_path(self.tomb.day)
+        if cache.exists():
+            self._source = cache.open("rb")
+            self.fetched_from_cache = True
+            return self
+        self._started = time.perf_counter()
         try:
             req = urllib.request.Request(
-                tomb.archive_url,
+                self.tomb.archive_url,
                 headers={"User-Agent": "coherence-network-archive/1.0"},
             )
-            with urllib.request.urlopen(req, timeout=60) as r:
-                payload = r.read()
+            self._source = urllib.request.urlopen(req, timeout=60)
         except (urllib.error.URLError, TimeoutError) as e:
-            return {
-                "day": target_day.isoformat(),
-                "events": [],
-                "found": True,
-                "fetched": False,
-                "error": f"fetch failed: {e}",
-                "tombstone": _tombstone_to_dict(tomb),
-            }
-        fetch_seconds = round(time.perf_counter() - t0, 3)
-
-        actual_sha = hashlib.sha256(payload).hexdigest()
-        if actual_sha != tomb.sha256:
-            return {
-                "day": target_day.isoformat(),
-                "events": [],
-                "found": True,
-                "fetched": False,
-                "error": (
-                    f"integrity check failed: tombstone sha256={tomb.sha256} "
-                    f"actual={actual_sha}"
-                ),
-                "tombstone": _tombstone_to_dict(tomb),
-            }
-        # Persist to cache for the next reader.
+            raise ArchiveRetrievalError(f"fetch failed: {e}", fetched=False) from e
         try:
             _CACHE_DIR.mkdir(parents=True, exist_ok=True)
-            cache.write_bytes(payload)
+            self._part = cache.with_name(f"{cache.name}.{os.getpid()}.{threading.get_ident()}.part")
+            self._sink = self._part.open("wb")
         except OSError as e:
             log.warning("archive: could not write cache %s: %s", cache, e)
+            self._part = None
+        return self
+
+    def verify(self) -> "DayStream":
+        """Check the SHA-256 of the whole payload before any line is read.
+
+        A network fetch lands in the cache (or, when the cache can't be
+        written, a spooled temp file) and is read back from there; a
+        cached payload is hashed in place. Raises
+        ``ArchiveRetrievalError`` on a fetch or integrity failure.
+        """
+        if self._source is None:
+            self.open()
+        if self.fetched_from_cache:
+            spool = None
+        else:
+            spool = self._sink or tempfile.SpooledTemporaryFile(max_size=8 << 20)
+        reader = _HashingReader(self._source, spool)
+        try:
+            reader.drain()
+        except OSError as e:
+            self._close(keep_part=False)
+            if spool is not None and spool is not self._sink:
+                spool.close()
+            if self.fetched_from_cache:
+                raise self._fail(f"cache read failed: {e}") from e
+            raise ArchiveRetrievalError(f"fetch failed: {e}", fetched=False) from e
+        actual_sha = reader.sha256.hexdigest()
+        if actual_sha != self.tomb.sha256:
+            self._close(keep_part=False)
+            if spool is not None and spool is not self._sink:
+                spool.close()
+            if self.fetched_from_cache:
+                log.warning("archive: cached payload sha256 mismatch — dropping cache")
+            raise self._fail(
+                f"integrity check failed: tombstone sha256={self.tomb.sha256} "
+                f"actual={actual_sha}"
+            )
+        if self._started:
+            self.fetch_seconds = round(time.perf_counter() - self._started, 3)
+        if self.fetched_from_cache:
+            self._source.seek(0)
+        elif self._part is not None:
+            self._close(keep_part=True)
+            self._source = _cache_path(self.tomb.day).open("rb")
+        else:
+            self._source.close()
+            spool.seek(0)
+            self._source = spool
+        self.verified = True
+        return self
+
+    def stop(self) -> None:
+        """Finish after the current line: hash the rest, skip decoding it."""
+        self._stop = True
+
+    def _close(self, *, keep_part: bool) -> None:
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+        if self._part is not None:
+            if keep_part:
+                try:
+                    os.replace(self._part, _cache_path(self.tomb.day))
+                except OSError as e:
+                    log.warning("archive: could not write cache %s: %s", self._part, e)
+            self._part.unlink(missing_ok=True)
+            self._part = None
+
+    def _fail(self, message: str) -> ArchiveRetrievalError:
+        if self.fetched_from_cache:
+            _cache_path(self.tomb.day).unlink(missing_ok=True)
+        return ArchiveRetrievalError(message, fetched=True)
+
+    def lines(self) -> Iterable[bytes]:
+        """Raw JSON lines (no trailing newline), verified when exhausted."""
+        if self._source is None:
+            self.open()
+        reader = _HashingReader(self._source, self._sink)
+        verified = False
+        try:
+            try:
+                with gzip.GzipFile(fileobj=reader, mode="rb") as gz:
+                    for line in gz:
+                        line = line.rstrip(b"\n")
+                        if not line.strip():
+                            continue
+                        self.lines_scanned += 1
+                        yield line
+                        if self._stop:
+                            break
+                reader.drain()
+            except (gzip.BadGzipFile, EOFError, zlib.error) as e:
+                raise self._fail(f"gunzip failed: {e}") from e
+            except OSError as e:
+                if self.fetched_from_cache:
+                    raise self._fail(f"cache read failed: {e}") from e
+                raise ArchiveRetrievalError(f"fetch failed: {e}", fetched=False) from e
+            if self._started:
+                self.fetch_seconds = round(time.perf_counter() - self._started, 3)
+            actual_sha = reader.sha256.hexdigest()
+            if actual_sha != self.tomb.sha256:
+                if self.fetched_from_cache:
+                    log.warning("archive: cached payload sha256 mismatch — dropping cache")
+                raise self._fail(
+                    f"integrity check failed: tombstone sha256={self.tomb.sha256} "
+                    f"actual={actual_sha}"
+                )
+            verified = True
+        finally:
+            self._close(keep_part=verified)
+
+    def matching_lines(self, flt: EventFilter) -> Iterable[bytes]:
+        """Raw lines that pass ``flt``; stops decoding past ``flt.until``."""
+        if flt.empty:
+            yield from self.lines()
+            return
+        for line in self.lines():
+            matches, past_until = flt.check(line)
+            if past_until:
+                # Events are ordered by created_at: nothing later can match.
+                self.stop()
+                continue
+            if matches:
+                yield line
+
+    def events(self, flt: EventFilter | None = None) -> Iterable[dict[str, Any]]:
+        for line in self.matching_lines(flt or EventFilter()):
+            yield json.loads(line)
+
+
+def open_day(target_day: date, *, verify: bool = False) -> DayStream | None:
+    """A ready-to-read stream over an archived day, or None if not archived.
+
+    With ``verify``, the payload's SHA-256 is checked before returning.
+    Raises ``ArchiveRetrievalError`` when the cold tier can't be reached
+    or the payload does not verify.
+    """
+    tomb = get_tombstone(target_day)
+    if not tomb:
+        return None
+    stream = DayStream(tomb).open()
+    return stream.verify() if verify else stream
+
+
+def _paged(
+    stream: DayStream,
+    flt: EventFilter,
+    offset: int,
+    limit: int | None,
+    page: dict[str, Any],
+) -> Iterable[bytes]:
+    """Matching raw lines in [offset, offset + limit); sets page["next_offset"]
+    when more remain. Once the page is full the stream is told to stop
+    decoding, so the rest of the payload is only hashed.
+    """
+    matched = 0
+    emitted = 0
+    for line in stream.matching_lines(flt):
+        matched += 1
+        if matched <= offset:
+            continue
+        if limit is not None and emitted >= limit:
+            page["next_offset"] = offset + limit
+            stream.stop()
+            continue
+        emitted += 1
+        yield line
 
-    # Decompress + parse JSONL.
+
+def ndjson_lines(
+    stream: DayStream,
+    flt: EventFilter,
+    *,
+    offset: int = 0,
+    limit: int | None = None,
+) -> Iterable[bytes]:
+    """NDJSON body for a streamed response: the archived lines as-is.
+
+    ``stream`` must already be verified (``DayStream.verify``), so
+    corrupt or tampered data is refused before the response starts.
+    Lines are passed through without a decode/encode round trip. A
+    failure after that point (a gunzip error in a payload whose hash
+    matched, a vanished cache file) can no longer change the status
+    code, so it ends the body as a final ``{"error": ...}`` line.
+    """
+    if not stream.verified:
+        raise ValueError("ndjson_lines needs a verified DayStream")
     try:
-        raw = gzip.decompress(payload)
-    except gzip.BadGzipFile as e:
+        for line in _paged(stream, flt, offset, limit, {}):
+            yield line + b"\n"
+    except ArchiveRetrievalError as e:
+        log.warning("archive: streamed retrieval of %s failed: %s", stream.tomb.day, e)
+        yield json.dumps({"error": str(e)}).encode("utf-8") + b"\n"
+
+
+def retrieve_day(
+    target_day: date,
+    *,
+    asset_id: str | None = None,
+    contributor_id: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    offset: int = 0,
+    limit: int | None = None,
+) -> dict[str, Any]:
+    """Retrieve a day's archived events. Verifies SHA-256, caches
+    locally for repeat reads. Returns a manifest with the event list.
+
+    Decoding streams through ``DayStream``; the filters run inside the
+    decode loop and ``offset`` / ``limit`` page over the matching events.
+    ``next_offset`` is set when more matches remain. Once a page is
+    full the rest of the payload is hashed but not decoded.
+    """
+    tomb = get_tombstone(target_day)
+    if not tomb:
+        return {"day": target_day.isoformat(), "events": [], "found": False, "reason": "not archived"}
+
+    flt = EventFilter(asset_id=asset_id, contributor_id=contributor_id, since=since, until=until)
+    stream = DayStream(tomb)
+    page: dict[str, Any] = {"next_offset": None}
+    try:
+        stream.open()
+        events = [json.loads(line) for line in _paged(stream, flt, offset, limit, page)]
+    except ArchiveRetrievalError as e:
         return {
             "day": target_day.isoformat(),
             "events": [],
             "found": True,
-            "fetched": True,
-            "error": f"gunzip failed: {e}",
+            "fetched": e.fetched,
+            "error": str(e),
             "tombstone": _tombstone_to_dict(tomb),
         }
 
-    events = [json.loads(line) for line in raw.splitlines() if line.strip()]
     return {
         "day": target_day.isoformat(),
         "events": events,
         "found": True,
         "fetched": True,
         "verified_sha256": tomb.sha256,
-        "fetched_from_cache": fetched_from_cache,
-        "fetch_seconds": fetch_seconds,
+        "fetched_from_cache": stream.fetched_from_cache,
+        "fetch_seconds": stream.fetch_seconds,
+        "offset": offset,
+        "limit": limit,
+        "next_offset": page["next_offset"],
         "tombstone": _tombstone_to_dict(tomb),
     }
 
 
+def tombstones_between(first_day: date, last_day: date) -> list[ViewEventsArchive]:
+    """Tombstones for the archived days in [first_day, last_day], detached."""
+    _ensure_ready()
+    with _session() as s:
+        rows = (
+            s.query(ViewEventsArchive)
+            .filter(ViewEventsArchive.day >= first_day, ViewEventsArchive.day <= last_day)
+            .order_by(ViewEventsArchive.day.asc())
+            .all()
+        )
+        for row in rows:
+            s.expunge(row)
+        return rows
+
+
 def list_archived_days() -> list[date]:
     """Return every archived day in ascending order. Used by the
     opt-out flow to enumerate cold-tier archives that may need
@@ -1,7 +1,8 @@
 """Views-tracing health service.
 
 The /api/views/ping path writes one row to ``asset_view_events`` and
-upserts one row to ``asset_reads_daily`` on every visit. The events
+adds one increment to the ``asset_reads_daily`` write-behind buffer on
+every visit. The events
 table grows linearly with traffic; the daily table is bounded by
 (assets × days).
 
@@ -10,9 +11,8 @@ three questions a maintainer needs to ask before tracing becomes a
 bottleneck:
 
   1. **How loud is the writer?** Latency per ping (p50 / p95 / p99
-     observed in a sliding in-memory ring). If the ring shows the
-     writer crossing budget, the synchronous path needs to move
-     async or batch.
+     observed in a sliding in-memory ring), plus the depth and flush
+     stats of the write-behind buffer in front of ``asset_reads_daily``.
   2. **How fast is the table growing?** Events in the last hour /
      day / 7d / 30d, plus oldest-event-age. If growth crosses
      budget the trim script can roll old events into the daily
@@ -38,6 +38,8 @@ from typing import Any, Deque
 
 from sqlalchemy import func
 
+from app.services import read_counter_buffer
+
 log = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -216,6 +218,7 @@ def get_views_health() -> dict[str, Any]:
         "writer": {
             "ping_latency": latency,
             "band": latency_band,
+            "read_counter_buffer": read_counter_buffer.stats(),
         },
         "events": {
             "total_rows": total_rows,
@@ -0,0 +1,168 @@
+"""Background flusher shared by the write-behind buffers.
+
+runtime_event_queue and read_counter_buffer both hold writes in memory
+and hand them to the database from one daemon thread. This module is
+the part they share: the flusher thread and its wake-ups, the final
+flush on shutdown and at exit, and a way for readers to wait until
+earlier writes have landed without writing anything themselves. Each
+buffer keeps its own data structure, admission policy and write, and
+supplies `flush`: write one batch, return how many items it took
+(0 once the buffer is empty).
+
+Read-your-writes holds only within one process. `wait_for_writes`
+covers what this process buffered before the call; another worker's
+buffer stays invisible until that worker's flusher writes it. On the
+event loop thread nobody waits: enqueue paths don't block for room and
+readers get what is already committed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import threading
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+def on_event_loop() -> bool:
+    """True on a thread that is running an asyncio event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class WriteBehind:
+    """One flusher thread in front of one buffer.
+
+    `cond` guards the flusher's state; buffers use it for their own
+    state too, so producers waiting for room are woken by flushes.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        flush: Callable[[], int],
+        *,
+        pending: Callable[[], bool],
+        interval: Callable[[], float],
+        ready: Callable[[], bool] = lambda: False,
+    ) -> None:
+        self.name = name
+        self.cond = threading.Condition()
+        self._flush = flush
+        self._pending = pending
+        self._interval = interval
+        self._ready = ready
+        self._flush_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        self._wanted = False
+        self._passes_started = 0
+        self._passes_finished = 0
+        atexit.register(self.shutdown, 2.0)
+
+    @property
+    def alive(self) -> bool:
+        thread = self._thread
+        return bool(thread is not None and thread.is_alive())
+
+    def _busy(self) -> bool:
+        with self.cond:
+            return self._passes_started > self._passes_finished
+
+    def drain(self) -> int:
+        """Write everything buffered so far on the calling thread.
+
+        A flush already in progress is waited for first, so on return
+        nothing buffered before the call is still in flight.
+        """
+        if not self._pending() and not self._busy():
+            return 0
+        return self._pass()
+
+    def _pass(self) -> int:
+        written = 0
+        with self._flush_lock:
+            with self.cond:
+                self._passes_started += 1
+            try:
+                while True:
+                    taken = self._flush()
+                    if not taken:
+                        return written
+                    written += taken
+            finally:
+                with self.cond:
+                    self._passes_finished += 1
+                    self.cond.notify_all()
+
+    def wake(self) -> None:
+        """Ask the flusher for a pass now rather than at the next interval."""
+        with self.cond:
+            self._wanted = True
+            self.cond.notify_all()
+        self.ensure_started()
+
+    def wait_for_writes(self, timeout: float) -> bool:
+        """Block until what this process buffered before the call is written.
+
+        The flusher does the writing. Returns False on timeout, and at
+        once on the event loop thread, where blocking would stall every
+        other request.
+        """
+        if not self._pending() and not self._busy():
+            return True
+        if on_event_loop():
+            self.wake()
+            return False
+        self.ensure_started()
+        with self.cond:
+            target = self._passes_started + 1
+            self._wanted = True
+            self.cond.notify_all()
+            return self.cond.wait_for(lambda: self._passes_finished >= target, timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self.cond:
+                # `cond` is shared with producers and readers, so wake only
+                # for a reason of our own, not every notify.
+                self.cond.wait_for(
+                    lambda: self._stopping or self._wanted or self._ready(),
+                    self._interval(),
+                )
+                stopping = self._stopping
+                self._wanted = False
+            try:
+                self._pass()
+            except Exception:
+                logger.warning("%s: flush failed", self.name, exc_info=True)
+            if stopping:
+                return
+
+    def ensure_started(self) -> None:
+        if self.alive:
+            return
+        with self.cond:
+            if self.alive:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop the flusher after it has written everything still buffered."""
+        with self.cond:
+            thread = self._thread
+            self._stopping = True
+            self.cond.notify_all()
+        if thread is not None:
+            thread.join(timeout)
+        self.drain()
+        with self.cond:
+            self._thread = None
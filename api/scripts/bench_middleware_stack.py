@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Per-request overhead of the request middleware stack, before and after.
+
+Builds a one-route app three ways and drives it straight through ASGI
+(no HTTP client, no socket), so what's left is middleware cost:
+
+  bare        the route alone
+  base_http   eight BaseHTTPMiddleware layers shaped like the old stack:
+              each awaits call_next and sets one response header
+  asgi        the real pure-ASGI stack, in main.py's order, runtime
+              metrics outermost; unlike the shaped layers it also records
+              each request as a runtime event
+
+Prints mean microseconds per request and the overhead over ``bare`` for
+each stack.
+
+Usage:
+  python api/scripts/bench_middleware_stack.py [--requests 5000] [--rounds 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from starlette.applications import Starlette  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+from starlette.routing import Route  # noqa: E402
+
+_LAYERS = 8
+
+
+async def _ok(_request):
+    return JSONResponse({"ok": True})
+
+
+def _bare() -> Starlette:
+    return Starlette(routes=[Route("/api/bench", _ok)])
+
+
+def _base_http() -> Starlette:
+    app = _bare()
+    for i in range(_LAYERS):
+
+        class Layer(BaseHTTPMiddleware):
+            header = f"X-Bench-{i}"
+
+            async def dispatch(self, request, call_next):
+                response = await call_next(request)
+                response.headers[self.header] = "1"
+                return response
+
+        app.add_middleware(Layer)
+    return app
+
+
+def _asgi() -> Starlette:
+    from app.main import (
+        AttributionMiddleware,
+        RateLimitMiddleware,
+        ReadTrackingMiddleware,
+        RequestDurationMiddleware,
+        RequestIDMiddleware,
+        RequestOutcomesMiddleware,
+        RuntimeMetricsMiddleware,
+        SecurityHeadersMiddleware,
+    )
+
+    app = _bare()
+    app.add_middleware(SecurityHeadersMiddleware)
+    app.add_middleware(RequestIDMiddleware)
+    app.add_middleware(ReadTrackingMiddleware)
+    app.add_middleware(RequestDurationMiddleware, threshold_seconds=1.0)
+    app.add_middleware(RequestOutcomesMiddleware)
+    app.add_middleware(RateLimitMiddleware)
+    app.add_middleware(AttributionMiddleware)
+    app.add_middleware(RuntimeMetricsMiddleware)
+    return app
+
+
+_SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/api/bench",
+    "raw_path": b"/api/bench",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"host", b"bench"), (b"x-contributor-id", b"bench")],
+    "client": ("127.0.0.1", 50000),
+    "server": ("bench", 80),
+}
+
+
+async def _one(app) -> None:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(_message):
+        return None
+
+    await app(dict(_SCOPE), receive, send)
+
+
+async def _measure(app, requests: int) -> float:
+    for _ in range(min(200, requests)):
+        await _one(app)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await _one(app)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def _run(requests: int, rounds: int) -> dict:
+    apps = {"bare": _bare(), "base_http": _base_http(), "asgi": _asgi()}
+    samples: dict[str, list[float]] = {name: [] for name in apps}
+    for _ in range(rounds):
+        for name, app in apps.items():
+            samples[name].append(await _measure(app, requests))
+    means = {name: statistics.median(values) for name, values in samples.items()}
+    return {
+        "requests_per_round": requests,
+        "rounds": rounds,
+        "us_per_request": {name: round(v, 1) for name, v in means.items()},
+        "overhead_us": {
+            name: round(means[name] - means["bare"], 1) for name in ("base_http", "asgi")
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_run(args.requests, args.rounds)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Check the API cold-start import against its budget.
+
+Imports ``app.main`` in fresh interpreters (app.core.import_profile) and
+prints where the time went and whether the median import time is over
+budget. The budget defaults to ``api.cold_start_budget_ms``. With
+``--fail-over-budget`` it exits 1 when over budget; CI runs it report-only,
+since wall-clock time on shared runners is too noisy to gate on.
+
+Usage:
+  python api/scripts/check_cold_start.py [--runs 3] [--budget-ms N] [--json] [--fail-over-budget]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.config_loader import get_int  # noqa: E402
+from app.core import import_profile  # noqa: E402
+
+
+def _print_human_summary(report: dict, budget_ms: int) -> None:
+    print("API Cold Start")
+    print("==============")
+    samples = ", ".join(f"{s:.0f}" for s in report["samples_ms"])
+    print(f"import {report['target']}: {report['wall_ms']:.0f}ms (samples: {samples})")
+    print(f"budget: {budget_ms}ms -> {'over' if report['over_budget'] else 'ok'}")
+    print(f"modules imported: {report['module_count']}")
+    print()
+    print("self time by package")
+    for row in report["packages"]:
+        print(f"  {row['self_ms']:8.1f}ms  {row['share'] * 100:5.1f}%  {row['package']} ({row['modules']})")
+    print()
+    print("slowest app modules (cumulative)")
+    for row in report["slowest_cumulative"]:
+        print(f"  {row['cumulative_ms']:8.1f}ms  {row['module']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check the API cold-start import budget")
+    parser.add_argument("--target", default="app.main", help="Module to import (default app.main)")
+    parser.add_argument("--runs", type=int, default=3, help="Timed imports; the median is checked")
+    parser.add_argument("--top", type=int, default=20, help="Rows per ranking")
+    parser.add_argument("--budget-ms", type=int, default=None, help="Override api.cold_start_budget_ms")
+    parser.add_argument("--json", action="store_true", help="Print full JSON report")
+    parser.add_argument("--fail-over-budget", action="store_true", help="Exit 1 when over budget")
+    args = parser.parse_args()
+
+    budget_ms = args.budget_ms if args.budget_ms is not None else get_int("api", "cold_start_budget_ms", 4500)
+    report = import_profile.profile(args.target, runs=args.runs, top=args.top)
+    report["budget_ms"] = budget_ms
+    report["over_budget"] = report["wall_ms"] > budget_ms
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_human_summary(report, budget_ms)
+
+    if args.fail_over_budget and report["over_budget"]:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
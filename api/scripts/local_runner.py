@@ -1456,6 +1456,68 @@ def claim_task(task_id: str) -> dict | None:
     return None
 
 
+# False once the hub answers 404/405 to claim-next (older deploy); workers
+# then fall back to listing pending tasks and PATCH-claiming them.
+_CLAIM_NEXT_SUPPORTED: list[bool] = [True]
+
+
+def _claimable_repo_urls() -> list[str] | None:
+    """Repos this node may take tasks for: the --repo filter, else repos with a keystore token."""
+    if _REPO_FILTER[0]:
+        return [_REPO_FILTER[0]]
+    ks_path = os.path.join(os.path.expanduser("~"), ".coherence-network", "keys.json")
+    try:
+        with open(ks_path, encoding="utf-8") as f:
+            tokens = json.load(f).get("repo_tokens", {})
+    except Exception:
+        tokens = {}
+    if not isinstance(tokens, dict):
+        return []
+    # An empty token can't push, so that repo is not claimable here.
+    return sorted(str(url) for url, token in tokens.items() if token)
+
+
+def claim_next_task(exclude_idea_ids: list[str]) -> dict | None:
+    """Atomically claim the next pending task on the hub, long-polling while the queue is empty.
+
+    Returns None when nothing became available within the wait, or when
+    the hub has no claim-next endpoint (see _CLAIM_NEXT_SUPPORTED).
+    """
+    wait_seconds = float(rc("execution", "claim_wait_seconds", 20))
+    body = {
+        "worker_id": WORKER_ID,
+        "exclude_idea_ids": exclude_idea_ids,
+        "repo_urls": _claimable_repo_urls(),
+        "wait_seconds": wait_seconds,
+    }
+    try:
+        resp = _HTTP_CLIENT.post(
+            f"{API_BASE}/api/agent/tasks/claim-next",
+            json=body,
+            headers={"X-API-Key": _resolve_api_key()},
+            timeout=wait_seconds + 30.0,
+        )
+    except httpx.HTTPError as e:
+        log.warning("API POST /api/agent/tasks/claim-next network error (transient): %s", e)
+        _shutdown_event.wait(10)
+        return None
+    if resp.status_code in (404, 405):
+        log.info("CLAIM_NEXT unavailable on hub (HTTP %d) — falling back to list + PATCH", resp.status_code)
+        _CLAIM_NEXT_SUPPORTED[0] = False
+        return None
+    if resp.status_code == 204:
+        return None
+    if resp.status_code >= 400:
+        log.warning("API POST /api/agent/tasks/claim-next → %d: %s", resp.status_code, resp.text[:200])
+        _shutdown_event.wait(15)
+        return None
+    task = resp.json()
+    if isinstance(task, dict) and task.get("status") == "running":
+        log.info("CLAIMED task=%s type=%s", task.get("id"), task.get("task_type"))
+        return task
+    return None
+
+
 def complete_task(task_id: str, output: str, success: bool, context_patch: dict | None = None) -> bool:
     status = "completed" if success else "failed"
     body: dict[str, Any] = {"status": status, "output": output[:50000]}
@@ -6873,6 +6935,66 @@ def _runner_verify_phase(task: dict) -> bool:
     return success
 
 
+def _claim_from_pending_list(worker_id: int) -> dict | None:
+    """List + PATCH claiming, for hubs without POST /api/agent/tasks/claim-next."""
+    # Get a pending task
+    pending = api("GET", "/api/agent/tasks?status=pending&limit=5")
+    if not pending:
+        _shutdown_event.wait(10)
+        return None
+
+    task_list = pending if isinstance(pending, list) else pending.get("tasks", [])
+    if not task_list:
+        _shutdown_event.wait(10)
+        return None
+
+    # Respect parallel cap: don't claim if at capacity
+    # Use _active_task_ids (not _active_idea_ids) so tasks without idea_id are counted.
+    with _active_lock:
+        if len(_active_task_ids) >= _MAX_PARALLEL:
+            _shutdown_event.wait(15)
+            return None
+
+    # Find a task for an idea we're not already working on
+    task = None
+    for candidate in task_list:
+        ctx = candidate.get("context") if isinstance(candidate.get("context"), dict) else {}
+        idea_id = ctx.get("idea_id", "")
+        workspace_git_url = ctx.get("workspace_git_url", "")
+
+        # Repo credential gate: skip tasks this node can't push to
+        if _REPO_FILTER[0]:
+            # Explicit --repo flag: only claim tasks for this repo
+            norm_filter = _REPO_FILTER[0].lower().replace("https://", "").replace("http://", "").rstrip("/")
+            norm_task = workspace_git_url.lower().replace("https://", "").replace("http://", "").rstrip("/")
+            if norm_task and norm_task != norm_filter:
+                continue
+        elif workspace_git_url and not _get_repo_token(workspace_git_url):
+            # Auto-filter: skip tasks for repos we don't have credentials for
+            log.debug("WORKER[%d] skipping task=%s — no credentials for %s",
+                      worker_id, candidate.get("id", "?")[:12], workspace_git_url)
+            continue
+
+        with _active_lock:
+            if len(_active_task_ids) >= _MAX_PARALLEL:
+                break  # At capacity
+            if candidate["id"] in _active_task_ids:
+                continue  # already claimed by another worker (covers no-idea-id tasks)
+            if idea_id and idea_id in _active_idea_ids:
+                continue  # already working this idea
+            # Try to claim
+            result = api("PATCH", f"/api/agent/tasks/{candidate['id']}", {
+                "status": "running", "worker_id": WORKER_ID,
+            })
+            if result and result.get("status") == "running":
+                _active_task_ids.add(candidate["id"])  # track regardless of idea_id
+                if idea_id:
+                    _active_idea_ids.add(idea_id)
+                task = result
+                break
+    return task
+
+
 def _worker_loop(worker_id: int, dry_run: bool = False) -> None:
     """Independent worker thread: claim one task, execute, repeat."""
     while not _shutdown_event.is_set():
@@ -6886,61 +7008,27 @@ def _worker_loop(worker_id: int, dry_run: bool = False) -> None:
                 _shutdown_event.wait(10)
                 continue
 
-            # Get a pending task
-            pending = api("GET", "/api/agent/tasks?status=pending&limit=5")
-            if not pending:
-                _shutdown_event.wait(10)
-                continue
-
-            task_list = pending if isinstance(pending, list) else pending.get("tasks", [])
-            if not task_list:
-                _shutdown_event.wait(10)
-                continue
-
-            # Respect parallel cap: don't claim if at capacity
-            # Use _active_task_ids (not _active_idea_ids) so tasks without idea_id are counted.
-            with _active_lock:
-                if len(_active_task_ids) >= _MAX_PARALLEL:
+            if _CLAIM_NEXT_SUPPORTED[0]:
+                # Respect parallel cap: don't claim if at capacity
+                with _active_lock:
+                    at_capacity = len(_active_task_ids) >= _MAX_PARALLEL
+                    busy_ideas = sorted(_active_idea_ids)
+                if at_capacity:
                     _shutdown_event.wait(15)
                     continue
-
-            # Find a task for an idea we're not already working on
-            task = None
-            for candidate in task_list:
-                ctx = candidate.get("context") if isinstance(candidate.get("context"), dict) else {}
-                idea_id = ctx.get("idea_id", "")
-                workspace_git_url = ctx.get("workspace_git_url", "")
-
-                # Repo credential gate: skip tasks this node can't push to
-                if _REPO_FILTER[0]:
-                    # Explicit --repo flag: only claim tasks for this repo
-                    norm_filter = _REPO_FILTER[0].lower().replace("https://", "").replace("http://", "").rstrip("/")
-                    norm_task = workspace_git_url.lower().replace("https://", "").replace("http://", "").rstrip("/")
-                    if norm_task and norm_task != norm_filter:
-                        continue
-                elif workspace_git_url and not _get_repo_token(workspace_git_url):
-                    # Auto-filter: skip tasks for repos we don't have credentials for
-                    log.debug("WORKER[%d] skipping task=%s — no credentials for %s",
-                              worker_id, candidate.get("id", "?")[:12], workspace_git_url)
+                # The hub picks and claims atomically and holds the request
+                # open while its queue is empty, so no extra wait on a miss.
+                task = claim_next_task(busy_ideas)
+                if task:
+                    ctx = task.get("context") if isinstance(task.get("context"), dict) else {}
+                    with _active_lock:
+                        _active_task_ids.add(task["id"])
+                        if ctx.get("idea_id"):
+                            _active_idea_ids.add(ctx["idea_id"])
+                elif _CLAIM_NEXT_SUPPORTED[0]:
                     continue
-
-                with _active_lock:
-                    if len(_active_task_ids) >= _MAX_PARALLEL:
-                        break  # At capacity
-                    if candidate["id"] in _active_task_ids:
-                        continue  # already claimed by another worker (covers no-idea-id tasks)
-                    if idea_id and idea_id in _active_idea_ids:
-                        continue  # already working this idea
-                    # Try to claim
-                    result = api("PATCH", f"/api/agent/tasks/{candidate['id']}", {
-                        "status": "running", "worker_id": WORKER_ID,
-                    })
-                    if result and result.get("status") == "running":
-                        _active_task_ids.add(candidate["id"])  # track regardless of idea_id
-                        if idea_id:
-                            _active_idea_ids.add(idea_id)
-                        task = result
-                        break
+            if not _CLAIM_NEXT_SUPPORTED[0]:
+                task = _claim_from_pending_list(worker_id)
 
             if not task:
                 _shutdown_event.wait(15)
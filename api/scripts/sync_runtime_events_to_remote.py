@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-"""Sync local runtime events JSON files into a remote API runtime store.
+"""Sync local runtime event files (legacy JSON + JSONL segments) into a remote API runtime store.
 
 Usage examples:
   python scripts/sync_runtime_events_to_remote.py --api-url https://api.coherencycoin.com
@@ -124,7 +124,11 @@ def _build_sync_id(raw_event: dict[str, Any], source_file: str) -> str:
     return f"loc_{digest}"
 
 
-def _load_events_from_file(path: Path) -> list[dict[str, Any]]:
+def _segments_dir(path: Path) -> Path:
+    return path.with_name(f"{path.stem}.segments")
+
+
+def _load_legacy_events(path: Path) -> list[dict[str, Any]]:
     try:
         raw = json.loads(path.read_text(encoding="utf-8"))
     except Exception:
@@ -138,6 +142,31 @@ def _load_events_from_file(path: Path) -> list[dict[str, Any]]:
     return []
 
 
+def _load_events_from_file(path: Path) -> list[dict[str, Any]]:
+    """Legacy JSON document plus the segmented JSONL log beside it.
+
+    The first segment is seeded from the legacy document, so rows are
+    de-duplicated by event id.
+    """
+    rows = _load_legacy_events(path) if path.exists() else []
+    seen = {row.get("id") for row in rows if row.get("id")}
+    for segment in sorted(_segments_dir(path).glob("seg-*.jsonl")):
+        try:
+            lines = segment.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            continue
+        for line in lines:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(row, dict) or (row.get("id") and row.get("id") in seen):
+                continue
+            seen.add(row.get("id"))
+            rows.append(row)
+    return rows
+
+
 def _event_to_record(raw_event: dict[str, Any], source_file: str) -> LocalEventRecord | None:
     endpoint = _normalize_endpoint(raw_event.get("raw_endpoint") or raw_event.get("endpoint"))
     runtime_ms = _coerce_runtime_ms(raw_event.get("runtime_ms"))
@@ -224,7 +253,7 @@ def _expand_event_paths(args: argparse.Namespace) -> list[Path]:
     for item in candidates:
         path = Path(item).expanduser().resolve()
         key = str(path)
-        if key in seen or not path.exists():
+        if key in seen or not (path.exists() or _segments_dir(path).is_dir()):
             continue
         seen.add(key)
         paths.append(path)
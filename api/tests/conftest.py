@@ -407,7 +407,10 @@ def _restore_app_routes_between_tests():
     try:
         yield
     finally:
-        app.router.routes[:] = before
+        if app.router.routes != before:
+            app.router.routes[:] = before
+            app.router._mark_routes_changed()
+            app.openapi_schema = None
 
 
 @pytest.fixture(autouse=True)
@@ -0,0 +1,149 @@
+"""Atomic claim-next for runners.
+
+Source under test: POST /api/agent/tasks/claim-next,
+agent_service_crud.claim_next_task and
+agent_task_store_service.claim_next_task.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+
+import anyio
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.services import agent_service, agent_task_store_service
+
+BASE = "http://test"
+
+
+@pytest.fixture
+def task_db(tmp_path, set_config):
+    set_config("agent_tasks", "persist", True)
+    set_config("agent_tasks", "use_db", True)
+    set_config("agent_tasks", "database_url", f"sqlite:///{tmp_path / 'agent_tasks.db'}")
+    agent_task_store_service._ENGINE_CACHE.update({"url": "", "engine": None, "sessionmaker": None})
+    agent_task_store_service._SCHEMA_INITIALIZED = False
+    yield
+    agent_task_store_service._ENGINE_CACHE.update({"url": "", "engine": None, "sessionmaker": None})
+    agent_task_store_service._SCHEMA_INITIALIZED = False
+
+
+def _pending(task_id: str, *, task_type: str = "impl", minutes_ago: int = 0, **context) -> dict:
+    return {
+        "id": task_id,
+        "direction": f"do {task_id}",
+        "task_type": task_type,
+        "status": "pending",
+        "model": "openrouter/free",
+        "command": "echo",
+        "context": context,
+        "created_at": (datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)).isoformat(),
+        "tier": "openrouter",
+    }
+
+
+@pytest.mark.asyncio
+async def test_claim_next_filters_and_returns_204_when_empty():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url=BASE) as c:
+        spec = (await c.post("/api/agent/tasks", json={"direction": "write a spec", "task_type": "spec"})).json()
+        impl = (await c.post("/api/agent/tasks", json={
+            "direction": "implement it", "task_type": "impl", "context": {"idea_id": "idea-a"},
+        })).json()
+
+        r = await c.post("/api/agent/tasks/claim-next", json={
+            "worker_id": "node-alpha:1", "task_types": ["impl"], "exclude_idea_ids": ["idea-a"],
+        })
+        assert r.status_code == 204
+
+        r = await c.post("/api/agent/tasks/claim-next", json={"worker_id": "node-alpha:1", "task_types": ["impl"]})
+        assert r.status_code == 200
+        body = r.json()
+        assert body["id"] == impl["id"]
+        assert body["status"] == "running" and body["claimed_by"] == "node-alpha:1"
+
+        r = await c.post("/api/agent/tasks/claim-next", json={"worker_id": "node-beta:2"})
+        assert r.status_code == 200 and r.json()["id"] == spec["id"]
+
+        r = await c.post("/api/agent/tasks/claim-next", json={"worker_id": "node-beta:2"})
+        assert r.status_code == 204
+
+
+@pytest.mark.asyncio
+async def test_claim_next_long_polls_until_a_task_is_created():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url=BASE) as c:
+        async def create_later() -> dict:
+            await asyncio.sleep(0.2)
+            return (await c.post("/api/agent/tasks", json={"direction": "arrives late", "task_type": "impl"})).json()
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        claim, created = await asyncio.gather(
+            c.post("/api/agent/tasks/claim-next", json={"worker_id": "node-alpha:1", "wait_seconds": 10}),
+            create_later(),
+        )
+
+    assert claim.status_code == 200
+    assert claim.json()["id"] == created["id"]
+    assert loop.time() - started < 5
+
+
+
+@pytest.mark.asyncio
+async def test_idle_long_poll_holds_no_threadpool_worker():
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url=BASE) as c:
+        claim = asyncio.ensure_future(c.post("/api/agent/tasks/claim-next", json={
+            "worker_id": "node-alpha:1", "workspace_id": "no-such-workspace", "wait_seconds": 1,
+        }))
+        await asyncio.sleep(0.4)
+        assert not claim.done()
+        assert limiter.borrowed_tokens == 0
+        assert (await claim).status_code == 204
+
+
+def test_store_claims_each_task_once_under_concurrency(task_db):
+    for i in range(12):
+        agent_task_store_service.upsert_task(_pending(f"task_{i:02d}", minutes_ago=30 - i))
+    claims: list[tuple[str, str]] = []
+    lock = threading.Lock()
+
+    def worker(name: str) -> None:
+        while True:
+            task = agent_task_store_service.claim_next_task(worker_id=name)
+            if task is None:
+                return
+            with lock:
+                claims.append((task["id"], name))
+
+    threads = [threading.Thread(target=worker, args=(f"w{n}",)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(task_id for task_id, _ in claims) == [f"task_{i:02d}" for i in range(12)]
+    for task_id, name in claims:
+        row = agent_task_store_service.load_task(task_id)
+        assert row["status"] == "running" and row["claimed_by"] == name and row["claimed_at"]
+
+
+def test_service_claim_uses_store_order_and_filters(task_db):
+    agent_task_store_service.upsert_task(_pending("task_old", minutes_ago=10, workspace_git_url="https://github.com/a/private"))
+    agent_task_store_service.upsert_task(_pending("task_spec", task_type="spec", minutes_ago=5))
+    agent_task_store_service.upsert_task(_pending("task_new", minutes_ago=1, workspace_git_url="github.com/a/public/"))
+
+    first = agent_service.claim_next_task("node-alpha:1", repo_urls=["https://github.com/a/public"])
+    assert first["id"] == "task_spec"  # oldest task the runner can push to
+    second = agent_service.claim_next_task("node-alpha:1", task_types=["impl"], repo_urls=["https://github.com/a/public"])
+    assert second["id"] == "task_new"
+    assert agent_service.claim_next_task("node-alpha:1", repo_urls=["https://github.com/a/public"]) is None
+    assert agent_service.claim_next_task("node-alpha:1", tiers=["claude"]) is None
+
+    third = agent_service.claim_next_task("node-beta:2")
+    assert third["id"] == "task_old" and third["claimed_by"] == "node-beta:2"
+    assert agent_task_store_service.load_task("task_old")["status"] == "running"
@@ -0,0 +1,132 @@
+"""The request middleware stack as pure ASGI layers.
+
+Source under test: SecurityHeaders/RequestID (app.main), ReadTracking,
+RequestDuration, RequestOutcomes, RateLimit and Attribution middlewares
+(app.middleware.*) and app.middleware.asgi.on_response_start.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.main import (
+    AttributionMiddleware,
+    RateLimitMiddleware,
+    ReadTrackingMiddleware,
+    RequestDurationMiddleware,
+    RequestIDMiddleware,
+    RequestOutcomesMiddleware,
+    SecurityHeadersMiddleware,
+    app as main_app,
+)
+
+_STACK = [
+    SecurityHeadersMiddleware,
+    RequestIDMiddleware,
+    ReadTrackingMiddleware,
+    RequestDurationMiddleware,
+    RequestOutcomesMiddleware,
+    RateLimitMiddleware,
+    AttributionMiddleware,
+]
+
+
+def _stacked(routes, **rate_limit) -> Starlette:
+    app = Starlette(routes=routes)
+    for cls in _STACK:
+        app.add_middleware(cls, **(rate_limit if cls is RateLimitMiddleware else {}))
+    return app
+
+
+def test_no_layer_is_a_base_http_middleware():
+    assert not any(issubclass(cls, BaseHTTPMiddleware) for cls in _STACK)
+    stacked = {m.cls for m in main_app.user_middleware}
+    assert set(_STACK) <= stacked
+
+
+@pytest.mark.asyncio
+async def test_streaming_body_passes_through_chunk_by_chunk():
+    seen: dict = {}
+
+    async def chunks():
+        for i in range(3):
+            yield f"chunk-{i}\n".encode()
+            await asyncio.sleep(0.1)
+
+    async def stream(request: Request):
+        seen["request_id"] = request.state.request_id
+        seen["contributor_id"] = request.state.contributor_id
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    app = _stacked([Route("/stream", stream)])
+    messages: list[tuple[float, dict]] = []
+    started = time.perf_counter()
+
+    requested = asyncio.Event()
+
+    async def receive():
+        if requested.is_set():
+            await asyncio.Event().wait()  # client stays connected
+        requested.set()
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append((time.perf_counter() - started, message))
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/stream", "raw_path": b"/stream", "root_path": "",
+        "query_string": b"", "client": ("127.0.0.1", 1), "server": ("test", 80),
+        "headers": [(b"host", b"test"), (b"x-request-id", b"rid-1"), (b"x-contributor-id", b"alice")],
+    }
+    await app(scope, receive, send)
+
+    start = next(m for _, m in messages if m["type"] == "http.response.start")
+    headers = {k.decode(): v.decode() for k, v in start["headers"]}
+    bodies = [(at, m) for at, m in messages if m["type"] == "http.response.body" and m.get("body")]
+    assert headers["x-request-id"] == "rid-1"
+    assert headers["x-attributed-to"] == "alice" and headers["x-attribution-source"] == "claimed"
+    assert headers["x-content-type-options"] == "nosniff"
+    assert seen == {"request_id": "rid-1", "contributor_id": "alice"}
+    assert [m["body"] for _, m in bodies] == [b"chunk-0\n", b"chunk-1\n", b"chunk-2\n"]
+    assert bodies[0][0] < bodies[-1][0] - 0.15
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_ceiling_answers_429_for_outer_circle(set_config):
+    set_config("api", "testing", False)
+
+    async def ok(_request):
+        return JSONResponse({"ok": True})
+
+    app = _stacked([Route("/api/thing", ok)], requests_per_minute=2)
+    transport = ASGITransport(app=app, client=("93.184.216.34", 4000))
+    async with AsyncClient(transport=transport, base_url="http://coherence.example") as c:
+        codes = [(await c.get("/api/thing")).status_code for _ in range(3)]
+        refused = await c.get("/api/thing")
+
+    assert codes == [200, 200, 429]
+    assert refused.headers["retry-after"] == "20"
+    # Only the layers outside the limiter see a refused request.
+    assert refused.headers["x-attribution-source"] == "none"
+    assert "x-request-id" not in refused.headers
+
+
+@pytest.mark.asyncio
+async def test_main_app_headers_unchanged():
+    async with AsyncClient(transport=ASGITransport(app=main_app), base_url="http://test") as c:
+        r = await c.get("/api/health", headers={"X-Request-ID": "trace-7"})
+
+    assert r.headers["x-request-id"] == "trace-7"
+    assert r.headers["x-attribution-source"] == "none"
+    assert r.headers["referrer-policy"] == "strict-origin-when-cross-origin"
+    assert "x-request-id" in r.headers["access-control-expose-headers"]
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import threading
+import time
+from datetime import datetime, timezone
+
 import pytest
 from httpx import ASGITransport, AsyncClient
 
@@ -112,3 +116,92 @@ async def test_local_circulation_ingest_and_readback() -> None:
     assert providers["claude"]["raw"]["source"] == "laptop:laptop-test"
     codex_limit = next(m for m in providers["codex"]["metrics"] if m["id"].startswith("limit_"))
     assert codex_limit["used"] == pytest.approx(0.22)
+
+
+def _stub_builders(monkeypatch, builders: dict) -> list[ProviderUsageSnapshot]:
+    stored: list[ProviderUsageSnapshot] = []
+    monkeypatch.setattr(automation_usage_service, "_provider_snapshot_builders", lambda: builders)
+    monkeypatch.setattr(automation_usage_service, "_active_provider_usage_counts", lambda: {})
+    monkeypatch.setattr(automation_usage_service, "_enrich_with_execution_stats", lambda snapshot: None)
+    monkeypatch.setattr(automation_usage_service, "_store_snapshot", stored.append)
+    return stored
+
+
+def _builder(provider: str, *, wait=None, calls=None):
+    def build() -> ProviderUsageSnapshot:
+        if calls is not None:
+            calls.append(provider)
+        if wait is not None:
+            wait()
+        return ProviderUsageSnapshot(id=f"provider_{provider}", provider=provider, kind="custom", status="ok")
+
+    return build
+
+
+def test_provider_snapshots_are_built_concurrently(monkeypatch) -> None:
+    names = ["coherence-internal", "openai", "claude", "cursor", "gemini", "github", "db-host"]
+    stored = _stub_builders(
+        monkeypatch, [(name, "custom", _builder(name, wait=lambda: time.sleep(0.3))) for name in names]
+    )
+
+    started = time.perf_counter()
+    providers = automation_usage_service._collect_provider_snapshots()
+    elapsed = time.perf_counter() - started
+
+    assert [p.provider for p in providers] == names
+    assert elapsed < 1.2
+    assert len(stored) == len(names)
+    assert all(p.raw["probe_ms"] >= 250 for p in providers)
+
+
+def test_slow_provider_falls_back_to_marked_stale_snapshot(monkeypatch, set_config) -> None:
+    set_config("automation_usage", "provider_probe_deadlines", {"github": 0.5})
+    release = threading.Event()
+    calls: list[str] = []
+    stored = _stub_builders(monkeypatch, [
+        ("openai", "openai", _builder("openai", calls=calls)),
+        ("github", "github", _builder("github", calls=calls, wait=lambda: release.wait(5))),
+    ])
+    last = ProviderUsageSnapshot(
+        id="provider_github_old", provider="github", kind="github", status="ok",
+        collected_at=datetime(2026, 1, 2, tzinfo=timezone.utc),
+    )
+    monkeypatch.setattr(automation_usage_service, "_latest_provider_snapshots", lambda: {"github": last})
+
+    first = {p.provider: p for p in automation_usage_service._collect_provider_snapshots()}
+
+    assert first["github"].id == "provider_github_old"
+    assert first["github"].raw["stale"] is True
+    assert first["github"].raw["stale_since"] == "2026-01-02T00:00:00+00:00"
+    assert "missed its 0.5s deadline" in first["github"].notes[-1]
+    assert [s.provider for s in stored] == ["openai"]
+    timings = {row["provider"]: row for row in automation_usage_service.provider_probe_timings()["providers"]}
+    assert timings["github"]["timeouts"] == 1
+
+    # The late probe is not restarted: the next collection takes its result.
+    release.set()
+    automation_usage_service._PROVIDER_PROBE_FUTURES["github"].result(timeout=5)
+    second = {p.provider: p for p in automation_usage_service._collect_provider_snapshots()}
+
+    assert second["github"].id == "provider_github"
+    assert "stale" not in second["github"].raw
+    assert calls.count("github") == 1
+    assert automation_usage_service.provider_probe_timings()["in_flight"] == []
+
+
+@pytest.mark.asyncio
+async def test_probe_timings_endpoint_lists_slowest_first(monkeypatch) -> None:
+    _stub_builders(monkeypatch, [
+        ("openai", "openai", _builder("openai")),
+        ("cursor", "custom", _builder("cursor", wait=lambda: time.sleep(0.2))),
+    ])
+    automation_usage_service._collect_provider_snapshots()
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/api/automation/usage/probe-timings")
+
+    assert response.status_code == 200
+    rows = [row for row in response.json()["providers"] if row["provider"] in {"openai", "cursor"}]
+    assert [row["provider"] for row in rows] == ["cursor", "openai"]
+    assert rows[0]["last_ms"] >= 150 and rows[0]["last_outcome"] == "ok"
+    assert rows[0]["avg_ms"] is not None
@@ -54,7 +54,12 @@ from app.services.substrate.markdown_frontend import (
 )
 from app.services.substrate.resonance import cell_resonance_signature
 from app.services.substrate.modality_shapes import CANONICAL_SHAPES
-from app.services.substrate.orm import SubstrateNamedCellORM, SubstrateNodeORM
+from app.services.substrate.orm import (
+    SubstrateInstanceSeqORM,
+    SubstrateNamedCellORM,
+    SubstrateNodeChildORM,
+    SubstrateNodeORM,
+)
 from app.services.substrate.substrate_strings import SubstrateStringORM
 
 from intern_canonical_words import intern_all  # noqa: E402
@@ -69,6 +74,8 @@ def session():
         poolclass=StaticPool,
     )
     SubstrateNodeORM.__table__.create(engine, checkfirst=True)
+    SubstrateNodeChildORM.__table__.create(engine, checkfirst=True)
+    SubstrateInstanceSeqORM.__table__.create(engine, checkfirst=True)
     SubstrateNamedCellORM.__table__.create(engine, checkfirst=True)
     SubstrateStringORM.__table__.create(engine, checkfirst=True)
     Session = sessionmaker(bind=engine, expire_on_commit=False)
@@ -0,0 +1,180 @@
+"""Cold start: lazily registered routers and the import-time report.
+
+Source under test: app.core.lazy_routers (placeholder routes, first-request
+load, warm phase, OpenAPI hook), app.core.import_profile, and
+GET /api/runtime/lazy-routers.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import types
+from pathlib import Path
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core import import_profile, lazy_routers
+from app.main import app as main_app
+
+_API_DIR = Path(__file__).resolve().parents[1]
+
+
+def _fake_router_module(monkeypatch, name: str = "tests_lazy_fake_router") -> str:
+    router = APIRouter()
+
+    @router.get("/lazy/ping")
+    async def ping() -> dict:
+        return {"pong": True}
+
+    module = types.ModuleType(name)
+    module.router = router
+    monkeypatch.setitem(sys.modules, name, module)
+    return name
+
+
+def _app_with_lazy_router(monkeypatch) -> FastAPI:
+    before = APIRouter()
+    before.add_api_route("/before", lambda: {"at": "before"}, methods=["GET"])
+    after = APIRouter()
+    after.add_api_route("/lazy/served-later", lambda: {"at": "after"}, methods=["GET"])
+
+    app = FastAPI()
+    app.include_router(before, prefix="/api")
+    lazy_routers.include(app, _fake_router_module(monkeypatch), prefixes=("/api/lazy",), prefix="/api")
+    app.include_router(after, prefix="/api")
+    return app
+
+
+_FRESH_DB_PROBE = """\
+import asyncio, sys
+from app import config_loader
+config_loader._load()["database"]["url"] = "sqlite:///" + sys.argv[1]
+from httpx import ASGITransport, AsyncClient
+from app.main import app
+from app.services import unified_db
+
+unified_db.ensure_schema()  # what startup does, before any lazy router is loaded
+
+async def main():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        r = await c.get("/api/federation/value/mirrors")
+    print(r.status_code, r.text)
+
+asyncio.run(main())
+"""
+
+
+def test_heavy_router_modules_are_not_imported_with_the_app():
+    lazy = ["app.routers.push", "app.routers.resonance", "app.routers.federation",
+            "app.routers.household", "app.routers.grocery", "pywebpush", "numpy"]
+    probe = f"import sys, app.main; print([m for m in {lazy!r} if m in sys.modules])"
+    out = subprocess.run(
+        [sys.executable, "-c", probe], cwd=str(_API_DIR), capture_output=True, text=True, check=True,
+    )
+    assert out.stdout.strip().splitlines()[-1] == "[]"
+    assert {e["module"] for e in lazy_routers.stats()["routers"]} >= set(lazy[:5])
+
+
+def test_lazy_router_tables_exist_on_a_fresh_database(tmp_path):
+    out = subprocess.run(
+        [sys.executable, "-c", _FRESH_DB_PROBE, str(tmp_path / "fresh.db")],
+        cwd=str(_API_DIR), capture_output=True, text=True, check=True,
+    )
+    assert out.stdout.strip().splitlines()[-1] == "200 []"
+
+
+@pytest.mark.asyncio
+async def test_first_request_loads_the_router_into_the_placeholders_slot(monkeypatch):
+    app = _app_with_lazy_router(monkeypatch)
+    placeholder_index = next(
+        i for i, r in enumerate(app.router.routes) if isinstance(r, lazy_routers.LazyRouterRoute)
+    )
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        first = await c.get("/api/lazy/ping")
+        later_router = await c.get("/api/lazy/served-later")
+        missing = await c.get("/api/lazy/nothing-here")
+        other = await c.get("/api/before")
+
+    assert first.status_code == 200 and first.json() == {"pong": True}
+    assert later_router.json() == {"at": "after"}
+    assert missing.status_code == 404
+    assert other.json() == {"at": "before"}
+    assert lazy_routers.pending(app) == []
+    slot = app.router.routes[placeholder_index]
+    assert slot.original_router is sys.modules["tests_lazy_fake_router"].router
+    entry = next(e for e in lazy_routers.stats()["routers"] if e["module"] == "tests_lazy_fake_router")
+    assert entry["state"] == "loaded" and entry["trigger"] == "request"
+
+
+@pytest.mark.asyncio
+async def test_warm_phase_loads_pending_routers(monkeypatch, set_config):
+    set_config("api", "lazy_router_warm_delay_seconds", 0)
+    app = _app_with_lazy_router(monkeypatch)
+
+    await lazy_routers.start_warm(app)
+
+    assert lazy_routers.pending(app) == []
+
+
+def test_disabled_lazy_routing_includes_on_the_spot(monkeypatch, set_config):
+    set_config("api", "lazy_routers", False)
+    app = _app_with_lazy_router(monkeypatch)
+
+    assert lazy_routers.pending(app) == []
+    assert any(getattr(r, "original_router", None) is sys.modules["tests_lazy_fake_router"].router
+               for r in app.router.routes)
+
+
+def test_openapi_schema_covers_lazy_routers():
+    # A fresh interpreter: building the schema loads every lazy router, which
+    # must not change what the shared app looks like to later tests.
+    probe = (
+        "from app.main import app; from app.core import lazy_routers\n"
+        "paths = app.openapi()['paths']\n"
+        "print(len(lazy_routers.pending(app)), sorted(p for p in paths if p in {"
+        "'/api/push/subscribe', '/api/household/requests', '/api/resonance/scan'}))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", probe], cwd=str(_API_DIR), capture_output=True, text=True, check=True,
+    )
+
+    assert out.stdout.strip().splitlines()[-1] == (
+        "0 ['/api/household/requests', '/api/push/subscribe', '/api/resonance/scan']"
+    )
+
+
+@pytest.mark.asyncio
+async def test_runtime_endpoint_reports_lazy_routers():
+    async with AsyncClient(transport=ASGITransport(app=main_app), base_url="http://test") as c:
+        r = await c.get("/api/runtime/lazy-routers")
+
+    assert r.status_code == 200
+    modules = {e["module"]: e for e in r.json()["routers"]}
+    assert modules["app.routers.push"]["prefixes"] == ["/api/push"]
+
+
+_TRACE = """\
+import time: self [us] | cumulative | imported package
+import time:       150 |        150 |   sqlalchemy.sql
+import time:       400 |        550 | sqlalchemy
+import time:      2000 |       2000 |     app.services.agent_service
+import time:       300 |       2300 |   app.routers.agent
+import time:      1000 |       3850 | app.main
+"""
+
+
+def test_import_profile_folds_trace_per_package():
+    rows = import_profile.parse_importtime(_TRACE)
+    report = import_profile.aggregate(rows, top=3)
+
+    assert [r["depth"] for r in rows] == [1, 0, 2, 1, 0]
+    assert report["module_count"] == 5 and report["traced_ms"] == 3.9
+    assert [p["package"] for p in report["packages"]] == [
+        "app.services.agent_service", "app.main", "sqlalchemy",
+    ]
+    assert report["packages"][2] == {"package": "sqlalchemy", "self_ms": 0.6, "share": 0.143, "modules": 2}
+    assert report["slowest_cumulative"][0] == {"module": "app.main", "self_ms": 1.0, "cumulative_ms": 3.9}
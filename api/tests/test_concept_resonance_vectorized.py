@@ -0,0 +1,120 @@
+"""Vectorized CRK + OT-φ batch backend against the pure-Python reference.
+
+Source under test: api/app/services/concept_resonance_vectorized.py
+(compare_concepts_batch) and concept_resonance_kernel.compare_concepts.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+
+import pytest
+
+from app.services import idea_resonance_service
+from app.services.concept_resonance_kernel import (
+    ConceptSymbol,
+    GeometricSubsymbol,
+    HarmonicComponent,
+    compare_concepts,
+    concept_to_symbol,
+    text_to_symbol,
+)
+from app.services.concept_resonance_vectorized import coherence_upper_bounds, compare_concepts_batch
+
+pytest.importorskip("numpy")
+
+_WORDS = (
+    "symbiosis microservice coupling emergent network cell api market trust learning "
+    "memory graph wave energy token design rhythm ecology code governance harmonic"
+).split()
+
+
+def _symbols() -> list[ConceptSymbol]:
+    rng = random.Random(7)
+    symbols = [text_to_symbol(" ".join(rng.sample(_WORDS, rng.randint(0, 12)))) for _ in range(24)]
+    symbols += [concept_to_symbol(concept) for concept in ("ucore", "love", "joy")]
+    symbols += [
+        ConceptSymbol(
+            components=[
+                HarmonicComponent("A", 1.0, (0.1, 0.2), 0.3, 0.7),
+                HarmonicComponent("a", 1.004, (0.1, 0.21), 2.0, 0.4),
+                HarmonicComponent("b", 2.0, None, 1.0, 0.0),
+            ],
+            geometry=GeometricSubsymbol((1.0, 0.0, 1.0), 0.5),
+            band_weights={"a": 2.0},
+            mu=0.3,
+        ),
+        ConceptSymbol(
+            components=[
+                HarmonicComponent("a", 1.002, (0.1, 0.2), -0.3, 0.5),
+                HarmonicComponent("B", 2.001, (0.5,), 7.5, 0.9),
+            ],
+            geometry=GeometricSubsymbol((1.0, 1.0, 0.0), 2.0),
+            band_weights={"B": 0.4},
+        ),
+        ConceptSymbol(),
+    ]
+    return symbols
+
+
+@pytest.mark.parametrize("tau_grid", [None, [0.0, 0.25, 1.0]])
+def test_batch_matches_reference_for_every_pair(tau_grid):
+    symbols = _symbols()
+    pairs = [(a, b) for a in symbols for b in symbols if a is not b]
+
+    vectorized = compare_concepts_batch(pairs, tau_grid, backend="numpy")
+    reference = compare_concepts_batch(pairs, tau_grid, backend="reference")
+
+    assert len(vectorized) == len(pairs)
+    assert sum(r.coherence > 0 for r in reference) > len(pairs) // 2
+    for got, want in zip(vectorized, reference):
+        assert got.used_ot == want.used_ot
+        for field in ("crk", "d_res", "d_ot_phi", "coherence", "d_codex"):
+            assert math.isclose(getattr(got, field), getattr(want, field), abs_tol=2e-6), (field, got, want)
+
+
+def test_batch_edge_cases():
+    assert compare_concepts_batch([]) == []
+    with pytest.raises(ValueError):
+        compare_concepts_batch([], backend="gpu")
+
+    empty = ConceptSymbol()
+    lone = ConceptSymbol(components=[HarmonicComponent("solo", 10.0)])
+    other = ConceptSymbol(components=[HarmonicComponent("other", 10.0)])
+    for s1, s2 in ((empty, empty), (lone, other), (lone, lone)):
+        assert compare_concepts_batch([(s1, s2)]) == [compare_concepts(s1, s2)]
+
+
+def test_upper_bounds_never_undercut_exact_coherence():
+    symbols = _symbols()
+    bounds = coherence_upper_bounds(symbols, symbols)
+    results = compare_concepts_batch([(a, b) for a in symbols for b in symbols])
+
+    exact = [r.coherence for r in results]
+    flat = bounds.ravel().tolist()
+    assert all(c <= b + 1e-6 for c, b in zip(exact, flat))
+    # Tight enough to prune: most bounds sit within 0.01 of the exact score.
+    assert sum(b - c < 0.01 for c, b in zip(exact, flat)) > 0.8 * len(flat)
+
+
+def test_cross_domain_scan_uses_batch_results(monkeypatch):
+    monkeypatch.setattr(idea_resonance_service, "_pair_cache", {})
+    monkeypatch.setattr(idea_resonance_service, "_symbol_cache", {})
+    monkeypatch.setattr(idea_resonance_service, "_resonance_events", [])
+    monkeypatch.setattr(idea_resonance_service, "_idea_fingerprints", {})
+    ideas = [
+        {"id": f"vec-{i}", "name": f"Idea {i}", "description": " ".join(_WORDS[i:i + 8]),
+         "tags": [tag], "interfaces": []}
+        for i, tag in enumerate(["biology", "software", "economics", "social", "physics", "art"])
+    ]
+
+    pairs = idea_resonance_service.get_cross_domain_pairs(ideas, limit=50)
+
+    # Every returned pair matches a one-at-a-time comparison.
+    assert pairs and all(p.cross_domain for p in pairs)
+    for pair in pairs:
+        a = next(i for i in ideas if i["id"] == pair.idea_id_a)
+        b = next(i for i in ideas if i["id"] == pair.idea_id_b)
+        expected = compare_concepts(idea_resonance_service._idea_symbol(a), idea_resonance_service._idea_symbol(b))
+        assert math.isclose(pair.coherence, expected.coherence, abs_tol=2e-6)
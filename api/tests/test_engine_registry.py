@@ -0,0 +1,164 @@
+"""One pooled engine per database URL, shared by every store.
+
+Source under test: unified_db.shared_engine / dispose_engine / pool_stats,
+the side stores' _create_engine delegating to it, and
+GET /api/runtime/db-pools.
+"""
+
+from __future__ import annotations
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, text
+
+from app.main import app
+from app.services import (
+    agent_task_store_service,
+    commit_evidence_registry_service,
+    runtime_event_store,
+    unified_db,
+)
+from app.services.agent_run_state import db as agent_run_state_db
+
+
+def _pool(url: str) -> dict:
+    return next(p for p in unified_db.pool_stats() if p["url"] == url)
+
+
+def test_stores_share_one_engine_per_url(tmp_path):
+    url = f"sqlite+pysqlite:///{tmp_path / 'shared.db'}"
+
+    engines = {
+        runtime_event_store._create_engine(url),
+        agent_task_store_service._create_engine(url),
+        agent_run_state_db._create_engine(url),
+        commit_evidence_registry_service._create_engine(url),
+    }
+
+    assert len(engines) == 1
+    assert _pool(url)["owners"] == [
+        "agent_run_state", "agent_task_store", "commit_evidence_registry", "runtime_event_store",
+    ]
+
+
+def test_sqlite_connections_are_pooled_and_pragmas_run_once():
+    url = unified_db.database_url()
+    before = _pool(url)
+
+    for _ in range(5):
+        with unified_db.session() as s:
+            mode = s.execute(text("PRAGMA journal_mode")).scalar()
+
+    after = _pool(url)
+    assert mode == "wal"
+    assert after["pool"] == "QueuePool"
+    assert after["connects"] == before["connects"]
+    assert after["checkouts"] - before["checkouts"] >= 5
+    assert after["checked_out"] == 0 and after["checked_in"] >= 1
+
+
+def test_pool_size_comes_from_config(tmp_path, set_config):
+    set_config("database", "pool_size", 3)
+    set_config("database", "max_overflow", 0)
+    url = f"sqlite+pysqlite:///{tmp_path / 'sized.db'}"
+
+    eng = unified_db.shared_engine(url, owner="test")
+
+    assert eng.pool.size() == 3 and eng.pool._max_overflow == 0
+
+
+def test_dispose_drops_the_pool_and_next_use_rebuilds(tmp_path):
+    url = f"sqlite+pysqlite:///{tmp_path / 'disposed.db'}"
+    first = unified_db.shared_engine(url, owner="test")
+    with first.connect() as conn:
+        conn.execute(text("select 1"))
+
+    unified_db.dispose_engine(url)
+
+    assert all(p["url"] != url for p in unified_db.pool_stats())
+    assert unified_db.shared_engine(url, owner="test") is not first
+
+
+def test_dispose_empties_every_owner_cache(tmp_path, set_config, monkeypatch):
+    url = f"sqlite+pysqlite:///{tmp_path / 'owners.db'}"
+    set_config("database_overrides", "runtime", url)
+    monkeypatch.setattr(runtime_event_store, "_ENGINE_CACHE", {"url": "", "engine": None, "sessionmaker": None})
+    first = runtime_event_store._engine()
+
+    unified_db.dispose_engine(url)
+
+    assert runtime_event_store._ENGINE_CACHE["engine"] is None
+    second = runtime_event_store._engine()
+    assert second is not first and second is unified_db.shared_engine(url, owner="test")
+
+
+def test_reset_engine_evicts_side_stores_on_the_main_url(set_config, monkeypatch):
+    url = unified_db.database_url()
+    set_config("database_overrides", "runtime", url)
+    monkeypatch.setattr(runtime_event_store, "_ENGINE_CACHE", {"url": "", "engine": None, "sessionmaker": None})
+    assert runtime_event_store._engine() is unified_db.engine()
+
+    unified_db.reset_engine()
+
+    assert runtime_event_store._ENGINE_CACHE["engine"] is None
+    assert runtime_event_store._engine() is unified_db.engine()
+
+
+def test_egress_probe_registers_with_the_shared_registry(tmp_path, monkeypatch):
+    from app.services import automation_usage_service
+
+    monkeypatch.setattr(
+        automation_usage_service, "_DB_HOST_EGRESS_ENGINE_CACHE", {"url": "", "engine": None, "sessionmaker": None},
+    )
+    url = f"sqlite+pysqlite:///{tmp_path / 'egress.db'}"
+
+    eng = automation_usage_service._db_host_egress_engine(url)
+
+    assert eng is unified_db.shared_engine(url, owner="test")
+    assert "db_egress" in _pool(url)["owners"]
+    unified_db.dispose_engine(url)
+    assert automation_usage_service._DB_HOST_EGRESS_ENGINE_CACHE["engine"] is None
+
+
+def test_postgres_connect_timeout_gets_its_own_registered_pool(monkeypatch):
+    made: list[tuple[str, int | None]] = []
+
+    def fake_create_engine(url, connect_timeout=None):
+        made.append((url, connect_timeout))
+        return create_engine("sqlite://")
+
+    monkeypatch.setattr(unified_db, "_create_engine", fake_create_engine)
+    url = "postgresql+psycopg://coherence:secret@db:5432/coherence"
+    try:
+        main = unified_db.shared_engine(url, owner="test")
+        probe = unified_db.shared_engine(url, owner="db_egress", connect_timeout=3)
+
+        assert probe is not main
+        assert probe is unified_db.shared_engine(url, owner="db_egress", connect_timeout=3)
+        assert made == [(url, None), (url, 3)]
+        pools = [p for p in unified_db.pool_stats() if p["url"] == unified_db._redact_url(url)]
+        assert [(p["owners"], p.get("connect_timeout")) for p in pools] == [(["test"], None), (["db_egress"], 3)]
+    finally:
+        unified_db.dispose_engine(url)
+    assert all(p["url"] != unified_db._redact_url(url) for p in unified_db.pool_stats())
+
+
+def test_memory_sqlite_is_not_given_queue_pool_settings():
+    eng = unified_db._create_engine("sqlite:///:memory:")
+    assert type(eng.pool).__name__ != "QueuePool"
+
+
+@pytest.mark.asyncio
+async def test_db_pools_endpoint_lists_the_shared_pool():
+    with unified_db.session() as s:
+        s.execute(text("select 1"))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        r = await c.get("/api/runtime/db-pools")
+
+    assert r.status_code == 200
+    pools = {p["url"]: p for p in r.json()["pools"]}
+    assert "unified_db" in pools[unified_db.database_url()]["owners"]
+    assert unified_db._redact_url("postgresql+psycopg://user:secret@db:5432/coherence") == (
+        "postgresql+psycopg://user:***@db:5432/coherence"
+    )
@@ -0,0 +1,190 @@
+"""Offloading never-awaiting async handlers and the event-loop lag monitor.
+
+Source under test: app.core.event_loop (never_awaits detection,
+offload_blocking_endpoints and its read/write lanes, start_lag_monitor /
+lag_stats) and its
+wiring into app.main.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, HTTPException
+from httpx import ASGITransport, AsyncClient
+
+from app.core import event_loop
+
+
+async def _plain() -> dict:
+    return {"ok": True}
+
+
+async def _awaits() -> None:
+    await asyncio.sleep(0)
+
+
+async def _iterates(source) -> list:
+    return [item async for item in source]
+
+
+async def _schedules() -> None:
+    asyncio.get_running_loop().call_soon(print)
+
+
+@event_loop.keep_on_loop
+async def _pinned() -> dict:
+    return {}
+
+
+def _sync() -> dict:
+    return {}
+
+
+def test_never_awaits_reads_the_bytecode():
+    assert event_loop.never_awaits(_plain)
+    assert not event_loop.never_awaits(_awaits)
+    assert not event_loop.never_awaits(_iterates)
+    assert not event_loop.never_awaits(_schedules)
+    assert not event_loop.never_awaits(_pinned)
+    assert not event_loop.never_awaits(_sync)
+
+
+def _limit() -> int:
+    return 3
+
+
+def _build_app() -> tuple[FastAPI, dict]:
+    seen: dict = {}
+    router = event_loop.offload_router(APIRouter())
+
+    @router.get("/slow")
+    async def slow(limit: int = Depends(_limit)) -> dict:
+        seen.setdefault("threads", set()).add(threading.get_ident())
+        time.sleep(0.3)
+        return {"limit": limit}
+
+    @router.get("/missing")
+    async def missing() -> dict:
+        raise HTTPException(status_code=404, detail="nope")
+
+    @router.get("/ping")
+    async def ping() -> dict:
+        await asyncio.sleep(0)
+        return {"pong": True}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    return app, seen
+
+
+@pytest.mark.asyncio
+async def test_offloaded_handlers_leave_the_loop_free():
+    app, seen = _build_app()
+    moved = event_loop.offload_blocking_endpoints(app)
+    app.dependency_overrides[_limit] = lambda: 7
+    loop_thread = threading.get_ident()
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        started = time.perf_counter()
+        slow = [asyncio.create_task(c.get("/api/slow")) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        ping = await c.get("/api/ping")
+        ping_at = time.perf_counter() - started
+        responses = await asyncio.gather(*slow)
+        missing = await c.get("/api/missing")
+
+    assert sorted(moved) == ["GET /missing", "GET /slow"]
+    assert ping.json() == {"pong": True} and ping_at < 0.25
+    assert [r.json() for r in responses] == [{"limit": 7}] * 3
+    assert loop_thread not in seen["threads"]
+    assert missing.status_code == 404 and missing.json() == {"detail": "nope"}
+
+
+@pytest.mark.asyncio
+async def test_writes_share_one_lane_while_reads_stay_concurrent():
+    active, peak, lock = [0], [0], threading.Lock()
+    router = event_loop.offload_router(APIRouter())
+
+    @router.post("/bump")
+    async def bump() -> dict:
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.1)
+        with lock:
+            active[0] -= 1
+        return {}
+
+    app = FastAPI()
+    app.include_router(router)
+    event_loop.offload_blocking_endpoints(app)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        codes = await asyncio.gather(*[c.post("/bump") for _ in range(4)])
+
+    assert [r.status_code for r in codes] == [200] * 4
+    assert peak[0] == 1
+
+
+def test_routers_stay_on_the_loop_unless_opted_in():
+    router = APIRouter()
+
+    @router.get("/plain")
+    async def plain() -> dict:
+        return {}
+
+    app = FastAPI()
+    app.include_router(router)
+
+    assert event_loop.offload_blocking_endpoints(app) == []
+    assert not hasattr(plain, "__offloaded__")
+
+
+def test_main_app_offloads_only_audited_routers():
+    from app.main import app
+    from app.routers import agent_tasks_routes, contributions, graph, ideas, runtime, views
+
+    def lane(router, path, method="GET"):
+        route = next(r for r in router.routes
+                     if getattr(r, "path", None) == path and method in getattr(r, "methods", ()))
+        return getattr(route.endpoint, "__offloaded__", None)
+
+    assert lane(graph.router, "/graph/stats") == "read"
+    assert lane(runtime.router, "/runtime/events") == "read"
+    assert lane(runtime.router, "/runtime/events", "POST") == "write"
+    assert lane(runtime.router, "/runtime/exerciser/run", "POST") is None
+    assert lane(views.router, "/views/ping", "POST") == "write"
+    assert lane(contributions.router, "/contributions/{contribution_id}") == "read"
+    for router in (ideas.router, agent_tasks_routes.router):
+        assert not any(getattr(r, "endpoint", None) and hasattr(r.endpoint, "__offloaded__")
+                       for r in router.routes)
+    assert event_loop.offload_blocking_endpoints(app) == []
+
+
+def _block_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_lag_monitor_names_the_blocking_function(set_config):
+    set_config("api", "loop_lag_interval_ms", 20)
+    set_config("api", "loop_lag_threshold_ms", 50)
+    event_loop.reset_lag_stats()
+
+    assert event_loop.start_lag_monitor()
+    try:
+        await asyncio.sleep(0.1)
+        _block_loop(0.4)
+        await asyncio.sleep(0.1)
+    finally:
+        event_loop.stop_lag_monitor()
+
+    stats = event_loop.lag_stats()
+    assert stats["blocked_events"] >= 1 and stats["max_lag_ms"] >= 300
+    top = stats["handlers"][0]
+    assert top["handler"].endswith("_block_loop") and top["total_ms"] >= 300
+    assert stats["running"] is False
@@ -0,0 +1,105 @@
+"""Bulk governance intake for POST /api/federation/sync.
+
+Source under test: federation_service.receive_payload / queue_sync_job /
+run_sync_job and governance_service.create_change_requests_bulk.
+"""
+
+from __future__ import annotations
+
+from uuid import uuid4
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.models.governance import ChangeRequestStatus
+from app.services import governance_service
+
+BASE = "http://test"
+
+
+async def _register_peer(client: AsyncClient) -> str:
+    instance_id = f"peer_{uuid4().hex[:10]}"
+    r = await client.post("/api/federation/instances", json={
+        "instance_id": instance_id,
+        "name": f"Peer {instance_id}",
+        "endpoint_url": f"https://{instance_id}.example",
+        "registered_at": "2026-05-13T00:00:00Z",
+        "trust_level": "pending",
+    })
+    assert r.status_code == 201, r.text
+    return instance_id
+
+
+def _payload(instance_id: str, usage_events: list[dict], **extra) -> dict:
+    return {
+        "source_instance_id": instance_id,
+        "timestamp": "2026-05-13T00:00:00Z",
+        "lineage_links": [],
+        "usage_events": usage_events,
+        **extra,
+    }
+
+
+def _open_requests_from(instance_id: str) -> list:
+    return [
+        cr for cr in governance_service.list_change_requests(limit=5000)
+        if cr.proposer_id == f"federation:{instance_id}" and cr.status == ChangeRequestStatus.OPEN
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sync_inserts_once_and_skips_items_already_pending():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url=BASE) as c:
+        instance_id = await _register_peer(c)
+        events = [{"event_id": f"ev{i}", "idea_id": "idea-x", "value": i} for i in range(40)]
+        events.append(dict(events[0]))  # repeated inside the same payload
+
+        r = await c.post("/api/federation/sync", json=_payload(
+            instance_id, events, idea_proposals=[{"id": "idea-new", "body_markdown": "# New"}],
+        ))
+        assert r.status_code == 200, r.text
+        body = r.json()
+        assert body["events_received"] == 41
+        assert body["governance_requests_created"] == 41 and body["accepted"] == 41
+        assert body["duplicates_skipped"] == 1
+        assert body["job_id"] is None
+
+        # The peer re-sends the batch: nothing new to vote on.
+        r = await c.post("/api/federation/sync", json=_payload(instance_id, events[:40]))
+        assert r.json()["governance_requests_created"] == 0
+        assert r.json()["duplicates_skipped"] == 40
+
+    created = _open_requests_from(instance_id)
+    assert len(created) == 41
+    assert all(cr.required_approvals >= 2 for cr in created)
+    by_type = {cr.payload["federation_type"]: cr.auto_apply_on_approval for cr in created}
+    assert by_type == {"usage_event": True, "idea_proposal": False}
+
+
+@pytest.mark.asyncio
+async def test_large_payload_is_ingested_as_a_background_job(set_config):
+    set_config("federation", "sync_async_threshold", 10)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url=BASE) as c:
+        instance_id = await _register_peer(c)
+        events = [{"event_id": f"big{i}"} for i in range(25)]
+
+        r = await c.post("/api/federation/sync", json=_payload(instance_id, events))
+        assert r.status_code == 202, r.text
+        job_id = r.json()["job_id"]
+        assert job_id
+
+        r = await c.get(f"/api/federation/sync/jobs/{job_id}")
+        assert r.status_code == 200
+        job = r.json()
+        assert job["status"] == "completed" and job["items"] == 25
+        assert job["result"]["governance_requests_created"] == 25
+
+        # Unknown sources are still rejected up front, without a job.
+        r = await c.post("/api/federation/sync", json=_payload("peer_never_registered", events))
+        assert r.status_code == 200
+        assert r.json()["job_id"] is None and r.json()["rejected"] == 25
+
+        assert (await c.get("/api/federation/sync/jobs/syncjob_missing")).status_code == 404
+
+    assert len(_open_requests_from(instance_id)) == 25
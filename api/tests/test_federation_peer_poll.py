@@ -389,3 +389,73 @@ async def test_poll_peer_unregistered_returns_structured_result():
     assert isinstance(result, PeerPollResult)
     assert result.pulse_status == "skipped"
     assert any("not registered" in n for n in result.notes)
+
+
+# ---------------------------------------------------------------------------
+# 9. Concurrent sweep, adaptive timeout, backoff for unreachable peers
+# ---------------------------------------------------------------------------
+
+
+def _slow_ok_transport(delay_s: float) -> httpx.MockTransport:
+    import asyncio
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(delay_s)
+        if request.url.path.endswith("/api/pulse/now"):
+            return httpx.Response(200, json=_ok_pulse_body())
+        if request.url.path.endswith("/api/federation/capabilities/self"):
+            return httpx.Response(200, json=_ok_capabilities_body())
+        return httpx.Response(200, json=_ok_canonicals_body())
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_poll_all_peers_sweeps_concurrently():
+    """Four peers × three probes at 0.2s each finish in about one probe's time."""
+    import time
+
+    peers = [f"peer-slow-{i}" for i in range(4)]
+    for peer_id in peers:
+        _register_peer(peer_id, endpoint_url=f"https://{peer_id}.example.test")
+
+    async with httpx.AsyncClient(transport=_slow_ok_transport(0.2), timeout=5.0) as client:
+        started = time.perf_counter()
+        results = await poll_all_peers(instance_ids=peers, client=client)
+        elapsed = time.perf_counter() - started
+
+    assert elapsed < 1.2  # sequential would be 4 × 3 × 0.2 = 2.4s
+    assert all(results[p].pulse_status == "ok" for p in peers)
+    assert all(len(results[p].probe_ms) == 3 for p in peers)
+    # Recent answers took ~0.2s, so the next timeout shrinks from the 5s ceiling.
+    health = federation_peer_poll_service.peer_poll_health()
+    assert 1.0 <= health[peers[0]]["timeout_s"] < 5.0
+
+
+@pytest.mark.asyncio
+async def test_unreachable_peer_backs_off_and_recovers(monkeypatch, set_config):
+    set_config("federation", "peer_poll_backoff_base_s", 60.0)
+    _register_peer("peer-dark", endpoint_url="https://peer-dark.example.test")
+    calls: list[str] = []
+
+    def dark_handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        raise httpx.ConnectTimeout("black hole", request=request)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(dark_handler)) as client:
+        first = await poll_all_peers(instance_ids=["peer-dark"], client=client)
+        second = await poll_all_peers(instance_ids=["peer-dark"], client=client)
+
+    assert first["peer-dark"].pulse_status == "unreachable"
+    assert len(calls) == 3  # the second sweep did not wait on the peer again
+    assert second["peer-dark"].pulse_status == "skipped"
+    assert any(n.startswith("backoff:") for n in second["peer-dark"].notes)
+    health = federation_peer_poll_service.peer_poll_health()["peer-dark"]
+    assert health["consecutive_failures"] == 1 and health["backoff_remaining_s"] > 0
+
+    # Once the backoff has elapsed the peer is polled again; answering resets it.
+    federation_peer_poll_service._HEALTH["peer-dark"].retry_at = 0.0
+    async with httpx.AsyncClient(transport=_slow_ok_transport(0.0)) as client:
+        third = await poll_all_peers(instance_ids=["peer-dark"], client=client)
+    assert third["peer-dark"].pulse_status == "ok"
+    assert federation_peer_poll_service.peer_poll_health()["peer-dark"]["consecutive_failures"] == 0
@@ -312,3 +312,112 @@ def test_get_neighbors_returns_connected_nodes():
         ids = {n["id"] for n in nodes if isinstance(n, dict) and "id" in n}
         assert "asset:spoke-1" in ids
         assert "asset:spoke-2" in ids
+
+
+# ── Set-based subgraph + path traversal ───────────────────────────
+
+
+def _chain(ids: list[str]) -> None:
+    for nid in ids:
+        graph_service.create_node(id=nid, type="concept", name=nid)
+    for a, b in zip(ids, ids[1:]):
+        graph_service.create_edge(from_id=a, to_id=b, type="extends")
+
+
+def test_get_subgraph_walks_depth_and_lists_each_edge_once():
+    """Depth bounds the walk; an edge seen from both of its ends is
+    still returned once."""
+    _chain(["concept:sg-a", "concept:sg-b", "concept:sg-c", "concept:sg-d"])
+    graph_service.create_edge(from_id="concept:sg-a", to_id="concept:sg-c", type="inspires")
+
+    result = graph_service.get_subgraph("concept:sg-a", depth=2)
+    ids = {n["id"] for n in result["nodes"]}
+    assert ids == {"concept:sg-a", "concept:sg-b", "concept:sg-c", "concept:sg-d"}
+    edge_ids = [e["id"] for e in result["edges"]]
+    assert len(edge_ids) == len(set(edge_ids)) == 4
+    assert result["truncated"] is False
+
+    shallow = graph_service.get_subgraph("concept:sg-a", depth=1)
+    assert {n["id"] for n in shallow["nodes"]} == {"concept:sg-a", "concept:sg-b", "concept:sg-c"}
+
+
+def test_get_subgraph_respects_node_budget():
+    """A hub with more neighbours than the budget returns a bounded,
+    truncated subgraph instead of reading the whole neighbourhood."""
+    graph_service.create_node(id="concept:sg-hub", type="concept", name="hub")
+    for i in range(6):
+        graph_service.create_node(id=f"concept:sg-leaf-{i}", type="concept", name=str(i))
+        graph_service.create_edge(
+            from_id="concept:sg-hub", to_id=f"concept:sg-leaf-{i}", type="extends",
+        )
+
+    result = graph_service.get_subgraph("concept:sg-hub", depth=2, max_nodes=3)
+    assert len(result["nodes"]) == 3
+    assert len(result["edges"]) == 2
+    assert result["truncated"] is True
+
+
+def test_get_path_returns_shortest_edge_sequence():
+    """Bidirectional search still returns edges ordered from source to
+    target, and prefers the shortcut over the long way round."""
+    _chain(["concept:p-a", "concept:p-b", "concept:p-c", "concept:p-d", "concept:p-e"])
+    shortcut = graph_service.create_edge(from_id="concept:p-e", to_id="concept:p-b", type="inspires")
+
+    path = graph_service.get_path("concept:p-a", "concept:p-e")
+    assert path is not None
+    assert len(path) == 2
+    assert {path[0]["from_id"], path[0]["to_id"]} == {"concept:p-a", "concept:p-b"}
+    assert path[1]["id"] == shortcut["id"]
+
+    assert graph_service.get_path("concept:p-a", "concept:p-d", max_depth=1) is None
+    graph_service.create_node(id="concept:p-island", type="concept", name="island")
+    assert graph_service.get_path("concept:p-a", "concept:p-island") is None
+
+
+# ── In-memory adjacency snapshot ──────────────────────────────────
+
+
+def test_adjacency_snapshot_tracks_local_edge_writes():
+    """Once loaded, the snapshot serves neighbour reads and follows
+    create/delete through graph_service without a reload."""
+    from app.services import graph_adjacency
+
+    _chain(["concept:adj-a", "concept:adj-b"])
+    assert {n["id"] for n in graph_service.get_neighbors("concept:adj-a")} == {"concept:adj-b"}
+    loaded = graph_adjacency.stats()
+    assert loaded["loaded"] is True
+
+    graph_service.create_node(id="concept:adj-c", type="concept", name="c")
+    edge = graph_service.create_edge(from_id="concept:adj-a", to_id="concept:adj-c", type="inspires")
+    assert {n["id"] for n in graph_service.get_neighbors("concept:adj-a")} == {
+        "concept:adj-b", "concept:adj-c",
+    }
+    listed = graph_service.list_edges_for_entity("concept:adj-a", edge_type="inspires")
+    assert [e["id"] for e in listed["items"]] == [edge["id"]]
+
+    graph_service.delete_edge(edge["id"])
+    graph_service.delete_node("concept:adj-b")
+    assert graph_service.get_neighbors("concept:adj-a") == []
+    after = graph_adjacency.stats()
+    assert after["generation"] == loaded["generation"] + 3
+    assert after["age_seconds"] >= loaded["age_seconds"]
+
+
+def test_adjacency_snapshot_reloads_when_another_writer_bumps_generation(set_config):
+    """A write from another worker shows up as a generation change, and
+    the next read past the check interval reloads the snapshot."""
+    from app.models.graph import Edge
+    from app.services import graph_adjacency, unified_db
+
+    set_config("graph", "adjacency_check_seconds", 0)
+    _chain(["concept:adj-x", "concept:adj-y"])
+    graph_service.create_node(id="concept:adj-z", type="concept", name="z")
+    assert {n["id"] for n in graph_service.get_neighbors("concept:adj-x")} == {"concept:adj-y"}
+
+    with unified_db.session() as s:
+        s.add(Edge(id="adj-external", from_id="concept:adj-x", to_id="concept:adj-z", type="inspires"))
+        graph_adjacency.bump_generation(s)
+
+    assert {n["id"] for n in graph_service.get_neighbors("concept:adj-x")} == {
+        "concept:adj-y", "concept:adj-z",
+    }
@@ -0,0 +1,145 @@
+"""Two-stage (bound-pruned) resonance search and incremental scans.
+
+Source under test: idea_resonance_service.get_cross_domain_pairs /
+find_resonant_ideas / scan_resonance and POST /api/resonance/scan.
+"""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from app.services import idea_resonance_service as svc
+from app.services.concept_resonance_kernel import compare_concepts
+
+pytest.importorskip("numpy")
+
+_TAGS = ["biology", "software", "economics", "social", "physics", "art", "cognition", "math"]
+_WORDS = (
+    "symbiosis microservice coupling emergent network cell market trust learning memory "
+    "graph wave energy token design rhythm ecology code governance harmonic feedback "
+    "signal swarm consensus gradient lattice pattern"
+).split()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state(monkeypatch):
+    monkeypatch.setattr(svc, "_pair_cache", {})
+    monkeypatch.setattr(svc, "_symbol_cache", {})
+    monkeypatch.setattr(svc, "_resonance_events", [])
+    monkeypatch.setattr(svc, "_idea_fingerprints", {})
+    monkeypatch.setattr(svc, "_dirty_ideas", set())
+
+
+def _ideas(count: int = 40) -> list[dict]:
+    rng = random.Random(11)
+    return [
+        {
+            "id": f"search-{i:02d}",
+            "name": f"Idea {i}",
+            "description": " ".join(rng.sample(_WORDS, rng.randint(2, 9))),
+            "tags": rng.sample(_TAGS, rng.randint(1, 2)),
+            "interfaces": [],
+        }
+        for i in range(count)
+    ]
+
+
+def _brute_force(ideas: list[dict], pairs: list[tuple[int, int]], floor: float) -> list[tuple[float, bool]]:
+    ranked = []
+    for i, j in pairs:
+        a, b = ideas[i], ideas[j]
+        coherence = compare_concepts(svc._idea_symbol(a), svc._idea_symbol(b)).coherence
+        cross = svc._is_cross_domain(
+            svc._infer_domains(a["tags"], a["interfaces"]), svc._infer_domains(b["tags"], b["interfaces"])
+        )
+        threshold = svc.CROSS_DOMAIN_MIN_COHERENCE if cross else svc.MIN_COHERENCE
+        if coherence >= max(threshold, floor):
+            ranked.append((coherence, cross))
+    return ranked
+
+
+def test_cross_domain_top_pairs_match_a_full_scan_with_fewer_comparisons():
+    ideas = _ideas()
+    n = len(ideas)
+    all_pairs = [(i, j) for i in range(n) for j in range(i + 1, n)]
+    expected = sorted(c for c, cross in _brute_force(ideas, all_pairs, 0.3) if cross)[::-1][:10]
+
+    pairs = svc.get_cross_domain_pairs(ideas, limit=10, min_coherence=0.3)
+
+    assert [p.coherence for p in pairs] == expected
+    scored = sum(1 for pair in svc._pair_cache.values() if pair is not None)
+    assert 0 < scored < len(all_pairs) // 2
+
+
+def test_find_resonant_ideas_matches_full_scan_order():
+    ideas = _ideas()
+    source = ideas[3]
+    expected = sorted(
+        _brute_force(ideas, [(3, j) for j in range(len(ideas)) if j != 3], 0.0),
+        key=lambda item: (item[1], item[0]),
+        reverse=True,
+    )[:5]
+
+    matches = svc.find_resonant_ideas(source, ideas, limit=5)
+
+    assert [(m.coherence, m.cross_domain) for m in matches] == expected
+
+
+def test_incremental_scan_only_touches_new_and_edited_ideas():
+    ideas = _ideas(20)
+    first = svc.scan_resonance(ideas)
+    assert first.ideas_changed == 20
+    assert first.pairs_scored + first.pairs_pruned == 20 * 19 // 2
+    assert svc.scan_resonance(ideas).pairs_scored == 0
+
+    ideas[5] = {**ideas[5], "description": "symbiosis microservice coupling feedback swarm"}
+    ideas.append({"id": "search-new", "name": "Fresh", "description": "lattice gradient wave",
+                  "tags": ["physics"], "interfaces": []})
+    events_before = len(svc._resonance_events)
+
+    again = svc.scan_resonance(ideas)
+
+    assert again.ideas_changed == 2
+    assert again.pairs_scored + again.pairs_pruned == 20 + 20 - 1  # pairs touching idea 5 or the new one
+    assert len(svc._resonance_events) > events_before
+    edited = [p for p in svc._pair_cache.values() if p and "search-05" in (p.idea_id_a, p.idea_id_b)]
+    for pair in edited:
+        other = next(i for i in ideas if i["id"] in (pair.idea_id_a, pair.idea_id_b) and i["id"] != "search-05")
+        expected = compare_concepts(svc._idea_symbol(ideas[5]), svc._idea_symbol(other)).coherence
+        assert pair.coherence == expected
+
+
+def test_invalidate_drops_pruned_pairs_too():
+    ideas = _ideas(3)
+    svc.get_cross_domain_pairs(ideas, limit=10)
+    svc._pair_cache[svc._cache_key("search-00", "search-pruned")] = None
+    svc._pair_cache[svc._cache_key("search-pruned", "search-zz")] = None
+
+    svc.invalidate_idea_cache("search-00")
+
+    assert not [k for k in svc._pair_cache if "search-00" in k]
+    assert list(svc._pair_cache) == [
+        svc._cache_key("search-01", "search-02"), svc._cache_key("search-pruned", "search-zz"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_scan_endpoint_reports_incremental_counts(monkeypatch):
+    from httpx import ASGITransport, AsyncClient
+
+    from app.main import app
+    from app.routers import resonance as resonance_router
+
+    ideas = _ideas(12)
+    monkeypatch.setattr(resonance_router, "_all_ideas_as_dicts", lambda: ideas)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        first = (await client.post("/api/resonance/scan")).json()
+        second = (await client.post("/api/resonance/scan")).json()
+        full = (await client.post("/api/resonance/scan", params={"incremental": "false"})).json()
+
+    assert first["ideas_changed"] == 12 and first["pairs_scored"] + first["pairs_pruned"] == 66
+    assert second["ideas_changed"] == 0 and second["pairs_scored"] == 0
+    assert full["incremental"] is False and full["ideas_changed"] == 12 and full["pairs_scored"] == 0
+    assert first["pairs_found"] == second["pairs_found"] == full["pairs_found"]
@@ -46,7 +46,12 @@ from app.services.substrate.inductive import (
     walk_value,
 )
 from app.services.substrate.kernel import NodeID
-from app.services.substrate.orm import SubstrateNamedCellORM, SubstrateNodeORM
+from app.services.substrate.orm import (
+    SubstrateInstanceSeqORM,
+    SubstrateNamedCellORM,
+    SubstrateNodeChildORM,
+    SubstrateNodeORM,
+)
 from app.services.substrate.quotient import (
     Decidability,
     build_quotient_library,
@@ -73,6 +78,8 @@ def session():
         poolclass=StaticPool,
     )
     SubstrateNodeORM.__table__.create(engine, checkfirst=True)
+    SubstrateNodeChildORM.__table__.create(engine, checkfirst=True)
+    SubstrateInstanceSeqORM.__table__.create(engine, checkfirst=True)
     SubstrateNamedCellORM.__table__.create(engine, checkfirst=True)
     SubstrateStringORM.__table__.create(engine, checkfirst=True)
     Session = sessionmaker(bind=engine, expire_on_commit=False)
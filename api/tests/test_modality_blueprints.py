@@ -38,7 +38,9 @@ if str(SCRIPTS_DIR) not in sys.path:
 
 from app.services.substrate.kernel import find_equivalent_cells, lookup_cell
 from app.services.substrate.orm import (
+    SubstrateInstanceSeqORM,
     SubstrateNamedCellORM,
+    SubstrateNodeChildORM,
     SubstrateNodeORM,
 )
 from app.services.substrate.substrate_strings import SubstrateStringORM
@@ -61,6 +63,8 @@ def session():
         poolclass=StaticPool,
     )
     SubstrateNodeORM.__table__.create(engine, checkfirst=True)
+    SubstrateNodeChildORM.__table__.create(engine, checkfirst=True)
+    SubstrateInstanceSeqORM.__table__.create(engine, checkfirst=True)
     SubstrateNamedCellORM.__table__.create(engine, checkfirst=True)
     SubstrateStringORM.__table__.create(engine, checkfirst=True)
     Session = sessionmaker(bind=engine, expire_on_commit=False)
@@ -35,7 +35,12 @@ from app.services.substrate.numeric_formats import (
     canonicalize,
     load_canonical_contract,
 )
-from app.services.substrate.orm import SubstrateNamedCellORM, SubstrateNodeORM
+from app.services.substrate.orm import (
+    SubstrateInstanceSeqORM,
+    SubstrateNamedCellORM,
+    SubstrateNodeChildORM,
+    SubstrateNodeORM,
+)
 from app.services.substrate.substrate_strings import SubstrateStringORM
 
 
@@ -53,6 +58,8 @@ def session():
         poolclass=StaticPool,
     )
     SubstrateNodeORM.__table__.create(engine, checkfirst=True)
+    SubstrateNodeChildORM.__table__.create(engine, checkfirst=True)
+    SubstrateInstanceSeqORM.__table__.create(engine, checkfirst=True)
     SubstrateNamedCellORM.__table__.create(engine, checkfirst=True)
     SubstrateStringORM.__table__.create(engine, checkfirst=True)
     Session = sessionmaker(bind=engine, expire_on_commit=False)
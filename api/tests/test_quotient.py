@@ -25,7 +25,12 @@ from sqlalchemy.pool import StaticPool
 
 from app.services.substrate.category import Level, RBasic, RType, Triv
 from app.services.substrate.kernel import DOMAIN_RECIPE, NodeID, intern_node
-from app.services.substrate.orm import SubstrateNamedCellORM, SubstrateNodeORM
+from app.services.substrate.orm import (
+    SubstrateInstanceSeqORM,
+    SubstrateNamedCellORM,
+    SubstrateNodeChildORM,
+    SubstrateNodeORM,
+)
 from app.services.substrate.quotient import (
     CanonStrategy,
     Decidability,
@@ -57,6 +62,8 @@ def session():
         poolclass=StaticPool,
     )
     SubstrateNodeORM.__table__.create(engine, checkfirst=True)
+    SubstrateNodeChildORM.__table__.create(engine, checkfirst=True)
+    SubstrateInstanceSeqORM.__table__.create(engine, checkfirst=True)
     SubstrateNamedCellORM.__table__.create(engine, checkfirst=True)
     SubstrateStringORM.__table__.create(engine, checkfirst=True)
     Session = sessionmaker(bind=engine, expire_on_commit=False)
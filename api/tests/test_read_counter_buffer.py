@@ -0,0 +1,139 @@
+"""Write-behind coalescing buffer in front of asset_reads_daily.
+
+Source under test: read_counter_buffer and the record_read / get_*_reads
+paths in read_tracking_service that go through it.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import date
+
+from app.services import read_counter_buffer, read_tracking_service, unified_db
+from app.services.read_tracking_service import AssetReadDaily
+
+
+def _stored(asset_id: str) -> AssetReadDaily | None:
+    with unified_db.session() as s:
+        return s.query(AssetReadDaily).filter_by(asset_id=asset_id, day=date.today()).first()
+
+
+def _quiet_flusher(set_config) -> None:
+    """Restart the flusher with an interval no test outlasts."""
+    set_config("read_tracking", "buffer_flush_interval_ms", 60_000.0)
+    read_counter_buffer.shutdown()
+
+
+def test_reads_coalesce_into_one_upsert(set_config):
+    _quiet_flusher(set_config)
+    before = read_counter_buffer.stats()
+    for i in range(40):
+        read_tracking_service.record_read("asset-hot", "lc-breath" if i % 2 else None, contributor_id="r")
+
+    assert read_counter_buffer.stats()["pending_rows"] == 1
+    row = read_tracking_service.get_daily_reads("asset-hot", date.today())
+
+    assert row["read_count"] == 40 and row["concepts"] == {"lc-breath": 20}
+    after = read_counter_buffer.stats()
+    assert after["batches"] - before["batches"] == 1
+    assert after["flushed"] - before["flushed"] == 40
+    assert after["pending_increments"] == 0
+
+
+def test_pending_bound_wakes_the_flusher(set_config):
+    set_config("read_tracking", "buffer_max_pending", 10)
+    _quiet_flusher(set_config)
+
+    for _ in range(10):
+        read_tracking_service.record_read("asset-bounded", "lc-moss")
+
+    deadline = time.monotonic() + 5
+    while _stored("asset-bounded") is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _stored("asset-bounded").read_count == 10
+
+
+def test_reads_past_twice_the_bound_are_dropped(set_config, monkeypatch):
+    set_config("read_tracking", "buffer_max_pending", 10)
+    _quiet_flusher(set_config)
+    monkeypatch.setattr(read_counter_buffer._WRITER, "ensure_started", lambda: None)
+    monkeypatch.setattr(read_counter_buffer._WRITER, "wake", lambda: None)
+    before = read_counter_buffer.stats()
+
+    for _ in range(25):
+        read_tracking_service.record_read("asset-capped", "lc-moss")
+
+    assert read_counter_buffer.stats()["pending_increments"] == 20
+    assert read_counter_buffer.stats()["dropped"] - before["dropped"] == 5
+    assert read_counter_buffer.drain() == 20
+    assert _stored("asset-capped").read_count == 20
+
+
+def test_failed_flush_keeps_increments_for_the_next_one(monkeypatch, set_config):
+    _quiet_flusher(set_config)
+    read_tracking_service.record_read("asset-retry", "lc-river")
+    real_write = read_counter_buffer._write
+    calls = {"n": 0}
+
+    def flaky(batch):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise RuntimeError("database unavailable")
+        real_write(batch)
+
+    monkeypatch.setattr(read_counter_buffer, "_write", flaky)
+    assert read_counter_buffer.drain() == 0
+    read_tracking_service.record_read("asset-retry", "lc-river")
+    assert read_counter_buffer.drain() == 2
+
+    row = _stored("asset-retry")
+    assert row.read_count == 2 and row.concepts == '{"lc-river": 2}'
+
+
+def test_existing_rows_are_incremented_and_sync_mode_writes_through(set_config):
+    read_tracking_service.record_read("asset-sync", "lc-stone")
+    read_counter_buffer.drain()
+    set_config("read_tracking", "write_behind", False)
+
+    read_tracking_service.record_read("asset-sync", "lc-stone")
+    read_tracking_service.record_read("asset-sync", "lc-cedar")
+
+    row = _stored("asset-sync")
+    assert row.read_count == 3
+    assert read_tracking_service.get_daily_reads("asset-sync", date.today())["concepts"] == {
+        "lc-stone": 2, "lc-cedar": 1,
+    }
+
+
+
+def test_concurrent_flushes_add_up_and_merge_concepts(set_config):
+    # Write-through mode turns every read into its own flush, so these
+    # threads stand in for several workers flushing the same row at once.
+    set_config("read_tracking", "write_behind", False)
+    start = threading.Barrier(8)
+
+    def reader(worker: int) -> None:
+        start.wait()
+        for i in range(15):
+            read_tracking_service.record_read("asset-hive", "lc-hive" if i % 3 else f"lc-{worker}")
+
+    threads = [threading.Thread(target=reader, args=(w,)) for w in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    row = read_tracking_service.get_daily_reads("asset-hive", date.today())
+    assert row["read_count"] == 120
+    assert row["concepts"] == {"lc-hive": 80, **{f"lc-{w}": 5 for w in range(8)}}
+
+
+def test_shutdown_flushes_and_stops_the_flusher():
+    read_tracking_service.record_read("asset-closing")
+    assert read_counter_buffer.stats()["flusher_alive"]
+
+    read_counter_buffer.shutdown()
+
+    assert _stored("asset-closing").read_count == 1
+    assert not read_counter_buffer.stats()["flusher_alive"]
@@ -0,0 +1,82 @@
+"""Inverted concept keyword index behind presence ↔ concept resonance.
+
+Source under test: concept_keyword_index (postings + freshness) and
+resonance_service.compute_resonance / resolve_query.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from app.models.graph import Node
+from app.services import concept_keyword_index, graph_adjacency, graph_service, resonance_service, unified_db
+
+
+def _concept(cid: str, description: str, **properties) -> dict:
+    return graph_service.create_node(
+        id=cid, type="concept", name=cid, description=description, properties=properties,
+    )
+
+
+def test_resolve_query_scores_the_full_concept_set():
+    oldest = _concept("lc-oldest", "tidal breathwork lantern ceremony", sacred_frequency={"hz": 432})
+    # Push the first concept past the 500 most recently updated.
+    for i in range(505):
+        _concept(f"lc-filler-{i}", f"filler story number{i}")
+    with unified_db.session() as s:
+        s.get(Node, oldest["id"]).updated_at = datetime.now(timezone.utc) - timedelta(days=30)
+        s.commit()
+    concept_keyword_index.invalidate()
+
+    result = resonance_service.resolve_query("a lantern ceremony with tidal breathwork")
+
+    assert [c["id"] for c in result["concepts"]] == ["lc-oldest"]
+    top = result["concepts"][0]
+    assert top["hz"] == 432 and top["shared_tokens"] == ["breathwork", "ceremony", "lantern", "tidal"]
+    assert concept_keyword_index.stats()["concepts"] == 506
+
+
+def test_patch_and_delete_refresh_the_index_in_place():
+    _concept("lc-breath", "moss spiral listening circle")
+    assert resonance_service.resolve_query("moss spiral")["concepts"]
+    generation = concept_keyword_index.stats()["generation"]
+
+    graph_service.update_node("lc-breath", description="ember drumming vigil")
+    assert resonance_service.resolve_query("moss spiral")["concepts"] == []
+    assert [c["id"] for c in resonance_service.resolve_query("ember vigil")["concepts"]] == ["lc-breath"]
+
+    graph_service.delete_node("lc-breath")
+    assert resonance_service.resolve_query("ember vigil")["concepts"] == []
+    stats = concept_keyword_index.stats()
+    assert stats["generation"] == generation + 2 and not stats["stale"]
+
+
+def test_other_workers_writes_are_picked_up(set_config):
+    set_config("resonance", "concept_index_check_seconds", 0.0)
+    _concept("lc-river", "river stone gathering")
+    assert resonance_service.resolve_query("river stone")["concepts"]
+
+    # Another process rewrites the concept and bumps the shared counter.
+    with unified_db.session() as s:
+        s.get(Node, "lc-river").description = "cedar smoke gathering"
+        graph_adjacency.bump_generation(s, graph_adjacency.CONCEPT_GENERATION_ROW_ID)
+        s.commit()
+
+    assert resonance_service.resolve_query("river stone")["concepts"] == []
+    assert resonance_service.resolve_query("cedar smoke")["concepts"]
+
+
+def test_compute_resonance_ignores_generic_tokens_and_single_overlaps():
+    _concept("lc-ceremony", "drum ceremony under cedar trees, a platform for listening")
+    _concept("lc-single", "drum workshop")
+    _concept("lc-generic", "platform service agent drum")
+    graph_service.create_node(
+        id="contributor:drummer", type="contributor", name="Cedar Drummer",
+        description="ceremony drum circle on a platform service",
+    )
+
+    scored = resonance_service.compute_resonance("contributor:drummer")
+
+    assert [item["concept_id"] for item in scored] == ["lc-ceremony"]
+    assert scored[0]["shared_tokens"] == ["cedar", "ceremony", "drum"]
+    assert scored[0]["score"] == round(3 / 5, 3)  # cedar, drummer, ceremony, drum, circle
@@ -0,0 +1,125 @@
+"""Segmented JSONL runtime event log (file-backed runtime mode).
+
+Source under test: api/app/services/runtime_event_log.py and its wiring
+into runtime_service.record_event / list_events.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.runtime import RuntimeEventCreate
+from app.services import runtime_event_log, runtime_service
+
+
+@pytest.fixture(autouse=True)
+def _fresh_log(monkeypatch):
+    # Compaction after rotation runs on a thread; tests drive it directly.
+    monkeypatch.setattr(runtime_event_log, "_compact_quietly", lambda directory: None)
+    runtime_event_log.reset()
+    yield
+    runtime_event_log.reset()
+
+
+def _event(i: int, at: datetime) -> dict:
+    return {"id": f"rt_{i:06d}", "recorded_at": at.isoformat(), "endpoint": "/api/x", "n": i}
+
+
+def test_append_rotates_by_size_and_reads_since(tmp_path, set_config):
+    set_config("runtime", "event_log_segment_max_bytes", 4096)
+    set_config("runtime", "event_log_segment_max_seconds", 0)
+    path = tmp_path / "runtime_events.json"
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i in range(600):
+        runtime_event_log.append(path, _event(i, base + timedelta(seconds=i)))
+
+    segments = sorted(runtime_event_log.segments_dir(path).glob("seg-*.jsonl"))
+    assert len(segments) > 5
+    assert all(seg.stat().st_size < 4096 + 200 for seg in segments)
+
+    rows = runtime_event_log.read(path)
+    assert [row["n"] for row in rows] == list(range(600))
+
+    since = base + timedelta(seconds=550)
+    assert [row["n"] for row in runtime_event_log.read(path, since=since)] == list(range(550, 600))
+
+    newest = runtime_event_log.read(path, limit=10)
+    assert [row["n"] for row in newest][-10:] == list(range(590, 600))
+    assert len(newest) < 600  # older segments were never opened
+
+
+def test_time_rotation_and_compaction(tmp_path, set_config):
+    set_config("runtime", "event_log_segment_max_seconds", 0.0001)
+    path = tmp_path / "runtime_events.json"
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i in range(6):
+        time.sleep(0.002)
+        runtime_event_log.append(path, _event(i, base + timedelta(days=i)))
+    directory = runtime_event_log.segments_dir(path)
+    assert len(list(directory.glob("seg-*.jsonl"))) >= 6
+
+    set_config("runtime", "event_log_segment_max_seconds", 0)
+    set_config("runtime", "event_log_retention_days", 2)
+    now = (base + timedelta(days=5)).timestamp()
+    stats = runtime_event_log.compact(path, now=now)
+
+    assert stats["dropped"] >= 1
+    assert [row["n"] for row in runtime_event_log.read(path)] == [3, 4, 5]
+    assert len(list(directory.glob("seg-*.jsonl"))) == 2  # merged sealed run + newest
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="segment locks need fcntl")
+def test_compaction_skips_segments_another_writer_holds(tmp_path, set_config):
+    import fcntl
+
+    set_config("runtime", "event_log_segment_max_seconds", 0.0001)
+    path = tmp_path / "runtime_events.json"
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i in range(6):
+        time.sleep(0.002)
+        runtime_event_log.append(path, _event(i, base + timedelta(seconds=i)))
+    set_config("runtime", "event_log_segment_max_seconds", 0)
+    directory = runtime_event_log.segments_dir(path)
+    segments = sorted(directory.glob("seg-*.jsonl"))
+    assert len(segments) >= 6
+
+    # Another worker process still appending to the third segment.
+    with segments[2].open("ab") as other_writer:
+        fcntl.flock(other_writer.fileno(), fcntl.LOCK_SH)
+        runtime_event_log.compact(path)
+        other_writer.write(json.dumps(_event(99, base + timedelta(seconds=2.5))).encode() + b"\n")
+        other_writer.flush()
+
+    assert segments[2].exists()
+    assert not segments[1].exists() and not segments[4].exists()  # merged into their run heads
+    assert [row["n"] for row in runtime_event_log.read(path)] == [0, 1, 2, 99, 3, 4, 5]
+
+
+def test_legacy_document_is_imported_once(tmp_path):
+    path = tmp_path / "runtime_events.json"
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    path.write_text(json.dumps({"events": [_event(2, base + timedelta(seconds=2)), _event(1, base)]}))
+
+    runtime_event_log.append(path, _event(3, base + timedelta(seconds=3)))
+    runtime_event_log.reset()
+    runtime_event_log.append(path, _event(4, base + timedelta(seconds=4)))
+
+    assert [row["n"] for row in runtime_event_log.read(path)] == [1, 2, 3, 4]
+
+
+def test_record_event_file_mode_appends_and_honors_since(monkeypatch):
+    monkeypatch.setattr(runtime_service.runtime_event_store, "enabled", lambda: False)
+    for ms in (10.0, 20.0):
+        runtime_service.record_event(
+            RuntimeEventCreate(source="api", endpoint="/api/health", method="GET", status_code=200, runtime_ms=ms)
+        )
+    rows = runtime_service.list_events(limit=10)
+    assert sorted(row.runtime_ms for row in rows) == [10.0, 20.0]
+
+    future = datetime.now(timezone.utc) + timedelta(hours=1)
+    assert runtime_service.list_events(limit=10, since=future) == []
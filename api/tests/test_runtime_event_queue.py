@@ -0,0 +1,161 @@
+"""Batched runtime event ingestion queue.
+
+Source under test: api/app/services/runtime_event_queue.py and
+runtime_event_store.write_events.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from app.models.runtime import RuntimeEvent, RuntimeEventCreate
+from app.services import runtime_event_queue, runtime_event_store, runtime_service
+from app.services.runtime import rollups as runtime_rollups
+
+
+@pytest.fixture
+def runtime_db(tmp_path, set_config):
+    runtime_event_queue.shutdown()
+    set_config("database_overrides", "runtime", f"sqlite:///{tmp_path / 'runtime.db'}")
+    runtime_event_store._ENGINE_CACHE.update({"url": "", "engine": None, "sessionmaker": None})
+    runtime_event_store._SCHEMA_INITIALIZED = False
+    runtime_rollups.reset()
+    runtime_event_queue._STATE["sample_tick"] = 0
+    yield
+    runtime_event_queue.shutdown()
+    runtime_event_store._ENGINE_CACHE.update({"url": "", "engine": None, "sessionmaker": None})
+    runtime_event_store._SCHEMA_INITIALIZED = False
+    runtime_rollups.reset()
+
+
+@pytest.fixture
+def no_flusher(monkeypatch):
+    """Keep events in the queue until the test lets the flusher start."""
+    held = {"on": True}
+    start = runtime_event_queue._WRITER.ensure_started
+    monkeypatch.setattr(
+        runtime_event_queue._WRITER, "ensure_started", lambda: None if held["on"] else start(),
+    )
+    return held
+
+
+def _event(i: int) -> RuntimeEvent:
+    return RuntimeEvent(
+        id=f"rt_q{i:05d}",
+        source="api",
+        endpoint="/api/health",
+        method="GET",
+        status_code=200,
+        runtime_ms=2.0,
+        runtime_cost_estimate=0.0,
+    )
+
+
+def test_record_event_is_batched_and_visible_to_readers(runtime_db, no_flusher, set_config):
+    set_config("runtime", "ingest_batch_size", 100)
+    before = runtime_event_queue.stats()
+    for _ in range(250):
+        runtime_service.record_event(
+            RuntimeEventCreate(source="api", endpoint="/api/health", method="GET", status_code=200, runtime_ms=1.0)
+        )
+    assert runtime_event_queue.stats()["depth"] == 250
+
+    no_flusher["on"] = False
+    rows = runtime_service.summarize_by_endpoint(seconds=3600)  # waits for the flusher
+    after = runtime_event_queue.stats()
+
+    assert rows[0].event_count == 250
+    assert after["depth"] == 0
+    assert after["written"] - before["written"] == 250
+    assert after["batches"] - before["batches"] == 3
+    assert len(runtime_service.list_events(limit=5000)) == 250
+
+
+def test_sampling_keeps_total_weight_and_full_queue_drops(runtime_db, no_flusher, set_config):
+    set_config("runtime", "ingest_queue_max", 100)
+    set_config("runtime", "ingest_sample_watermark", 0.05)
+    set_config("runtime", "ingest_sample_rate", 5)
+    before = runtime_event_queue.stats()
+    admitted = [runtime_event_queue.enqueue(_event(i)) for i in range(25)]
+    assert admitted.count(True) == 9  # 5 below the watermark, then 1 in 5
+    assert runtime_event_queue.stats()["sampled_out"] - before["sampled_out"] == 16
+
+    runtime_event_queue.drain()
+    rows = runtime_service.summarize_by_endpoint(seconds=3600)
+    assert rows[0].event_count == 25
+    assert rows[0].total_runtime_ms == 50.0
+
+    set_config("runtime", "ingest_queue_max", 3)
+    set_config("runtime", "ingest_sample_rate", 1)
+    set_config("runtime", "ingest_block_timeout_ms", 0)
+    dropped_before = runtime_event_queue.stats()["dropped"]
+    results = [runtime_event_queue.enqueue(_event(100 + i)) for i in range(5)]
+    assert results == [True, True, True, False, False]
+    assert runtime_event_queue.stats()["dropped"] - dropped_before == 2
+
+
+@pytest.mark.asyncio
+async def test_full_queue_never_blocks_the_event_loop(runtime_db, no_flusher, set_config):
+    set_config("runtime", "ingest_queue_max", 1)
+    set_config("runtime", "ingest_sample_rate", 1)
+    set_config("runtime", "ingest_block_timeout_ms", 10_000)
+    assert runtime_event_queue.enqueue(_event(300)) is True
+
+    started = time.monotonic()
+    assert runtime_event_queue.enqueue(_event(301)) is False
+    assert runtime_event_queue.wait_for_writes() is False
+    assert time.monotonic() - started < 1.0
+
+
+def test_readers_wait_for_a_flush_already_in_flight(runtime_db, set_config, monkeypatch):
+    """The flusher may have taken the batch but not committed it; readers still see it."""
+    set_config("runtime", "ingest_flush_interval_ms", 60000)
+    write_events = runtime_event_store.write_events
+    taken, release = threading.Event(), threading.Event()
+
+    def slow_write(batch, **kwargs):
+        taken.set()
+        release.wait(5)
+        return write_events(batch, **kwargs)
+
+    monkeypatch.setattr(runtime_event_store, "write_events", slow_write)
+    runtime_event_queue.enqueue(_event(400))
+    runtime_event_queue._WRITER.wake()
+    assert taken.wait(5)
+    assert runtime_event_queue.stats()["depth"] == 0
+
+    threading.Timer(0.1, release.set).start()
+    assert runtime_event_queue.wait_for_writes() is True
+    assert [row.id for row in runtime_event_store.list_events(limit=10)] == ["rt_q00400"]
+
+
+def test_shutdown_flushes_pending_events(runtime_db, set_config):
+    set_config("runtime", "ingest_flush_interval_ms", 60000)
+    for i in range(7):
+        runtime_event_queue.enqueue(_event(200 + i))
+    assert runtime_event_queue.stats()["flusher_alive"] is True
+
+    runtime_event_queue.shutdown()
+
+    stats = runtime_event_queue.stats()
+    assert stats["depth"] == 0
+    assert stats["flusher_alive"] is False
+    assert len(runtime_event_store.list_events(limit=100)) == 7
+
+
+@pytest.mark.asyncio
+async def test_ingest_stats_endpoint_reports_queue_depth():
+    from httpx import ASGITransport, AsyncClient
+
+    from app.main import app
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/api/runtime/ingest/stats")
+
+    assert response.status_code == 200
+    payload = response.json()
+    for key in ("depth", "capacity", "dropped", "sampled_out", "written", "batches"):
+        assert key in payload
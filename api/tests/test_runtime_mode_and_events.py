@@ -6,7 +6,6 @@ from app.models.runtime import RuntimeEvent, RuntimeEventCreate
 from app.services import runtime_service
 from app.services import idea_service
 from app.services.runtime import cache as runtime_cache
-from app.services.runtime import events as runtime_events
 from app.services.runtime import routes as runtime_routes
 
 
@@ -24,17 +23,16 @@ def test_runtime_cache_meta_key_uses_config_test_context(set_config):
 
 
 def test_record_event_uses_normalized_endpoint_value(monkeypatch):
-    store: dict[str, list[dict]] = {"events": []}
+    appended: list[dict] = []
 
-    monkeypatch.setattr(runtime_events.runtime_event_store, "enabled", lambda: False)
-    monkeypatch.setattr(runtime_events.runtime_store, "read_store", lambda: store)
-    monkeypatch.setattr(runtime_events.runtime_store, "write_store", lambda payload: store.update(payload))
-    monkeypatch.setattr(runtime_events.runtime_paths, "estimate_runtime_cost", lambda runtime_ms: 0.0)
-    monkeypatch.setattr(runtime_events, "resolve_idea_id", lambda **_: "idea-runtime")
-    monkeypatch.setattr(runtime_events, "resolve_origin_idea_id", lambda idea_id: idea_id)
-    monkeypatch.setattr(runtime_events, "normalize_endpoint", lambda endpoint, method=None: "/api/ideas/{idea_id}")
+    monkeypatch.setattr(runtime_service.runtime_event_store, "enabled", lambda: False)
+    monkeypatch.setattr(runtime_service.runtime_event_log, "append", lambda path, payload: appended.append(payload))
+    monkeypatch.setattr(runtime_service, "estimate_runtime_cost", lambda runtime_ms: 0.0)
+    monkeypatch.setattr(runtime_service, "resolve_idea_id", lambda **_: "idea-runtime")
+    monkeypatch.setattr(runtime_service, "resolve_origin_idea_id", lambda idea_id: idea_id)
+    monkeypatch.setattr(runtime_service, "normalize_endpoint", lambda endpoint, method=None: "/api/ideas/{idea_id}")
 
-    event = runtime_events.record_event(
+    event = runtime_service.record_event(
         RuntimeEventCreate(
             source="api",
             endpoint="/api/ideas/demo-123",
@@ -49,7 +47,7 @@ def test_record_event_uses_normalized_endpoint_value(monkeypatch):
     assert event.endpoint == "/api/ideas/{idea_id}"
     assert event.raw_endpoint == "/api/ideas/demo-123"
     assert event.metadata["normalized_from"] == "/api/ideas/demo-123"
-    assert store["events"], "record_event should persist the event payload"
+    assert appended, "record_event should persist the event payload"
 
 
 def test_noisy_activity_runtime_events_flush_as_bucket_summary(monkeypatch):
@@ -108,10 +106,9 @@ def test_endpoint_summary_weights_aggregate_runtime_events(monkeypatch):
         )
     ]
 
-    monkeypatch.setattr(runtime_service, "list_events", lambda **_: rows)
     monkeypatch.setattr(runtime_service, "resolve_origin_idea_id", lambda idea_id: idea_id)
 
-    summary = runtime_service.summarize_by_endpoint(seconds=3600)[0]
+    summary = runtime_service.summarize_by_endpoint(seconds=3600, event_rows=rows)[0]
 
     assert summary.event_count == 4
     assert summary.total_runtime_ms == 60.0
@@ -135,6 +132,54 @@ def test_runtime_route_registry_covers_live_idea_realization_family():
     )
 
 
+def test_compiled_route_matcher_keeps_registry_order_and_reloads(set_config, tmp_path):
+    import json
+    import os
+
+    registry = tmp_path / "canonical_routes.json"
+    routes = [
+        {"path": "/api/things/{thing_id}", "methods": ["GET"], "idea_id": "first"},
+        {"path": "/api/things/{other}", "methods": ["POST"], "idea_id": "second"},
+        {"path": "/api/things/special", "methods": ["GET"], "idea_id": "exact"},
+        {"path": "/api/things/{thing_id}/parts/{part}", "idea_id": "any-method"},
+    ]
+    registry.write_text(json.dumps({"api_routes": routes}), encoding="utf-8")
+    set_config("route_registry", "canonical_routes_path", str(registry))
+
+    match = runtime_routes.match_canonical_route
+    assert match("/api/things/special", "GET")["idea_id"] == "exact"
+    assert match("/api/things/abc?x=1", "get")["idea_id"] == "first"
+    assert match("/api/things/abc", "POST")["idea_id"] == "second"
+    assert match("/api/things/abc", None)["idea_id"] == "first"
+    assert match("/api/things/abc", "DELETE") is None
+    assert match("/api/things/a/parts/b", "PUT")["idea_id"] == "any-method"
+    assert match("/api/things/a/b", "GET") is None
+    assert runtime_service.normalize_endpoint("/api/things/abc", "POST") == "/api/things/{other}"
+
+    compiled = runtime_routes.compiled_routes()
+    assert runtime_routes.compiled_routes() is compiled
+    registry.write_text(json.dumps({"api_routes": routes[1:]}), encoding="utf-8")
+    stat = registry.stat()
+    os.utime(registry, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert runtime_routes.compiled_routes() is not compiled
+    assert match("/api/things/abc", "GET") is None
+
+
+def test_idea_prefix_table_prefers_longest_prefix():
+    table = runtime_routes.PrefixTable({
+        "/": "root",
+        "/api": "api",
+        "/api/health": "health",
+        "/api/health-proxy": "proxy",
+        7: "ignored",
+    })
+    assert table.lookup("/api/health-proxy/x") == "proxy"
+    assert table.lookup("/api/healthz") == "health"
+    assert table.lookup("/api/ideas") == "api"
+    assert table.lookup("/web") == "root"
+    assert runtime_routes.PrefixTable({}).lookup("/api") is None
+
+
 def test_domain_discovery_defaults_off_in_test_mode(set_config):
     set_config("api", "testing", True)
     set_config("api", "test_context_id", "idea-domain-test")
@@ -0,0 +1,151 @@
+"""Runtime event rollups behind the endpoint / idea summaries.
+
+Source under test: api/app/services/runtime/rollups.py, the rollup table
+in runtime_event_store, and runtime_service.summarize_by_endpoint /
+summarize_by_idea.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.runtime import RuntimeEvent, RuntimeEventCreate
+from app.services import runtime_event_log, runtime_event_store, runtime_service
+from app.services.runtime import rollups as runtime_rollups
+
+
+@pytest.fixture(autouse=True)
+def _fresh_rollups():
+    runtime_rollups.reset()
+    runtime_event_log.reset()
+    yield
+    runtime_rollups.reset()
+    runtime_event_log.reset()
+
+
+@pytest.fixture
+def runtime_db(tmp_path, set_config):
+    set_config("database_overrides", "runtime", f"sqlite:///{tmp_path / 'runtime.db'}")
+    runtime_event_store._ENGINE_CACHE.update({"url": "", "engine": None, "sessionmaker": None})
+    runtime_event_store._SCHEMA_INITIALIZED = False
+    runtime_event_store._ROLLUP_BACKFILL["until"] = None
+    yield
+    runtime_event_store._ENGINE_CACHE.update({"url": "", "engine": None, "sessionmaker": None})
+    runtime_event_store._SCHEMA_INITIALIZED = False
+
+
+def _record(endpoint: str, status: int = 200, source: str = "api", **metadata) -> None:
+    runtime_service.record_event(
+        RuntimeEventCreate(
+            source=source,
+            endpoint=endpoint,
+            method="GET",
+            status_code=status,
+            runtime_ms=10.0,
+            metadata=metadata,
+        )
+    )
+
+
+def test_plan_window_tiles_the_window_without_gaps():
+    now = datetime(2026, 3, 1, 12, 34, 56, tzinfo=timezone.utc).timestamp()
+    for seconds in (60, 1800, 7200, 86400, 86400 * 10):
+        ranges = runtime_rollups.plan_window(now - seconds, now)
+        for (_, _, end), (_, start, _) in zip(ranges, ranges[1:]):
+            assert end == start
+        assert ranges[0][1] <= now - seconds < ranges[0][1] + 3600
+        assert ranges[-1][2] > now
+        for granularity, start, end in ranges:
+            if granularity == "hour":
+                assert start % 3600 == 0 and end % 3600 == 0
+
+
+def test_file_mode_endpoint_summary_is_not_capped_at_2000_events():
+    for _ in range(2100):
+        _record("/api/health")
+    _record("/api/health", status=500, is_paid_provider=True, runtime_cost_usd=0.5)
+
+    row = runtime_service.summarize_by_endpoint(seconds=3600)[0]
+
+    assert row.event_count == 2101
+    assert row.status_counts == {"200": 2100, "500": 1}
+    assert row.paid_tool_event_count == 1
+    assert row.paid_tool_failure_count == 1
+    assert row.paid_tool_runtime_cost == 0.5
+
+
+def test_file_mode_rollups_rebuild_from_the_event_log():
+    _record("/api/health", source="web_api")
+    _record("/api/health", source="api", event_count=4, total_runtime_ms=80.0)
+    runtime_rollups.reset()  # e.g. a restarted process
+
+    rows = runtime_service.summarize_by_endpoint(seconds=3600)
+    assert rows[0].event_count == 5
+    assert rows[0].total_runtime_ms == 90.0
+    assert rows[0].by_source == {"web_api": 1, "api": 4}
+
+    web = runtime_service.summarize_by_endpoint(seconds=3600, source="web_api")
+    assert web[0].event_count == 1
+
+
+def test_db_rollups_are_written_with_events_and_backfilled_once(runtime_db):
+    # A database from before rollups existed: runtime_events only.
+    engine = runtime_event_store._engine()
+    runtime_event_store.RuntimeEventRecord.__table__.create(engine)
+    with runtime_event_store._session() as session:
+        session.add(
+            runtime_event_store.RuntimeEventRecord(
+                id="rt_legacy",
+                source="api",
+                endpoint="/api/health",
+                raw_endpoint="/api/health",
+                method="GET",
+                status_code=200,
+                runtime_ms=5.0,
+                metadata_json="{}",
+                runtime_cost_estimate=0.0,
+                recorded_at=datetime.now(timezone.utc) - timedelta(minutes=5),
+            )
+        )
+
+    _record("/api/health")
+    _record("/api/health", status=404)
+
+    rows = runtime_service.summarize_by_endpoint(seconds=3600)
+    assert rows[0].status_counts == {"200": 2, "404": 1}
+    assert runtime_service.summarize_by_endpoint(seconds=3600)[0].event_count == 3
+
+    ideas = runtime_service.summarize_by_idea(seconds=3600)
+    assert sum(row.event_count for row in ideas) == 3
+
+
+def test_db_rollup_backfill_is_retried_after_a_failed_write(runtime_db, monkeypatch):
+    engine = runtime_event_store._engine()
+    runtime_event_store.RuntimeEventRecord.__table__.create(engine)
+    with runtime_event_store._session() as session:
+        session.add(
+            runtime_event_store.RuntimeEventRecord(
+                id="rt_legacy",
+                source="api",
+                endpoint="/api/health",
+                raw_endpoint="/api/health",
+                method="GET",
+                status_code=200,
+                runtime_ms=5.0,
+                metadata_json="{}",
+                runtime_cost_estimate=0.0,
+                recorded_at=datetime.now(timezone.utc) - timedelta(minutes=5),
+            )
+        )
+    _record("/api/health")
+
+    write_rollups = runtime_event_store.write_rollups
+    monkeypatch.setattr(runtime_event_store, "write_rollups", lambda rows: False)
+    assert runtime_service.summarize_by_endpoint(seconds=3600)[0].event_count == 1
+    assert runtime_event_store.pending_rollup_backfill() is not None
+
+    monkeypatch.setattr(runtime_event_store, "write_rollups", write_rollups)
+    assert runtime_service.summarize_by_endpoint(seconds=3600)[0].event_count == 2
+    assert runtime_event_store.pending_rollup_backfill() is None
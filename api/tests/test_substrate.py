@@ -37,6 +37,7 @@ from app.services.substrate import (
     ingest_memory_file,
     ingest_resource_file,
     ingest_transmission_file,
+    intern_many,
     intern_node,
     lattice_stats,
     lookup_cell,
@@ -56,23 +57,34 @@ from app.services.substrate.category import (
     RType,
 )
 from app.services.substrate.kernel import DOMAIN_BLUEPRINT, DOMAIN_RECIPE
-from app.services.substrate.orm import SubstrateNamedCellORM, SubstrateNodeORM
+from app.services.substrate.orm import (
+    SubstrateInstanceSeqORM,
+    SubstrateNamedCellORM,
+    SubstrateNodeChildORM,
+    SubstrateNodeORM,
+)
 
 
-@pytest.fixture
-def session():
-    """In-memory SQLite session with substrate tables only."""
+def _substrate_sessionmaker():
+    """In-memory SQLite with substrate tables only."""
     engine = create_engine(
         "sqlite:///:memory:",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
     SubstrateNodeORM.__table__.create(engine, checkfirst=True)
+    SubstrateNodeChildORM.__table__.create(engine, checkfirst=True)
+    SubstrateInstanceSeqORM.__table__.create(engine, checkfirst=True)
     SubstrateNamedCellORM.__table__.create(engine, checkfirst=True)
     from app.services.substrate.substrate_strings import SubstrateStringORM
     SubstrateStringORM.__table__.create(engine, checkfirst=True)
-    Session = sessionmaker(bind=engine, expire_on_commit=False)
-    s = Session()
+    return sessionmaker(bind=engine, expire_on_commit=False)
+
+
+@pytest.fixture
+def session():
+    """In-memory SQLite session with substrate tables only."""
+    s = _substrate_sessionmaker()()
     try:
         yield s
         s.commit()
@@ -99,6 +111,113 @@ def test_intern_node_dedup_returns_same_id(session):
     assert row.count == 2
 
 
+def test_intern_node_instances_follow_existing_rows(session):
+    """The instance counter seeds from MAX(instance), then counts up by one."""
+    cat = NodeID(1, Level.BASIC, BBasic.CONTAINER, BContainer.OBJECT)
+    # A shape interned before substrate_instance_seq existed.
+    session.add(SubstrateNodeORM(
+        package=1, level=Level.COMPLEX_1, type_=cat.type_, instance=7,
+        serialized="legacy", domain=DOMAIN_BLUEPRINT, count=1,
+    ))
+    session.flush()
+    a = intern_node(session, DOMAIN_BLUEPRINT, cat, [NodeID(1, Level.TRIVIAL, BType.NUMERIC, 2)])
+    b = intern_node(session, DOMAIN_BLUEPRINT, cat, [NodeID(1, Level.TRIVIAL, BType.NUMERIC, 4)])
+    assert (a.instance, b.instance) == (8, 9)
+
+
+def test_intern_node_shape_cache_drops_on_rollback(session):
+    """A shape interned in a rolled-back transaction is interned afresh."""
+    cat = NodeID(1, Level.BASIC, BBasic.CONTAINER, BContainer.OBJECT)
+    child = NodeID(1, Level.TRIVIAL, BType.NUMERIC, 2)
+    a = intern_node(session, DOMAIN_BLUEPRINT, cat, [child])
+    session.rollback()
+    assert session.query(SubstrateNodeORM).count() == 0
+    b = intern_node(session, DOMAIN_BLUEPRINT, cat, [child])
+    assert a == b
+    assert session.query(SubstrateNodeORM).count() == 1
+
+
+def test_intern_many_matches_intern_node(session):
+    """A batch resolves exactly as one-at-a-time interning would."""
+    from app.services.substrate import kernel
+    cat = NodeID(1, Level.BASIC, BBasic.CONTAINER, BContainer.OBJECT)
+    int_t = NodeID(1, Level.TRIVIAL, BType.NUMERIC, 2)
+    str_t = NodeID(1, Level.TRIVIAL, BType.NUMERIC, 4)
+    warm = intern_node(session, DOMAIN_BLUEPRINT, cat, [int_t])
+    fired = []
+    kernel.register_mutation_callback(fired.append)
+    try:
+        got = intern_many(session, DOMAIN_BLUEPRINT, [
+            (cat, [str_t]),
+            (int_t, []),
+            (cat, [int_t]),
+            (cat, [str_t]),
+            (cat, [int_t, str_t]),
+        ])
+    finally:
+        kernel.unregister_mutation_callback(fired.append)
+    assert got[1] == int_t
+    assert got[2] == warm
+    assert got[0] == got[3] != warm
+    assert [got[0].instance, got[4].instance] == [warm.instance + 1, warm.instance + 2]
+    assert len(fired) == 1
+    # Callers interning afterwards see the batch's shapes.
+    assert intern_node(session, DOMAIN_BLUEPRINT, cat, [int_t, str_t]) == got[4]
+    counts = {
+        row.instance: row.count
+        for row in session.query(SubstrateNodeORM).populate_existing()
+    }
+    assert counts == {warm.instance: 2, got[0].instance: 2, got[4].instance: 2}
+
+
+def test_word_sequence_batch_matches_token_by_token(session):
+    """Batched word ingest leaves the lattice a per-token loop would."""
+    from sqlalchemy import func
+    from app.services.substrate import ingest_word_cell, tokenize_words
+    from app.services.substrate.markdown_frontend import (
+        list_recipe,
+        section_content_to_word_sequence,
+        substrate_string_recipe,
+    )
+    from app.services.substrate.substrate_strings import SubstrateStringORM
+
+    text = "The field tends the field. Tending, the Field becomes whole!"
+    batched = section_content_to_word_sequence(session, text)
+
+    one_by_one = _substrate_sessionmaker()()
+    elements = []
+    for t in tokenize_words(text):
+        if t["kind"] == "word":
+            cell, _, _ = ingest_word_cell(
+                one_by_one, lemma=t["lemma"], pos=t["pos"], hz=t["hz"],
+                semantic_field=t["field"], surface=t["surface"],
+            )
+            elements.append(NodeID(1, Level.TRIVIAL, RType.REF, cell.cell_id))
+        else:
+            elements.append(substrate_string_recipe(one_by_one, t["surface"]))
+    looped = list_recipe(one_by_one, elements)
+
+    def lattice(s):
+        nodes = s.query(
+            SubstrateNodeORM.domain, SubstrateNodeORM.level, SubstrateNodeORM.type_,
+            func.count(), func.sum(SubstrateNodeORM.count),
+        ).group_by(
+            SubstrateNodeORM.domain, SubstrateNodeORM.level, SubstrateNodeORM.type_,
+        ).all()
+        cells = s.query(SubstrateNamedCellORM.domain, SubstrateNamedCellORM.name).all()
+        return sorted(nodes), sorted(cells), s.query(SubstrateStringORM).count()
+
+    assert lattice(session) == lattice(one_by_one)
+    assert (batched.level, batched.type_) == (looped.level, looped.type_)
+    # The cell is bound to its last token's shapes ("Field"), which a fresh
+    # single ingest in the same session resolves to again.
+    cell, blueprint_id, ctor_id = ingest_word_cell(
+        session, lemma="field", pos="UNK", hz=432, semantic_field="neutral", surface="Field",
+    )
+    assert (lookup_cell(session, "word", "field.UNK").blueprint, cell.ctor) == (blueprint_id, ctor_id)
+    one_by_one.close()
+
+
 def test_different_shapes_get_different_ids(session):
     """Different children → different NodeIDs."""
     cat = NodeID(1, Level.BASIC, BBasic.CONTAINER, BContainer.OBJECT)
@@ -42,7 +42,12 @@ from app.services.substrate import (
     topology_cell,
 )
 from app.services.substrate.category import BBasic, BDomain, Level, RBasic, RResonance
-from app.services.substrate.orm import SubstrateNamedCellORM, SubstrateNodeORM
+from app.services.substrate.orm import (
+    SubstrateInstanceSeqORM,
+    SubstrateNamedCellORM,
+    SubstrateNodeChildORM,
+    SubstrateNodeORM,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -58,6 +63,8 @@ def session():
         poolclass=StaticPool,
     )
     SubstrateNodeORM.__table__.create(engine, checkfirst=True)
+    SubstrateNodeChildORM.__table__.create(engine, checkfirst=True)
+    SubstrateInstanceSeqORM.__table__.create(engine, checkfirst=True)
     SubstrateNamedCellORM.__table__.create(engine, checkfirst=True)
     from app.services.substrate.substrate_strings import SubstrateStringORM
     SubstrateStringORM.__table__.create(engine, checkfirst=True)
@@ -392,3 +399,159 @@ def test_cell_resonance_signature_captures_authored_edges(session):
     for entry in sig:
         assert isinstance(entry, tuple) and len(entry) == 2
         assert isinstance(entry[0], int) and isinstance(entry[1], int)
+
+
+# ---------------------------------------------------------------------------
+# Reverse walks read the child index — exact refs, backfill-equivalent
+# ---------------------------------------------------------------------------
+
+
+def test_reverse_walk_matches_exact_cell_ref_not_prefix(session):
+    """Target 12 must not pick up edges into 123 (the old LIKE did)."""
+    from app.services.substrate import cell_resonance_signature, find_cells_shaping
+    shapes_edge(session, 7, 12)
+    shapes_edge(session, 8, 123)
+    shapes_edge(session, 12, 40)
+    assert find_cells_shaping(session, 12) == [7]
+    assert find_cells_shaping(session, 123) == [8]
+    # 12 is the target of one edge and the source of another; 123's edge stays out.
+    assert cell_resonance_signature(session, 12) == {
+        (int(RResonance.SHAPES), 7),
+        (int(RResonance.SHAPES), 40),
+    }
+    assert cell_resonance_signature(session, 1) == set()
+
+
+def test_backfill_rebuilds_child_index_for_legacy_rows(session, monkeypatch):
+    """Composites interned before the index existed are backfilled on first walk."""
+    from app.services.substrate import cell_resonance_signature, find_cells_shaping
+    from app.services.substrate import kernel
+    src = make_cell(session, name="lc-backfill", domain="concept", blueprint=BID_concept())
+    author_geometry_signature(session, src.cell_id, {"form": "triad"}, arity_hz=174)
+    triad = geometric_form_cell(session, "triad")
+    before_sig = cell_resonance_signature(session, src.cell_id)
+    before_src = find_cells_shaping(session, triad.cell_id)
+
+    session.query(SubstrateNodeChildORM).delete()
+    monkeypatch.setattr(kernel, "_CHILD_INDEX_READY", set())
+
+    assert find_cells_shaping(session, triad.cell_id) == before_src == [src.cell_id]
+    assert cell_resonance_signature(session, src.cell_id) == before_sig
+    assert kernel.backfill_node_children(session) == 0
+
+
+def test_child_index_backfill_survives_caller_rollback(tmp_path, monkeypatch):
+    """The backfill commits on its own; a read session that rolls back can't undo it."""
+    from app.services.substrate import find_cells_shaping
+    from app.services.substrate import kernel
+    from app.services.substrate.substrate_strings import SubstrateStringORM
+    engine = create_engine(f"sqlite:///{tmp_path / 'substrate.db'}")
+    for orm in (SubstrateNodeORM, SubstrateNodeChildORM, SubstrateInstanceSeqORM,
+                SubstrateNamedCellORM, SubstrateStringORM):
+        orm.__table__.create(engine, checkfirst=True)
+    Session = sessionmaker(bind=engine, expire_on_commit=False)
+    with Session() as s:
+        src = make_cell(s, name="lc-rollback", domain="concept", blueprint=BID_concept())
+        author_geometry_signature(s, src.cell_id, {"form": "triad"}, arity_hz=174)
+        triad = geometric_form_cell(s, "triad")
+        s.query(SubstrateNodeChildORM).delete()
+        s.commit()
+    monkeypatch.setattr(kernel, "_CHILD_INDEX_READY", set())
+
+    with Session() as read:
+        assert find_cells_shaping(read, triad.cell_id) == [src.cell_id]
+        read.rollback()
+
+    assert str(engine.url) in kernel._CHILD_INDEX_READY
+    with Session() as s:
+        assert s.query(SubstrateNodeChildORM).count() > 0
+        assert kernel.backfill_node_children(s) == 0
+    engine.dispose()
+
+
+# ---------------------------------------------------------------------------
+# Sparse resonance index — batched coherence, same numbers as the SQL walk
+# ---------------------------------------------------------------------------
+
+
+def _triadic_family(session):
+    cells = []
+    for name, geometry, hz in [
+        ("lc-idx-a", {"form": "triad", "polarity": "parallel-facets"}, 174),
+        ("lc-idx-b", {"form": "triad", "polarity": "parallel-facets"}, 174),
+        ("lc-idx-c", {"form": "triad"}, 174),
+        ("lc-idx-d", {"form": "dyad"}, 528),
+    ]:
+        cell = make_cell(session, name=name, domain="concept", blueprint=BID_concept())
+        author_geometry_signature(session, cell.cell_id, geometry, arity_hz=hz)
+        cells.append(cell.cell_id)
+    return cells
+
+
+def test_resonance_index_matches_coherence_score(session):
+    from app.services.substrate import coherence_distance, coherence_score
+    from app.services.substrate.resonance_index import ResonanceIndex
+    cells = _triadic_family(session)
+    index = ResonanceIndex.build(session)
+    for x in cells:
+        for y in cells:
+            assert index.score(x, y) == pytest.approx(coherence_score(session, x, y))
+            assert index.distance(x, y) == coherence_distance(session, x, y)
+
+
+def test_resonance_index_top_k_and_pairs(session):
+    from app.services.substrate import coherence_score
+    from app.services.substrate.resonance_index import coherent_pairs, most_coherent
+    a, b, c, d = _triadic_family(session)
+    ranked = most_coherent(session, a, 2)
+    assert [cell_id for cell_id, _ in ranked] == [b, c]
+    assert ranked[0][1] == pytest.approx(1.0)
+    assert ranked[1][1] == pytest.approx(coherence_score(session, a, c))
+    assert d not in {cell_id for cell_id, _ in most_coherent(session, a, 10)}
+    assert (a, b) in {(x, y) for x, y, _ in coherent_pairs(session, 0.99)}
+
+
+def test_resonance_index_folds_in_new_edges(session):
+    """Edges authored after the index is built update its rows when they commit."""
+    from app.services.substrate.resonance_index import get_index, most_coherent
+    a, b, c, d = _triadic_family(session)
+    session.commit()
+    index = get_index(session)
+    author_geometry_signature(session, d, {"form": "triad", "polarity": "parallel-facets"}, arity_hz=174)
+    assert d not in {cell_id for cell_id, _ in most_coherent(session, a, 10)}
+    session.commit()
+    assert get_index(session) is index
+    assert d in {cell_id for cell_id, _ in most_coherent(session, a, 10)}
+
+
+def test_resonance_index_ignores_rolled_back_edges(session):
+    from app.services.substrate.resonance_index import get_index, most_coherent
+    a, b, c, d = _triadic_family(session)
+    session.commit()
+    index = get_index(session)
+    author_geometry_signature(session, d, {"form": "triad", "polarity": "parallel-facets"}, arity_hz=174)
+    session.rollback()
+    session.commit()
+    assert get_index(session) is index
+    assert d not in {cell_id for cell_id, _ in most_coherent(session, a, 10)}
+
+
+@pytest.mark.asyncio
+async def test_coherence_neighbors_endpoint():
+    from httpx import ASGITransport, AsyncClient
+
+    from app.main import app
+    from app.services.unified_db import session as session_scope
+
+    with session_scope() as s:
+        a, b, c, d = _triadic_family(s)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/api/substrate/coherence/neighbors/concept/lc-idx-a?k=1")
+        pairs = await client.get("/api/substrate/coherence/pairs?threshold=0.99")
+        missing = await client.get("/api/substrate/coherence/neighbors/concept/nope")
+    assert response.status_code == 200
+    body = response.json()
+    assert [n["cell"]["name"] for n in body["neighbors"]] == ["lc-idx-b"]
+    assert body["neighbors"][0]["score"] == 1.0
+    assert {(p["a"]["name"], p["b"]["name"]) for p in pairs.json()["pairs"]} >= {("lc-idx-a", "lc-idx-b")}
+    assert missing.status_code == 404
@@ -0,0 +1,203 @@
+"""Long-range view queries merging cold-tier archives with hot rollups.
+
+Source under test: view_archive_query.query_range (parallel summary
+builds, summary cache, tier merge without double counting, fallback to
+rollups) and GET /api/views/range. Archived days are served from
+file:// URLs with the archive cache pointed at a temp dir.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.services import unified_db, view_archive_query, view_rollups
+from app.services import view_events_archive_service as archive
+
+FIRST = date(2026, 1, 1)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / "cache"
+    monkeypatch.setattr(archive, "_CACHE_DIR", path)
+    return path
+
+
+def _at(day: date, hour: int = 12) -> datetime:
+    return datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc) + timedelta(hours=hour)
+
+
+def _day_views(day: date) -> list[tuple[str, str | None, str | None, datetime]]:
+    n = day.day
+    return [
+        ("asset-a" if i % 2 else "asset-b", f"viewer-{i % 5}" if i % 3 else None, None, _at(day, i % 24))
+        for i in range(n)
+    ]
+
+
+def _archive_day(tmp_path, day: date, views, *, fold: bool = True) -> None:
+    """Archive a day the way the archive script leaves it: tombstone
+    written, rollups for the day still in place."""
+    lines = [
+        json.dumps({
+            "id": f"{day}-{i}", "asset_id": a, "contributor_id": c, "session_fingerprint": None,
+            "source_page": None, "referrer_contributor_id": r, "created_at": at.isoformat(),
+        }, separators=(",", ":"))
+        for i, (a, c, r, at) in enumerate(views)
+    ]
+    payload = gzip.compress("".join(line + "\n" for line in lines).encode())
+    remote = tmp_path / f"remote-{day}.jsonl.gz"
+    remote.write_bytes(payload)
+    archive.record_tombstone(
+        day,
+        manifest={
+            "event_count": len(lines), "bytes_original": 0, "bytes_compressed": len(payload),
+            "sha256": hashlib.sha256(payload).hexdigest(),
+        },
+        archive_url=remote.as_uri(),
+    )
+    if fold:
+        _fold(views)
+
+
+def _fold(views) -> None:
+    with unified_db.session() as s:
+        view_rollups.fold_views(s, views)
+        s.commit()
+
+
+def _expected(days: list[date]) -> dict[str, int]:
+    counts: dict[str, int] = {}
+    for day in days:
+        for asset_id, *_ in _day_views(day):
+            counts[asset_id] = counts.get(asset_id, 0) + 1
+    return counts
+
+
+def _views(result) -> dict[str, int]:
+    return {a["asset_id"]: a["total_views"] for a in result["assets"]}
+
+
+def test_archived_and_hot_days_merge_without_double_counting(tmp_path, cache_dir):
+    days = [FIRST + timedelta(days=i) for i in range(10)]
+    for day in days[:7]:
+        _archive_day(tmp_path, day, _day_views(day))
+    for day in days[7:]:
+        _fold(_day_views(day))
+
+    first = view_archive_query.query_range(days[0], days[-1])
+    again = view_archive_query.query_range(days[0], days[-1])
+
+    assert _views(first) == _expected(days)
+    assert first["days"] == {"archived": 7, "from_summary_cache": 0, "fetched": 7, "fallback": [], "hot": 3}
+    assert _views(again) == _expected(days) and again["days"]["from_summary_cache"] == 7
+    assert len(list(cache_dir.glob("summary-*.json"))) == 7
+    viewers: dict[str, set] = {}
+    for day in days:
+        for asset_id, contributor_id, *_ in _day_views(day):
+            if contributor_id:
+                viewers.setdefault(asset_id, set()).add(contributor_id)
+    assert {a["asset_id"]: a["unique_contributors"] for a in first["assets"]} == {
+        asset_id: len(ids) for asset_id, ids in viewers.items()
+    }
+
+
+def test_asset_filter_carries_daily_breakdown(tmp_path, cache_dir):
+    old, new = FIRST + timedelta(days=2), FIRST + timedelta(days=3)
+    _archive_day(tmp_path, old, _day_views(old), fold=False)
+    _fold(_day_views(new))
+
+    result = view_archive_query.query_range(old, new, asset_ids=["asset-a", "asset-none"])
+
+    by_asset = {a["asset_id"]: a for a in result["assets"]}
+    assert by_asset["asset-a"]["daily_views"] == [
+        {"date": old.isoformat(), "count": 1},
+        {"date": new.isoformat(), "count": 2},
+    ]
+    assert by_asset["asset-none"]["total_views"] == 0
+
+
+def test_rewritten_day_is_resummarised_and_failed_day_falls_back(tmp_path, cache_dir):
+    day, broken = FIRST + timedelta(days=4), FIRST + timedelta(days=5)
+    _archive_day(tmp_path, day, _day_views(day))
+    _archive_day(tmp_path, broken, _day_views(broken))
+    (tmp_path / f"remote-{broken}.jsonl.gz").write_bytes(b"not the archived payload")
+
+    before = view_archive_query.query_range(day, broken)
+    # What rewrite_archived_day leaves behind: new payload + tombstone, gz cache dropped.
+    _archive_day(tmp_path, day, _day_views(day)[:1], fold=False)
+    archive._cache_path(day).unlink()
+    after = view_archive_query.query_range(day, day)
+
+    assert _views(before) == _expected([day, broken])
+    assert [f["day"] for f in before["days"]["fallback"]] == [broken.isoformat()]
+    assert _views(after) == {"asset-b": 1} and after["days"]["fetched"] == 1
+
+
+def test_summary_builds_run_with_bounded_parallelism(tmp_path, cache_dir, set_config, monkeypatch):
+    days = [FIRST + timedelta(days=i) for i in range(8)]
+    for day in days:
+        _archive_day(tmp_path, day, _day_views(day), fold=False)
+    set_config("view_archive", "max_parallel_fetches", 3)
+    build = view_archive_query._build_summary
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def slow_build(tomb):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        try:
+            return build(tomb)
+        finally:
+            with lock:
+                active[0] -= 1
+
+    monkeypatch.setattr(view_archive_query, "_build_summary", slow_build)
+
+    result = view_archive_query.query_range(days[0], days[-1])
+
+    assert _views(result) == _expected(days)
+    assert peak[0] == 3
+
+
+def test_summary_builds_per_request_are_capped(tmp_path, cache_dir, set_config):
+    days = [FIRST + timedelta(days=i) for i in range(5)]
+    for day in days:
+        _archive_day(tmp_path, day, _day_views(day), fold=False)
+    set_config("view_archive", "max_summary_builds_per_request", 2)
+
+    first = view_archive_query.query_range(days[0], days[-1])
+    assert first["missing"] == [d.isoformat() for d in days[2:]]
+    assert first["days"]["fetched"] == 2
+    assert _views(first) == _expected(days[:2])
+
+    second = view_archive_query.query_range(days[0], days[-1])
+    assert second["missing"] == [days[4].isoformat()]
+    assert second["days"]["from_summary_cache"] == 2
+
+    third = view_archive_query.query_range(days[0], days[-1])
+    assert third["missing"] == []
+    assert _views(third) == _expected(days)
+
+
+@pytest.mark.asyncio
+async def test_range_endpoint(tmp_path, cache_dir):
+    day = FIRST + timedelta(days=6)
+    _archive_day(tmp_path, day, _day_views(day))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        r = await c.get("/api/views/range", params={"since": day.isoformat(), "until": day.isoformat()})
+        bad = await c.get("/api/views/range", params={"since": "2026-02-01", "until": "2026-01-01"})
+
+    assert r.status_code == 200 and _views(r.json()) == _expected([day])
+    assert bad.status_code == 400
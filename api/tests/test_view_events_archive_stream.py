@@ -0,0 +1,156 @@
+"""Streaming, filtered and paged retrieval of archived view-event days.
+
+Source under test: view_events_archive_service.DayStream / retrieve_day /
+ndjson_lines and GET /api/views/archive/{day}. Archives are seeded as a
+tombstone plus a gzipped JSONL served from a file:// URL, with the local
+cache pointed at a temp dir.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.services import view_events_archive_service as archive
+
+DAY = date(2026, 2, 14)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / "cache"
+    monkeypatch.setattr(archive, "_CACHE_DIR", path)
+    return path
+
+
+def _events(n: int = 60) -> list[dict]:
+    start = datetime.combine(DAY, datetime.min.time(), tzinfo=timezone.utc)
+    return [
+        {
+            "id": f"ev-{i:03d}",
+            "asset_id": "asset-a" if i % 3 else "asset-b",
+            "contributor_id": f"viewer-{i % 4}" if i % 5 else None,
+            "session_fingerprint": None,
+            "source_page": "/assets",
+            "referrer_contributor_id": None,
+            "created_at": (start + timedelta(minutes=20 * i)).isoformat(),
+        }
+        for i in range(n)
+    ]
+
+
+def _archive(tmp_path, events: list[dict]) -> bytes:
+    payload = gzip.compress(b"".join(
+        (json.dumps(e, separators=(",", ":")) + "\n").encode() for e in events
+    ))
+    remote = tmp_path / "remote.jsonl.gz"
+    remote.write_bytes(payload)
+    archive.record_tombstone(
+        DAY,
+        manifest={
+            "event_count": len(events),
+            "bytes_original": 0,
+            "bytes_compressed": len(payload),
+            "sha256": hashlib.sha256(payload).hexdigest(),
+        },
+        archive_url=remote.as_uri(),
+    )
+    return payload
+
+
+def test_fetch_tees_into_cache_and_second_read_is_local(tmp_path, cache_dir):
+    events = _events()
+    payload = _archive(tmp_path, events)
+
+    first = archive.retrieve_day(DAY)
+    second = archive.retrieve_day(DAY)
+
+    assert first["events"] == events and first["fetched_from_cache"] is False
+    assert archive._cache_path(DAY).read_bytes() == payload
+    assert not list(cache_dir.glob("*.part"))
+    assert second["events"] == events and second["fetched_from_cache"] is True
+
+
+def test_filters_and_pages_over_matches(tmp_path, cache_dir):
+    events = _events()
+    _archive(tmp_path, events)
+    since = datetime.combine(DAY, datetime.min.time(), tzinfo=timezone.utc) + timedelta(hours=3)
+    expected = [
+        e for e in events
+        if e["asset_id"] == "asset-a" and e["contributor_id"] == "viewer-1"
+        and datetime.fromisoformat(e["created_at"]) >= since
+    ]
+
+    page = archive.retrieve_day(DAY, asset_id="asset-a", contributor_id="viewer-1", since=since, limit=2)
+    rest = archive.retrieve_day(
+        DAY, asset_id="asset-a", contributor_id="viewer-1", since=since, offset=page["next_offset"],
+    )
+
+    assert page["events"] == expected[:2] and page["next_offset"] == 2
+    assert rest["events"] == expected[2:] and rest["next_offset"] is None
+
+
+def test_until_stops_decoding_but_still_verifies(tmp_path, cache_dir):
+    events = _events()
+    _archive(tmp_path, events)
+    archive.retrieve_day(DAY)
+    until = datetime.combine(DAY, datetime.min.time(), tzinfo=timezone.utc) + timedelta(hours=2)
+
+    stream = archive.open_day(DAY)
+    got = list(stream.events(archive.EventFilter(until=until)))
+
+    assert [e["id"] for e in got] == ["ev-000", "ev-001", "ev-002", "ev-003", "ev-004", "ev-005"]
+    assert stream.lines_scanned == 7
+
+
+def test_corrupt_cache_is_dropped_and_refetched(tmp_path, cache_dir):
+    events = _events()
+    _archive(tmp_path, events)
+    cache_dir.mkdir()
+    archive._cache_path(DAY).write_bytes(gzip.compress(b'{"id":"forged"}\n'))
+
+    bad = archive.retrieve_day(DAY)
+    good = archive.retrieve_day(DAY)
+
+    assert bad["fetched"] is True and "integrity check failed" in bad["error"]
+    assert good["events"] == events and good["fetched_from_cache"] is False
+
+
+@pytest.mark.asyncio
+async def test_ndjson_endpoint_streams_matching_lines(tmp_path, cache_dir):
+    events = _events()
+    payload = _archive(tmp_path, events)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        r = await c.get(f"/api/views/archive/{DAY.isoformat()}", params={"format": "ndjson", "asset_id": "asset-b"})
+        missing = await c.get("/api/views/archive/2020-01-01", params={"format": "ndjson"})
+
+    assert r.status_code == 200 and r.headers["content-type"].startswith("application/x-ndjson")
+    assert r.headers["x-archive-sha256"] == hashlib.sha256(payload).hexdigest()
+    assert [json.loads(line) for line in r.text.splitlines()] == [e for e in events if e["asset_id"] == "asset-b"]
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_ndjson_refuses_tampered_payload_before_streaming(tmp_path, cache_dir):
+    events = _events()
+    _archive(tmp_path, events)
+    (tmp_path / "remote.jsonl.gz").write_bytes(gzip.compress(b'{"id":"forged"}\n'))
+    url = f"/api/views/archive/{DAY.isoformat()}"
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        tampered = await c.get(url, params={"format": "ndjson"})
+        cache_dir.mkdir(exist_ok=True)
+        archive._cache_path(DAY).write_bytes(gzip.compress(b'{"id":"forged"}\n'))
+        corrupt_cache = await c.get(url, params={"format": "ndjson"})
+
+    assert tampered.status_code == 502 and "integrity check failed" in tampered.json()["detail"]
+    assert "forged" not in tampered.text
+    assert corrupt_cache.status_code == 502 and "forged" not in corrupt_cache.text
+    assert not archive._cache_path(DAY).exists() and not list(cache_dir.glob("*.part"))
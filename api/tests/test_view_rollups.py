@@ -0,0 +1,191 @@
+"""Hourly/daily view rollups behind trending and asset view stats.
+
+Source under test: view_rollups (sketch, window planning, backfill) and
+read_tracking_service.get_trending / get_asset_view_stats in rollup and
+raw-fallback modes.
+"""
+
+from __future__ import annotations
+
+import threading
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+from app.services import read_tracking_service, unified_db, view_events_archive_service, view_rollups
+from app.services.read_tracking_service import AssetViewEvent
+from app.services.view_rollups import AssetViewRollup, ViewerSketch
+
+
+def _seed_view(s, asset_id: str, created_at: datetime, contributor_id=None, referrer=None) -> None:
+    s.add(AssetViewEvent(
+        id=str(uuid4()),
+        asset_id=asset_id,
+        contributor_id=contributor_id,
+        referrer_contributor_id=referrer,
+        created_at=created_at,
+    ))
+    view_rollups.fold_views(s, [(asset_id, contributor_id, referrer, created_at)])
+
+
+def _seed_history() -> None:
+    now = datetime.now(timezone.utc)
+    with unified_db.session() as s:
+        for day in range(12):
+            for i in range(day % 4 + 1):
+                _seed_view(
+                    s, "asset-river", now - timedelta(days=day, hours=i * 5),
+                    contributor_id=f"viewer-{(day + i) % 7}", referrer="guide-a" if i % 2 else None,
+                )
+            _seed_view(s, "asset-stone", now - timedelta(days=day, minutes=30))
+        _seed_view(s, "asset-stone", now - timedelta(days=6, hours=23, minutes=50), referrer="guide-b")
+        s.commit()
+    read_tracking_service.record_view("asset-river", contributor_id="viewer-new", referrer_contributor_id="guide-a")
+    read_tracking_service.record_view("asset-cedar")
+
+
+def test_rollup_reads_match_raw_fallback(set_config):
+    _seed_history()
+
+    rolled_stats = read_tracking_service.get_asset_view_stats("asset-river", days=7)
+    rolled_trending = read_tracking_service.get_trending(limit=10, days=7)
+    set_config("read_tracking", "rollups", False)
+    raw_stats = read_tracking_service.get_asset_view_stats("asset-river", days=7)
+    raw_trending = read_tracking_service.get_trending(limit=10, days=7)
+
+    assert rolled_stats == raw_stats
+    assert rolled_stats["unique_contributors"] == 8
+    assert rolled_stats["top_referrers"][0]["contributor_id"] == "guide-a"
+    assert sorted(rolled_trending, key=lambda t: t["asset_id"]) == sorted(raw_trending, key=lambda t: t["asset_id"])
+    assert [t["asset_id"] for t in rolled_trending] == ["asset-river", "asset-stone", "asset-cedar"]
+
+
+def test_views_fold_into_hour_and_day_rows():
+    read_tracking_service.record_view("asset-moss", contributor_id="viewer-a")
+    read_tracking_service.record_view("asset-moss", contributor_id="viewer-a")
+    read_tracking_service.record_view("asset-moss")
+
+    with unified_db.session() as s:
+        rows = {row.granularity: row for row in s.query(AssetViewRollup).filter_by(asset_id="asset-moss")}
+    assert set(rows) == {"hour", "day"}
+    for row in rows.values():
+        assert (row.view_count, row.anonymous_count) == (3, 1)
+        assert ViewerSketch.from_bytes(row.viewer_sketch).estimate() == 1
+
+
+def test_table_created_next_to_existing_events_is_backfilled():
+    now = datetime.now(timezone.utc)
+    with unified_db.session() as s:
+        for i in range(5):
+            s.add(AssetViewEvent(
+                id=str(uuid4()), asset_id="asset-old", contributor_id=f"viewer-{i % 3}",
+                created_at=now - timedelta(days=i),
+            ))
+        s.commit()
+    AssetViewRollup.__table__.drop(unified_db.engine())
+    AssetViewRollup.__table__.create(unified_db.engine())
+    view_rollups.reset()
+
+    stats = read_tracking_service.get_asset_view_stats("asset-old", days=30)
+
+    assert stats["total_views"] == 5 and stats["unique_contributors"] == 3
+    with unified_db.session() as s:
+        assert s.query(AssetViewRollup).filter_by(granularity="backfill").count() == 0
+
+
+def test_sketch_estimates_merges_and_round_trips():
+    left, right = ViewerSketch(), ViewerSketch()
+    for i in range(6000):
+        left.add(f"contributor-{i}")
+    for i in range(3000, 9000):
+        right.add(f"contributor-{i}")
+
+    merged = ViewerSketch.from_bytes(left.to_bytes())
+    merged.merge(ViewerSketch.from_bytes(right.to_bytes()))
+
+    assert abs(merged.estimate() - 9000) / 9000 < 0.05
+    assert left.to_bytes()[:1] == b"d"
+    small = ViewerSketch()
+    for name in ("a", "b", "c", "a"):
+        small.add(name)
+    assert small.to_bytes()[:1] == b"s" and ViewerSketch.from_bytes(small.to_bytes()).estimate() == 3
+
+
+def test_plan_window_tiles_days_hours_and_raw_edge():
+    now = datetime(2026, 3, 10, 14, 25, tzinfo=timezone.utc).timestamp()
+    since = now - 3 * 86400
+
+    ranges, raw_edge = view_rollups.plan_window(since, now)
+
+    day = 86400
+    assert raw_edge == (since, since + 35 * 60)
+    assert ranges == [
+        ("hour", int(since + 35 * 60), int(now // day * day - 2 * day)),
+        ("day", int(now // day * day - 2 * day), int(now // day * day)),
+        ("hour", int(now // day * day), int(now // day * day + 15 * 3600)),
+    ]
+
+
+def test_concurrent_views_add_up_and_merge_sketches():
+    start = threading.Barrier(8)
+
+    def viewer(worker: int) -> None:
+        start.wait()
+        for i in range(15):
+            read_tracking_service.record_view(
+                "asset-hive", contributor_id=f"viewer-{worker}-{i % 5}", referrer_contributor_id="guide-h",
+            )
+
+    threads = [threading.Thread(target=viewer, args=(w,)) for w in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    expected = ViewerSketch()
+    for w in range(8):
+        for i in range(5):
+            expected.add(f"viewer-{w}-{i}")
+    with unified_db.session() as s:
+        rows = s.query(AssetViewRollup).filter_by(asset_id="asset-hive").all()
+    assert {row.granularity for row in rows} == {"hour", "day"}
+    for row in rows:
+        assert row.view_count == 120
+        assert ViewerSketch.from_bytes(row.viewer_sketch).registers == expected.registers
+        assert row.referrers == '{"guide-h": 120}'
+
+
+def test_plan_window_past_hour_retention_starts_at_the_day_row():
+    now = datetime(2026, 3, 10, 14, 25, tzinfo=timezone.utc).timestamp()
+    since = now - 40 * 86400
+
+    ranges, raw_edge = view_rollups.plan_window(since, now, hour_floor_ts=now - 35 * 86400)
+
+    assert raw_edge is None
+    assert ranges[0] == ("day", int(since // 86400 * 86400), int(now // 86400 * 86400))
+
+
+def test_prune_drops_old_hours_and_archived_old_days(set_config):
+    set_config("read_tracking", "rollup_day_retention_days", 30)
+    now = datetime(2026, 3, 10, 12, tzinfo=timezone.utc)
+    old_archived = date(2026, 1, 5)
+    old_unarchived = date(2026, 1, 6)
+    with unified_db.session() as s:
+        for day in (old_archived, old_unarchived, now.date()):
+            at = datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc) + timedelta(hours=3)
+            view_rollups.fold_views(s, [("asset-fern", None, None, at)])
+        s.commit()
+    view_events_archive_service.record_tombstone(
+        old_archived,
+        manifest={"event_count": 1, "bytes_original": 0, "bytes_compressed": 0, "sha256": "0" * 64},
+        archive_url="file:///nowhere",
+    )
+
+    removed = view_rollups.prune(now)
+
+    with unified_db.session() as s:
+        left = sorted(
+            (row.granularity, datetime.fromtimestamp(row.bucket_start, tz=timezone.utc).date())
+            for row in s.query(AssetViewRollup).filter_by(asset_id="asset-fern")
+        )
+    assert removed == {"hour": 2, "day": 1}
+    assert left == [("day", old_unarchived), ("day", now.date()), ("hour", now.date())]
@@ -580,7 +580,12 @@ def cmd_reset(args: argparse.Namespace) -> int:
         print("reset: pass --yes to clear substrate tables", file=sys.stderr)
         return 2
 
-    from app.services.substrate.orm import SubstrateNamedCellORM, SubstrateNodeORM
+    from app.services.substrate.orm import (
+        SubstrateInstanceSeqORM,
+        SubstrateNamedCellORM,
+        SubstrateNodeChildORM,
+        SubstrateNodeORM,
+    )
     from app.services.substrate.substrate_strings import SubstrateStringORM
 
     with session_scope() as session:
@@ -588,6 +593,8 @@ def cmd_reset(args: argparse.Namespace) -> int:
         nodes = session.query(SubstrateNodeORM).count()
         strings = session.query(SubstrateStringORM).count()
         session.query(SubstrateNamedCellORM).delete()
+        session.query(SubstrateNodeChildORM).delete()
+        session.query(SubstrateInstanceSeqORM).delete()
         session.query(SubstrateNodeORM).delete()
         session.query(SubstrateStringORM).delete()
         session.commit()
@@ -91,7 +91,9 @@ def substrate_session():
         def find_downstream_cells(_session, _cell_id):  # type: ignore
             return []
     from app.services.substrate.orm import (
+        SubstrateInstanceSeqORM,
         SubstrateNamedCellORM,
+        SubstrateNodeChildORM,
         SubstrateNodeORM,
     )
     from app.services.substrate.substrate_strings import SubstrateStringORM
@@ -108,6 +110,8 @@ def substrate_session():
     else:
         engine = create_engine(db_url)
     SubstrateNodeORM.__table__.create(engine, checkfirst=True)
+    SubstrateNodeChildORM.__table__.create(engine, checkfirst=True)
+    SubstrateInstanceSeqORM.__table__.create(engine, checkfirst=True)
     SubstrateNamedCellORM.__table__.create(engine, checkfirst=True)
     SubstrateStringORM.__table__.create(engine, checkfirst=True)
     Session = sessionmaker(bind=engine, expire_on_commit=False)